@@ -9,10 +9,13 @@ to identify discrepancies, missing implementations, and incorrect endpoint usage
 Generated on: October 20, 2025
 """
 
+import glob
 import json
 from datetime import datetime
 from typing import Dict, List, Any
 
+from response_schemas import schema_for, validate_report
+
 class APIComplianceAuditor:
     def __init__(self):
         self.audit_results = {
@@ -284,6 +287,38 @@ class APIComplianceAuditor:
         }
         return findings
 
+    def audit_response_schemas(self, report_files: List[str] = None):
+        """Check schema coverage and validate recorded responses against the schemas"""
+        if report_files is None:
+            report_files = sorted(glob.glob("api_test_report_*.json"))
+        
+        without_schema = []
+        for category in self.api_endpoints.values():
+            for endpoint in category["endpoints"]:
+                if schema_for(endpoint["method"], endpoint["path"]) is None:
+                    without_schema.append(f"{endpoint['method']} {endpoint['path']}")
+        
+        reports = []
+        mismatches = 0
+        checked = 0
+        for report_file in report_files:
+            try:
+                result = validate_report(report_file)
+            except (OSError, ValueError) as e:
+                reports.append({"report_file": report_file, "error": str(e)})
+                continue
+            checked += result["summary"]["checked"]
+            mismatches += len(result["mismatches"])
+            reports.append(result)
+        
+        return {
+            "endpoints_without_schema": without_schema,
+            "reports_validated": len(reports),
+            "responses_checked": checked,
+            "schema_mismatches": mismatches,
+            "reports": reports
+        }
+
     def generate_recommendations(self):
         """Generate recommendations for fixing API compliance issues"""
         return [
@@ -479,6 +514,7 @@ class APIComplianceAuditor:
         employee_sub_audit = self.audit_employee_subscription_service()
         health_audit = self.audit_health_check_service()
         missing_services = self.check_missing_services()
+        schema_audit = self.audit_response_schemas()
         
         # Store results
         self.audit_results["services_audit"] = {
@@ -489,7 +525,8 @@ class APIComplianceAuditor:
             "availability": availability_audit,
             "employee_subscriptions": employee_sub_audit,
             "health_check": health_audit,
-            "missing_services": missing_services
+            "missing_services": missing_services,
+            "response_schemas": schema_audit
         }
         
         # Calculate compliance
@@ -506,10 +543,18 @@ class APIComplianceAuditor:
         self.audit_results["recommendations"] = self.generate_recommendations()
         
         # Identify critical issues
+        if schema_audit["responses_checked"] == 0:
+            schema_issue = "Mock data fallbacks should be verified to match API response structure (no recorded responses to check)"
+        elif schema_audit["schema_mismatches"]:
+            schema_issue = (f"{schema_audit['schema_mismatches']} of {schema_audit['responses_checked']} recorded "
+                            f"responses do not match the documented response schemas")
+        else:
+            schema_issue = (f"All {schema_audit['responses_checked']} recorded responses match the documented "
+                            f"response schemas")
         self.audit_results["critical_issues"] = [
             "3 authentication endpoints implemented but not used in UI components",
             "All UI components created for remaining endpoints - now 93.3% compliance!",
-            "Mock data fallbacks should be verified to match API response structure"
+            schema_issue
         ]
         
         return self.audit_results
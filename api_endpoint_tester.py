@@ -4,22 +4,58 @@ ThoughtPro B2B Production API Endpoint Tester
 Similar to Postman - tests each API endpoint and fetches results
 """
 
+import argparse
 import requests
 import json
 import time
 from datetime import datetime
 import sys
 import os
-from urllib.parse import urljoin
+import socket
+from urllib.parse import urljoin, urlsplit
+from requests.adapters import HTTPAdapter
+
+from circuit_breaker import HostCircuitBreaker, argv_option, breaker_from_argv
+from generator_monitor import GeneratorMonitor
+from load_runner import (DEFAULT_MAX_ERROR_RATE, DEFAULT_SLO_P99_MS, LoadRunner, Slo, capacity_search,
+                         curve_path_for, parse_target, print_capacity, print_rate, print_step, rate_run,
+                         save_curve)
+from log_pipeline import LogPipeline
+from payload_metrics import count_wire_bytes, empty_metrics, exchange_metrics, format_bytes
+from report_renderer import DEFAULT_TOP_N, DETAIL_LIMIT, ReportRenderer, render_result_sections
+from response_schemas import ResponseValidator
+from result_store import ResultStore
 
 class ProductionAPITester:
-    def __init__(self, base_url="https://thoughtprob2b.thoughthealer.org/api/v1"):
+    def __init__(self, base_url="https://thoughtprob2b.thoughthealer.org/api/v1", validation_sample_rate=1.0,
+                 quiet=False, breaker=None, keep_details=True):
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
+        # Wire sizes counted off the socket - exact for chunked and compressed bodies
+        self.session.hooks['response'].append(count_wire_bytes)
         self.auth_token = None
         self.test_data = {}
+        
+        # Every result goes to the columnar store (result_store.py), which the report
+        # reads; full result dicts with response bodies are kept only for keep_details,
+        # and only the first DETAIL_LIMIT - larger runs report aggregates and samples
+        self.store = ResultStore()
+        self.keep_details = keep_details
+        self.store_path = None
+        self.report_top_n = DEFAULT_TOP_N
         self.results = []
         
+        # Validate every response by default; load runs pass a lower sample rate
+        self.schema_validator = ResponseValidator(sample_rate=validation_sample_rate)
+        
+        # Per-request console output is queued and rendered by a background writer;
+        # quiet mode drops it so only the summary is printed
+        self.output = LogPipeline(quiet=quiet)
+        
+        # Unreachable hosts and an exceeded run deadline short-circuit requests
+        # instead of waiting out a timeout for each one (see circuit_breaker.py)
+        self.breaker = breaker or HostCircuitBreaker()
+        
         # Set up session headers
         self.session.headers.update({
             'Content-Type': 'application/json',
@@ -27,8 +63,9 @@ class ProductionAPITester:
             'Accept': 'application/json'
         })
 
-    def log_result(self, method, endpoint, status_code, response_data, duration, error=None):
-        """Log the API test result"""
+    def log_result(self, method, endpoint, status_code, response_data, duration, error=None,
+                   short_circuited=False, payload=None):
+        """Log the API test result (``payload``: byte counts from payload_metrics.exchange_metrics)"""
         result = {
             'timestamp': datetime.now().isoformat(),
             'method': method,
@@ -38,19 +75,32 @@ class ProductionAPITester:
             'duration_ms': round(duration * 1000, 2),
             'success': 200 <= status_code < 300,
             'response_data': response_data,
-            'error': error
+            'error': error,
+            'short_circuited': short_circuited,
+            **(payload or empty_metrics()),
+            'schema_errors': self.schema_validator.validate(method, endpoint, status_code, response_data)
         }
-        self.results.append(result)
+        self.store.append(result)
+        if self.keep_details and len(self.results) < DETAIL_LIMIT:
+            self.results.append(result)
         
         # Console output
-        status_emoji = "✅" if result['success'] else "❌"
-        print(f"{status_emoji} {method} {endpoint}")
-        print(f"   Status: {status_code} | Duration: {result['duration_ms']}ms")
-        if result['success']:
-            print(f"   Response: {json.dumps(response_data, indent=2)[:200]}...")
-        else:
-            print(f"   Error: {error or 'Request failed'}")
-        print("-" * 80)
+        if not self.output.quiet:
+            status_emoji = "✅" if result['success'] else "❌"
+            lines = [
+                f"{status_emoji} {method} {endpoint}",
+                f"   Status: {status_code} | Duration: {result['duration_ms']}ms"
+                + (f" | Size: {format_bytes(result['response_wire_bytes'])} wire, "
+                   f"{format_bytes(result['response_body_bytes'])} decoded" if payload else "")
+            ]
+            if result['success']:
+                lines.append(f"   Response: {json.dumps(response_data, indent=2)[:200]}...")
+            else:
+                lines.append(f"   Error: {error or 'Request failed'}")
+            if result['schema_errors']:
+                lines.append(f"   Schema: {result['schema_errors'][0]} ({len(result['schema_errors'])} issue(s))")
+            lines.append("-" * 80)
+            self.output.console("\n".join(lines))
         
         return result
 
@@ -67,23 +117,31 @@ class ProductionAPITester:
         if self.auth_token and (auth_required or 'Authorization' not in request_headers):
             request_headers['Authorization'] = f'Bearer {self.auth_token}'
         
+        # Skip without waiting if the host is unreachable or the run is out of time
+        reason = self.breaker.check(self.session, url)
+        if reason:
+            return self.log_result(method, endpoint, 0, None, 0.0, f"Short-circuited - {reason}",
+                                   short_circuited=True)
+        timeout = self.breaker.timeout()
+        
         try:
             start_time = time.time()
             
             if method.upper() == 'GET':
-                response = self.session.get(url, headers=request_headers, timeout=30)
+                response = self.session.get(url, headers=request_headers, timeout=timeout)
             elif method.upper() == 'POST':
-                response = self.session.post(url, json=data, headers=request_headers, timeout=30)
+                response = self.session.post(url, json=data, headers=request_headers, timeout=timeout)
             elif method.upper() == 'PUT':
-                response = self.session.put(url, json=data, headers=request_headers, timeout=30)
+                response = self.session.put(url, json=data, headers=request_headers, timeout=timeout)
             elif method.upper() == 'PATCH':
-                response = self.session.patch(url, json=data, headers=request_headers, timeout=30)
+                response = self.session.patch(url, json=data, headers=request_headers, timeout=timeout)
             elif method.upper() == 'DELETE':
-                response = self.session.delete(url, headers=request_headers, timeout=30)
+                response = self.session.delete(url, headers=request_headers, timeout=timeout)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
             duration = time.time() - start_time
+            self.breaker.record(url)
             
             # Try to parse JSON response
             try:
@@ -91,22 +149,120 @@ class ProductionAPITester:
             except:
                 response_data = response.text[:500] if response.text else None
             
-            return self.log_result(method, endpoint, response.status_code, response_data, duration)
+            return self.log_result(method, endpoint, response.status_code, response_data, duration,
+                                   payload=exchange_metrics(response, duration))
             
-        except requests.exceptions.Timeout:
+        except requests.exceptions.Timeout as e:
             duration = time.time() - start_time
+            self.breaker.record(url, e)
             return self.log_result(method, endpoint, 408, None, duration, "Request timeout")
-        except requests.exceptions.ConnectionError:
+        except requests.exceptions.ConnectionError as e:
             duration = time.time() - start_time
+            self.breaker.record(url, e)
             return self.log_result(method, endpoint, 0, None, duration, "Connection error")
         except Exception as e:
             duration = time.time() - start_time
             return self.log_result(method, endpoint, 0, None, duration, str(e))
 
+    def load_request(self, target):
+        """Send one load-run request and return its status code (0 on transport failure)
+        
+        Unlike make_request nothing is logged or kept per request; schema checks
+        follow the validator's sample rate, and only sampled bodies are parsed.
+        """
+        url = f"{self.base_url}{target.endpoint}"
+        if self.breaker.check(self.session, url):
+            return 0
+        headers = None
+        if self.auth_token:
+            headers = {'Authorization': f'Bearer {self.auth_token}'}
+        try:
+            response = self.session.request(target.method, url, json=target.data, headers=headers,
+                                            timeout=self.breaker.timeout())
+        except requests.exceptions.RequestException as e:
+            self.breaker.record(url, e)
+            return 0
+        self.breaker.record(url)
+        if self.schema_validator.sample():
+            try:
+                response_data = response.json()
+            except ValueError:
+                response_data = None
+            self.schema_validator.check(target.method, target.endpoint, response.status_code, response_data)
+        return response.status_code
+
+    def run_capacity_search(self, targets, slo=None, per_endpoint=False, curve_path=None, rate_rps=None,
+                            **search_options):
+        """Step-load search for the throughput knee, over a weighted mix or per endpoint
+        
+        With ``rate_rps`` one open-loop step at that rate replaces the search
+        (``max_concurrency`` workers, ``step_duration`` seconds).
+        Returns {name: report}; see load_runner.capacity_search and rate_run.
+        """
+        slo = slo or Slo()
+        max_concurrency = search_options.get('max_concurrency', 256)
+        # One pooled connection per worker, so connections are not churned at high concurrency
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        groups = {target.name: [target] for target in targets} if per_endpoint else \
+            {" + ".join(f"{t.name}:{t.weight:g}" for t in targets): targets}
+        mode = f"FIXED RATE {rate_rps:g} rps" if rate_rps else "CAPACITY SEARCH"
+        p99 = "corrected p99" if slo.corrected else "p99"
+        print(f"📈 {mode} - SLO {p99} <= {slo.p99_ms:.0f}ms, errors <= {slo.max_error_rate:.1%}")
+        print(f"Base URL: {self.base_url}")
+        print("=" * 80)
+        
+        self.breaker.start()
+        # Warm-up phase 1: resolve the host once so no measured request pays for DNS
+        # (the pool fill and server warm-up run per concurrency inside the runner)
+        host = urlsplit(self.base_url).hostname
+        dns_start = time.perf_counter()
+        try:
+            socket.getaddrinfo(host, None)
+            dns = {'phase': 'dns', 'host': host, 'ms': round((time.perf_counter() - dns_start) * 1000, 2)}
+        except OSError as e:
+            dns = {'phase': 'dns', 'host': host, 'error': str(e)}
+        reports = {}
+        # Samples this process's CPU, scheduling lag, sockets and RSS; steps taken
+        # while the generator itself was saturated are marked invalid
+        monitor = GeneratorMonitor().start()
+        for name, group in groups.items():
+            print(f"\n🎯 {name}")
+            group_start = monitor.now()
+            runner = LoadRunner(self.load_request, group, monitor=monitor)
+            if rate_rps:
+                report = rate_run(runner, slo, rate_rps, max_concurrency, search_options.get('step_duration', 30.0),
+                                  search_options.get('warmup_duration', 0.0), on_step=print_step)
+            else:
+                report = capacity_search(runner, slo, on_step=print_step, **search_options)
+            report['warmup'].insert(0, dns)
+            report['target'] = name
+            report['base_url'] = self.base_url
+            report['timestamp'] = datetime.now().isoformat()
+            report['schema_validation'] = self.schema_validator.summary()
+            report['generator'] = monitor.summary(group_start, monitor.now())
+            reports[name] = report
+            if rate_rps:
+                print_rate(name, report)
+            else:
+                print_capacity(name, report)
+                # Scalability model of the curve (NumPy is only needed here)
+                from scalability_fit import analyze_report, print_fit
+                report['scalability'] = analyze_report(report)
+                print_fit(report['scalability'])
+            if curve_path:
+                path = curve_path_for(curve_path, group[0]) if per_endpoint else curve_path
+                save_curve(report, path)
+                print(f"💾 Curve saved to: {path}")
+        monitor.stop()
+        return reports
+
     def test_authentication_endpoints(self):
         """Test all authentication related endpoints"""
-        print("\n🔐 TESTING AUTHENTICATION ENDPOINTS")
-        print("=" * 80)
+        self.output.console("\n🔐 TESTING AUTHENTICATION ENDPOINTS")
+        self.output.console("=" * 80)
         
         # 1. Register User Profile
         register_data = {
@@ -143,7 +299,7 @@ class ProductionAPITester:
                             result['response_data'].get('data', {}).get('token'))
                 if token:
                     self.auth_token = token
-                    print(f"🔑 Auth token acquired: {token[:20]}...")
+                    self.output.console(f"🔑 Auth token acquired: {token[:20]}...")
         
         # 4. Get User Profile (requires auth)
         self.make_request('GET', '/auth/supabase/profile', auth_required=True)
@@ -172,8 +328,8 @@ class ProductionAPITester:
 
     def test_company_endpoints(self):
         """Test all company management endpoints"""
-        print("\n🏢 TESTING COMPANY ENDPOINTS")
-        print("=" * 80)
+        self.output.console("\n🏢 TESTING COMPANY ENDPOINTS")
+        self.output.console("=" * 80)
         
         # 1. Create Company with Supabase
         company_data = {
@@ -257,8 +413,8 @@ class ProductionAPITester:
 
     def test_psychologist_endpoints(self):
         """Test all psychologist management endpoints"""
-        print("\n🧠 TESTING PSYCHOLOGIST ENDPOINTS")
-        print("=" * 80)
+        self.output.console("\n🧠 TESTING PSYCHOLOGIST ENDPOINTS")
+        self.output.console("=" * 80)
         
         # 1. Get All Psychologists
         self.make_request('GET', '/psychologists')
@@ -298,8 +454,8 @@ class ProductionAPITester:
 
     def test_booking_endpoints(self):
         """Test all booking related endpoints"""
-        print("\n📅 TESTING BOOKING ENDPOINTS")
-        print("=" * 80)
+        self.output.console("\n📅 TESTING BOOKING ENDPOINTS")
+        self.output.console("=" * 80)
         
         # 1. Get My Bookings
         self.make_request('GET', '/bookings/my-bookings', auth_required=True)
@@ -320,8 +476,8 @@ class ProductionAPITester:
 
     def test_employee_subscription_endpoints(self):
         """Test employee subscription related endpoints"""
-        print("\n💳 TESTING EMPLOYEE SUBSCRIPTION ENDPOINTS")
-        print("=" * 80)
+        self.output.console("\n💳 TESTING EMPLOYEE SUBSCRIPTION ENDPOINTS")
+        self.output.console("=" * 80)
         
         # 1. Verify Google Play Purchase
         purchase_data = {
@@ -347,8 +503,8 @@ class ProductionAPITester:
 
     def test_availability_endpoints(self):
         """Test availability and holiday management endpoints"""
-        print("\n📋 TESTING AVAILABILITY & HOLIDAY ENDPOINTS")
-        print("=" * 80)
+        self.output.console("\n📋 TESTING AVAILABILITY & HOLIDAY ENDPOINTS")
+        self.output.console("=" * 80)
         
         # 1. Create Availability Slot
         availability_data = {
@@ -423,8 +579,8 @@ class ProductionAPITester:
 
     def test_health_check_endpoints(self):
         """Test system health and status endpoints"""
-        print("\n❤️ TESTING HEALTH CHECK ENDPOINTS")
-        print("=" * 80)
+        self.output.console("\n❤️ TESTING HEALTH CHECK ENDPOINTS")
+        self.output.console("=" * 80)
         
         # 1. Employee Subscription Service Status
         self.make_request('GET', '/employee-subscriptions/status')
@@ -440,8 +596,12 @@ class ProductionAPITester:
         print(f"🚀 STARTING PRODUCTION API TESTS")
         print(f"Base URL: {self.base_url}")
         print(f"Started at: {datetime.now().isoformat()}")
+        if self.breaker.deadline:
+            print(f"Deadline: {self.breaker.deadline:.0f}s | Circuit breaker after "
+                  f"{self.breaker.failure_threshold} consecutive connection failures")
         print("=" * 80)
         
+        self.breaker.start()
         try:
             self.test_authentication_endpoints()
             self.test_company_endpoints()
@@ -451,8 +611,10 @@ class ProductionAPITester:
             self.test_availability_endpoints()
             self.test_health_check_endpoints()
         except KeyboardInterrupt:
+            self.output.flush()
             print("\n⚠️  Tests interrupted by user")
         except Exception as e:
+            self.output.flush()
             print(f"\n❌ Unexpected error during testing: {str(e)}")
         
         # Generate summary report
@@ -460,53 +622,157 @@ class ProductionAPITester:
 
     def generate_report(self):
         """Generate comprehensive test report"""
+        # Summaries are printed directly, after any queued per-request output
+        self.output.flush()
         print("\n📊 GENERATING TEST REPORT")
         print("=" * 80)
         
-        total_tests = len(self.results)
-        successful_tests = sum(1 for r in self.results if r['success'])
+        store = self.store
+        total_tests = len(store)
+        successful_tests = store.count('success')
         failed_tests = total_tests - successful_tests
+        short_circuited = store.count('short_circuited')
+        breaker_summary = self.breaker.summary()
         
         success_rate = (successful_tests / total_tests * 100) if total_tests > 0 else 0
+        schema_summary = self.schema_validator.summary()
+        payload_by_endpoint = store.payload_summary()
+        payload_totals = store.payload_totals()
         
         print(f"📈 SUMMARY STATISTICS:")
         print(f"   Total Tests: {total_tests}")
         print(f"   Successful: {successful_tests} ({success_rate:.1f}%)")
         print(f"   Failed: {failed_tests} ({100-success_rate:.1f}%)")
+        if short_circuited:
+            print(f"   Short-circuited: {short_circuited} (not sent - {'; '.join(breaker_summary['reasons'])})")
+        print(f"   Schema Mismatches: {schema_summary['schema_failures']}/{schema_summary['checked']} checked "
+              f"(sample rate {schema_summary['sample_rate']}, {schema_summary['overhead_pct_of_cpu']}% of CPU)")
+        print(f"   Bytes: {format_bytes(payload_totals['request_wire_bytes'])} sent, "
+              f"{format_bytes(payload_totals['response_wire_bytes'])} received "
+              f"({format_bytes(payload_totals['response_body_bytes'])} decoded)")
         print(f"   Base URL: {self.base_url}")
         print(f"   Test Duration: {datetime.now().isoformat()}")
         
-        # Save detailed report to file
+        # Largest responses first - list endpoints grow with the data behind them
+        largest = sorted(((key, row) for key, row in payload_by_endpoint.items() if row['responses']),
+                         key=lambda item: -item[1]['response_body_bytes_mean'])[:5]
+        if largest:
+            print("\n📦 LARGEST PAYLOADS (mean per response):")
+            for key, row in largest:
+                ratio = f"{row['compression_ratio_mean']:.1f}x" if row['compression_ratio_mean'] else "-"
+                print(f"   {key:60} {format_bytes(row['response_body_bytes_mean']):>10} decoded "
+                      f"{format_bytes(row['response_wire_bytes_mean']):>10} wire  compression {ratio:>5}  "
+                      f"{format_bytes(row['effective_bytes_per_sec_mean'])}/s")
+        
+        # Save detailed report to file - JSON and HTML written section by section in one
+        # pass over the store; only aggregates and the top-N samples are decoded
         report_filename = f"api_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        report_data = {
-            'summary': {
-                'total_tests': total_tests,
-                'successful_tests': successful_tests,
-                'failed_tests': failed_tests,
-                'success_rate': success_rate,
-                'base_url': self.base_url,
-                'test_timestamp': datetime.now().isoformat()
-            },
-            'test_data_used': self.test_data,
-            'detailed_results': self.results
-        }
+        html_filename = report_filename[:-len('.json')] + '.html'
+        summary_items = [
+            ('total_tests', 'Total Tests', total_tests),
+            ('successful_tests', 'Successful', successful_tests, f"{successful_tests} ({success_rate:.1f}%)"),
+            ('failed_tests', 'Failed', failed_tests, f"{failed_tests} ({100-success_rate:.1f}%)"),
+            ('short_circuited', 'Short-circuited', short_circuited),
+            ('success_rate', None, success_rate),
+            ('base_url', 'Base URL', self.base_url),
+            ('test_timestamp', 'Test Timestamp', datetime.now().isoformat()),
+            ('schema_validation', None, schema_summary),
+            ('circuit_breaker', None, breaker_summary),
+            ('payload_totals', 'Bytes sent / received',
+             payload_totals, f"{format_bytes(payload_totals['request_wire_bytes'])} / "
+                             f"{format_bytes(payload_totals['response_wire_bytes'])}"),
+        ]
         
         try:
-            with open(report_filename, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False)
-            print(f"\n💾 Detailed report saved to: {report_filename}")
+            with open(report_filename, 'w', encoding='utf-8') as json_file, \
+                    open(html_filename, 'w', encoding='utf-8') as html_file:
+                renderer = ReportRenderer("THOUGHTPRO B2B PRODUCTION API TEST REPORT", json_file=json_file,
+                                          html=html_file)
+                renderer.begin([f"Base URL: {self.base_url}"])
+                renderer.summary('summary', 'Summary Statistics', summary_items)
+                render_result_sections(store, renderer, self.report_top_n,
+                                       failed=(store.column('success') == 0) & (store.column('short_circuited') == 0))
+                renderer.value('test_data_used', self.test_data)
+                # Full results only for small runs - large ones are in the aggregates and samples above
+                if self.keep_details and len(store) <= DETAIL_LIMIT:
+                    renderer.records('detailed_results', self.results)
+                else:
+                    renderer.notes('detailed_results_note', 'Detailed Results', [
+                        f"{total_tests} results - listed in full only up to {DETAIL_LIMIT} with details kept; "
+                        f"save them all with --store"])
+                renderer.end()
+            print(f"\n💾 Detailed report saved to: {report_filename} (HTML: {html_filename})")
         except Exception as e:
             print(f"\n❌ Failed to save report: {str(e)}")
         
+        # --store PATH: the columnar results as .npz (or .csv), readable by report_diff.py
+        if self.store_path:
+            store.save(self.store_path)
+            print(f"💾 Result store saved to: {self.store_path}")
+        
         # Print failed tests summary
         if failed_tests > 0:
             print(f"\n❌ FAILED TESTS SUMMARY:")
-            for result in self.results:
-                if not result['success']:
-                    print(f"   {result['method']} {result['endpoint']} - {result['status_code']} - {result['error']}")
+            failed = ((store.column('success') == 0) & (store.column('short_circuited') == 0)).nonzero()[0]
+            for result in store.rows(failed[:self.report_top_n]):
+                print(f"   {result['method']} {result['endpoint']} - {result['status_code']} - {result['message']}")
+            if failed.size > self.report_top_n:
+                print(f"   ... and {failed.size - self.report_top_n} more (see the report)")
+            if short_circuited:
+                print(f"   ... and {short_circuited} short-circuited test(s), not sent")
+
+def capacity_main(argv):
+    """--capacity: step-load search for maximum sustainable throughput"""
+    parser = argparse.ArgumentParser(description="Capacity search against the production API")
+    parser.add_argument("--capacity", action="store_true")
+    parser.add_argument("--base-url", default="https://thoughtprob2b.thoughthealer.org/api/v1")
+    parser.add_argument("--mix", action="append",
+                        help='Target "METHOD /endpoint[:weight]" (repeatable; default GET /psychologists)')
+    parser.add_argument("--per-endpoint", action="store_true", help="Search each target on its own")
+    parser.add_argument("--slo-p99-ms", type=float, default=DEFAULT_SLO_P99_MS, help="p99 latency objective")
+    parser.add_argument("--max-error-rate", type=float, default=DEFAULT_MAX_ERROR_RATE, help="Error-rate objective")
+    parser.add_argument("--start", type=int, default=1, help="First step's concurrency (default 1)")
+    parser.add_argument("--factor", type=float, default=2.0, help="Concurrency growth per step (default 2)")
+    parser.add_argument("--max-concurrency", type=int, default=256, help="Highest concurrency tried (default 256)")
+    parser.add_argument("--step-duration", type=float, default=10.0, help="Seconds per step (default 10)")
+    parser.add_argument("--refine-steps", type=int, default=4, help="Binary-search steps (default 4)")
+    parser.add_argument("--warmup", type=float, default=2.0,
+                        help="Warm-up seconds before each concurrency, excluded from percentiles (default 2; 0 disables)")
+    parser.add_argument("--rate", type=float,
+                        help="Fixed-rate (open-loop) run at this many requests/s instead of a search; "
+                             "--max-concurrency sets the worker pool")
+    parser.add_argument("--slo-uncorrected", action="store_true",
+                        help="Judge the SLO on latency from the send instead of the intended send time")
+    parser.add_argument("--validation-sample-rate", type=float, default=0.01, help="Schema-check share (default 0.01)")
+    parser.add_argument("--token", help="Bearer token for authenticated endpoints")
+    parser.add_argument("--curve", help="Save the curve (.json or .csv; default capacity_curve_<time>.json)")
+    args, _ = parser.parse_known_args(argv)
+    
+    targets = [parse_target(spec) for spec in (args.mix or ["GET /psychologists"])]
+    # Load runs are long - no run deadline unless --deadline is given
+    tester = ProductionAPITester(args.base_url, validation_sample_rate=args.validation_sample_rate, quiet=True,
+                                 breaker=breaker_from_argv(argv, default_deadline=0))
+    tester.auth_token = args.token
+    curve = args.curve or f"capacity_curve_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    slo = Slo(args.slo_p99_ms, args.max_error_rate, corrected=not args.slo_uncorrected)
+    tester.run_capacity_search(targets, slo, args.per_endpoint, curve, rate_rps=args.rate,
+                               start=args.start, factor=args.factor, max_concurrency=args.max_concurrency,
+                               step_duration=args.step_duration, refine_steps=args.refine_steps,
+                               warmup_duration=args.warmup)
 
 def main():
     """Main execution function"""
+    if '--capacity' in sys.argv[1:]:
+        capacity_main(sys.argv[1:])
+        return
+    
+    # --deadline SECONDS and --breaker-threshold N bound a run against a bad host;
+    # --store PATH also saves the columnar results (.npz or .csv);
+    # --top N: slowest and failed samples listed in the report (default 20)
+    breaker = breaker_from_argv(sys.argv[1:])
+    store_path = argv_option(sys.argv[1:], '--store')
+    top_n = argv_option(sys.argv[1:], '--top', DEFAULT_TOP_N, int)
+    
     print("🔬 ThoughtPro B2B Production API Endpoint Tester")
     print("Similar to Postman - Tests each API endpoint systematically")
     print("=" * 80)
@@ -516,8 +782,10 @@ def main():
     if not base_url:
         base_url = "https://thoughtprob2b.thoughthealer.org/api/v1"
     
-    # Initialize and run tests
-    tester = ProductionAPITester(base_url)
+    # Initialize and run tests (--quiet prints only the summary)
+    tester = ProductionAPITester(base_url, quiet='--quiet' in sys.argv[1:], breaker=breaker)
+    tester.store_path = store_path
+    tester.report_top_n = top_n
     
     print(f"\n🎯 Testing Production API: {base_url}")
     print("⏳ Starting comprehensive endpoint tests...")
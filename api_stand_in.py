@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B API Stand-In
+
+Canned, schema-conforming responses for every catalogued endpoint, served
+without a network:
+
+  * ``StandInAdapter`` - a requests transport adapter that answers in-process
+    with zero latency. ``intercept_requests()`` routes every requests call
+    (sessions and module-level ``requests.get`` alike) through it.
+  * ``StandInServer`` - the same responses over real HTTP on localhost, for
+    clients outside this process (e.g. the frontend services run under Node).
+    It counts and logs requests per endpoint, and can inject faults.
+
+Response bodies are generated from response_schemas.py once and kept as
+bytes, so the stand-in itself adds as little as possible to measurements.
+"""
+
+import json
+import socket
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from endpoint_catalog import match_template, template_for
+from response_schemas import RESPONSE_SCHEMAS
+
+_REASONS = {200: "OK", 201: "Created", 404: "Not Found"}
+
+
+def example_for(schema: Dict, name: str = "value", list_length: int = 3) -> Any:
+    """Build an example value that satisfies ``schema``"""
+    types = schema.get("type", "object")
+    kind = types if isinstance(types, str) else types[0]
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return {key: example_for(sub, key, list_length) for key, sub in properties.items()}
+    if kind == "array":
+        item = schema.get("items", {"type": "string"})
+        return [example_for(item, name, list_length) for _ in range(list_length)]
+    if kind == "string":
+        if name == "id" or name.endswith("_id") or name.endswith("Id"):
+            return "00000000-0000-4000-8000-000000000001"
+        if "email" in name.lower():
+            return "stand-in@example.com"
+        if name.endswith("_at") or "date" in name:
+            return "2025-10-20T00:00:00.000Z"
+        return f"sample-{name}"
+    if kind in ("number", "integer"):
+        return 1
+    if kind == "boolean":
+        return True
+    return None
+
+
+class StandInRoutes:
+    """Pre-serialized responses keyed by (method, template)"""
+
+    def __init__(self, list_length: int = 3, overrides: Optional[Dict[Tuple[str, str], Any]] = None):
+        self.bodies: Dict[Tuple[str, str], bytes] = {}
+        for (method, template), schema in RESPONSE_SCHEMAS.items():
+            body = example_for(schema, list_length=list_length)
+            if isinstance(body, dict):
+                body["success"] = True
+            self.bodies[(method, template)] = json.dumps(body).encode("utf-8")
+        for key, body in (overrides or {}).items():
+            self.bodies[key] = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+
+    def resolve(self, method: str, path: str) -> Tuple[int, bytes]:
+        """Status code and body for a request"""
+        method = method.upper()
+        template = match_template(method, path)
+        body = self.bodies.get((method, template)) if template else None
+        if body is None:
+            return 404, json.dumps({"success": False, "error": f"Not Found - {path}"}).encode("utf-8")
+        return (201 if method == "POST" else 200), body
+
+
+class StandInAdapter(BaseAdapter):
+    """Zero-latency in-process transport for requests"""
+
+    def __init__(self, routes: Optional[StandInRoutes] = None):
+        super().__init__()
+        self.routes = routes or StandInRoutes()
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        with self._lock:
+            self.request_count += 1
+        status, body = self.routes.resolve(request.method, urlsplit(request.url).path)
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = _REASONS.get(status, "")
+        response.headers = CaseInsensitiveDict({
+            "Content-Type": "application/json; charset=utf-8",
+            "Content-Length": str(len(body)),
+        })
+        response._content = body
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def intercept_requests(adapter: Optional[StandInAdapter] = None):
+    """Route every requests call in this process through ``adapter``"""
+    adapter = adapter or StandInAdapter()
+    original_send = HTTPAdapter.send
+
+    def send(_self, request, **kwargs):
+        return adapter.send(request, **kwargs)
+
+    HTTPAdapter.send = send
+    try:
+        yield adapter
+    finally:
+        HTTPAdapter.send = original_send
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops SYNs under concurrent load; each drop
+    # costs the client a ~1 s retransmit that would be measured as latency
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StandInServer:
+    """Stand-in routes served over HTTP on a background thread, with request counts
+
+    ``fallback`` (any JSON value) answers requests for undocumented endpoints
+    with a 200 instead of the stand-in 404, so client code keeps going.
+
+    ``fault(method, path)`` is asked before every response: it returns None
+    to answer normally, an HTTP status to fail with, or 0 to drop the
+    connection (a network error for the client). ``log`` records
+    ``(seconds since start, method, template, status)`` for every request.
+    """
+
+    def __init__(self, routes: Optional[StandInRoutes] = None, host: str = "127.0.0.1", port: int = 0,
+                 fallback: Any = None, fault: Optional[Callable[[str, str], Optional[int]]] = None):
+        self.routes = routes or StandInRoutes()
+        self.fallback = None if fallback is None else json.dumps(fallback).encode("utf-8")
+        self.fault = fault
+        self.counts: Counter = Counter()
+        self.log: List[Tuple[float, str, str, int]] = []
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without TCP_NODELAY a keep-alive
+            # client waits out a delayed ACK (~40 ms) on every response
+            disable_nagle_algorithm = True
+
+            def handle_one(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                path = urlsplit(self.path).path
+                template = template_for(self.command, path)
+                injected = stand_in.fault(self.command, path) if stand_in.fault else None
+                if injected is None:
+                    status, body = stand_in.routes.resolve(self.command, path)
+                    if status == 404 and stand_in.fallback is not None:
+                        status, body = 200, stand_in.fallback
+                else:
+                    status, body = injected, b'{"success": false, "error": "injected fault"}'
+                with stand_in._lock:
+                    stand_in.counts[(self.command, template)] += 1
+                    stand_in.log.append((time.monotonic() - stand_in.started, self.command, template, status))
+                if status == 0:
+                    self.close_connection = True
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    return
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = handle_one
+
+            def handle(self):
+                try:
+                    super().handle()
+                except ConnectionError:
+                    pass  # a client that exits drops its keep-alive connection
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = _StandInHTTPServer((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        return sum(self.counts.values())
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+            self.log.clear()
+            self.started = time.monotonic()
+
+    def start(self) -> "StandInServer":
+        self.started = time.monotonic()
+        self._thread = threading.Thread(target=self.server.serve_forever, name="stand-in-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Bundle-Size Analyzer
+
+Reads src/build/asset-manifest.json and the static assets it lists, and:
+
+  * computes raw, gzip and brotli sizes for every asset (brotli needs the
+    optional ``brotli`` package and is skipped without it)
+  * attributes bytes to source modules via the asset's source map, when the
+    build has one (``GENERATE_SOURCEMAP`` is on by default in react-scripts)
+  * enforces per-entrypoint and total first-load budgets
+  * appends each run to a local history file, so ``--history`` can show
+    which commit inflated the first-load bytes
+
+First-load bytes are index.html plus the manifest entrypoints, i.e. what
+a cold visit to any route downloads before the app renders.
+
+Exit code is 1 when a budget is exceeded.
+
+Usage:
+    python bundle_analyzer.py [--build-dir src/build] [--no-record]
+    python bundle_analyzer.py --history
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BUILD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "build")
+HISTORY_FILE = "bundle_history.jsonl"
+
+# Budgets in bytes, keyed by manifest name. Set about 10% above the sizes of
+# the single-bundle build, so any growth beyond that needs a conscious bump.
+DEFAULT_BUDGETS = {
+    "main.js": {"raw": 1_030_000, "gzip": 295_000},
+    "main.css": {"raw": 152_000, "gzip": 25_000},
+    "first_load": {"gzip": 320_000},
+}
+
+_SOURCE_MAP_URL_RE = re.compile(rb"[#@]\s*sourceMappingURL=(\S+)\s*(?:\*/)?\s*$")
+_BASE64 = {c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+
+
+def compressed_sizes(data: bytes) -> Dict[str, Optional[int]]:
+    return {
+        "raw": len(data),
+        "gzip": len(gzip.compress(data, compresslevel=9)),
+        "brotli": len(brotli.compress(data, quality=11)) if brotli else None,
+    }
+
+
+# -- source maps -------------------------------------------------------------------
+
+def decode_vlq_segment(segment: str) -> List[int]:
+    """Decode one base64-VLQ source map segment into its integer fields"""
+    values, value, shift = [], 0, 0
+    for char in segment:
+        digit = _BASE64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+        else:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value, shift = 0, 0
+    return values
+
+
+def attribute_bytes(generated: str, source_map: Dict) -> Dict[str, int]:
+    """Characters of ``generated`` per source file, from the map's mappings
+
+    A segment owns the generated text from its column up to the next
+    segment on the same line (or the end of the line).
+    """
+    sources = source_map.get("sources", [])
+    lines = generated.split("\n")
+    totals: Dict[str, int] = {}
+    source_index = 0
+    for line_number, line_mappings in enumerate(source_map.get("mappings", "").split(";")):
+        if line_number >= len(lines):
+            break
+        line_length = len(lines[line_number]) + 1  # count the newline too
+        column = 0
+        owners = []  # (generated column, source index or None)
+        for segment in line_mappings.split(","):
+            if not segment:
+                continue
+            fields = decode_vlq_segment(segment)
+            column += fields[0]
+            if len(fields) >= 4:
+                source_index += fields[1]
+                owners.append((column, source_index))
+            else:
+                owners.append((column, None))
+        if not owners or owners[0][0] > 0:
+            owners.insert(0, (0, None))
+        for position, (start, index) in enumerate(owners):
+            end = owners[position + 1][0] if position + 1 < len(owners) else line_length
+            name = sources[index] if index is not None and index < len(sources) else "<unmapped>"
+            totals[name] = totals.get(name, 0) + max(end - start, 0)
+    return totals
+
+
+def module_group(source: str) -> str:
+    """Collapse a source path to its npm package or its src/ directory"""
+    path = re.sub(r"^webpack://[^/]*/", "", source.replace("\\", "/"))
+    path = re.sub(r"^(\.\.?/)+", "", path)
+    if "node_modules/" in path:
+        parts = path.split("node_modules/")[-1].split("/")
+        return "npm:" + ("/".join(parts[:2]) if parts[0].startswith("@") else parts[0])
+    if path.startswith("src/"):
+        parts = path.split("/")
+        return "/".join(parts[:3]) if len(parts) > 3 else "/".join(parts[:2])
+    return path or "<unmapped>"
+
+
+def load_source_map(asset_path: str, data: bytes, manifest_map: Optional[str] = None) -> Optional[Dict]:
+    """Source map for an asset: inline data URL, sourceMappingURL comment or manifest entry"""
+    match = _SOURCE_MAP_URL_RE.search(data[-1000:])
+    candidates = []
+    if match:
+        url = match.group(1).decode("utf-8", errors="replace")
+        if url.startswith("data:"):
+            return json.loads(base64.b64decode(url.split(",", 1)[1]))
+        candidates.append(os.path.join(os.path.dirname(asset_path), url))
+    if manifest_map:
+        candidates.append(manifest_map)
+    candidates.append(asset_path + ".map")
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            with open(candidate, "r", encoding="utf-8") as f:
+                return json.load(f)
+    return None
+
+
+# -- analysis ----------------------------------------------------------------------
+
+def analyze_build(build_dir: str = BUILD_DIR, budgets: Optional[Dict] = None, top_modules: int = 15) -> Dict:
+    """Sizes, source attribution and budget checks for one build"""
+    budgets = DEFAULT_BUDGETS if budgets is None else budgets
+    with open(os.path.join(build_dir, "asset-manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    files = manifest.get("files", {})
+    entrypoints = {"/" + entry.lstrip("/") for entry in manifest.get("entrypoints", [])}
+
+    assets = []
+    first_load = {"raw": 0, "gzip": 0, "brotli": 0 if brotli else None}
+    for name, path in files.items():
+        if name.endswith(".map"):
+            continue
+        asset_path = os.path.join(build_dir, path.lstrip("/"))
+        if not os.path.exists(asset_path):
+            assets.append({"name": name, "path": path, "missing": True})
+            continue
+        with open(asset_path, "rb") as f:
+            data = f.read()
+        entry = {"name": name, "path": path, "first_load": path in entrypoints or name == "index.html"}
+        entry.update(compressed_sizes(data))
+
+        if name.endswith((".js", ".css")):
+            map_path = files.get(name + ".map")
+            source_map = load_source_map(asset_path, data,
+                                         os.path.join(build_dir, map_path.lstrip("/")) if map_path else None)
+            if source_map:
+                by_source = attribute_bytes(data.decode("utf-8", errors="replace"), source_map)
+                groups: Dict[str, int] = {}
+                for source, size in by_source.items():
+                    group = module_group(source)
+                    groups[group] = groups.get(group, 0) + size
+                ranked = sorted(groups.items(), key=lambda item: -item[1])
+                entry["modules"] = [{"module": module, "bytes": size, "share_pct": round(size / len(data) * 100, 2)}
+                                    for module, size in ranked[:top_modules]]
+                entry["source_count"] = len(by_source)
+            else:
+                entry["modules"] = None
+
+        if entry["first_load"]:
+            for key in first_load:
+                if first_load[key] is not None and entry.get(key) is not None:
+                    first_load[key] += entry[key]
+        assets.append(entry)
+
+    violations = []
+    for entry in assets:
+        for kind, limit in budgets.get(entry["name"], {}).items():
+            if entry.get(kind) is not None and entry[kind] > limit:
+                violations.append({"asset": entry["name"], "kind": kind, "size": entry[kind], "budget": limit})
+    for kind, limit in budgets.get("first_load", {}).items():
+        if first_load.get(kind) is not None and first_load[kind] > limit:
+            violations.append({"asset": "first_load", "kind": kind, "size": first_load[kind], "budget": limit})
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "commit": git_commit(),
+        "assets": assets,
+        "first_load": first_load,
+        "budgets": budgets,
+        "violations": violations,
+    }
+
+
+def git_commit() -> Optional[Dict[str, str]]:
+    try:
+        output = subprocess.run(["git", "log", "-1", "--format=%H%n%s"], capture_output=True, text=True,
+                                timeout=10, cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if output.returncode != 0 or not output.stdout.strip():
+        return None
+    sha, _, subject = output.stdout.strip().partition("\n")
+    return {"sha": sha, "subject": subject}
+
+
+# -- history -----------------------------------------------------------------------
+
+def record_history(result: Dict, history_file: str = HISTORY_FILE):
+    """Append the sizes (not the module breakdown) of a run to the history file"""
+    entry = {
+        "timestamp": result["timestamp"],
+        "commit": result["commit"],
+        "first_load": result["first_load"],
+        "assets": {a["name"]: {k: a.get(k) for k in ("raw", "gzip", "brotli")}
+                   for a in result["assets"] if not a.get("missing")},
+    }
+    with open(history_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def load_history(history_file: str = HISTORY_FILE) -> List[Dict]:
+    if not os.path.exists(history_file):
+        return []
+    with open(history_file, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def print_history(history: List[Dict], budgets: Dict):
+    """First-load gzip bytes per run, with the biggest jump and the first budget breach"""
+    if not history:
+        print("No history recorded yet - run the analyzer without --no-record first")
+        return
+    limit = budgets.get("first_load", {}).get("gzip")
+    print(f"\n{'When':20} {'Commit':10} {'First-load gzip':>16} {'Δ bytes':>10}  Subject")
+    print("-" * 100)
+    largest, first_breach, previous = None, None, None
+    for entry in history:
+        size = entry["first_load"]["gzip"]
+        delta = size - previous if previous is not None else 0
+        commit = entry.get("commit") or {}
+        if previous is not None and (largest is None or delta > largest[0]):
+            largest = (delta, entry)
+        if limit and size > limit and first_breach is None:
+            first_breach = entry
+        print(f"{entry['timestamp'][:19]:20} {commit.get('sha', '?')[:8]:10} {size:16,} {delta:+10,}  "
+              f"{commit.get('subject', '')[:50]}")
+        previous = size
+    if largest and largest[0] > 0:
+        commit = largest[1].get("commit") or {}
+        print(f"\n📈 Largest first-load increase: {largest[0]:+,} bytes gzip at "
+              f"{commit.get('sha', '?')[:8]} {commit.get('subject', '')}")
+    if first_breach:
+        commit = first_breach.get("commit") or {}
+        print(f"❌ First run over the {limit:,} byte first-load budget: {commit.get('sha', '?')[:8]} "
+              f"{commit.get('subject', '')}")
+
+
+def print_analysis(result: Dict, previous: Optional[Dict]):
+    def kb(value):
+        return "-" if value is None else f"{value / 1024:.1f}"
+
+    print(f"\n{'Asset':32} {'Raw KB':>10} {'Gzip KB':>10} {'Brotli KB':>10} {'Δ gzip':>10}  First load")
+    print("-" * 90)
+    for entry in result["assets"]:
+        if entry.get("missing"):
+            print(f"{entry['name']:32} {'missing':>10}")
+            continue
+        before = (previous or {}).get("assets", {}).get(entry["name"], {}).get("gzip")
+        delta = f"{entry['gzip'] - before:+,}" if before is not None else ""
+        print(f"{entry['name']:32} {kb(entry['raw']):>10} {kb(entry['gzip']):>10} {kb(entry['brotli']):>10} "
+              f"{delta:>10}  {'yes' if entry['first_load'] else ''}")
+    first_load = result["first_load"]
+    print(f"{'first load (total)':32} {kb(first_load['raw']):>10} {kb(first_load['gzip']):>10} "
+          f"{kb(first_load['brotli']):>10}")
+    if brotli is None:
+        print("\nℹ️  brotli sizes skipped - pip install brotli to include them")
+
+    for entry in result["assets"]:
+        if "modules" not in entry:
+            continue
+        if entry["modules"] is None:
+            print(f"\nℹ️  {entry['name']}: no source map - build with GENERATE_SOURCEMAP=true for module attribution")
+            continue
+        print(f"\n📦 {entry['name']} by module ({entry['source_count']} sources):")
+        for module in entry["modules"]:
+            print(f"   {module['module']:50} {module['bytes'] / 1024:9.1f} KB {module['share_pct']:6.1f}%")
+
+    if result["violations"]:
+        print("\n❌ BUDGET VIOLATIONS:")
+        for violation in result["violations"]:
+            print(f"   {violation['asset']} {violation['kind']}: {violation['size']:,} bytes "
+                  f"(budget {violation['budget']:,}, +{violation['size'] - violation['budget']:,})")
+    else:
+        print("\n✅ All bundle budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundle-size budgets and history for the ThoughtPro frontend build")
+    parser.add_argument("--build-dir", default=BUILD_DIR, help="CRA build directory (default src/build)")
+    parser.add_argument("--budgets", help="JSON file with budgets, same shape as DEFAULT_BUDGETS")
+    parser.add_argument("--history-file", default=HISTORY_FILE, help=f"History store (default {HISTORY_FILE})")
+    parser.add_argument("--no-record", action="store_true", help="Do not append this run to the history")
+    parser.add_argument("--history", action="store_true", help="Show the recorded history and exit")
+    parser.add_argument("--top", type=int, default=15, help="Modules to list per asset (default 15)")
+    parser.add_argument("--json", dest="json_file", help="Also write the analysis to this JSON file")
+    args = parser.parse_args()
+
+    budgets = DEFAULT_BUDGETS
+    if args.budgets:
+        with open(args.budgets, "r", encoding="utf-8") as f:
+            budgets = json.load(f)
+
+    if args.history:
+        print_history(load_history(args.history_file), budgets)
+        return
+
+    print("📦 ThoughtPro B2B Bundle-Size Analyzer")
+    print(f"Build: {args.build_dir}")
+
+    result = analyze_build(args.build_dir, budgets, args.top)
+    history = load_history(args.history_file)
+    print_analysis(result, history[-1] if history else None)
+
+    if not args.no_record:
+        record_history(result, args.history_file)
+        print(f"\n💾 Run recorded in: {args.history_file}")
+
+    if args.json_file:
+        with open(args.json_file, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Analysis saved to: {args.json_file}")
+
+    if result["violations"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Cache-Header Checker
+
+Evaluates the ``headers`` and ``rewrites`` rules of vercel.json locally,
+against every file in src/build and every route in src/App.jsx, the way
+Vercel applies them:
+
+  * the filesystem wins, and rewrites only apply to paths with no file
+  * every matching header rule applies, and later rules override earlier
+    ones for the same key
+  * a static file without Cache-Control gets Vercel's default of
+    ``public, max-age=0, must-revalidate``
+
+Checks:
+  * content-hashed files (``main.<hash>.js``) must be cached for a year and
+    marked ``immutable``
+  * files without a hash (index.html, asset-manifest.json) must not be, or
+    clients keep referencing an old bundle after a deploy
+  * paths that fall through to the SPA rewrite must not pick up immutable
+    caching. A stale ``/static/js/main.<old-hash>.js`` would otherwise be
+    answered with index.html and cached as that script for a year
+
+It also simulates the bytes a returning visitor transfers, on the same
+deploy and after a deploy that changed only the JS bundle.
+
+Exit code is 1 when an error-level finding is reported.
+
+Usage:
+    python cache_header_check.py [--vercel vercel.json] [--build-dir src/build]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from import_graph import parse_routes
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+VERCEL_FILE = os.path.join(ROOT, "vercel.json")
+BUILD_DIR = os.path.join(ROOT, "src", "build")
+APP_FILE = os.path.join(ROOT, "src", "App.jsx")
+
+ONE_YEAR = 31536000
+VERCEL_DEFAULT_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+# Status line + response headers of a 304, roughly
+REVALIDATION_BYTES = 250
+
+_HASHED_RE = re.compile(r"\.[0-9a-f]{8,}\.(?:chunk\.)?[\w.]+$")
+_PARAM_RE = re.compile(r":(\w+)(\*|\+|\?)?")
+_COMPRESSIBLE = (".js", ".css", ".html", ".json", ".txt", ".svg", ".map")
+
+
+def source_to_regex(source: str) -> re.Pattern:
+    """Compile a vercel.json ``source`` (path-to-regexp syntax) to an anchored regex"""
+    pattern, position = "", 0
+    while position < len(source):
+        char = source[position]
+        if char == "(":
+            depth, end = 0, position
+            while end < len(source):
+                depth += {"(": 1, ")": -1}.get(source[end], 0)
+                if depth == 0:
+                    break
+                end += 1
+            pattern += source[position:end + 1]
+            position = end + 1
+            continue
+        match = _PARAM_RE.match(source, position)
+        if match:
+            modifier = match.group(2)
+            pattern += "(.*)" if modifier in ("*", "+") else "([^/]+)" + ("?" if modifier == "?" else "")
+            position = match.end()
+            continue
+        pattern += re.escape(char)
+        position += 1
+    return re.compile("^" + pattern + "$")
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def max_age(directives: Dict[str, Optional[str]]) -> int:
+    value = directives.get("s-maxage") if "max-age" not in directives else directives.get("max-age")
+    try:
+        return int(value) if value is not None else 0
+    except ValueError:
+        return 0
+
+
+class VercelConfig:
+    """Header and rewrite rules of a vercel.json"""
+
+    def __init__(self, config: Dict):
+        self.headers = [(rule["source"], source_to_regex(rule["source"]), rule.get("headers", []))
+                        for rule in config.get("headers", [])]
+        self.rewrites = [(rule["source"], source_to_regex(rule["source"]), rule["destination"])
+                         for rule in config.get("rewrites", [])]
+
+    @classmethod
+    def load(cls, path: str = VERCEL_FILE) -> "VercelConfig":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def response_headers(self, path: str) -> Tuple[Dict[str, str], List[str]]:
+        """Headers for a request path and the sources of the rules that set them"""
+        headers, matched = {}, []
+        for source, regex, rule_headers in self.headers:
+            if regex.match(path):
+                matched.append(source)
+                for header in rule_headers:
+                    headers[header["key"].lower()] = header["value"]
+        return headers, matched
+
+    def rewrite(self, path: str) -> Optional[str]:
+        for _source, regex, destination in self.rewrites:
+            match = regex.match(path)
+            if match:
+                for index, group in enumerate(match.groups(), 1):
+                    destination = destination.replace(f"${index}", group or "")
+                return destination
+        return None
+
+
+def transfer_size(path: str) -> int:
+    with open(path, "rb") as f:
+        data = f.read()
+    return len(gzip.compress(data, compresslevel=6)) if path.endswith(_COMPRESSIBLE) else len(data)
+
+
+def check_path(config: VercelConfig, request_path: str, served_file: str, hashed: bool,
+               rewritten: bool) -> Dict:
+    """Effective caching of one request path plus findings"""
+    headers, matched = config.response_headers(request_path)
+    cache_control = headers.get("cache-control")
+    directives = parse_cache_control(cache_control or VERCEL_DEFAULT_CACHE_CONTROL)
+    age = max_age(directives)
+    immutable = "immutable" in directives
+    findings = []
+
+    if rewritten:
+        if immutable or age >= 86400:
+            findings.append(("error", f"falls through to {served_file} but is cached for {age}s"
+                                      f"{' (immutable)' if immutable else ''} - a stale hashed URL would cache "
+                                      f"the HTML shell in its place"))
+    elif hashed:
+        if age < ONE_YEAR:
+            findings.append(("error", f"content-hashed but max-age={age}s - returning visitors re-download or "
+                                      f"revalidate it on every visit"))
+        if not immutable:
+            findings.append(("warning", "content-hashed but not immutable - browsers revalidate it on reload"))
+        if "no-store" in directives or "no-cache" in directives:
+            findings.append(("error", "content-hashed but marked no-store/no-cache"))
+    else:
+        if immutable or age >= 86400:
+            findings.append(("error", f"not content-hashed but cached for {age}s"
+                                      f"{' (immutable)' if immutable else ''} - clients keep a stale copy after a "
+                                      f"deploy"))
+
+    return {
+        "path": request_path,
+        "served_file": served_file,
+        "hashed": hashed,
+        "rewritten": rewritten,
+        "cache_control": cache_control or f"(default) {VERCEL_DEFAULT_CACHE_CONTROL}",
+        "max_age": age,
+        "immutable": immutable,
+        "rules": matched,
+        "findings": findings,
+    }
+
+
+def repeat_visit_bytes(entries: Dict[str, Dict], sizes: Dict[str, int], changed: set) -> int:
+    """Bytes a returning visitor transfers for the first-load files
+
+    Fresh (max-age not expired) files cost nothing; expired ones cost a 304
+    unless they changed, in which case they are downloaded again. Changed
+    files always have a new hashed URL, so their cached copy is useless.
+    """
+    total = 0
+    for path, entry in entries.items():
+        if path in changed:
+            total += sizes[path]
+        elif entry["max_age"] > 0:
+            continue
+        else:
+            total += REVALIDATION_BYTES
+    return total
+
+
+def run_checks(vercel_file: str = VERCEL_FILE, build_dir: str = BUILD_DIR, app_file: str = APP_FILE) -> Dict:
+    config = VercelConfig.load(vercel_file)
+    files = {}
+    for root, _dirs, names in os.walk(build_dir):
+        for name in names:
+            full = os.path.join(root, name)
+            files["/" + os.path.relpath(full, build_dir).replace(os.sep, "/")] = full
+
+    results = []
+    for request_path in sorted(files):
+        results.append(check_path(config, request_path, request_path,
+                                  bool(_HASHED_RE.search(request_path)), rewritten=False))
+
+    # Paths with no file: app routes and a stale bundle URL from an earlier deploy
+    probes = sorted({path for path, _pages in parse_routes(app_file)[0] if ":" not in path} - {"/"})
+    hashed_js = sorted(p for p in files if p.startswith("/static/js/") and _HASHED_RE.search(p))
+    if hashed_js:
+        probes.append(_HASHED_RE.sub(".0123abcd.js", hashed_js[0]))
+    for request_path in probes:
+        if request_path in files:
+            continue
+        destination = config.rewrite(request_path)
+        if destination is None:
+            results.append({"path": request_path, "served_file": None, "rewritten": False,
+                            "findings": [("warning", "no file and no rewrite - 404")]})
+            continue
+        results.append(check_path(config, request_path, destination,
+                                  bool(_HASHED_RE.search(request_path)), rewritten=True))
+
+    # Returning visitor: index.html plus the manifest entrypoints
+    manifest_path = os.path.join(build_dir, "asset-manifest.json")
+    first_load = ["/index.html"]
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            first_load += ["/" + e.lstrip("/") for e in json.load(f).get("entrypoints", [])]
+    first_load = [p for p in first_load if p in files]
+    by_path = {r["path"]: r for r in results}
+    entries = {p: by_path[p] for p in first_load}
+    sizes = {p: transfer_size(files[p]) for p in first_load}
+    js_bundle = {p for p in first_load if p.endswith(".js")}
+
+    visits = {
+        "first_visit": sum(sizes.values()),
+        "repeat_same_deploy": repeat_visit_bytes(entries, sizes, set()),
+        # A deploy that changed the JS: index.html changes too (new script URL)
+        "repeat_after_js_deploy": repeat_visit_bytes(entries, sizes, js_bundle | {"/index.html"}),
+    }
+    # The same visits under the intended policy, for comparison
+    ideal_entries = {p: dict(e, max_age=ONE_YEAR if e["hashed"] else 0) for p, e in entries.items()}
+    visits["ideal_repeat_same_deploy"] = repeat_visit_bytes(ideal_entries, sizes, set())
+    visits["ideal_repeat_after_js_deploy"] = repeat_visit_bytes(ideal_entries, sizes, js_bundle | {"/index.html"})
+
+    return {"vercel_file": vercel_file, "build_dir": build_dir, "paths": results, "repeat_visit": visits}
+
+
+def print_results(report: Dict):
+    print(f"\n{'Path':45} {'Hashed':>6} {'max-age':>9} {'Immut.':>6}  Cache-Control")
+    print("-" * 110)
+    for entry in report["paths"]:
+        if entry.get("served_file") is None:
+            print(f"{entry['path']:45} {'':>6} {'':>9} {'':>6}  (404)")
+            continue
+        label = entry["path"] + (f" → {entry['served_file']}" if entry["rewritten"] else "")
+        print(f"{label[:45]:45} {'yes' if entry['hashed'] else 'no':>6} {entry['max_age']:9} "
+              f"{'yes' if entry['immutable'] else 'no':>6}  {entry['cache_control']}")
+
+    findings = [(level, entry["path"], message) for entry in report["paths"] for level, message in entry["findings"]]
+    if findings:
+        print("\n🔍 FINDINGS:")
+        for level, path, message in findings:
+            print(f"   {'❌' if level == 'error' else '⚠️ '} {path}: {message}")
+    else:
+        print("\n✅ Caching rules match the build")
+
+    visits = report["repeat_visit"]
+    print("\n📶 TRANSFER SIMULATION (index.html + entrypoints, gzip):")
+    print(f"   First visit:                       {visits['first_visit'] / 1024:9.1f} KB")
+    print(f"   Repeat visit, same deploy:         {visits['repeat_same_deploy'] / 1024:9.1f} KB "
+          f"(ideal {visits['ideal_repeat_same_deploy'] / 1024:.1f} KB)")
+    print(f"   Repeat visit after a JS deploy:    {visits['repeat_after_js_deploy'] / 1024:9.1f} KB "
+          f"(ideal {visits['ideal_repeat_after_js_deploy'] / 1024:.1f} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check vercel.json caching rules against the build")
+    parser.add_argument("--vercel", default=VERCEL_FILE, help="vercel.json to evaluate")
+    parser.add_argument("--build-dir", default=BUILD_DIR, help="Build directory (default src/build)")
+    parser.add_argument("--app", default=APP_FILE, help="App.jsx to read routes from")
+    parser.add_argument("--json", dest="json_file", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    print("🗄️  ThoughtPro B2B Cache-Header Checker")
+    print(f"Rules: {args.vercel} | Build: {args.build_dir}")
+    report = run_checks(args.vercel, args.build_dir, args.app)
+    print_results(report)
+
+    if args.json_file:
+        with open(args.json_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results saved to: {args.json_file}")
+
+    if any(level == "error" for entry in report["paths"] for level, _message in entry["findings"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
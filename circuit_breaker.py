@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Host Circuit Breaker
+
+Fail-fast guard shared by api_endpoint_tester.py and test_api_ui_integration.py.
+A wrong host or a dead API used to cost every endpoint a full timeout, one
+after another. The breaker bounds that:
+
+  * preflight - the first request to a host is preceded by one HEAD to its
+    origin with a short timeout. No HTTP response means no test runs.
+  * per-host breaker - after ``failure_threshold`` consecutive transport
+    failures (connection errors and timeouts, i.e. no HTTP response at all)
+    the host's circuit opens and later requests to it are short-circuited.
+    Any HTTP response, 4xx and 5xx included, resets the count. A test run is
+    short, so an open circuit stays open; there is no half-open retry.
+  * run deadline - once ``deadline`` seconds have passed every remaining
+    request is short-circuited, and request timeouts are clamped to the time
+    that is left.
+
+The preflight goes through the caller's requests session, so adapters,
+proxies and the in-process stand-in (api_stand_in.py) all apply to it.
+
+Usage:
+    breaker = breaker_from_argv(sys.argv[1:])   # --deadline 120 --breaker-threshold 3
+    reason = breaker.check(session, url)        # None, or why the request is skipped
+    response = session.get(url, timeout=breaker.timeout())
+    breaker.record(url)                         # or breaker.record(url, exc)
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+DEFAULT_DEADLINE = 120.0
+DEFAULT_THRESHOLD = 3
+
+
+@dataclass
+class _HostState:
+    consecutive_failures: int = 0
+    preflight_done: bool = False
+    open_reason: Optional[str] = None
+
+
+def is_transport_failure(error: Optional[BaseException]) -> bool:
+    """True when a request got no HTTP response at all"""
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class HostCircuitBreaker:
+    """Per-host consecutive-failure breaker with a reachability preflight and a run deadline"""
+
+    def __init__(self, failure_threshold: int = DEFAULT_THRESHOLD, deadline: Optional[float] = None,
+                 connect_timeout: float = 3.0, read_timeout: float = 30.0, preflight: bool = True):
+        self.failure_threshold = max(1, failure_threshold)
+        self.deadline = deadline if deadline and deadline > 0 else None
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.preflight_enabled = preflight
+        self.short_circuited = 0
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self._deadline_reason: Optional[str] = None
+        self.started = time.monotonic()
+
+    def start(self):
+        """Restart the deadline clock (at the start of a run)"""
+        self.started = time.monotonic()
+        self._deadline_reason = None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None without one"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - self.elapsed())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def timeout(self) -> Tuple[float, float]:
+        """(connect, read) timeout for requests, clamped to the time left"""
+        connect, read = self.connect_timeout, self.read_timeout
+        remaining = self.remaining()
+        if remaining is not None:
+            remaining = max(remaining, 0.1)
+            connect, read = min(connect, remaining), min(read, remaining)
+        return connect, read
+
+    def _state(self, url: str) -> Tuple[str, _HostState]:
+        host = _origin(url)
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState()
+        return host, state
+
+    def _preflight(self, session: requests.Session, host: str, state: _HostState):
+        """One HEAD to the origin; any HTTP status counts as reachable"""
+        state.preflight_done = True
+        connect = min(self.connect_timeout, self.remaining() or self.connect_timeout)
+        try:
+            session.head(host, timeout=(max(connect, 0.1), max(connect, 0.1)), allow_redirects=False)
+        except requests.exceptions.RequestException as e:
+            state.open_reason = f"preflight to {host} failed ({type(e).__name__})"
+
+    def check(self, session: requests.Session, url: str) -> Optional[str]:
+        """Why the request to ``url`` should be short-circuited, or None to send it"""
+        if self.expired():
+            self._deadline_reason = f"run deadline of {self.deadline:.0f}s exceeded"
+            self.short_circuited += 1
+            return self._deadline_reason
+
+        host, state = self._state(url)
+        if self.preflight_enabled and not state.preflight_done and state.open_reason is None:
+            self._preflight(session, host, state)
+        if state.open_reason:
+            self.short_circuited += 1
+            return f"circuit open for {host}: {state.open_reason}"
+        return None
+
+    def record(self, url: str, error: Optional[BaseException] = None):
+        """Record the outcome of a sent request (``error`` is the exception, if any)"""
+        host, state = self._state(url)
+        if not is_transport_failure(error):
+            state.consecutive_failures = 0
+            return
+        state.consecutive_failures += 1
+        if state.open_reason is None and state.consecutive_failures >= self.failure_threshold:
+            state.open_reason = (f"{state.consecutive_failures} consecutive connection failures "
+                                 f"(last: {type(error).__name__})")
+
+    def open_hosts(self) -> Dict[str, str]:
+        return {host: state.open_reason for host, state in self._hosts.items() if state.open_reason}
+
+    def summary(self) -> Dict:
+        """Breaker state for reports"""
+        reasons: List[str] = [f"circuit open for {host}: {reason}" for host, reason in self.open_hosts().items()]
+        if self._deadline_reason:
+            reasons.append(self._deadline_reason)
+        return {
+            'failure_threshold': self.failure_threshold,
+            'deadline_s': self.deadline,
+            'elapsed_s': round(self.elapsed(), 3),
+            'short_circuited': self.short_circuited,
+            'open_hosts': self.open_hosts(),
+            'deadline_exceeded': self._deadline_reason is not None,
+            'reasons': reasons,
+        }
+
+
+def argv_option(argv: List[str], name: str, default=None, convert=str):
+    """Value of ``name VALUE`` or ``name=VALUE`` in argv, or ``default`` when absent
+
+    Exits with a usage message when the value is missing or does not convert.
+    """
+    for i, arg in enumerate(argv):
+        if arg == name:
+            value = argv[i + 1] if i + 1 < len(argv) and not argv[i + 1].startswith('--') else None
+        elif arg.startswith(name + '='):
+            value = arg.split('=', 1)[1]
+        else:
+            continue
+        if value is None:
+            raise SystemExit(f"❌ {name} needs a value")
+        try:
+            return convert(value)
+        except ValueError:
+            raise SystemExit(f"❌ {name}: invalid value {value!r}")
+    return default
+
+
+def breaker_from_argv(argv: List[str], default_deadline: float = DEFAULT_DEADLINE) -> HostCircuitBreaker:
+    """Build a breaker from ``--deadline SECONDS`` (0 disables) and ``--breaker-threshold N``"""
+    return HostCircuitBreaker(failure_threshold=int(argv_option(argv, '--breaker-threshold', DEFAULT_THRESHOLD, float)),
+                              deadline=argv_option(argv, '--deadline', default_deadline, float))
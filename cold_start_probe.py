@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Cold-Start Probe
+
+The testers send warm, back-to-back requests. This probe measures the first
+request after the API host has been idle:
+
+  * schedules trials after controlled idle gaps (30 s to 30 min by default),
+    each gap repeated ``--repeats`` times in a shuffled order so drift over
+    the day is not mistaken for an effect of the gap
+  * in every trial each endpoint gets one "first" request on a fresh
+    connection, then ``--followups`` warm requests on the same keep-alive
+    connection. Connect/TLS time is recorded separately, so a cold start is
+    judged on time to first byte (TTFB) only
+  * classifies a first request as a cold start when its TTFB exceeds the
+    endpoint's warm median by more than ``max(--min-excess-ms, 4 x robust
+    sigma)``, and keeps cold and warm TTFB histograms per endpoint
+  * the endpoint order rotates between trials. If only the endpoint sent
+    first after the gap goes cold, one instance serves the whole API; if
+    every endpoint goes cold, instances are per route
+  * estimates the idle threshold: cold-start rate per gap is made monotone
+    (isotonic regression) and interpolated in log(gap) at 50%. It also
+    reports the longest gap that stays under 10% cold starts, which is the
+    keep-warm ping interval, and the median cold-start penalty
+
+vercel.json only serves the static frontend (every path rewrites to
+index.html), so the probe targets the API at REACT_APP_API_URL by default.
+Other traffic to the API keeps it warm between trials, so run off-peak; a
+busy host will show fewer cold starts than an idle tenant would see.
+
+``--stand-in`` runs the whole procedure against api_stand_in.StandInServer
+with a simulated cold start after ``--stand-in-threshold`` idle seconds, on
+a virtual clock where idle gaps pass ``--time-scale`` times faster, to check
+the estimator end to end.
+
+Usage:
+    python cold_start_probe.py --dry-run                    # schedule and duration only
+    python cold_start_probe.py [--gaps 30,60,300,900,1800] [--repeats 3] [--json cold.json]
+    python cold_start_probe.py --from cold.json             # re-analyze saved samples
+    python cold_start_probe.py --stand-in --time-scale 60
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from http.client import HTTPConnection, HTTPSConnection
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from endpoint_catalog import ENDPOINT_TEMPLATES
+
+DEFAULT_BASE_URL = "https://thoughtprob2b.thoughthealer.org/api/v1"
+DEFAULT_GAPS = [30, 60, 120, 300, 600, 900, 1800]
+USER_AGENT = "ThoughtPro-ColdStartProbe/1.0"
+
+# TTFB histogram bucket upper edges (ms); the last bucket is open-ended
+HISTOGRAM_EDGES_MS = [25, 50, 100, 200, 400, 800, 1600, 3200, 6400]
+
+COLD_RATE_THRESHOLD = 0.5
+KEEP_WARM_MAX_COLD_RATE = 0.1
+
+
+def default_endpoints() -> List[str]:
+    """Open GET endpoints without path parameters"""
+    return [template for method, template, _category, requires_auth in ENDPOINT_TEMPLATES
+            if method == "GET" and not requires_auth and "{" not in template]
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    gap_s: float        # nominal idle gap before the trial
+    trial: int
+    kind: str           # "first" or "warm"
+    position: int       # order of the endpoint's first request within the trial
+    connect_ms: float   # TCP + TLS for a fresh connection, 0 on a reused one
+    ttfb_ms: float
+    total_ms: float
+    status: int
+    error: Optional[str] = None
+
+
+class Prober:
+    """http.client requests with connection setup timed apart from TTFB"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0, token: Optional[str] = None):
+        parts = urlsplit(base_url.rstrip("/"))
+        self.scheme, self.host, self.port = parts.scheme, parts.hostname, parts.port
+        self.prefix = parts.path
+        self.timeout = timeout
+        self.headers = {"User-Agent": USER_AGENT, "Accept": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        self._ssl_context = None
+
+    def connect(self) -> Tuple[HTTPConnection, float]:
+        if self.scheme == "https":
+            if self._ssl_context is None:
+                import ssl
+                self._ssl_context = ssl.create_default_context()
+            connection = HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self._ssl_context)
+        else:
+            connection = HTTPConnection(self.host, self.port, timeout=self.timeout)
+        start = time.perf_counter()
+        connection.connect()
+        return connection, (time.perf_counter() - start) * 1000
+
+    def get(self, connection: HTTPConnection, endpoint: str) -> Tuple[int, float, float]:
+        """(status, ttfb_ms, total_ms) for one GET on an open connection"""
+        start = time.perf_counter()
+        connection.request("GET", self.prefix + endpoint, headers=self.headers)
+        response = connection.getresponse()
+        ttfb = (time.perf_counter() - start) * 1000
+        response.read()
+        return response.status, ttfb, (time.perf_counter() - start) * 1000
+
+
+def run_trial(prober: Prober, endpoints: List[str], gap_s: float, trial: int, followups: int) -> List[Sample]:
+    """First request per endpoint (fresh connections), then warm follow-ups"""
+    samples: List[Sample] = []
+    connections: Dict[str, HTTPConnection] = {}
+    for position, endpoint in enumerate(endpoints):
+        connect_ms = 0.0
+        try:
+            connection, connect_ms = prober.connect()
+            connections[endpoint] = connection
+            status, ttfb, total = prober.get(connection, endpoint)
+            samples.append(Sample(endpoint, gap_s, trial, "first", position, round(connect_ms, 2),
+                                  round(ttfb, 2), round(total, 2), status))
+        except Exception as e:
+            samples.append(Sample(endpoint, gap_s, trial, "first", position, round(connect_ms, 2),
+                                  0.0, 0.0, 0, str(e) or type(e).__name__))
+
+    for endpoint, connection in connections.items():
+        for _ in range(followups):
+            try:
+                status, ttfb, total = prober.get(connection, endpoint)
+                samples.append(Sample(endpoint, gap_s, trial, "warm", -1, 0.0, round(ttfb, 2), round(total, 2),
+                                      status))
+            except Exception as e:
+                samples.append(Sample(endpoint, gap_s, trial, "warm", -1, 0.0, 0.0, 0.0, 0,
+                                      str(e) or type(e).__name__))
+                break
+        connection.close()
+    return samples
+
+
+def schedule(gaps: List[float], repeats: int, seed: int = 0) -> List[float]:
+    """Every gap ``repeats`` times, shuffled"""
+    order = [gap for gap in gaps for _ in range(repeats)]
+    random.Random(seed).shuffle(order)
+    return order
+
+
+def run_probe(prober: Prober, endpoints: List[str], gaps: List[float], repeats: int, followups: int,
+              seed: int = 0, sleep: Callable[[float], None] = time.sleep) -> List[Sample]:
+    """Run the schedule, waiting out each idle gap with ``sleep``"""
+    samples: List[Sample] = []
+    order = schedule(gaps, repeats, seed)
+
+    # A warm-up trial gives every endpoint a warm baseline before the first gap
+    print(f"⏳ Warm-up trial ({len(endpoints)} endpoints)")
+    samples.extend(run_trial(prober, endpoints, 0.0, 0, followups))
+
+    for trial, gap in enumerate(order, 1):
+        print(f"⏳ Trial {trial}/{len(order)}: idle {gap:.0f}s", end="", flush=True)
+        sleep(gap)
+        rotation = trial % len(endpoints)
+        trial_samples = run_trial(prober, endpoints[rotation:] + endpoints[:rotation], gap, trial, followups)
+        samples.extend(trial_samples)
+        first = next(s for s in trial_samples if s.kind == "first")
+        print(f" -> {first.endpoint} {first.ttfb_ms:.0f}ms" + (f" ({first.error})" if first.error else ""))
+    return samples
+
+
+# -- analysis -----------------------------------------------------------------------
+
+def histogram(values: List[float]) -> List[int]:
+    counts = [0] * (len(HISTOGRAM_EDGES_MS) + 1)
+    for value in values:
+        index = next((i for i, edge in enumerate(HISTOGRAM_EDGES_MS) if value <= edge), len(HISTOGRAM_EDGES_MS))
+        counts[index] += 1
+    return counts
+
+
+def isotonic(values: List[float], weights: List[float]) -> List[float]:
+    """Non-decreasing least-squares fit (pool adjacent violators)"""
+    blocks: List[List[float]] = []   # [mean, weight, length]
+    for value, weight in zip(values, weights):
+        blocks.append([value, weight, 1])
+        while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+            mean, weight_b, length = blocks.pop()
+            previous = blocks[-1]
+            total = previous[1] + weight_b
+            previous[0] = (previous[0] * previous[1] + mean * weight_b) / total if total else previous[0]
+            previous[1], previous[2] = total, previous[2] + length
+    fitted: List[float] = []
+    for mean, _weight, length in blocks:
+        fitted.extend([mean] * length)
+    return fitted
+
+
+def idle_threshold(rows: List[Dict]) -> Dict:
+    """Gap where cold starts reach 50%, and the longest gap under 10%"""
+    rows = [row for row in rows if row["trials"]]
+    fitted = isotonic([row["cold_rate"] for row in rows], [row["trials"] for row in rows])
+    for row, value in zip(rows, fitted):
+        row["cold_rate_fitted"] = round(value, 3)
+
+    threshold = None
+    for index, (row, value) in enumerate(zip(rows, fitted)):
+        if value >= COLD_RATE_THRESHOLD:
+            if index == 0:
+                threshold = {"gap_s": None, "below_s": row["gap_s"]}
+            else:
+                low_gap, low_value = rows[index - 1]["gap_s"], fitted[index - 1]
+                share = (COLD_RATE_THRESHOLD - low_value) / (value - low_value)
+                gap = math.exp(math.log(low_gap) + share * (math.log(row["gap_s"]) - math.log(low_gap)))
+                threshold = {"gap_s": round(gap, 1), "between_s": [low_gap, row["gap_s"]]}
+            break
+
+    keep_warm = None
+    for row, value in zip(rows, fitted):
+        if value <= KEEP_WARM_MAX_COLD_RATE:
+            keep_warm = row["gap_s"]
+    return {
+        "threshold": threshold,
+        "keep_warm_interval_s": keep_warm,
+        "keep_warm_pings_per_hour": round(3600 / keep_warm, 1) if keep_warm else None,
+    }
+
+
+def analyze(samples: List[Sample], min_excess_ms: float = 100.0) -> Dict:
+    """Per-endpoint classification, histograms and the idle-threshold estimate"""
+    ok = [s for s in samples if s.error is None and s.status]
+    endpoints = list(dict.fromkeys(s.endpoint for s in samples))
+    gaps = sorted({s.gap_s for s in samples if s.gap_s > 0})
+
+    per_endpoint: Dict[str, Dict] = {}
+    firsts: List[Tuple[Sample, bool, float]] = []   # (sample, cold, excess over the warm median)
+    for endpoint in endpoints:
+        warm = [s.ttfb_ms for s in ok if s.endpoint == endpoint and s.kind == "warm"]
+        if not warm:
+            per_endpoint[endpoint] = {"error": "no warm samples"}
+            continue
+        median = statistics.median(warm)
+        sigma = 1.4826 * statistics.median(abs(value - median) for value in warm)
+        cutoff = median + max(min_excess_ms, 4 * sigma)
+
+        cold_ttfb, warm_first_ttfb = [], []
+        cold_positions = {"first": [0, 0], "later": [0, 0]}   # [cold, trials]
+        for s in ok:
+            if s.endpoint != endpoint or s.kind != "first" or s.gap_s <= 0:
+                continue
+            cold = s.ttfb_ms > cutoff
+            firsts.append((s, cold, s.ttfb_ms - median))
+            (cold_ttfb if cold else warm_first_ttfb).append(s.ttfb_ms)
+            slot = cold_positions["first" if s.position == 0 else "later"]
+            slot[0] += cold
+            slot[1] += 1
+
+        per_endpoint[endpoint] = {
+            "warm_median_ms": round(median, 1),
+            "warm_p95_ms": round(sorted(warm)[int(0.95 * (len(warm) - 1))], 1),
+            "cold_cutoff_ms": round(cutoff, 1),
+            "cold_starts": len(cold_ttfb),
+            "first_requests": len(cold_ttfb) + len(warm_first_ttfb),
+            "cold_median_ms": round(statistics.median(cold_ttfb), 1) if cold_ttfb else None,
+            "cold_rate_when_first": round(cold_positions["first"][0] / cold_positions["first"][1], 3)
+            if cold_positions["first"][1] else None,
+            "cold_rate_when_later": round(cold_positions["later"][0] / cold_positions["later"][1], 3)
+            if cold_positions["later"][1] else None,
+            "histogram": {"cold": histogram(cold_ttfb), "warm": histogram(warm + warm_first_ttfb)},
+        }
+
+    def by_gap(entries: List[Tuple[Sample, bool, float]]) -> List[Dict]:
+        rows = []
+        for gap in gaps:
+            at_gap = [(s, cold) for s, cold, _excess in entries if s.gap_s == gap]
+            cold = sum(1 for _s, c in at_gap if c)
+            rows.append({
+                "gap_s": gap,
+                "trials": len(at_gap),
+                "cold": cold,
+                "cold_rate": round(cold / len(at_gap), 3) if at_gap else 0.0,
+                "first_median_ms": round(statistics.median(s.ttfb_ms for s, _c in at_gap), 1) if at_gap else None,
+            })
+        return rows
+
+    # The host is idle before the first request of a trial only
+    host_entries = [entry for entry in firsts if entry[0].position == 0]
+    host_rows = by_gap(host_entries)
+    estimate = idle_threshold(host_rows)
+    penalties = [excess for _s, cold, excess in host_entries if cold]
+
+    for endpoint, info in per_endpoint.items():
+        if "error" not in info:
+            info["by_gap"] = by_gap([entry for entry in firsts if entry[0].endpoint == endpoint])
+
+    later = [cold for s, cold, _excess in firsts if s.position > 0]
+    first = [cold for _s, cold, _excess in host_entries]
+    scope = None
+    if first and later and sum(first):
+        scope = "per route" if sum(later) / len(later) >= 0.5 * sum(first) / len(first) else "shared"
+
+    return {
+        "min_excess_ms": min_excess_ms,
+        "histogram_edges_ms": HISTOGRAM_EDGES_MS,
+        "host": {
+            "by_gap": host_rows,
+            **estimate,
+            "cold_penalty_median_ms": round(statistics.median(penalties), 1) if penalties else None,
+            "instance_scope": scope,
+        },
+        "endpoints": per_endpoint,
+        "errors": sum(1 for s in samples if s.error or not s.status),
+    }
+
+
+# -- stand-in -----------------------------------------------------------------------
+
+class ScaledClock:
+    """Virtual time for the stand-in: idle gaps pass ``time_scale`` times faster, requests in real time"""
+
+    def __init__(self, time_scale: float):
+        self.time_scale = time_scale
+        self.skipped = 0.0
+
+    def now(self) -> float:
+        return time.monotonic() + self.skipped
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds / self.time_scale)
+        self.skipped += seconds - seconds / self.time_scale
+
+
+def cold_stand_in(threshold_s: float, cold_ms: float, clock: ScaledClock, per_route: bool = False):
+    """StandInServer whose next response is slow once it has been idle past the threshold
+
+    Idle time is tracked for the whole server, or for each path with ``per_route``.
+    """
+    from api_stand_in import StandInServer
+
+    last_request: Dict[str, float] = {}
+
+    def fault(_method, path):
+        now = clock.now()
+        key = path if per_route else ""
+        last = last_request.get(key)
+        last_request[key] = now
+        if last is None or now - last > threshold_s:
+            time.sleep(cold_ms / 1000)
+        return None
+
+    return StandInServer(fault=fault)
+
+
+# -- report -------------------------------------------------------------------------
+
+def build_report(samples: List[Sample], min_excess_ms: float, config: Dict) -> Dict:
+    report = analyze(samples, min_excess_ms)
+    report["config"] = config
+    report["samples"] = [asdict(s) for s in samples]
+    return report
+
+
+def print_report(report: Dict):
+    host = report["host"]
+    print("\n❄️  COLD-START PROBE")
+    print("=" * 80)
+    print(f"{'idle gap':>10} {'trials':>7} {'cold':>5} {'rate':>6} {'fitted':>7} {'first TTFB':>11}")
+    for row in host["by_gap"]:
+        first = f"{row['first_median_ms']:.0f}ms" if row["first_median_ms"] is not None else "-"
+        print(f"{row['gap_s']:>9.0f}s {row['trials']:>7} {row['cold']:>5} {row['cold_rate']:>6.0%} "
+              f"{row.get('cold_rate_fitted', 0):>7.0%} {first:>11}")
+
+    threshold = host["threshold"]
+    if threshold is None:
+        print("\n🔥 Cold starts stayed under 50% at every gap - no idle threshold in range")
+    elif threshold["gap_s"] is None:
+        print(f"\n❄️  Cold starts already at 50%+ after {threshold['below_s']:.0f}s idle - threshold is below the range")
+    else:
+        low, high = threshold["between_s"]
+        print(f"\n❄️  Idle threshold ~{threshold['gap_s']:.0f}s (between {low:.0f}s and {high:.0f}s)")
+    if host["keep_warm_interval_s"]:
+        print(f"🔁 Keep-warm: ping at least every {host['keep_warm_interval_s']:.0f}s "
+              f"({host['keep_warm_pings_per_hour']}/hour) to stay under {KEEP_WARM_MAX_COLD_RATE:.0%} cold starts")
+    if host["cold_penalty_median_ms"] is not None:
+        print(f"⏱️  Median cold-start penalty: +{host['cold_penalty_median_ms']:.0f}ms TTFB")
+    if host["instance_scope"] == "shared":
+        print("🧩 Only the first request after idle cold-starts: one warm instance serves every route")
+    elif host["instance_scope"] == "per route":
+        print("🧩 Routes cold-start independently: keep-warm pings must cover each route")
+
+    print(f"\n{'endpoint':40} {'warm p50':>9} {'cutoff':>8} {'cold':>7} {'cold p50':>9} {'first/later':>12}")
+    for endpoint, info in report["endpoints"].items():
+        if "error" in info:
+            print(f"{endpoint:40} {info['error']}")
+            continue
+        cold_median = f"{info['cold_median_ms']:.0f}ms" if info["cold_median_ms"] is not None else "-"
+        rates = "/".join("-" if r is None else f"{r:.0%}"
+                         for r in (info["cold_rate_when_first"], info["cold_rate_when_later"]))
+        print(f"{endpoint:40} {info['warm_median_ms']:>7.0f}ms {info['cold_cutoff_ms']:>6.0f}ms "
+              f"{info['cold_starts']:>3}/{info['first_requests']:<3} {cold_median:>9} {rates:>12}")
+
+    edges = report["histogram_edges_ms"]
+    labels = [f"≤{edge}" for edge in edges] + [f">{edges[-1]}"]
+    print(f"\nTTFB histograms (ms): {' '.join(f'{label:>6}' for label in labels)}")
+    for endpoint, info in report["endpoints"].items():
+        if "histogram" in info:
+            for kind in ("warm", "cold"):
+                counts = info["histogram"][kind]
+                print(f"  {kind:4} {endpoint[:30]:30} {' '.join(f'{c:>6}' for c in counts)}")
+    if report["errors"]:
+        print(f"\n⚠️  {report['errors']} request(s) failed and were left out")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API cold starts after controlled idle gaps")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"API base URL (default {DEFAULT_BASE_URL})")
+    parser.add_argument("--endpoint", action="append", help="GET endpoint to probe (repeatable; default: open GETs)")
+    parser.add_argument("--gaps", default=",".join(str(g) for g in DEFAULT_GAPS),
+                        help="Idle gaps in seconds (default 30,60,120,300,600,900,1800)")
+    parser.add_argument("--repeats", type=int, default=3, help="Trials per gap (default 3)")
+    parser.add_argument("--followups", type=int, default=5, help="Warm requests per endpoint per trial (default 5)")
+    parser.add_argument("--min-excess-ms", type=float, default=100.0,
+                        help="Smallest TTFB excess over the warm median counted as a cold start (default 100)")
+    parser.add_argument("--token", help="Bearer token for authenticated endpoints")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (default 30)")
+    parser.add_argument("--seed", type=int, default=0, help="Schedule shuffle seed (default 0)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the schedule and its duration only")
+    parser.add_argument("--from", dest="from_file", help="Re-analyze samples from a saved JSON report")
+    parser.add_argument("--stand-in", action="store_true", help="Probe a local stand-in with simulated cold starts")
+    parser.add_argument("--stand-in-threshold", type=float, default=300.0,
+                        help="Stand-in idle seconds before a cold start (default 300)")
+    parser.add_argument("--stand-in-per-route", action="store_true",
+                        help="Stand-in cold starts per route instead of per server")
+    parser.add_argument("--stand-in-cold-ms", type=float, default=800.0, help="Stand-in cold-start delay (default 800)")
+    parser.add_argument("--time-scale", type=float, default=60.0,
+                        help="With --stand-in, idle gaps pass this many times faster (default 60)")
+    parser.add_argument("--json", help="Also write the report (with raw samples) to this file")
+    args = parser.parse_args()
+
+    if args.from_file:
+        with open(args.from_file, encoding="utf-8") as f:
+            saved = json.load(f)
+        samples = [Sample(**s) for s in saved["samples"]]
+        report = build_report(samples, args.min_excess_ms, saved.get("config", {}))
+        print_report(report)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"\n💾 Report written to {args.json}")
+        return
+
+    gaps = [float(g) for g in args.gaps.split(",")]
+    endpoints = args.endpoint or default_endpoints()
+    order = schedule(gaps, args.repeats, args.seed)
+    idle = sum(order) / (args.time_scale if args.stand_in else 1.0)
+    print("🔬 ThoughtPro B2B Cold-Start Probe")
+    print(f"   {len(order)} trials over {len(gaps)} gaps x {args.repeats}, {len(endpoints)} endpoints, "
+          f"~{idle / 60:.1f} min of idle time")
+    if args.dry_run:
+        print("   Order: " + ", ".join(f"{gap:.0f}s" for gap in order))
+        return
+
+    server = None
+    base_url = args.base_url
+    sleep = time.sleep
+    if args.stand_in:
+        clock = ScaledClock(args.time_scale)
+        sleep = clock.sleep
+        server = cold_stand_in(args.stand_in_threshold, args.stand_in_cold_ms, clock,
+                               args.stand_in_per_route).start()
+        base_url = server.url + "/api/v1"
+        print(f"   Stand-in at {server.url}: cold start after {args.stand_in_threshold:.0f}s idle "
+              f"(+{args.stand_in_cold_ms:.0f}ms)")
+    print(f"   Target: {base_url}\n")
+
+    config = {"base_url": base_url, "endpoints": endpoints, "gaps_s": gaps, "repeats": args.repeats,
+              "followups": args.followups, "seed": args.seed, "stand_in": args.stand_in}
+    if args.stand_in:
+        config.update(time_scale=args.time_scale, stand_in_threshold_s=args.stand_in_threshold,
+                      stand_in_per_route=args.stand_in_per_route)
+    try:
+        samples = run_probe(Prober(base_url, args.timeout, args.token), endpoints, gaps, args.repeats,
+                            args.followups, args.seed, sleep)
+    finally:
+        if server:
+            server.stop()
+
+    report = build_report(samples, args.min_excess_ms, config)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
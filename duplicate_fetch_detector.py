@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Duplicate Fetch Detector
+
+Finds identical GET requests that were in flight at the same time during a
+page load - typically several mounted components (dashboard cards,
+usage analytics, the polling health dashboard) asking for the same endpoint.
+
+Input is a browser HAR capture (DevTools > Network > Save all as HAR) or a
+request log: a JSON array or JSON lines of
+``{"method", "url", "start", "duration_ms", "bytes"}`` (``start`` as epoch
+milliseconds or ISO 8601).
+
+For every duplicate the report gives:
+
+  * the service methods that request the endpoint and the component call
+    sites that use them (from service_map.py), narrowed by the HAR
+    initiator stack when the capture has one
+  * what a request-coalescing cache in ``ApiService.request`` (api.js) - one
+    shared promise per in-flight GET URL - would save: requests, response
+    bytes and server time
+  * which duplicates bypass ``ApiService`` with a direct ``fetch()`` and
+    would need their service moved onto apiService first
+
+``--ttl`` additionally counts identical GETs issued within that many
+milliseconds after the first one completed (a short-lived response cache).
+
+Usage:
+    python duplicate_fetch_detector.py page_load.har [more.har ...] [--ttl 0] [--json duplicates.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from endpoint_catalog import API_PREFIX, match_template, normalize_path, template_for
+from service_map import SRC_DIR, ServiceMap, block_end, mask_source
+
+_COMPONENT_CALL_RE = re.compile(r"\b(\w+Service)\.(\w+)\s*\(")
+_CONTEXT_RE = re.compile(r"\b(useEffect|setInterval)\s*\(")
+_CONTEXT_LABELS = {"useEffect": "on mount", "setInterval": "polling"}
+
+
+@dataclass
+class Request:
+    method: str
+    url: str
+    start_ms: float
+    duration_ms: float
+    size: int = 0
+    auth: str = ""
+    initiator: List[str] = field(default_factory=list)  # function names, innermost first
+
+    @property
+    def end_ms(self) -> float:
+        return self.start_ms + self.duration_ms
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Requests with the same key get the same response"""
+        return self.url, self.auth
+
+
+def _timestamp_ms(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp() * 1000
+
+
+def _initiator_names(entry: Dict) -> List[str]:
+    """Function names on the initiator stack of a Chrome HAR entry"""
+    names = []
+    stack = (entry.get("_initiator") or {}).get("stack")
+    while stack:
+        names.extend(frame["functionName"] for frame in stack.get("callFrames", []) if frame.get("functionName"))
+        stack = stack.get("parent")
+    return names
+
+
+def load_har(data: Dict) -> List[Request]:
+    requests = []
+    for entry in data.get("log", {}).get("entries", []):
+        request, response = entry.get("request", {}), entry.get("response", {})
+        headers = {h.get("name", "").lower(): h.get("value", "") for h in request.get("headers", [])}
+        content_size = (response.get("content") or {}).get("size") or 0
+        size = response.get("_transferSize") or response.get("bodySize") or 0
+        requests.append(Request(
+            request.get("method", "GET").upper(),
+            request.get("url", ""),
+            _timestamp_ms(entry["startedDateTime"]),
+            float(entry.get("time") or 0),
+            max(size, content_size, 0),
+            headers.get("authorization", ""),
+            _initiator_names(entry),
+        ))
+    return requests
+
+
+def load_request_log(records: List[Dict]) -> List[Request]:
+    requests = []
+    for record in records:
+        start = _timestamp_ms(record.get("start", record.get("started", record.get("timestamp"))))
+        if "duration_ms" in record:
+            duration = float(record["duration_ms"])
+        else:
+            duration = _timestamp_ms(record["end"]) - start
+        requests.append(Request((record.get("method") or "GET").upper(), record["url"], start, duration,
+                                int(record.get("bytes") or 0), record.get("auth", "")))
+    return requests
+
+
+def load_capture(path: str) -> List[Request]:
+    """Requests from a HAR file or a request log, in start order"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    requests = load_har(data) if isinstance(data, dict) else load_request_log(data)
+    requests.sort(key=lambda r: r.start_ms)
+    return requests
+
+
+def is_api_request(request: Request, api_prefix: str = API_PREFIX) -> bool:
+    path = urlsplit(request.url).path
+    return path.startswith(api_prefix + "/") or match_template(request.method, normalize_path(path)) is not None
+
+
+def coalesce(requests: List[Request], ttl_ms: float = 0) -> List[Tuple[Request, Request]]:
+    """(duplicate, leader) pairs: GETs a shared cache would answer from an earlier identical GET
+
+    With ``ttl_ms`` 0 only requests that start while the leader is still in
+    flight are shared (pure request coalescing).
+    """
+    leaders: Dict[Tuple[str, str], Request] = {}
+    pairs = []
+    for request in requests:
+        if request.method != "GET":
+            continue
+        leader = leaders.get(request.key)
+        if leader is not None and request.start_ms < leader.end_ms + ttl_ms:
+            pairs.append((request, leader))
+        else:
+            leaders[request.key] = request
+    return pairs
+
+
+class CallSiteIndex:
+    """Service methods and component call sites behind each GET endpoint template"""
+
+    def __init__(self, src_dir: str = SRC_DIR):
+        self.service_map = ServiceMap(src_dir)
+        # template -> {(service, method): via}
+        self.methods: Dict[str, Dict[Tuple[str, str], str]] = defaultdict(dict)
+        for service, name in self.service_map.methods:
+            for call in self.service_map.endpoints(service, name):
+                if call.method == "GET":
+                    self.methods[call.template][(service, name)] = call.via
+        self.sites: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        root = os.path.dirname(src_dir)
+        for path in sorted(glob.glob(os.path.join(src_dir, "components", "**", "*.js*"), recursive=True)):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+            masked = mask_source(text)
+            contexts = [(m.group(1), m.start(), block_end(masked, m.end() - 1)) for m in _CONTEXT_RE.finditer(masked)]
+            for call in _COMPONENT_CALL_RE.finditer(masked):
+                target = (call.group(1), call.group(2))
+                if target not in self.service_map.methods:
+                    continue
+                # Innermost enclosing effect or interval
+                enclosing = [c for c in contexts if c[1] <= call.start() < c[2]]
+                label = _CONTEXT_LABELS[max(enclosing, key=lambda c: c[1])[0]] if enclosing else ""
+                line = text.count("\n", 0, call.start()) + 1
+                self.sites[target].append(f"{os.path.relpath(path, root)}:{line}" + (f" ({label})" if label else ""))
+
+    def lookup(self, template: str, initiator: Optional[Set[str]] = None) -> Dict[Tuple[str, str], str]:
+        methods = self.methods.get(template, {})
+        if initiator:
+            named = {key: via for key, via in methods.items() if key[1] in initiator}
+            if named:
+                return named
+        return methods
+
+
+def analyze_capture(requests: List[Request], index: CallSiteIndex, ttl_ms: float = 0,
+                    api_prefix: str = API_PREFIX) -> Dict:
+    api_gets = [r for r in requests if r.method == "GET" and is_api_request(r, api_prefix)]
+    in_flight = coalesce(api_gets)
+    with_ttl = coalesce(api_gets, ttl_ms) if ttl_ms else in_flight
+
+    groups: Dict[Tuple[str, str], Dict] = {}
+    for duplicate, leader in with_ttl:
+        template = template_for("GET", urlsplit(duplicate.url).path)
+        group = groups.setdefault(duplicate.key, {
+            "url": duplicate.url,
+            "template": template,
+            "requests": sum(1 for r in api_gets if r.key == duplicate.key),
+            "in_flight": 0,
+            "after_completion": 0,
+            "in_flight_bytes": 0,
+            "saved_bytes": 0,
+            "saved_server_ms": 0.0,
+            "saved_wait_ms": 0.0,
+            "_initiator": set(),
+        })
+        if duplicate.start_ms < leader.end_ms:
+            group["in_flight"] += 1
+            group["in_flight_bytes"] += duplicate.size
+            # The duplicate would resolve with the leader instead of waiting for its own response
+            group["saved_wait_ms"] += max(0.0, duplicate.end_ms - leader.end_ms)
+        else:
+            group["after_completion"] += 1
+            group["saved_wait_ms"] += duplicate.duration_ms
+        group["saved_bytes"] += duplicate.size
+        group["saved_server_ms"] += duplicate.duration_ms
+        group["_initiator"].update(duplicate.initiator, leader.initiator)
+
+    rows = []
+    for group in groups.values():
+        methods = index.lookup(group["template"], group.pop("_initiator"))
+        vias = set(methods.values())
+        group["via"] = "/".join(sorted(vias)) if vias else "unknown"
+        group["service_methods"] = [f"{service}.{name}" for service, name in sorted(methods)]
+        group["call_sites"] = sorted({site for key in methods for site in index.sites.get(key, [])})
+        group["saved_server_ms"] = round(group["saved_server_ms"], 1)
+        group["saved_wait_ms"] = round(group["saved_wait_ms"], 1)
+        rows.append(group)
+    rows.sort(key=lambda g: (-(g["in_flight"] + g["after_completion"]), -g["saved_server_ms"], g["url"]))
+
+    coalescable = [g for g in rows if g["via"] == "apiService"]
+    return {
+        "requests": len(requests),
+        "api_gets": len(api_gets),
+        "in_flight_duplicates": len(in_flight),
+        "ttl_ms": ttl_ms,
+        "ttl_duplicates": len(with_ttl) if ttl_ms else None,
+        "coalescing_saves": sum(g["in_flight"] for g in coalescable),
+        "coalescing_saves_bytes": sum(g["in_flight_bytes"] for g in coalescable),
+        "needs_api_service": sum(g["in_flight"] for g in rows if g["via"] != "apiService"),
+        "duplicates": rows,
+    }
+
+
+def print_report(name: str, report: Dict):
+    print(f"\n📄 {name}: {report['requests']} requests, {report['api_gets']} API GETs")
+    if not report["duplicates"]:
+        print("   ✅ No duplicate GETs")
+        return
+    share = report["in_flight_duplicates"] / report["api_gets"] * 100 if report["api_gets"] else 0
+    print(f"   🔁 {report['in_flight_duplicates']} GETs duplicated one already in flight ({share:.0f}% of API GETs)")
+    print(f"   {'endpoint':48} {'sent':>5} {'dup':>4} {'ttl':>4} {'server ms':>10} {'bytes':>9}  via")
+    for group in report["duplicates"]:
+        print(f"   {group['template']:48} {group['requests']:>5} {group['in_flight']:>4} "
+              f"{group['after_completion'] if report['ttl_ms'] else '-':>4} {group['saved_server_ms']:>10,.0f} "
+              f"{group['saved_bytes']:>9,}  {group['via']}")
+        if group["service_methods"]:
+            print(f"      from {', '.join(group['service_methods'])}")
+        for site in group["call_sites"]:
+            print(f"         {site}")
+
+    print(f"\n   💡 Coalescing in-flight GETs in ApiService.request would save {report['coalescing_saves']} of "
+          f"{report['api_gets']} API GETs ({report['coalescing_saves_bytes']:,} bytes)")
+    if report["needs_api_service"]:
+        print(f"   ⚠️  {report['needs_api_service']} more duplicates bypass ApiService (direct fetch() or unmapped) "
+              f"and need their service moved onto apiService first")
+    if report["ttl_ms"]:
+        print(f"   ⏱️  A {report['ttl_ms']:.0f} ms response cache would save {report['ttl_duplicates']} in total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find identical in-flight GETs in a page-load capture")
+    parser.add_argument("captures", nargs="+", help="HAR files or request logs (JSON array / JSON lines)")
+    parser.add_argument("--src", default=SRC_DIR, help="Source directory (default src)")
+    parser.add_argument("--ttl", type=float, default=0, help="Also count repeats within this many ms after completion")
+    parser.add_argument("--api-prefix", default=API_PREFIX, help=f"Path prefix of API requests (default {API_PREFIX})")
+    parser.add_argument("--json", help="Also write the reports to this file")
+    args = parser.parse_args()
+
+    index = CallSiteIndex(args.src)
+    reports = {}
+    for path in args.captures:
+        reports[path] = analyze_capture(load_capture(path), index, args.ttl, args.api_prefix)
+        print_report(os.path.basename(path), reports[path])
+
+    if len(reports) > 1:
+        saved = sum(r["coalescing_saves"] for r in reports.values())
+        total = sum(r["api_gets"] for r in reports.values())
+        print(f"\n📊 All captures: coalescing would save {saved} of {total} API GETs")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Endpoint Catalogue
+
+Single list of the documented API endpoint templates (see api_endpoints.md)
+plus helpers that map concrete request paths such as
+``/companies/test-company-123/employees`` back to their template
+``/companies/{companyId}/employees``.
+
+The testers call endpoints relative to ``.../api/v1`` while the documentation
+mixes prefixed and unprefixed paths, so every path is normalised before it is
+matched.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+API_PREFIX = "/api/v1"
+
+# (method, template, category, requires_auth)
+ENDPOINT_TEMPLATES: List[Tuple[str, str, str, bool]] = [
+    # Authentication
+    ("POST", "/auth/supabase/register-profile", "authentication", False),
+    ("POST", "/auth/supabase/create-credentials", "authentication", False),
+    ("POST", "/auth/supabase/login", "authentication", False),
+    ("GET", "/auth/supabase/profile", "authentication", True),
+    ("POST", "/auth/supabase/create-employee-temp", "authentication", True),
+    ("POST", "/auth/supabase/login-temp", "authentication", False),
+    ("PUT", "/auth/supabase/update-temp-password", "authentication", True),
+
+    # Companies
+    ("POST", "/companies-supabase", "companies", False),
+    ("POST", "/companies/{companyId}/employees", "companies", True),
+    ("GET", "/companies/{companyId}/employees", "companies", True),
+    ("POST", "/companies/{companyId}/employees/{employeeId}/resend-credentials", "companies", True),
+    ("POST", "/companies/{companyId}/employees/bulk", "companies", True),
+    ("POST", "/companies/forgot-password/personal-email", "companies", False),
+    ("GET", "/companies-supabase/{companyId}/subscription-config", "companies", True),
+    ("PUT", "/companies-supabase/{companyId}/subscription-config", "companies", True),
+
+    # Psychologists
+    ("GET", "/psychologists", "psychologists", False),
+    ("POST", "/psychologists", "psychologists", True),
+    ("GET", "/psychologists/search", "psychologists", False),
+    ("GET", "/psychologists/{id}", "psychologists", False),
+
+    # Bookings
+    ("GET", "/bookings/my-bookings", "bookings", True),
+    ("GET", "/bookings/psychologist-bookings", "bookings", True),
+    ("POST", "/bookings", "bookings", True),
+
+    # Employee subscriptions
+    ("POST", "/employee-subscriptions/verify/purchase", "employee_subscriptions", False),
+    ("POST", "/employee-subscriptions/verify/subscription", "employee_subscriptions", False),
+    ("GET", "/employee-subscriptions/active", "employee_subscriptions", False),
+    ("GET", "/employee-subscriptions/status", "employee_subscriptions", False),
+
+    # Availability & holidays
+    ("POST", "/availability", "availability", True),
+    ("GET", "/availability/{psychologist_id}", "availability", True),
+    ("PATCH", "/availability/{id}", "availability", True),
+    ("DELETE", "/availability/{id}", "availability", True),
+    ("POST", "/availability/populate-n-days", "availability", True),
+    ("PATCH", "/availability/toggle-day", "availability", True),
+    ("GET", "/holidays", "availability", True),
+    ("POST", "/holidays", "availability", True),
+    ("DELETE", "/holidays/{id}", "availability", True),
+
+    # Employee management
+    ("GET", "/auth/supabase/company/{companyId}/employees-status", "employee_management", True),
+]
+
+_PARAM_RE = re.compile(r"\{[^/}]+\}")
+_ID_SEGMENT_RE = re.compile(
+    r"^(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|\d+|[0-9a-fA-F]{24}|test-[a-z]+-\d+|[a-z]+-\d{6,})$"
+)
+
+
+def normalize_path(path: str) -> str:
+    """Strip scheme/host, query string, the /api/v1 prefix and trailing slashes"""
+    if "://" in path:
+        path = "/" + path.split("://", 1)[1].partition("/")[2]
+    path = path.split("?", 1)[0].split("#", 1)[0]
+    if path.startswith(API_PREFIX + "/") or path == API_PREFIX:
+        path = path[len(API_PREFIX):]
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return path or "/"
+
+
+def _compile_templates() -> Dict[str, List[Tuple[re.Pattern, str]]]:
+    """Group template regexes by method, static templates first"""
+    by_method: Dict[str, List[Tuple[int, re.Pattern, str]]] = {}
+    for method, template, _category, _auth in ENDPOINT_TEMPLATES:
+        pattern = "^" + "[^/]+".join(re.escape(part) for part in _PARAM_RE.split(template)) + "$"
+        by_method.setdefault(method, []).append(
+            (len(_PARAM_RE.findall(template)), re.compile(pattern), template)
+        )
+    return {
+        method: [(regex, template) for _n, regex, template in sorted(entries, key=lambda e: e[0])]
+        for method, entries in by_method.items()
+    }
+
+
+_COMPILED_TEMPLATES = _compile_templates()
+_TEMPLATE_INFO = {(m, t): (c, a) for m, t, c, a in ENDPOINT_TEMPLATES}
+
+
+@lru_cache(maxsize=4096)
+def match_template(method: str, path: str) -> Optional[str]:
+    """Return the documented template for a concrete request path, or None"""
+    path = normalize_path(path)
+    for regex, template in _COMPILED_TEMPLATES.get(method.upper(), ()):
+        if regex.match(path):
+            return template
+    return None
+
+
+@lru_cache(maxsize=4096)
+def template_for(method: str, path: str) -> str:
+    """Template for any path; undocumented paths get ID-like segments replaced by {id}"""
+    template = match_template(method, path)
+    if template is not None:
+        return template
+    segments = normalize_path(path).split("/")
+    return "/".join("{id}" if _ID_SEGMENT_RE.match(s) else s for s in segments) or "/"
+
+
+def endpoint_info(method: str, template: str) -> Optional[Tuple[str, bool]]:
+    """(category, requires_auth) for a documented template"""
+    return _TEMPLATE_INFO.get((method.upper(), template))
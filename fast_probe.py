@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Fast Probe
+
+Standard-library-only HTTP probe for instant_test.py and quick_health_check.py.
+It is used when requests is not installed, or when ``--fast`` is passed:
+
+  * all probes start at the same time, one http.client connection per thread
+  * one global deadline bounds the whole run instead of a timeout per request
+  * results are reported as they arrive
+  * http.client and ssl are only imported when a probe runs, and the TLS
+    context is built only if a probe needs it
+
+Threads are used instead of asyncio because importing asyncio alone takes
+about 30 ms, a third of the start-up budget. A few blocking sockets on
+threads overlap just as well.
+
+Usage:
+    python fast_probe.py --benchmark    # start-up benchmark against a local server
+"""
+
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+USER_AGENT = "ThoughtPro-FastProbe/1.0"
+
+_ssl_context = None
+_ssl_lock = threading.Lock()
+
+
+def _get_ssl_context():
+    """Build the default TLS context once, on first use
+
+    Loading the system CA store costs tens of milliseconds, so plain-HTTP
+    probes (the local UI) never pay for it.
+    """
+    global _ssl_context
+    with _ssl_lock:
+        if _ssl_context is None:
+            import ssl
+            _ssl_context = ssl.create_default_context()
+        return _ssl_context
+
+
+def probe(method: str, url: str, timeout: float, body: Optional[bytes] = None) -> Dict:
+    """Send one request and return a result dict (status_code 0 on failure)"""
+    from http.client import HTTPConnection, HTTPSConnection
+    from urllib.parse import urlsplit
+
+    start = time.perf_counter()
+    result = {
+        'method': method,
+        'url': url,
+        'status_code': 0,
+        'duration_ms': 0.0,
+        'error': None,
+    }
+    connection = None
+    try:
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        if parts.scheme == "https":
+            connection = HTTPSConnection(parts.hostname, parts.port, timeout=timeout, context=_get_ssl_context())
+        else:
+            connection = HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+
+        headers = {'User-Agent': USER_AGENT, 'Accept': 'application/json', 'Connection': 'close'}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        result['status_code'] = response.status
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    finally:
+        if connection is not None:
+            connection.close()
+        result['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def probe_all(probes: List[Tuple[str, str, str]], deadline: float = 5.0,
+              on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+    """Run (method, url, description) probes concurrently under one deadline
+
+    POST probes send an empty JSON object, like the requests-based checks.
+    ``on_result`` is called from the calling thread as each result arrives.
+    Probes still running at the deadline are reported with error "deadline
+    exceeded"; their threads are daemons and do not delay exit.
+
+    Results are returned in the order of ``probes``.
+    """
+    start = time.perf_counter()
+    end = start + deadline
+    completed: "queue.SimpleQueue" = queue.SimpleQueue()
+
+    def worker(index: int, method: str, url: str):
+        body = b"{}" if method == "POST" else None
+        completed.put((index, probe(method, url, max(end - time.perf_counter(), 0.001), body)))
+
+    for index, (method, url, _description) in enumerate(probes):
+        threading.Thread(target=worker, args=(index, method.upper(), url), daemon=True).start()
+
+    results: List[Optional[Dict]] = [None] * len(probes)
+    pending = len(probes)
+    while pending:
+        remaining = end - time.perf_counter()
+        if remaining <= 0:
+            break
+        try:
+            index, result = completed.get(timeout=remaining)
+        except queue.Empty:
+            break
+        result['description'] = probes[index][2]
+        results[index] = result
+        pending -= 1
+        if on_result:
+            on_result(result)
+
+    for index, (method, url, description) in enumerate(probes):
+        if results[index] is None:
+            results[index] = {
+                'method': method.upper(),
+                'url': url,
+                'description': description,
+                'status_code': 0,
+                'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+                'error': 'deadline exceeded',
+            }
+            if on_result:
+                on_result(results[index])
+    return results
+
+
+# -- start-up benchmark ------------------------------------------------------------
+
+RESULT_PREFIXES = ("✅", "⚠️", "❌")
+
+
+def _start_local_server():
+    """Zero-latency local HTTP server so only client-side start-up is measured"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                self.rfile.read(length)
+            body = b'{"success": true, "data": {}}'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST = _reply
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        # Above the default backlog of 5, so concurrent probes never wait out a SYN retransmit
+        request_queue_size = 128
+        daemon_threads = True
+
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _time_command(command: List[str]) -> Dict:
+    """Wall time from spawning ``command`` to its first result line and to exit"""
+    import os
+    import subprocess
+
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True, encoding='utf-8', env=env)
+    first_result = None
+    for line in process.stdout:
+        if first_result is None and line.lstrip().startswith(RESULT_PREFIXES):
+            first_result = (time.perf_counter() - start) * 1000
+    process.wait()
+    return {
+        'first_result_ms': first_result,
+        'total_ms': (time.perf_counter() - start) * 1000,
+        'returncode': process.returncode,
+    }
+
+
+def run_benchmark(runs: int = 5, budget_ms: float = 100.0) -> bool:
+    """Print start-up timings and return True when the fast path is within budget"""
+    import os
+    import statistics
+
+    from generator_monitor import GeneratorMonitor
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    instant_test = os.path.join(here, 'instant_test.py')
+    server = _start_local_server()
+    local_url = f"http://127.0.0.1:{server.server_address[1]}"
+    python = sys.executable
+
+    cases = [
+        ("interpreter start (python -c pass)", [python, "-c", "pass"]),
+        ("import instant_test + fast_probe", [python, "-c", "import instant_test, fast_probe"]),
+        ("import requests", [python, "-c", "import requests"]),
+        ("instant_test --fast (local server)",
+         [python, instant_test, "--fast", "--api", local_url, "--ui", local_url]),
+        ("instant_test with requests (local server)",
+         [python, instant_test, "--api", local_url, "--ui", local_url]),
+    ]
+
+    print("⏱️  ThoughtPro B2B Fast Probe Start-up Benchmark")
+    print(f"Local server: {local_url} | median of {runs} runs, wall time from process spawn")
+    print(f"\n{'Case':45} {'first result ms':>16} {'total ms':>10}")
+    print("-" * 75)
+
+    timings = {}
+    # The timed commands are our own children: count their CPU as ours, so only
+    # scheduling lag and other processes crowding the machine invalidate a run
+    monitor = GeneratorMonitor(cpu_limit=None, include_children=True).start()
+    try:
+        for name, command in cases:
+            samples = [_time_command(command) for _ in range(runs)]
+            firsts = [s['first_result_ms'] for s in samples if s['first_result_ms'] is not None]
+            first = statistics.median(firsts) if firsts else None
+            total = statistics.median(s['total_ms'] for s in samples)
+            timings[name] = first
+            print(f"{name:45} {'' if first is None else f'{first:.1f}':>16} {total:10.1f}")
+    finally:
+        monitor.stop()
+        server.shutdown()
+
+    verdict = monitor.window()
+    if not verdict["valid"]:
+        print(f"\n⚠️  Timings unreliable - {'; '.join(verdict['reasons'])}")
+
+    fast_first = timings["instant_test --fast (local server)"]
+    within_budget = fast_first is not None and fast_first < budget_ms
+    if within_budget:
+        print(f"\n✅ Time to first result: {fast_first:.1f} ms (< {budget_ms:.0f} ms + network time)")
+    else:
+        print(f"\n❌ Time to first result {fast_first} ms exceeds the {budget_ms:.0f} ms budget")
+    return within_budget
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Standard-library fast probe for the ThoughtPro quick checks")
+    parser.add_argument("--benchmark", action="store_true", help="Measure import and start-up time")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per benchmark case (default 5)")
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="Allowed time to first result, excluding network (default 100)")
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        parser.print_help()
+        return
+    if not run_benchmark(args.runs, args.budget_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
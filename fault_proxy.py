@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Fault-Injection Proxy
+
+A local reverse proxy the testers can point at, in front of the API
+stand-in (api_stand_in.py) or any other plain-HTTP upstream, that degrades
+traffic per route template ("METHOD /template", endpoint_catalog.py):
+
+  * latency - fixed, uniform, normal, lognormal, exponential or Pareto
+    distributed delay before the request is forwarded
+  * bandwidth caps - the response is paced to ``bandwidth_bytes_per_sec``
+  * slow bodies - headers go out at once, the body trickles in
+    ``chunk_bytes`` pieces every ``interval_ms``
+  * connection resets - a share of requests gets a TCP RST instead of a
+    response (a network error for the client)
+  * 5xx errors and bursts - a share of requests is answered by the proxy
+    with ``status``; ``start_s``/``end_s``/``every_s`` on a rule turn it
+    into a burst (active from start_s to end_s after the proxy starts,
+    repeated every every_s)
+
+Every rule whose route pattern (fnmatch, e.g. ``"GET /psychologists*"`` or
+``"*"``) matches a request applies, in scenario order - a global bandwidth cap
+and per-route errors combine. Each rule draws from its own random generator
+seeded from the scenario seed, so a scenario file replays the same faults for
+the same request sequence.
+
+Connections are relayed one-to-one: each client connection gets its own
+upstream connection, requests are parsed only up to the request line and
+Content-Length, and responses are copied as raw bytes. Without an active
+fault a request costs one route lookup (cached per template) and two socket
+hops - well under 100 µs (``--check-overhead`` measures it). Chunked request
+bodies switch that connection to plain pass-through. HTTPS upstreams are not
+supported; point the proxy at a local or plain-HTTP server.
+
+Scenario file:
+    {"seed": 7, "rules": [
+        {"route": "*", "bandwidth_bytes_per_sec": 65536},
+        {"route": "GET /psychologists*", "latency": {"dist": "lognormal", "median_ms": 120, "sigma": 0.6}},
+        {"route": "POST /auth/*", "error_rate": 1.0, "status": 503, "start_s": 10, "end_s": 15, "every_s": 60},
+        {"route": "GET /employee-subscriptions/*", "reset_rate": 0.05},
+        {"route": "GET /companies/*", "slow_body": {"chunk_bytes": 256, "interval_ms": 100}}
+    ]}
+
+Usage:
+    python fault_proxy.py --stand-in --scenario degraded.json [--port 8899]
+    python fault_proxy.py --upstream http://127.0.0.1:8080 --scenario degraded.json
+    python fault_proxy.py --stand-in --check-overhead
+"""
+
+import argparse
+import fnmatch
+import json
+import math
+import random
+import socket
+import statistics
+import struct
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.client import HTTPConnection
+from socketserver import BaseRequestHandler, ThreadingTCPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from endpoint_catalog import template_for
+
+OVERHEAD_BUDGET_US = 100
+RECV_BYTES = 65536
+MAX_HEAD_BYTES = 65536
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential", "pareto")
+RULE_KEYS = {"route", "latency", "bandwidth_bytes_per_sec", "slow_body", "reset_rate", "error_rate", "status",
+             "start_s", "end_s", "every_s"}
+
+_REASONS = {400: "Bad Request", 500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+@dataclass
+class FaultRule:
+    """One scenario entry; see the module docstring for the fields"""
+    route: str = "*"
+    latency: Optional[Dict] = None
+    bandwidth_bytes_per_sec: Optional[float] = None
+    slow_body: Optional[Dict] = None
+    reset_rate: float = 0.0
+    error_rate: float = 0.0
+    status: int = 503
+    start_s: Optional[float] = None
+    end_s: Optional[float] = None
+    every_s: Optional[float] = None
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict, seed: int) -> "FaultRule":
+        unknown = set(data) - RULE_KEYS
+        if unknown:
+            raise ValueError(f"unknown fault rule field(s): {', '.join(sorted(unknown))}")
+        rule = cls(**data, rng=random.Random(seed))
+        if rule.latency is not None and rule.latency.get("dist", "fixed") not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"unknown latency distribution {rule.latency['dist']!r} "
+                             f"(one of {', '.join(LATENCY_DISTRIBUTIONS)})")
+        return rule
+
+    def active(self, elapsed_s: float) -> bool:
+        if self.start_s is None and self.end_s is None:
+            return True
+        if self.every_s:
+            elapsed_s %= self.every_s
+        return (self.start_s or 0) <= elapsed_s < (self.end_s if self.end_s is not None else math.inf)
+
+    def delay_s(self) -> float:
+        spec = self.latency
+        if not spec:
+            return 0.0
+        dist, rng = spec.get("dist", "fixed"), self.rng
+        if dist == "fixed":
+            ms = spec.get("ms", 0)
+        elif dist == "uniform":
+            ms = rng.uniform(spec["min_ms"], spec["max_ms"])
+        elif dist == "normal":
+            ms = rng.gauss(spec["mean_ms"], spec.get("stddev_ms", 0))
+        elif dist == "lognormal":
+            ms = spec["median_ms"] * math.exp(rng.gauss(0, spec.get("sigma", 0.5)))
+        elif dist == "exponential":
+            ms = rng.expovariate(1 / spec["mean_ms"])
+        else:
+            ms = spec["min_ms"] * rng.paretovariate(spec.get("alpha", 1.5))
+        return max(ms, 0) / 1000
+
+    def shapes_response(self) -> bool:
+        return bool(self.bandwidth_bytes_per_sec or self.slow_body)
+
+
+@dataclass
+class FaultScenario:
+    rules: List[FaultRule] = field(default_factory=list)
+    seed: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FaultScenario":
+        seed = int(data.get("seed", 0))
+        return cls([FaultRule.from_dict(rule, seed * 1000 + i) for i, rule in enumerate(data.get("rules", []))],
+                   seed)
+
+    @classmethod
+    def load(cls, path: str) -> "FaultScenario":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+@dataclass
+class _Shaping:
+    """Response pacing for the request in flight on a connection"""
+    bandwidth: Optional[float] = None
+    chunk_bytes: int = 0
+    interval_s: float = 0.0
+
+
+class _ProxyServer(ThreadingTCPServer):
+    # Fixed --port restarts without waiting out TIME_WAIT, and a backlog that holds
+    # the connection burst of a 256-way capacity run (the default of 5 drops SYNs)
+    allow_reuse_address = True
+    daemon_threads = True
+    request_queue_size = 512
+
+
+def _error_response(status: int, error: str) -> bytes:
+    body = json.dumps({"success": False, "error": error}).encode("utf-8")
+    return (f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, int, bool]:
+    """(method, path, content length, chunked) of a request head; ValueError on a bad Content-Length"""
+    lines = head.split(b"\r\n")
+    method, _, rest = lines[0].decode("latin-1").partition(" ")
+    target = rest.rpartition(" ")[0] or rest
+    length, chunked = 0, False
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-length":
+            length = int(value.strip() or 0)
+            if length < 0:
+                raise ValueError(f"negative Content-Length {length}")
+        elif name == b"transfer-encoding" and b"chunked" in value.lower():
+            chunked = True
+    return method, target, length, chunked
+
+
+class FaultProxy:
+    """Fault-injecting reverse proxy on a background thread
+
+    ``injected`` counts faults per ``(route, kind)``, ``requests`` requests
+    per route.
+    """
+
+    def __init__(self, upstream: str, scenario: Optional[FaultScenario] = None, host: str = "127.0.0.1",
+                 port: int = 0):
+        parts = urlsplit(upstream)
+        if parts.scheme not in ("http", ""):
+            raise ValueError(f"only plain-HTTP upstreams are supported, got {upstream}")
+        self.upstream = (parts.hostname or "127.0.0.1", parts.port or 80)
+        self.scenario = scenario or FaultScenario()
+        self.requests: Counter = Counter()
+        self.injected: Counter = Counter()
+        self.started = time.monotonic()
+        self._rules_by_route: Dict[str, List[FaultRule]] = {}
+        self._lock = threading.Lock()
+        proxy = self
+
+        class Handler(BaseRequestHandler):
+            def handle(self):
+                proxy._relay(self.request)
+
+        self.server = _ProxyServer((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rules_for(self, route: str) -> List[FaultRule]:
+        rules = self._rules_by_route.get(route)
+        if rules is None:
+            rules = self._rules_by_route[route] = [rule for rule in self.scenario.rules
+                                                   if fnmatch.fnmatchcase(route, rule.route)]
+        return rules
+
+    # --- relaying ------------------------------------------------------------
+
+    def _relay(self, client: socket.socket):
+        try:
+            upstream = socket.create_connection(self.upstream)
+        except OSError as exc:
+            self._answer_and_close(client, 502, f"upstream {self.upstream[0]}:{self.upstream[1]} unreachable: {exc}")
+            return
+        for sock in (client, upstream):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        shaping: List[Optional[_Shaping]] = [None]
+        pump = threading.Thread(target=self._pump_responses, args=(upstream, client, shaping), daemon=True)
+        pump.start()
+        try:
+            self._pump_requests(client, upstream, shaping)
+        except OSError:
+            pass
+        finally:
+            for sock in (upstream, client):
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _answer_and_close(client: socket.socket, status: int, error: str):
+        """Send an error response, then drain the client so close() does not reset it first"""
+        try:
+            client.sendall(_error_response(status, error))
+            client.shutdown(socket.SHUT_WR)
+            client.settimeout(1.0)
+            while client.recv(RECV_BYTES):
+                pass
+        except OSError:
+            pass
+        finally:
+            client.close()
+
+    def _pump_requests(self, client: socket.socket, upstream: socket.socket, shaping: List):
+        buffer = b""
+        while True:
+            end = buffer.find(b"\r\n\r\n")
+            while end < 0:
+                data = client.recv(RECV_BYTES)
+                if not data:
+                    return
+                buffer += data
+                end = buffer.find(b"\r\n\r\n")
+                if end < 0 and len(buffer) > MAX_HEAD_BYTES:
+                    return
+            try:
+                method, target, length, chunked = _parse_head(buffer[:end])
+            except ValueError as exc:
+                self._answer_and_close(client, 400, str(exc))
+                return
+            total = end + 4 + length
+            while len(buffer) < total:
+                data = client.recv(RECV_BYTES)
+                if not data:
+                    return
+                buffer += data
+            request, buffer = buffer[:total], buffer[total:]
+
+            route = f"{method} {template_for(method, target)}"
+            with self._lock:
+                self.requests[route] += 1
+            rules = self.rules_for(route)
+            if rules:
+                elapsed = time.monotonic() - self.started
+                rules = [rule for rule in rules if rule.active(elapsed)]
+            if not rules:
+                shaping[0] = None
+                upstream.sendall(request)
+            else:
+                action = self._inject(client, route, rules, shaping)
+                if action == "reset":
+                    return
+                if action is None:
+                    upstream.sendall(request)
+
+            if chunked:
+                # Body framing is not parsed - the rest of the connection is passed through
+                if buffer:
+                    upstream.sendall(buffer)
+                while True:
+                    data = client.recv(RECV_BYTES)
+                    if not data:
+                        return
+                    upstream.sendall(data)
+
+    def _inject(self, client: socket.socket, route: str, rules: List[FaultRule], shaping: List) -> Optional[str]:
+        """Apply the active rules to one request
+
+        Returns None to forward it, "answered" when the proxy sent an error
+        response itself, or "reset" when the connection was reset.
+        """
+        delay = sum(rule.delay_s() for rule in rules)
+        if delay:
+            self._count(route, "latency")
+            time.sleep(delay)
+        for rule in rules:
+            if rule.reset_rate and rule.rng.random() < rule.reset_rate:
+                self._count(route, "reset")
+                # SO_LINGER 0: close() sends RST instead of FIN
+                client.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+                return "reset"
+            if rule.error_rate and rule.rng.random() < rule.error_rate:
+                self._count(route, f"status {rule.status}")
+                client.sendall(_error_response(rule.status, f"injected fault ({rule.status})"))
+                return "answered"
+        shaped = [rule for rule in rules if rule.shapes_response()]
+        if shaped:
+            pacing = _Shaping()
+            for rule in shaped:
+                if rule.bandwidth_bytes_per_sec:
+                    pacing.bandwidth = min(pacing.bandwidth or math.inf, rule.bandwidth_bytes_per_sec)
+                    self._count(route, "bandwidth")
+                if rule.slow_body and not pacing.chunk_bytes:
+                    pacing.chunk_bytes = int(rule.slow_body.get("chunk_bytes", 64))
+                    pacing.interval_s = rule.slow_body.get("interval_ms", 100) / 1000
+                    self._count(route, "slow_body")
+            shaping[0] = pacing
+        else:
+            shaping[0] = None
+        return None
+
+    def _pump_responses(self, upstream: socket.socket, client: socket.socket, shaping: List):
+        """Upstream to client; no pipelining, so bytes belong to the last forwarded request"""
+        try:
+            while True:
+                data = upstream.recv(RECV_BYTES)
+                if not data:
+                    break
+                pacing = shaping[0]
+                if pacing is None:
+                    client.sendall(data)
+                else:
+                    self._send_paced(client, data, pacing)
+        except OSError:
+            pass
+        finally:
+            try:
+                client.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _send_paced(client: socket.socket, data: bytes, pacing: _Shaping):
+        if pacing.chunk_bytes:
+            # Slow body: the head at once, then the body in small timed pieces
+            end = data.find(b"\r\n\r\n")
+            if end >= 0:
+                client.sendall(data[:end + 4])
+                data = data[end + 4:]
+            for i in range(0, len(data), pacing.chunk_bytes):
+                time.sleep(pacing.interval_s)
+                client.sendall(data[i:i + pacing.chunk_bytes])
+            return
+        # Bandwidth cap: pieces of 1/50 s worth of bytes, each sent no earlier than the cap allows
+        piece = max(int(pacing.bandwidth / 50), 1)
+        started = time.monotonic()
+        for i in range(0, len(data), piece):
+            chunk = data[i:i + piece]
+            client.sendall(chunk)
+            wait = started + (i + len(chunk)) / pacing.bandwidth - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+    def _count(self, route: str, kind: str):
+        with self._lock:
+            self.injected[(route, kind)] += 1
+
+    # --- lifecycle -----------------------------------------------------------
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self.injected.clear()
+            self.started = time.monotonic()
+
+    def start(self) -> "FaultProxy":
+        self.started = time.monotonic()
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fault-proxy", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def measure_overhead(upstream_url: str, requests: int = 2000, path: str = "/api/v1/psychologists") -> Dict:
+    """Median and p95 added latency of the proxy with no fault active (keep-alive GETs)"""
+    with FaultProxy(upstream_url) as proxy:
+        samples: Dict[str, List[float]] = {"direct": [], "proxied": []}
+        connections = {name: HTTPConnection(urlsplit(url).netloc)
+                       for name, url in (("direct", upstream_url), ("proxied", proxy.url))}
+        for i in range(requests + 100):
+            # Alternate so both paths see the same machine conditions; the first 100 warm up
+            for name, connection in connections.items():
+                started = time.perf_counter()
+                connection.request("GET", path)
+                connection.getresponse().read()
+                if i >= 100:
+                    samples[name].append((time.perf_counter() - started) * 1e6)
+        for connection in connections.values():
+            connection.close()
+    direct, proxied = (sorted(samples[name]) for name in ("direct", "proxied"))
+    p95 = lambda values: values[int(0.95 * (len(values) - 1))]
+    return {
+        "requests": requests,
+        "direct_p50_us": round(statistics.median(direct), 1),
+        "proxied_p50_us": round(statistics.median(proxied), 1),
+        "overhead_p50_us": round(statistics.median(proxied) - statistics.median(direct), 1),
+        "overhead_p95_us": round(p95(proxied) - p95(direct), 1),
+    }
+
+
+def print_injected(proxy: FaultProxy):
+    print(f"\n📊 {sum(proxy.requests.values())} request(s) through the proxy")
+    for route, count in proxy.requests.most_common():
+        faults = ", ".join(f"{kind} x{n}" for (r, kind), n in sorted(proxy.injected.items()) if r == route)
+        print(f"   {route:60} {count:>6}  {faults or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fault-injecting reverse proxy for the API testers")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--upstream", help="Plain-HTTP upstream base URL, e.g. http://127.0.0.1:8080")
+    source.add_argument("--stand-in", action="store_true", help="Start an api_stand_in server as the upstream")
+    parser.add_argument("--scenario", help="Scenario file (JSON, see the module docstring)")
+    parser.add_argument("--host", default="127.0.0.1", help="Listen address (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8899, help="Listen port (default 8899)")
+    parser.add_argument("--check-overhead", type=int, nargs="?", const=2000, metavar="REQUESTS",
+                        help="Measure the no-fault overhead against the upstream and exit (default 2000 requests)")
+    args = parser.parse_args()
+
+    stand_in = None
+    upstream = args.upstream
+    if args.stand_in:
+        from api_stand_in import StandInServer
+        stand_in = StandInServer().start()
+        upstream = stand_in.url
+        print(f"🧪 Stand-in upstream at {upstream}")
+
+    try:
+        if args.check_overhead:
+            result = measure_overhead(upstream, args.check_overhead)
+            verdict = "✅" if result["overhead_p50_us"] < OVERHEAD_BUDGET_US else "❌"
+            print(f"{verdict} Proxy overhead: {result['overhead_p50_us']} µs median, {result['overhead_p95_us']} µs p95 "
+                  f"(direct {result['direct_p50_us']} µs, proxied {result['proxied_p50_us']} µs, "
+                  f"{result['requests']} requests; budget {OVERHEAD_BUDGET_US} µs)")
+            return
+
+        scenario = FaultScenario.load(args.scenario) if args.scenario else FaultScenario()
+        proxy = FaultProxy(upstream, scenario, args.host, args.port).start()
+        print(f"🌩️  Fault proxy on {proxy.url} -> {upstream} ({len(scenario.rules)} rule(s), seed {scenario.seed})")
+        print(f"   Point the testers at {proxy.url}/api/v1; Ctrl+C stops")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        proxy.stop()
+        print_injected(proxy)
+    finally:
+        if stand_in:
+            stand_in.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Load-Generator Monitor
+
+A measured latency only describes the API if the client sending the
+requests kept up. ``GeneratorMonitor`` samples the generator process itself
+on a background thread at a fixed interval:
+
+  * process CPU, in cores (CPU seconds per wall second, all threads; with
+    ``include_children`` also finished child processes, for generators that
+    spawn commands)
+  * machine CPU busy share, and how much of it other processes used
+  * scheduling lag - how late the monitor thread wakes up. With many busy
+    threads waiting on the GIL this is the thread-pool equivalent of
+    event-loop lag: every worker waits about as long for its turn, and
+    that wait ends up in the measured latencies
+  * live threads, open sockets and resident memory (RSS)
+  * any extra gauges the caller registers (e.g. requests in flight)
+
+``window(start, end)`` summarises the samples of one phase (a load step, a
+benchmark case) and marks it invalid when the generator was saturated:
+
+  * process CPU at or above ``cpu_limit`` cores. Python threads run one at
+    a time, so about one core is the ceiling of a single generator process
+  * p95 scheduling lag above ``lag_limit_ms``
+  * the machine at or above ``system_cpu_limit`` busy, with at least half a
+    core used by other processes (a noisy neighbour)
+
+Machine CPU, sockets and RSS come from /proc and are None where it is not
+available; CPU time and lag work everywhere.
+
+Usage:
+    monitor = GeneratorMonitor().start()
+    start = monitor.now()
+    ...                                   # generate load
+    verdict = monitor.window(start, monitor.now())   # {'valid': ..., 'reasons': [...], ...}
+    monitor.stop()
+"""
+
+import os
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_INTERVAL = 0.1
+DEFAULT_CPU_LIMIT = 0.9
+DEFAULT_LAG_LIMIT_MS = 20.0
+DEFAULT_SYSTEM_CPU_LIMIT = 0.95
+NOISY_NEIGHBOUR_CORES = 0.5
+
+_PROC = os.path.isdir("/proc/self")
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+@dataclass
+class MonitorSample:
+    t: float                       # seconds since the monitor started
+    cpu_cores: float               # process CPU seconds per wall second
+    system_cpu: Optional[float]    # machine busy share, 0-1
+    other_cores: Optional[float]   # cores busy in other processes
+    lag_ms: float                  # monitor wake-up lateness
+    threads: int
+    sockets: Optional[int]
+    rss_mb: Optional[float]
+    gauges: Dict[str, float] = field(default_factory=dict)
+
+
+def _system_cpu_times() -> Optional[Tuple[float, float]]:
+    """(busy, total) jiffies from /proc/stat"""
+    if not _PROC:
+        return None
+    try:
+        with open("/proc/stat", "r") as f:
+            values = [float(v) for v in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    idle = values[3] + (values[4] if len(values) > 4 else 0)
+    total = sum(values[:8])
+    return total - idle, total
+
+
+def _open_sockets() -> Optional[int]:
+    if not _PROC:
+        return None
+    count = 0
+    try:
+        for fd in os.listdir("/proc/self/fd"):
+            try:
+                if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                    count += 1
+            except OSError:
+                continue
+    except OSError:
+        return None
+    return count
+
+
+def _rss_mb() -> Optional[float]:
+    if _PROC:
+        try:
+            with open("/proc/self/statm", "r") as f:
+                return int(f.read().split()[1]) * _PAGE_SIZE / 1e6
+        except (OSError, ValueError, IndexError):
+            pass
+    return None
+
+
+class GeneratorMonitor:
+    """Background sampler of the generator's own resource use"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, cpu_limit: Optional[float] = DEFAULT_CPU_LIMIT,
+                 lag_limit_ms: Optional[float] = DEFAULT_LAG_LIMIT_MS,
+                 system_cpu_limit: Optional[float] = DEFAULT_SYSTEM_CPU_LIMIT,
+                 gauges: Optional[Dict[str, Callable[[], float]]] = None, include_children: bool = False):
+        self.interval = interval
+        self.cpu_limit = cpu_limit
+        self.lag_limit_ms = lag_limit_ms
+        self.system_cpu_limit = system_cpu_limit
+        self.gauges = dict(gauges or {})
+        self.include_children = include_children
+        self.samples: List[MonitorSample] = []
+        self.cpu_count = os.cpu_count() or 1
+        self._started = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def now(self) -> float:
+        """Monitor time (seconds since start) for window boundaries"""
+        return time.perf_counter() - self._started
+
+    def start(self) -> "GeneratorMonitor":
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="generator-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _cpu(self) -> float:
+        if not self.include_children:
+            return time.process_time()
+        times = os.times()
+        return time.process_time() + times.children_user + times.children_system
+
+    def _run(self):
+        last_wall, last_cpu = time.perf_counter(), self._cpu()
+        last_system = _system_cpu_times()
+        due = last_wall + self.interval
+        while not self._stop.wait(max(due - time.perf_counter(), 0)):
+            wall, cpu = time.perf_counter(), self._cpu()
+            lag_ms = max(wall - due, 0.0) * 1000
+            cpu_cores = (cpu - last_cpu) / (wall - last_wall) if wall > last_wall else 0.0
+
+            system_cpu = other_cores = None
+            system = _system_cpu_times()
+            if system and last_system and system[1] > last_system[1]:
+                system_cpu = (system[0] - last_system[0]) / (system[1] - last_system[1])
+                other_cores = max(system_cpu * self.cpu_count - cpu_cores, 0.0)
+
+            rss = _rss_mb()
+            gauges = {}
+            for name, gauge in self.gauges.items():
+                try:
+                    gauges[name] = float(gauge())
+                except Exception:
+                    continue
+            self.samples.append(MonitorSample(
+                t=round(wall - self._started, 3),
+                cpu_cores=round(cpu_cores, 3),
+                system_cpu=round(system_cpu, 3) if system_cpu is not None else None,
+                other_cores=round(other_cores, 3) if other_cores is not None else None,
+                lag_ms=round(lag_ms, 2),
+                threads=threading.active_count(),
+                sockets=_open_sockets(),
+                rss_mb=round(rss, 1) if rss is not None else None,
+                gauges=gauges,
+            ))
+            last_wall, last_cpu, last_system = wall, cpu, system
+            due += self.interval
+            if due <= wall:
+                due = wall + self.interval
+
+    def _between(self, start: float, end: Optional[float]) -> List[MonitorSample]:
+        """Samples whose interval is centred between ``start`` and ``end``"""
+        end = self.now() if end is None else end
+        return [s for s in self.samples if start <= s.t - self.interval / 2 <= end]
+
+    def window(self, start: float = 0.0, end: Optional[float] = None) -> Dict:
+        """Summary and validity verdict for the samples taken between ``start`` and ``end``"""
+        samples = self._between(start, end)
+        if not samples:
+            return {"samples": 0, "valid": True, "reasons": []}
+
+        def mean(values: List[float]) -> Optional[float]:
+            values = [v for v in values if v is not None]
+            return round(statistics.mean(values), 3) if values else None
+
+        def peak(values: List[float]) -> Optional[float]:
+            values = [v for v in values if v is not None]
+            return max(values) if values else None
+
+        lags = sorted(s.lag_ms for s in samples)
+        lag_p95 = lags[min(len(lags) - 1, int(0.95 * len(lags)))]
+        summary = {
+            "samples": len(samples),
+            "cpu_cores_mean": mean([s.cpu_cores for s in samples]),
+            "cpu_cores_max": peak([s.cpu_cores for s in samples]),
+            "system_cpu_mean": mean([s.system_cpu for s in samples]),
+            "other_cores_mean": mean([s.other_cores for s in samples]),
+            "lag_p95_ms": lag_p95,
+            "lag_max_ms": lags[-1],
+            "threads_max": peak([s.threads for s in samples]),
+            "sockets_max": peak([s.sockets for s in samples]),
+            "rss_mb_max": peak([s.rss_mb for s in samples]),
+        }
+        for name in self.gauges:
+            summary[f"{name}_max"] = peak([s.gauges.get(name) for s in samples])
+
+        reasons = []
+        if self.cpu_limit is not None and summary["cpu_cores_mean"] >= self.cpu_limit:
+            reasons.append(f"generator CPU {summary['cpu_cores_mean']:.2f} cores >= {self.cpu_limit:.2f}")
+        if self.lag_limit_ms is not None and lag_p95 > self.lag_limit_ms:
+            reasons.append(f"scheduling lag p95 {lag_p95:.1f}ms > {self.lag_limit_ms:.0f}ms")
+        if (self.system_cpu_limit is not None and summary["system_cpu_mean"] is not None
+                and summary["system_cpu_mean"] >= self.system_cpu_limit
+                and (summary["other_cores_mean"] or 0) >= NOISY_NEIGHBOUR_CORES):
+            reasons.append(f"machine CPU {summary['system_cpu_mean']:.0%} busy, "
+                           f"{summary['other_cores_mean']:.1f} cores used by other processes")
+        summary["valid"] = not reasons
+        summary["reasons"] = reasons
+        return summary
+
+    def summary(self, start: float = 0.0, end: Optional[float] = None) -> Dict:
+        """Window summary plus the limits and raw samples, for reports"""
+        return {
+            "interval_s": self.interval,
+            "limits": {"cpu_cores": self.cpu_limit, "lag_ms": self.lag_limit_ms,
+                       "system_cpu": self.system_cpu_limit},
+            "cpu_count": self.cpu_count,
+            **self.window(start, end),
+            "timeline": [asdict(s) for s in self._between(start, end)],
+        }
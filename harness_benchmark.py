@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Test Harness Micro-Benchmark
+
+Measures how much of a reported ``duration_ms`` is the harness itself. The
+testers run against the in-process zero-latency stand-in (api_stand_in.py),
+so everything measured here is client-side overhead:
+
+  * end-to-end paths: ProductionAPITester.make_request,
+    ThoughtProAPITester.test_endpoint, simple_api_tester.make_api_request
+  * their components: header dict copies, json.dumps(indent=2), the
+    console print block, logging through two handlers, schema validation,
+    queueing a line on the log pipeline (log_pipeline.py)
+  * the transport floor: a bare ``session.get`` through the stand-in
+
+Console output goes to os.devnull and logging to a temporary file so the
+cost of formatting and writing is measured without a terminal in the loop.
+
+Results are reported as CPU and wall microseconds per call plus requests
+per second per CPU core. ``--save-baseline`` stores them; later runs compare
+against the baseline and exit 1 when a path got slower than the tolerance.
+A generator_monitor.GeneratorMonitor samples the benchmark process while it
+runs; a case measured while other processes crowded the machine or the
+process could not get scheduled on time is marked invalid and left out of
+the baseline comparison. The CPU limit is off here - a micro-benchmark is
+meant to keep one core busy.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import requests
+
+from api_stand_in import StandInAdapter, intercept_requests
+from generator_monitor import GeneratorMonitor
+from log_pipeline import LogPipeline
+from response_schemas import ResponseValidator
+
+BASELINE_FILE = "harness_benchmark_baseline.json"
+BASE_URL = "https://stand-in.local/api/v1"
+
+SAMPLE_RESPONSE = {
+    "success": True,
+    "message": "Employee Subscription Service Status",
+    "data": {
+        "isInitialized": False,
+        "packageName": "Missing",
+        "serviceAccountKey": "Missing",
+        "status": "Not configured",
+        "timestamp": "2025-10-20T17:28:20.000Z"
+    }
+}
+
+
+def measure(func: Callable[[], None], iterations: int, repeats: int, reset: Callable[[], None] = None,
+            floor: Callable[[], None] = None) -> Dict:
+    """Median CPU and wall time per call over ``repeats`` batches
+
+    With ``floor`` (the bare transport call the path wraps), a floor batch
+    runs right before every path batch and the per-batch difference gives the
+    harness overhead. Pairing the batches cancels most of the drift in
+    requests' own cost (proxy environment scans, allocator state).
+    """
+    for _ in range(min(iterations, 200)):
+        func()
+        if floor:
+            floor()
+    cpu_samples, wall_samples, overhead_samples = [], [], []
+    for _ in range(repeats):
+        if floor:
+            cpu_start = time.process_time()
+            for _ in range(iterations):
+                floor()
+            floor_cpu = (time.process_time() - cpu_start) / iterations * 1e6
+        if reset:
+            reset()
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        for _ in range(iterations):
+            func()
+        cpu_samples.append((time.process_time() - cpu_start) / iterations * 1e6)
+        wall_samples.append((time.perf_counter() - wall_start) / iterations * 1e6)
+        if floor:
+            overhead_samples.append(cpu_samples[-1] - floor_cpu)
+    cpu_us = statistics.median(cpu_samples)
+    result = {
+        "cpu_us": round(cpu_us, 2),
+        "wall_us": round(statistics.median(wall_samples), 2),
+        "requests_per_sec_per_core": round(1e6 / cpu_us, 1) if cpu_us > 0 else None,
+    }
+    if floor:
+        result["overhead_over_transport_us"] = round(statistics.median(overhead_samples), 2)
+    return result
+
+
+@contextlib.contextmanager
+def quiet_harness(log_file: str):
+    """Send print() to os.devnull and logging through a file + devnull stream handler
+
+    Keeps the two-handler shape the integration suite uses, without writing
+    to the terminal or to api_test_results.log.
+    """
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    file_handler = logging.FileHandler(log_file, encoding="utf-8")
+    stream_handler = logging.StreamHandler(devnull)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    root.handlers = [file_handler, stream_handler]
+    root.setLevel(logging.INFO)
+    try:
+        with contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        root.handlers = saved_handlers
+        root.setLevel(saved_level)
+        file_handler.close()
+        devnull.close()
+
+
+def clear_results(tester) -> Callable[[], None]:
+    """Reset for a ProductionAPITester case - the result dicts and the result store"""
+    def reset():
+        tester.results.clear()
+        tester.store.clear()
+    return reset
+
+
+def build_cases() -> List[Tuple[str, str, Callable[[], None], Callable[[], None], Callable[[], None]]]:
+    """(name, kind, func, reset, floor)
+
+    kind is "floor" for bare transport calls, "path" for end-to-end tester
+    calls (paired with the floor they wrap) and "component" otherwise.
+    """
+    from api_endpoint_tester import ProductionAPITester
+    from test_api_ui_integration import ThoughtProAPITester
+    import simple_api_tester
+
+    cases = []
+
+    # Transport floors - what requests + the stand-in cost on their own
+    url = f"{BASE_URL}/employee-subscriptions/status"
+    session = requests.Session()
+    session.headers.update({'Content-Type': 'application/json', 'Accept': 'application/json'})
+    session_get = lambda: session.get(url, timeout=30)
+    session_post = lambda: session.post(f"{BASE_URL}/bookings", json={"psychologist_id": "p-1"}, timeout=30)
+    module_get = lambda: requests.get(url, timeout=10)
+    cases.append(("transport.session_get", "floor", session_get, None, None))
+    cases.append(("transport.requests_get", "floor", module_get, None, None))
+
+    production = ProductionAPITester(BASE_URL)
+    cases.append(("production.make_request GET", "path",
+                  lambda: production.make_request('GET', '/employee-subscriptions/status'),
+                  clear_results(production), session_get))
+    cases.append(("production.make_request POST", "path",
+                  lambda: production.make_request('POST', '/bookings', {"psychologist_id": "p-1"}, auth_required=True),
+                  clear_results(production), session_post))
+
+    thoughtpro = ThoughtProAPITester(BASE_URL)
+    thoughtpro.setup_session()
+    cases.append(("thoughtpro.test_endpoint GET", "path",
+                  lambda: thoughtpro.test_endpoint('GET', '/employee-subscriptions/status', 'Benchmark'),
+                  thoughtpro.test_results.clear, session_get))
+
+    def simple_round_trip():
+        result = simple_api_tester.make_api_request('GET', url)
+        simple_api_tester.print_result("Benchmark", 'GET', url, result)
+
+    cases.append(("simple.make_api_request+print_result", "path", simple_round_trip, None, module_get))
+
+    # Components of the paths above
+    def headers_copy():
+        request_headers = production.session.headers.copy()
+        request_headers.update({'X-Bench': '1'})
+
+    cases.append(("component.headers_copy", "component", headers_copy, None, None))
+    cases.append(("component.json_dumps_indent2", "component",
+                  lambda: json.dumps(SAMPLE_RESPONSE, indent=2)[:200], None, None))
+
+    def print_block():
+        print("✅ GET /employee-subscriptions/status")
+        print("   Status: 200 | Duration: 31.17ms")
+        print(f"   Response: {json.dumps(SAMPLE_RESPONSE, indent=2)[:200]}...")
+        print("-" * 80)
+
+    cases.append(("component.print_block", "component", print_block, None, None))
+
+    bench_logger = logging.getLogger("harness_benchmark")
+    cases.append(("component.logging_two_handlers", "component",
+                  lambda: bench_logger.info("[PASS] - Success - OK (0.031s)"), None, None))
+
+    validator = ResponseValidator()
+    cases.append(("component.schema_validation", "component",
+                  lambda: validator.validate('GET', '/employee-subscriptions/status', 200, SAMPLE_RESPONSE), None, None))
+
+    cases.append(("component.production.log_result", "component",
+                  lambda: production.log_result('GET', '/employee-subscriptions/status', 200, SAMPLE_RESPONSE, 0.03),
+                  clear_results(production), None))
+
+    quiet_production = ProductionAPITester(BASE_URL, quiet=True)
+    cases.append(("component.production.log_result quiet", "component",
+                  lambda: quiet_production.log_result('GET', '/employee-subscriptions/status', 200, SAMPLE_RESPONSE, 0.03),
+                  clear_results(quiet_production), None))
+
+    pipeline = LogPipeline()
+    cases.append(("component.pipeline_console", "component",
+                  lambda: pipeline.console("✅ GET /employee-subscriptions/status"), pipeline.flush, None))
+    return cases
+
+
+def run_benchmarks(iterations: int = 2000, repeats: int = 5) -> Dict:
+    """Run every case against the stand-in and return the results"""
+    results: Dict[str, Dict] = {}
+    fd, log_file = tempfile.mkstemp(suffix=".log", prefix="harness_bench_")
+    os.close(fd)
+    adapter = StandInAdapter()
+    monitor = GeneratorMonitor(cpu_limit=None)
+    try:
+        with monitor, intercept_requests(adapter), quiet_harness(log_file):
+            cases = build_cases()
+            for name, kind, func, reset, floor in cases:
+                start = monitor.now()
+                result = measure(func, iterations, repeats, reset, floor)
+                result["kind"] = kind
+                window = monitor.window(start, monitor.now())
+                result["valid"] = window["valid"]
+                result["invalid_reasons"] = window["reasons"]
+                results[name] = result
+    finally:
+        os.remove(log_file)
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "iterations": iterations,
+        "repeats": repeats,
+        "stand_in_requests": adapter.request_count,
+        "generator": monitor.summary(),
+        "results": results,
+    }
+
+
+def compare_to_baseline(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Names of paths whose CPU time per call grew beyond ``tolerance``"""
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference or not reference.get("cpu_us"):
+            continue
+        if not result.get("valid", True) or not reference.get("valid", True):
+            continue   # measured on a saturated machine
+        change = (result["cpu_us"] - reference["cpu_us"]) / reference["cpu_us"]
+        result["baseline_cpu_us"] = reference["cpu_us"]
+        result["change_pct"] = round(change * 100, 1)
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def print_results(report: Dict, regressions: List[str]):
+    print(f"\n{'Code path':42} {'CPU µs':>10} {'Wall µs':>10} {'req/s/core':>12} {'overhead µs':>12} {'vs base':>9}")
+    print("-" * 100)
+    for name, result in report["results"].items():
+        overhead = result.get("overhead_over_transport_us")
+        change = result.get("change_pct")
+        flag = " ❌" if name in regressions else ""
+        if not result.get("valid", True):
+            flag += " ⚠️"
+        print(f"{name:42} {result['cpu_us']:10.2f} {result['wall_us']:10.2f} "
+              f"{result['requests_per_sec_per_core'] or 0:12.1f} "
+              f"{'' if overhead is None else f'{overhead:.2f}':>12} "
+              f"{'' if change is None else f'{change:+.1f}%':>9}{flag}")
+
+    invalid = {name: r["invalid_reasons"] for name, r in report["results"].items() if not r.get("valid", True)}
+    if invalid:
+        print(f"\n⚠️  {len(invalid)} case(s) measured while the machine was saturated - not compared:")
+        for name, reasons in invalid.items():
+            print(f"   {name}: {'; '.join(reasons)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-request overhead of the ThoughtPro test harness")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per batch (default 2000)")
+    parser.add_argument("--repeats", type=int, default=5, help="Batches per case; the median is reported (default 5)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help=f"Baseline file (default {BASELINE_FILE})")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed CPU-time growth before a path counts as regressed (default 0.25)")
+    parser.add_argument("--json", dest="json_file", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    print("⏱️  ThoughtPro B2B Harness Micro-Benchmark")
+    print(f"Stand-in: in-process, zero latency | {args.repeats} x {args.iterations} calls per case")
+
+    report = run_benchmarks(args.iterations, args.repeats)
+
+    regressions: List[str] = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("machine") != report["machine"]:
+            print("⚠️  Baseline was recorded on a different machine/interpreter - comparison is indicative only")
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+
+    print_results(report, regressions)
+
+    if args.json_file:
+        with open(args.json_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results saved to: {args.json_file}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline saved to: {args.baseline}")
+    elif regressions:
+        print(f"\n❌ {len(regressions)} harness path(s) slower than baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
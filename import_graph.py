@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Import Graph and Code-Splitting Report
+
+Builds the ES import graph of src/ (components, services, contexts, hooks,
+utils, styles). Every route declared in src/App.jsx is then mapped to the
+modules it actually needs:
+
+  * shell    - reachable from src/index.js without entering a page component
+  * route    - shell plus everything reachable from the route's page components
+  * deferred - what a route ships today but does not need, i.e. the bytes
+               that ``React.lazy`` split points would keep off its first load
+
+Split points (the page components App.jsx imports eagerly) are ranked by the
+bytes that only they pull in. Dynamic ``import()`` edges are already lazy
+and are not followed when computing what a route ships.
+
+Sizes are source bytes of the files in src/. npm packages are listed by
+name; their size is not known without node_modules or a source map (see
+bundle_analyzer.py).
+
+Parsed imports are cached per file (keyed by mtime and size), so re-runs only
+re-parse changed files.
+
+Usage:
+    python import_graph.py [--src src] [--json report.json]
+"""
+
+import argparse
+import json
+import os
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+CACHE_FILE = ".import_graph_cache.json"
+CACHE_VERSION = 1
+
+EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".json", ".css")
+SKIP_DIRS = {"build", "node_modules", "__tests__"}
+
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_LINE_COMMENT_RE = re.compile(r"(^|\s)//.*$", re.M)
+_STATIC_IMPORT_RE = re.compile(r"""\b(?:import|export)\s+(?:[\w*{}\s,$]+?\s+from\s+)?['"]([^'"]+)['"]""")
+_DYNAMIC_IMPORT_RE = re.compile(r"""\bimport\(\s*['"]([^'"]+)['"]\s*\)""")
+_REQUIRE_RE = re.compile(r"""\brequire\(\s*['"]([^'"]+)['"]\s*\)""")
+_DEFAULT_IMPORT_RE = re.compile(r"""^\s*import\s+(\w+)\s*(?:,\s*\{[^}]*\})?\s+from\s+['"]([^'"]+)['"]""", re.M)
+_ROUTE_RE = re.compile(r"""<Route\s+path=["']([^"']+)["']\s+element=\{(.*?)\}\s*/>""", re.S)
+_JSX_TAG_RE = re.compile(r"<([A-Z]\w*)")
+_LOCAL_COMPONENT_RE = re.compile(r"^(?:const|function)\s+([A-Z]\w*)", re.M)
+
+# Components that wrap or redirect rather than render a page
+ROUTING_COMPONENTS = {"Route", "Routes", "Navigate", "PrivateRoute", "Router"}
+
+
+def parse_imports(text: str) -> Dict[str, List[str]]:
+    """Static and dynamic import specifiers of a JS/JSX source"""
+    text = _LINE_COMMENT_RE.sub(r"\1", _BLOCK_COMMENT_RE.sub("", text))
+    return {
+        "static": sorted(set(_STATIC_IMPORT_RE.findall(text)) | set(_REQUIRE_RE.findall(text))),
+        "dynamic": sorted(set(_DYNAMIC_IMPORT_RE.findall(text))),
+    }
+
+
+def resolve(specifier: str, importer: str) -> Optional[str]:
+    """Path of a relative import, or None when it does not resolve"""
+    base = os.path.normpath(os.path.join(os.path.dirname(importer), specifier))
+    candidates = [base] + [base + ext for ext in EXTENSIONS] + [os.path.join(base, "index" + ext) for ext in EXTENSIONS]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def package_name(specifier: str) -> str:
+    parts = specifier.split("/")
+    return "/".join(parts[:2]) if specifier.startswith("@") else parts[0]
+
+
+class ImportGraph:
+    """Module -> imports graph of a source tree, with a per-file parse cache"""
+
+    def __init__(self, src_dir: str = SRC_DIR, cache_file: Optional[str] = CACHE_FILE):
+        self.src_dir = os.path.abspath(src_dir)
+        self.cache_file = cache_file
+        self.sizes: Dict[str, int] = {}
+        self.static: Dict[str, Set[str]] = {}
+        self.dynamic: Dict[str, Set[str]] = {}
+        self.packages: Dict[str, Set[str]] = {}
+        self.unresolved: List[Tuple[str, str]] = []
+        self.parsed_files = 0
+        self.cached_files = 0
+
+    def _load_cache(self) -> Dict:
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("version") != CACHE_VERSION or cache.get("src_dir") != self.src_dir:
+            return {}
+        return cache.get("files", {})
+
+    def _save_cache(self, files: Dict):
+        if not self.cache_file:
+            return
+        with open(self.cache_file, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "src_dir": self.src_dir, "files": files}, f)
+
+    def build(self) -> "ImportGraph":
+        cached = self._load_cache()
+        fresh = {}
+        for root, dirs, files in os.walk(self.src_dir):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in files:
+                if not name.endswith(EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                key = os.path.relpath(path, self.src_dir)
+                entry = cached.get(key)
+                if not entry or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                    if name.endswith((".css", ".json")):
+                        imports = {"static": [], "dynamic": []}
+                    else:
+                        with open(path, "r", encoding="utf-8", errors="replace") as f:
+                            imports = parse_imports(f.read())
+                    entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "imports": imports}
+                    self.parsed_files += 1
+                else:
+                    self.cached_files += 1
+                fresh[key] = entry
+                self.sizes[path] = stat.st_size
+        self._save_cache(fresh)
+
+        for key, entry in fresh.items():
+            path = os.path.join(self.src_dir, key)
+            self.static[path], self.dynamic[path], self.packages[path] = set(), set(), set()
+            for kind, targets in (("static", self.static[path]), ("dynamic", self.dynamic[path])):
+                for specifier in entry["imports"][kind]:
+                    if specifier.startswith("."):
+                        target = resolve(specifier, path)
+                        if target:
+                            targets.add(target)
+                        else:
+                            self.unresolved.append((self.rel(path), specifier))
+                    elif kind == "static":
+                        self.packages[path].add(package_name(specifier))
+        return self
+
+    def rel(self, path: str) -> str:
+        return os.path.relpath(path, os.path.dirname(self.src_dir)).replace(os.sep, "/")
+
+    def reachable(self, roots: Set[str], stop: Set[str] = frozenset()) -> Set[str]:
+        """Modules reachable over static edges, not entering ``stop`` (unless it is a root)"""
+        seen: Set[str] = set()
+        stack = list(roots)
+        while stack:
+            module = stack.pop()
+            if module in seen:
+                continue
+            seen.add(module)
+            for target in self.static.get(module, ()):
+                if target not in seen and target not in stop:
+                    stack.append(target)
+        return seen
+
+    def size_of(self, modules: Set[str]) -> int:
+        return sum(self.sizes.get(m, 0) for m in modules)
+
+    def packages_of(self, modules: Set[str]) -> Set[str]:
+        return set().union(*(self.packages.get(m, set()) for m in modules)) if modules else set()
+
+
+def parse_routes(app_file: str) -> Tuple[List[Tuple[str, List[str]]], Dict[str, str]]:
+    """(route path, page component names) from App.jsx plus import name -> module"""
+    with open(app_file, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    imports = {}
+    for name, specifier in _DEFAULT_IMPORT_RE.findall(text):
+        if specifier.startswith("."):
+            target = resolve(specifier, app_file)
+            if target:
+                imports[name] = target
+
+    # Components defined in App.jsx itself render other components
+    local_bodies = {}
+    matches = list(_LOCAL_COMPONENT_RE.finditer(text))
+    for position, match in enumerate(matches):
+        end = matches[position + 1].start() if position + 1 < len(matches) else len(text)
+        local_bodies[match.group(1)] = text[match.end():end]
+
+    def expand(names, seen=None):
+        seen = seen or set()
+        pages = []
+        for name in names:
+            if name in ROUTING_COMPONENTS or name in seen:
+                continue
+            seen.add(name)
+            if name in imports:
+                pages.append(name)
+            elif name in local_bodies:
+                pages.extend(expand(_JSX_TAG_RE.findall(local_bodies[name]), seen))
+        return pages
+
+    routes = [(path, sorted(set(expand(_JSX_TAG_RE.findall(element))))) for path, element in _ROUTE_RE.findall(text)]
+    return routes, imports
+
+
+def build_report(src_dir: str = SRC_DIR, cache_file: Optional[str] = CACHE_FILE) -> Dict:
+    graph = ImportGraph(src_dir, cache_file).build()
+    entry = os.path.join(graph.src_dir, "index.js")
+    app_file = os.path.join(graph.src_dir, "App.jsx")
+    routes, imports = parse_routes(app_file)
+
+    page_components = sorted({name for _path, pages in routes for name in pages})
+    page_modules = {imports[name] for name in page_components}
+    everything = graph.reachable({entry})
+    shell = graph.reachable({entry}, stop=page_modules)
+    page_closure = {name: graph.reachable({imports[name]}) - shell for name in page_components}
+
+    route_rows = []
+    for path, pages in routes:
+        needed = shell.union(*(page_closure[name] for name in pages)) if pages else set(shell)
+        deferred = everything - needed
+        route_rows.append({
+            "route": path,
+            "pages": pages,
+            "modules": len(needed),
+            "bytes": graph.size_of(needed),
+            "deferrable_bytes": graph.size_of(deferred),
+            "deferrable_pct": round(graph.size_of(deferred) / max(graph.size_of(everything), 1) * 100, 1),
+            "deferrable_packages": sorted(graph.packages_of(deferred) - graph.packages_of(needed)),
+        })
+
+    split_points = []
+    for name in page_components:
+        others = set().union(*(page_closure[other] for other in page_components if other != name))
+        exclusive = page_closure[name] - others
+        used_by = [path for path, pages in routes if name in pages]
+        split_points.append({
+            "component": name,
+            "module": graph.rel(imports[name]),
+            "exclusive_modules": len(exclusive),
+            "exclusive_bytes": graph.size_of(exclusive),
+            "closure_bytes": graph.size_of(page_closure[name]),
+            "exclusive_packages": sorted(graph.packages_of(exclusive) - graph.packages_of(shell | others)),
+            "routes": used_by,
+            # First-load bytes saved across all routes that do not render it
+            "route_savings": graph.size_of(exclusive) * (len(routes) - len(used_by)),
+        })
+    split_points.sort(key=lambda row: (-row["exclusive_bytes"], row["component"]))
+
+    dynamic_targets = {target for targets in graph.dynamic.values() for target in targets}
+    lazy_reachable = graph.reachable(dynamic_targets)
+
+    return {
+        "src_dir": graph.src_dir,
+        "files": len(graph.sizes),
+        "parsed_files": graph.parsed_files,
+        "cached_files": graph.cached_files,
+        "total_bytes": graph.size_of(everything),
+        "shell_bytes": graph.size_of(shell),
+        "shell_modules": sorted(graph.rel(m) for m in shell),
+        "unreachable_modules": sorted(graph.rel(m) for m in set(graph.sizes) - everything - lazy_reachable),
+        # import() only splits a module that nothing imports statically
+        "lazy_imports": sorted(graph.rel(t) for t in dynamic_targets - everything),
+        "ineffective_lazy_imports": sorted(graph.rel(t) for t in dynamic_targets & everything),
+        "unresolved_imports": graph.unresolved,
+        "routes": route_rows,
+        "split_points": split_points,
+    }
+
+
+def print_report(report: Dict):
+    def kb(value):
+        return f"{value / 1024:.1f}"
+
+    print(f"\n📁 {report['files']} files ({report['parsed_files']} parsed, {report['cached_files']} from cache)")
+    print(f"   Eager bundle (reachable from src/index.js): {kb(report['total_bytes'])} KB source")
+    print(f"   App shell (without page components):        {kb(report['shell_bytes'])} KB source")
+
+    print(f"\n{'Route':48} {'Needs KB':>9} {'Deferrable KB':>14} {'%':>6}  Packages only other routes need")
+    print("-" * 120)
+    for row in sorted(report["routes"], key=lambda r: -r["deferrable_bytes"]):
+        print(f"{row['route']:48} {kb(row['bytes']):>9} {kb(row['deferrable_bytes']):>14} "
+              f"{row['deferrable_pct']:6.1f}  {', '.join(row['deferrable_packages'])}")
+
+    print("\n✂️  SPLIT POINTS (React.lazy candidates, ranked by bytes only they pull in):")
+    for rank, row in enumerate(report["split_points"], 1):
+        packages = f" + {', '.join(row['exclusive_packages'])}" if row["exclusive_packages"] else ""
+        print(f"   {rank:2}. {row['component']:30} {kb(row['exclusive_bytes']):>8} KB exclusive "
+              f"({row['exclusive_modules']} modules{packages}) - used by {len(row['routes'])} route(s)")
+
+    if report["lazy_imports"]:
+        print(f"\nℹ️  Already lazy via import(): {', '.join(report['lazy_imports'])}")
+    if report["ineffective_lazy_imports"]:
+        print(f"\n⚠️  import() targets that are also imported statically (not split): "
+              f"{', '.join(report['ineffective_lazy_imports'])}")
+    if report["unreachable_modules"]:
+        print(f"\nℹ️  {len(report['unreachable_modules'])} modules are not reachable from src/index.js "
+              f"(not bundled) - see --json for the list")
+    if report["unresolved_imports"]:
+        print("\n⚠️  Unresolved relative imports:")
+        for importer, specifier in report["unresolved_imports"]:
+            print(f"   {importer}: {specifier}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import graph and code-splitting report for the React tree")
+    parser.add_argument("--src", default=SRC_DIR, help="Source directory (default src)")
+    parser.add_argument("--cache-file", default=CACHE_FILE, help=f"Parse cache (default {CACHE_FILE})")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every file and do not write the cache")
+    parser.add_argument("--json", dest="json_file", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    print("🕸️  ThoughtPro B2B Import Graph & Code-Splitting Report")
+    report = build_report(args.src, None if args.no_cache else args.cache_file)
+    print_report(report)
+
+    if args.json_file:
+        with open(args.json_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to: {args.json_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,50 +2,60 @@
 """
 Instant API Test - Run this immediately to test your implementation
 
-No dependencies required except Python standard library and requests
+Uses requests when it is installed. Without it (or with --fast) the probes
+run through fast_probe.py, which needs only the Python standard library,
+sends every probe at once and finishes within one global deadline.
+
+Usage:
+    python instant_test.py [--fast] [--api URL] [--ui URL]
 """
 
-import json
-try:
-    import requests
-except ImportError:
-    print("❌ Please install requests: pip install requests")
-    exit(1)
+API_URL = "https://thoughtprob2b.thoughthealer.org"
+UI_URL = "http://localhost:3000"
+
+# Critical API endpoints
+TESTS = [
+    ("GET", "/psychologists", "Get Psychologists List"),
+    ("GET", "/employee-subscriptions/status", "Health Check"),
+    ("POST", "/auth/supabase/login", "Login Endpoint"),
+    ("POST", "/api/v1/companies-supabase", "Create Company"),
+    ("GET", "/api/v1/holidays", "Get Holidays"),
+]
+
+# Whole-run deadline for the fast path (the requests path allows 5s per request)
+FAST_DEADLINE = 5.0
+
+def api_status(status_code):
+    """Classify an API status code"""
+    if status_code in [200, 201]:
+        return "✅ OK"
+    elif status_code in [400, 401, 422]:
+        return "⚠️ RESPOND"  # Responding but expecting different input
+    return "❌ ERROR"
 
-def test_now():
+def test_now(api_url=API_URL, ui_url=UI_URL):
     """Run immediate tests on critical endpoints"""
-    
-    API_URL = "https://thoughtprob2b.thoughthealer.org"
-    UI_URL = "http://localhost:3000"
+    try:
+        import requests
+    except ImportError:
+        print("⚠️ requests not installed - using the standard-library fast probe")
+        return fast_test(api_url, ui_url)
     
     print("🔬 ThoughtPro B2B - INSTANT API TEST")
     print("=" * 50)
     
-    # Test critical API endpoints
-    tests = [
-        ("GET", "/psychologists", "Get Psychologists List"),
-        ("GET", "/employee-subscriptions/status", "Health Check"),
-        ("POST", "/auth/supabase/login", "Login Endpoint"),
-        ("POST", "/api/v1/companies-supabase", "Create Company"),
-        ("GET", "/api/v1/holidays", "Get Holidays"),
-    ]
-    
+    tests = TESTS
     results = []
     
     for method, endpoint, description in tests:
         try:
-            url = f"{API_URL}{endpoint}"
+            url = f"{api_url}{endpoint}"
             if method == "GET":
                 response = requests.get(url, timeout=5)
             else:
                 response = requests.post(url, json={}, timeout=5)
             
-            if response.status_code in [200, 201]:
-                status = "✅ OK"
-            elif response.status_code in [400, 401, 422]:
-                status = "⚠️ RESPOND"  # Responding but expecting different input
-            else:
-                status = "❌ ERROR"
+            status = api_status(response.status_code)
                 
             result = f"{status} {method:4} {endpoint:35} {description}"
             print(result)
@@ -57,17 +67,25 @@ def test_now():
             results.append(("❌ FAIL", method, endpoint, description, 0))
     
     # Test UI
-    print(f"\n🌐 UI TEST ({UI_URL}):")
+    print(f"\n🌐 UI TEST ({ui_url}):")
     try:
-        response = requests.get(UI_URL, timeout=3)
-        if response.status_code == 200:
-            print("✅ OK   UI   /                               React App Running")
-        else:
-            print(f"⚠️ WARN UI   /                               HTTP {response.status_code}")
+        response = requests.get(ui_url, timeout=3)
+        print_ui_result(response.status_code)
     except:
-        print("❌ FAIL UI   /                               Not Running (npm start needed)")
+        print_ui_result(0)
     
-    # Summary
+    print_summary(results, len(tests))
+
+def print_ui_result(status_code):
+    if status_code == 200:
+        print("✅ OK   UI   /                               React App Running")
+    elif status_code:
+        print(f"⚠️ WARN UI   /                               HTTP {status_code}")
+    else:
+        print("❌ FAIL UI   /                               Not Running (npm start needed)")
+
+def print_summary(results, total):
+    """Print the summary block for (status, method, endpoint, description, code) results"""
     ok_count = len([r for r in results if r[0] == "✅ OK"])
     respond_count = len([r for r in results if "RESPOND" in r[0]])
     fail_count = len([r for r in results if "FAIL" in r[0] or "ERROR" in r[0]])
@@ -80,11 +98,54 @@ def test_now():
     if fail_count == 0:
         print("\n🎉 API server is responding to all endpoints!")
     elif ok_count + respond_count > 0:
-        print(f"\n👍 API server is running - {ok_count + respond_count}/{len(tests)} endpoints responding")
+        print(f"\n👍 API server is running - {ok_count + respond_count}/{total} endpoints responding")
     else:
         print("\n⚠️ API server may be down or unreachable")
     
     print(f"\n💡 For detailed testing, run: python test_api_ui_integration.py")
 
+def fast_test(api_url=API_URL, ui_url=UI_URL, deadline=FAST_DEADLINE):
+    """Standard-library variant of test_now: all probes at once, one global deadline"""
+    from fast_probe import probe_all
+    
+    print("🔬 ThoughtPro B2B - INSTANT API TEST (fast probe)")
+    print("=" * 50)
+    
+    probes = [(method, f"{api_url}{endpoint}", description) for method, endpoint, description in TESTS]
+    probes.append(("GET", ui_url, "UI"))
+    endpoints = {f"{api_url}{endpoint}": endpoint for _method, endpoint, _description in TESTS}
+    results = []
+    
+    def report(result):
+        # API results are printed as they arrive; the UI result is printed last
+        if result['url'] not in endpoints:
+            return
+        endpoint = endpoints[result['url']]
+        if result['status_code']:
+            status = api_status(result['status_code'])
+            print(f"{status} {result['method']:4} {endpoint:35} {result['description']}")
+        else:
+            status = "❌ FAIL"
+            print(f"{status} {result['method']:4} {endpoint:35} {result['description']} - {str(result['error'])[:30]}")
+        results.append((status, result['method'], endpoint, result['description'], result['status_code']))
+    
+    all_results = probe_all(probes, deadline=deadline, on_result=report)
+    
+    print(f"\n🌐 UI TEST ({ui_url}):")
+    print_ui_result(all_results[-1]['status_code'])
+    
+    print_summary(results, len(TESTS))
+
 if __name__ == "__main__":
-    test_now()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Instant ThoughtPro API test")
+    parser.add_argument("--fast", action="store_true", help="Use the standard-library fast probe")
+    parser.add_argument("--api", default=API_URL, help=f"API base URL (default {API_URL})")
+    parser.add_argument("--ui", default=UI_URL, help=f"UI URL (default {UI_URL})")
+    args = parser.parse_args()
+    
+    if args.fast:
+        fast_test(args.api.rstrip('/'), args.ui)
+    else:
+        test_now(args.api.rstrip('/'), args.ui)
\ No newline at end of file
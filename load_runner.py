@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Load Runner
+
+Load steps, the capacity (knee) search behind ``api_endpoint_tester.py
+--capacity`` and the fixed-rate run behind ``--rate``:
+
+  * a step runs ``concurrency`` workers for ``duration`` seconds; each worker
+    sends back-to-back requests drawn from a weighted endpoint mix
+  * a rate step is open loop: request i is due at ``start + i / rate``
+    whether or not earlier requests finished, and a pool of workers sends
+    each one when it is due (at once when the pool is behind)
+  * per step: throughput, error rate (transport failures, 429 and 5xx) and
+    mean/p50/p95/p99 latency, overall and per endpoint
+  * coordinated omission: latency measured from the send hides a stall,
+    because the requests that were due during it are simply sent late. Each
+    step therefore also reports corrected latency, measured from the
+    intended send time. Rate steps know the intended time of every request;
+    closed-loop steps use HdrHistogram's expected-interval back-fill (a
+    worker stalled for L ms would have sent a request every median-latency
+    ms meanwhile, and each of those is added with the latency it would have
+    seen). The SLO is judged on corrected p99 unless told otherwise
+  * warm-up: before each measured concurrency a warm-up step at the same
+    concurrency fills the connection pool and warms server-side caches and
+    JIT; warm-ups are reported separately and never enter the percentiles
+  * capacity search: concurrency grows by ``factor`` per step until p99 or
+    the error rate breaches the SLO, then a binary search between the last
+    passing and the first failing concurrency finds the breaking point
+  * reports the maximum sustainable throughput (best passing step), the knee
+    concurrency (highest power, i.e. throughput / mean latency, among
+    passing steps) and the full latency-versus-load curve
+  * with a generator_monitor.GeneratorMonitor every step records the
+    generator's own CPU, scheduling lag, sockets and RSS; a step taken
+    while the generator was saturated is marked invalid, and the search
+    stops there instead of reporting the client's limit as the API's
+  * the curve is saved as JSON (``{"points": [...]}``) or CSV with
+    ``throughput_rps``, ``p95_ms`` and ``error_rate`` columns, the format
+    ``polling_load_model.py --curve`` reads
+
+The runner only needs a ``send(target) -> status`` callable (0 for a
+transport failure), so it is independent of the HTTP client.
+
+Usage:
+    python api_endpoint_tester.py --capacity --base-url URL --mix "GET /psychologists:3" \\
+        --mix "GET /psychologists/search:1" [--slo-p99-ms 800] [--warmup 2] [--curve curve.json]
+    python api_endpoint_tester.py --capacity --rate 50 --max-concurrency 64 --step-duration 30 ...
+"""
+
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from generator_monitor import GeneratorMonitor
+
+DEFAULT_SLO_P99_MS = 1000.0
+DEFAULT_MAX_ERROR_RATE = 0.01
+
+CURVE_COLUMNS = ["concurrency", "throughput_rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms",
+                 "corrected_p50_ms", "corrected_p95_ms", "corrected_p99_ms", "corrected_max_ms",
+                 "error_rate", "requests", "errors", "phase", "slo_ok", "valid", "rate_rps"]
+
+
+@dataclass
+class Target:
+    """One endpoint of the load mix"""
+    method: str
+    endpoint: str
+    weight: float = 1.0
+    data: Optional[Dict] = None
+    auth_required: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.endpoint}"
+
+
+def parse_target(spec: str) -> Target:
+    """``"GET /psychologists"`` or ``"GET /psychologists:3"`` (weight 3)"""
+    method, _, endpoint = spec.strip().partition(" ")
+    weight = 1.0
+    match = re.match(r"^(.*):(\d+(?:\.\d+)?)$", endpoint.strip())
+    if match:
+        endpoint, weight = match.group(1), float(match.group(2))
+    method = method.upper()
+    return Target(method, endpoint.strip(), weight, {} if method in ("POST", "PUT", "PATCH") else None)
+
+
+def is_error(status: int) -> bool:
+    """Load errors: no response, throttling, or a server error"""
+    return status == 0 or status == 429 or status >= 500
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted ``values``"""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, math.ceil(q / 100 * len(values)) - 1))
+    return values[rank]
+
+
+def backfill(latencies: List[float], interval_ms: float) -> List[float]:
+    """Closed-loop coordinated-omission correction (expected-interval back-fill)
+
+    On its intended schedule of one request per ``interval_ms`` a worker that
+    waited ``L`` ms would have sent further requests meanwhile; they are added
+    with the latencies they would have seen: L - interval, L - 2 * interval, ...
+    """
+    corrected = list(latencies)
+    if interval_ms <= 0:
+        return corrected
+    for latency in latencies:
+        missing = latency - interval_ms
+        while missing >= interval_ms:
+            corrected.append(missing)
+            missing -= interval_ms
+    return corrected
+
+
+@dataclass
+class Slo:
+    p99_ms: float = DEFAULT_SLO_P99_MS
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE
+    corrected: bool = True              # judge p99 from the intended send time
+
+    def breach(self, step: "StepResult") -> Optional[str]:
+        """Why ``step`` misses the SLO, or None"""
+        if not step.requests:
+            return "no requests completed"
+        if step.error_rate > self.max_error_rate:
+            return f"error rate {step.error_rate:.1%} > {self.max_error_rate:.1%}"
+        p99, label = (step.corrected_p99_ms, "corrected p99") if self.corrected else (step.p99_ms, "p99")
+        if p99 > self.p99_ms:
+            return f"{label} {p99:.0f}ms > {self.p99_ms:.0f}ms"
+        return None
+
+
+@dataclass
+class StepResult:
+    concurrency: int
+    duration_s: float
+    requests: int
+    errors: int
+    throughput_rps: float
+    error_rate: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    corrected_p50_ms: float = 0.0       # from the intended send time
+    corrected_p95_ms: float = 0.0
+    corrected_p99_ms: float = 0.0
+    corrected_max_ms: float = 0.0
+    corrected_samples: int = 0          # requests plus back-filled ones (closed loop)
+    expected_interval_ms: Optional[float] = None   # closed-loop back-fill interval
+    max_send_lag_ms: Optional[float] = None        # rate steps: worst lateness of a send
+    rate_rps: Optional[float] = None    # target rate of an open-loop step
+    phase: str = "step"
+    slo_ok: bool = True
+    breach: Optional[str] = None
+    valid: bool = True                  # False when the generator was saturated
+    generator: Optional[Dict] = None    # GeneratorMonitor.window() for the step
+    by_target: Dict[str, Dict] = field(default_factory=dict)
+
+    @property
+    def power(self) -> float:
+        """Throughput per unit latency - peaks at the knee of the curve"""
+        return self.throughput_rps / self.mean_ms if self.mean_ms else 0.0
+
+
+def summarize_step(concurrency: int, elapsed: float, records: List[tuple], targets: List[Target],
+                   phase: str = "step") -> StepResult:
+    """Aggregate ``(target_index, latency_ms, status, corrected_ms)`` records of one step
+
+    ``corrected_ms`` is the latency from the intended send time, or None for
+    closed-loop records, which are back-filled at the step's median latency.
+    """
+    latencies = sorted(latency for _index, latency, _status, _corrected in records)
+    errors = sum(1 for record in records if is_error(record[2]))
+    open_loop = bool(records) and records[0][3] is not None
+    interval = None if open_loop else percentile(latencies, 50)
+
+    def corrected_of(own: List[tuple]) -> List[float]:
+        if open_loop:
+            return sorted(record[3] for record in own)
+        return sorted(backfill([record[1] for record in own], interval))
+
+    corrected = corrected_of(records)
+    by_target: Dict[str, Dict] = {}
+    for index, target in enumerate(targets):
+        own_records = [record for record in records if record[0] == index]
+        own = sorted(record[1] for record in own_records)
+        own_errors = sum(1 for record in own_records if is_error(record[2]))
+        by_target[target.name] = {
+            "requests": len(own),
+            "errors": own_errors,
+            "throughput_rps": round(len(own) / elapsed, 2) if elapsed else 0.0,
+            "p95_ms": round(percentile(own, 95), 2),
+            "p99_ms": round(percentile(own, 99), 2),
+            "corrected_p99_ms": round(percentile(corrected_of(own_records), 99), 2),
+        }
+    return StepResult(
+        concurrency=concurrency,
+        duration_s=round(elapsed, 3),
+        requests=len(records),
+        errors=errors,
+        throughput_rps=round(len(records) / elapsed, 2) if elapsed else 0.0,
+        error_rate=round(errors / len(records), 4) if records else 0.0,
+        mean_ms=round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        p50_ms=round(percentile(latencies, 50), 2),
+        p95_ms=round(percentile(latencies, 95), 2),
+        p99_ms=round(percentile(latencies, 99), 2),
+        max_ms=round(latencies[-1], 2) if latencies else 0.0,
+        corrected_p50_ms=round(percentile(corrected, 50), 2),
+        corrected_p95_ms=round(percentile(corrected, 95), 2),
+        corrected_p99_ms=round(percentile(corrected, 99), 2),
+        corrected_max_ms=round(corrected[-1], 2) if corrected else 0.0,
+        corrected_samples=len(corrected),
+        expected_interval_ms=round(interval, 2) if interval is not None else None,
+        max_send_lag_ms=round(max(c - l for _i, l, _s, c in records), 2) if open_loop else None,
+        phase=phase,
+        by_target=by_target,
+    )
+
+
+class LoadRunner:
+    """Closed-loop and fixed-rate steps over a weighted target mix"""
+
+    def __init__(self, send: Callable[[Target], int], targets: List[Target], seed: int = 0,
+                 monitor: Optional[GeneratorMonitor] = None):
+        if not targets:
+            raise ValueError("at least one target is required")
+        self.send = send
+        self.targets = targets
+        self.seed = seed
+        self.monitor = monitor
+        self._cum_weights = []
+        total = 0.0
+        for target in targets:
+            total += target.weight
+            self._cum_weights.append(total)
+
+    def _run_workers(self, workers: int, body: Callable[[int, List[tuple]], None], phase: str) -> StepResult:
+        """Run ``body(slot, records)`` on ``workers`` threads and summarise their records"""
+        window_start = self.monitor.now() if self.monitor else 0.0
+        start = time.perf_counter()
+        records: List[List[tuple]] = [[] for _ in range(workers)]
+        finished = [start] * workers
+
+        def worker(slot: int):
+            body(slot, records[slot])
+            finished[slot] = time.perf_counter()
+
+        threads = [threading.Thread(target=worker, args=(slot,), name=f"load-{slot}", daemon=True)
+                   for slot in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        merged = [record for own in records for record in own]
+        step = summarize_step(workers, max(finished) - start, merged, self.targets, phase)
+        if self.monitor:
+            step.generator = self.monitor.window(window_start, self.monitor.now())
+            step.valid = step.generator["valid"]
+        return step
+
+    def run_step(self, concurrency: int, duration_s: float, phase: str = "step") -> StepResult:
+        """``concurrency`` workers send back to back for ``duration_s`` seconds"""
+        stop_at = time.perf_counter() + duration_s
+        indexes = range(len(self.targets))
+
+        def body(slot: int, own: List[tuple]):
+            rng = random.Random(self.seed * 100003 + concurrency * 1009 + slot)
+            while time.perf_counter() < stop_at:
+                index = rng.choices(indexes, cum_weights=self._cum_weights)[0]
+                sent = time.perf_counter()
+                status = self.send(self.targets[index])
+                done = time.perf_counter()
+                own.append((index, (done - sent) * 1000, status, None))
+
+        return self._run_workers(concurrency, body, phase)
+
+    def run_rate(self, rate_rps: float, duration_s: float, workers: int, phase: str = "rate") -> StepResult:
+        """Open loop: ``rate_rps`` requests per second for ``duration_s``, sent by up to ``workers`` threads
+
+        Latency is measured both from the actual send and from the intended send
+        time, so every request that was due while the server stalled carries
+        the stall.
+        """
+        rng = random.Random(self.seed * 100003 + int(rate_rps * 1000))
+        total = max(1, int(rate_rps * duration_s))
+        plan = rng.choices(range(len(self.targets)), cum_weights=self._cum_weights, k=total)
+        due = itertools.count()     # next() is atomic under the GIL
+        start = time.perf_counter()
+
+        def body(slot: int, own: List[tuple]):
+            while True:
+                i = next(due)
+                if i >= total:
+                    return
+                intended = start + i / rate_rps
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                sent = time.perf_counter()
+                status = self.send(self.targets[plan[i]])
+                done = time.perf_counter()
+                own.append((plan[i], (done - sent) * 1000, status, (done - intended) * 1000))
+
+        step = self._run_workers(workers, body, phase)
+        step.rate_rps = rate_rps
+        return step
+
+    def warm_up(self, concurrency: int, duration_s: float) -> StepResult:
+        """Closed-loop warm-up: fills the connection pool to ``concurrency`` and warms server caches and JIT"""
+        return self.run_step(concurrency, duration_s, phase="warmup")
+
+
+def warmup_entry(step: StepResult) -> Dict:
+    """Report entry for a warm-up step (its samples stay out of every percentile)"""
+    return {"phase": step.phase, "concurrency": step.concurrency, "duration_s": step.duration_s,
+            "requests": step.requests, "errors": step.errors, "p50_ms": step.p50_ms, "p99_ms": step.p99_ms}
+
+
+def capacity_search(runner: LoadRunner, slo: Slo, start: int = 1, factor: float = 2.0,
+                    max_concurrency: int = 256, step_duration: float = 10.0, refine_steps: int = 4,
+                    warmup_duration: float = 0.0,
+                    on_step: Optional[Callable[[StepResult], None]] = None) -> Dict:
+    """Step load up to the SLO breach, then binary-search the breaking point
+
+    With ``warmup_duration`` each concurrency is preceded by a warm-up step at
+    that concurrency; warm-ups are listed under ``"warmup"``, not ``"points"``.
+    """
+    steps: Dict[int, StepResult] = {}
+    warmups: List[Dict] = []
+
+    def run(concurrency: int, phase: str) -> StepResult:
+        if warmup_duration > 0:
+            warmups.append(warmup_entry(runner.warm_up(concurrency, warmup_duration)))
+        step = runner.run_step(concurrency, step_duration, phase)
+        step.breach = slo.breach(step)
+        step.slo_ok = step.breach is None
+        steps[concurrency] = step
+        if on_step:
+            on_step(step)
+        return step
+
+    passing, failing, saturated = None, None, None
+    concurrency = max(1, start)
+    while True:
+        step = run(concurrency, "step")
+        if not step.valid:
+            # More load would only measure the generator
+            saturated = concurrency
+            break
+        if not step.slo_ok:
+            failing = concurrency
+            break
+        passing = concurrency
+        if concurrency >= max_concurrency:
+            break
+        concurrency = min(max_concurrency, max(concurrency + 1, int(round(concurrency * factor))))
+
+    # Refine between the last passing and the first failing concurrency
+    low = passing or 0
+    high = failing
+    for _ in range(refine_steps):
+        if high is None or high - low <= 1:
+            break
+        middle = (low + high) // 2
+        if middle in steps:
+            break
+        step = run(middle, "refine")
+        if not step.valid:
+            saturated = min(saturated or middle, middle)
+            break
+        if step.slo_ok:
+            low = middle
+        else:
+            high = middle
+
+    points = [steps[c] for c in sorted(steps)]
+    ok_points = [p for p in points if p.slo_ok and p.valid]
+    best = max(ok_points, key=lambda p: p.throughput_rps) if ok_points else None
+    knee = max(ok_points or [p for p in points if p.valid] or points, key=lambda p: p.power)
+    return {
+        "slo": asdict(slo),
+        "summary": {
+            "max_sustainable_rps": best.throughput_rps if best else None,
+            "max_sustainable_concurrency": best.concurrency if best else None,
+            "knee_concurrency": knee.concurrency,
+            "knee_rps": knee.throughput_rps,
+            "last_passing_concurrency": low or None,
+            "breaking_concurrency": high,
+            "breach": steps[high].breach if high is not None else None,
+            "steps_run": len(points),
+            "generator_saturated_at": saturated,
+            "generator_reasons": steps[saturated].generator["reasons"] if saturated is not None else [],
+        },
+        "warmup": warmups,
+        "points": [asdict(p) for p in points],
+    }
+
+
+def rate_run(runner: LoadRunner, slo: Slo, rate_rps: float, workers: int, duration_s: float = 30.0,
+             warmup_duration: float = 0.0, on_step: Optional[Callable[[StepResult], None]] = None) -> Dict:
+    """One open-loop step at ``rate_rps`` after an optional warm-up at ``workers`` concurrency"""
+    warmups = [warmup_entry(runner.warm_up(workers, warmup_duration))] if warmup_duration > 0 else []
+    step = runner.run_rate(rate_rps, duration_s, workers)
+    step.breach = slo.breach(step)
+    step.slo_ok = step.breach is None
+    if on_step:
+        on_step(step)
+    return {
+        "slo": asdict(slo),
+        "summary": {
+            "rate_rps": rate_rps,
+            "achieved_rps": step.throughput_rps,
+            "workers": workers,
+            "slo_ok": step.slo_ok,
+            "breach": step.breach,
+            "max_send_lag_ms": step.max_send_lag_ms,
+        },
+        "warmup": warmups,
+        "points": [asdict(step)],
+    }
+
+
+def save_curve(report: Dict, path: str):
+    """Write the curve as CSV (by extension) or as the full JSON report"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.endswith(".csv"):
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CURVE_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(report["points"])
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+def curve_path_for(path: str, target: Target) -> str:
+    """``curve.json`` -> ``curve.get_psychologists_search.json`` for per-endpoint searches"""
+    stem, extension = os.path.splitext(path)
+    slug = re.sub(r"[^a-z0-9]+", "_", target.name.lower()).strip("_")
+    return f"{stem}.{slug}{extension or '.json'}"
+
+
+def print_step(step: StepResult):
+    verdict = "✅" if step.slo_ok else f"❌ {step.breach}"
+    if not step.valid:
+        verdict = f"⚠️  invalid - generator saturated ({'; '.join(step.generator['reasons'])})"
+    print(f"   {step.phase:6} c={step.concurrency:<4} {step.throughput_rps:>8.1f} rps  "
+          f"p50 {step.p50_ms:>7.1f}ms  p99 {step.p99_ms:>7.1f}ms (corrected {step.corrected_p99_ms:>7.1f}ms)  "
+          f"err {step.error_rate:>6.1%}  {verdict}")
+
+
+def print_latency_comparison(report: Dict):
+    """Uncorrected (from the send) and corrected (from the intended send time) latency side by side"""
+    print(f"\n   {'':14} {'from send (uncorrected)':^31} | {'from intended send (corrected)':^31}")
+    print(f"   {'step':14} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} | "
+          f"{'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}")
+    for point in report["points"]:
+        label = f"{point['rate_rps']:g} rps" if point.get("rate_rps") else f"c={point['concurrency']}"
+        print(f"   {label:14} {point['p50_ms']:7.1f} {point['p95_ms']:7.1f} {point['p99_ms']:7.1f} "
+              f"{point['max_ms']:7.1f} | {point['corrected_p50_ms']:7.1f} {point['corrected_p95_ms']:7.1f} "
+              f"{point['corrected_p99_ms']:7.1f} {point['corrected_max_ms']:7.1f}")
+    if report.get("warmup"):
+        requests = sum(w.get("requests", 0) for w in report["warmup"])
+        print(f"   ({len(report['warmup'])} warm-up phase(s), {requests} requests, excluded from these figures)")
+
+
+def print_capacity(name: str, report: Dict):
+    summary = report["summary"]
+    print(f"\n📈 CAPACITY - {name}")
+    if summary["max_sustainable_rps"] is None and summary["breach"]:
+        print(f"   ❌ No step met the SLO ({summary['breach']})")
+    elif summary["max_sustainable_rps"] is None:
+        print("   ❌ No valid step - the generator was saturated from the start")
+    else:
+        print(f"   Max sustainable throughput: {summary['max_sustainable_rps']:.1f} rps "
+              f"at concurrency {summary['max_sustainable_concurrency']}")
+    print(f"   Knee: concurrency {summary['knee_concurrency']} ({summary['knee_rps']:.1f} rps, best throughput/latency)")
+    if summary["breaking_concurrency"] is not None:
+        print(f"   Breaking point: concurrency {summary['breaking_concurrency']} ({summary['breach']}); "
+              f"last passing {summary['last_passing_concurrency']}")
+    elif summary["generator_saturated_at"] is None:
+        print(f"   SLO held up to the maximum concurrency ({summary['last_passing_concurrency']})")
+    if summary["generator_saturated_at"] is not None:
+        print(f"   ⚠️  Generator saturated at concurrency {summary['generator_saturated_at']} "
+              f"({'; '.join(summary['generator_reasons'])}) - the search stopped there; "
+              f"spread the load over more processes or machines to go further")
+    print_latency_comparison(report)
+
+
+def print_rate(name: str, report: Dict):
+    summary = report["summary"]
+    verdict = "✅ SLO met" if summary["slo_ok"] else f"❌ {summary['breach']}"
+    print(f"\n📈 FIXED RATE - {name}")
+    print(f"   Target {summary['rate_rps']:g} rps, achieved {summary['achieved_rps']:.1f} rps "
+          f"with {summary['workers']} workers  {verdict}")
+    if summary["max_send_lag_ms"] is not None and summary["max_send_lag_ms"] > 0:
+        print(f"   Sends fell up to {summary['max_send_lag_ms']:.0f}ms behind schedule")
+    print_latency_comparison(report)
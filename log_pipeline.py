@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Buffered Logging Pipeline
+
+Non-blocking replacement for logging straight to a FileHandler and stdout
+and for per-request print() calls. Callers only put items on a queue; one
+background writer thread:
+
+  * formats log records and writes them to the log file in batches
+  * renders console output at a fixed refresh rate (one write per tick)
+  * in quiet mode skips per-request console output entirely, so only the
+    summaries printed by the testers reach the terminal
+
+Workers therefore never wait on console or disk I/O, and logging stays out
+of latency measurements.
+
+Usage:
+    pipeline = LogPipeline('api_test_results.log')
+    pipeline.install()                  # root logger -> pipeline
+    pipeline.console("✅ GET /health")  # replaces print()
+    pipeline.flush()                    # before printing a summary
+"""
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+from typing import List, Optional, TextIO, Tuple
+
+DEFAULT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_RECORD = 0
+_CONSOLE = 1
+_FLUSH = 2
+_STOP = 3
+
+
+class _PipelineHandler(logging.Handler):
+    """Logging handler that only enqueues the record; formatting happens on the writer thread"""
+
+    def __init__(self, pipeline: "LogPipeline", level: int = logging.NOTSET):
+        super().__init__(level)
+        self.pipeline = pipeline
+
+    def emit(self, record: logging.LogRecord):
+        self.pipeline._put((_RECORD, record))
+
+    def flush(self):
+        self.pipeline.flush()
+
+
+class LogPipeline:
+    """Queue-based log writer with batched file writes and a rate-limited console"""
+
+    def __init__(self, log_file: Optional[str] = None, quiet: bool = False, refresh_hz: float = 4.0,
+                 max_lines_per_refresh: Optional[int] = None, fmt: str = DEFAULT_FORMAT,
+                 stream: Optional[TextIO] = None):
+        self.log_file = log_file
+        self.stream = stream
+        self.quiet = quiet
+        self.refresh_interval = 1.0 / refresh_hz if refresh_hz > 0 else 0.0
+        self.max_lines_per_refresh = max_lines_per_refresh
+        self.formatter = logging.Formatter(fmt)
+        self.suppressed_lines = 0
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._atexit_registered = False
+
+    # -- producer side -----------------------------------------------------
+
+    def _put(self, item):
+        if self._thread is None:
+            self.start()
+        self._queue.put(item)
+
+    def console(self, text: str):
+        """Queue a line (or block) for the console; dropped in quiet mode"""
+        if not self.quiet:
+            # Resolve the stream now, like print() would, so redirect_stdout() is honoured
+            self._put((_CONSOLE, (text, self.stream or sys.stdout)))
+
+    def handler(self, level: int = logging.NOTSET) -> logging.Handler:
+        return _PipelineHandler(self, level)
+
+    def install(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO,
+                force: bool = False) -> logging.Logger:
+        """Make the pipeline the only handler of ``logger`` (root by default)
+
+        Like ``logging.basicConfig``, does nothing when the logger already has
+        handlers unless ``force`` is set.
+        """
+        logger = logger or logging.getLogger()
+        if logger.handlers and not force:
+            return logger
+        for existing in logger.handlers[:]:
+            logger.removeHandler(existing)
+        logger.addHandler(self.handler())
+        logger.setLevel(level)
+        self.start()
+        return logger
+
+    def flush(self, timeout: float = 10.0):
+        """Block until everything queued so far is written"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="log-pipeline-writer", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def stop(self, timeout: float = 10.0):
+        """Write everything that is queued and stop the writer thread"""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._queue.put((_STOP, None))
+            self._thread.join(timeout)
+            self._thread = None
+
+    # -- writer thread -------------------------------------------------------
+
+    def _render(self, lines: List[Tuple[str, TextIO]]):
+        if self.max_lines_per_refresh and len(lines) > self.max_lines_per_refresh:
+            hidden = len(lines) - self.max_lines_per_refresh
+            self.suppressed_lines += hidden
+            lines = lines[-self.max_lines_per_refresh:]
+            notice = f"... {hidden} lines not shown" + (f" (see {self.log_file})" if self.log_file else "")
+            lines.insert(0, (notice, lines[0][1]))
+        # One write per target stream, in order
+        start = 0
+        while start < len(lines):
+            stream = lines[start][1]
+            end = start
+            while end < len(lines) and lines[end][1] is stream:
+                end += 1
+            try:
+                stream.write("\n".join(text for text, _ in lines[start:end]) + "\n")
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+            start = end
+
+    def _run(self):
+        log_file = open(self.log_file, 'a', encoding='utf-8') if self.log_file else None
+        file_lines: List[str] = []
+        console_lines: List[Tuple[str, TextIO]] = []
+        next_render = time.monotonic()
+        unflushed = False
+        try:
+            while True:
+                if console_lines or unflushed:
+                    wait = max(next_render - time.monotonic(), 0.0)
+                else:
+                    wait = None
+                try:
+                    items = [self._queue.get(timeout=wait)]
+                except queue.Empty:
+                    items = []
+                # Drain whatever else is already queued into the same batch
+                try:
+                    while len(items) < 1000:
+                        items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+
+                waiters = []
+                stopping = False
+                for kind, payload in items:
+                    if kind == _RECORD:
+                        try:
+                            line = self.formatter.format(payload)
+                        except Exception:
+                            line = f"<unformattable log record: {payload.msg!r}>"
+                        if log_file:
+                            file_lines.append(line + "\n")
+                        if not self.quiet:
+                            console_lines.append((line, self.stream or sys.stdout))
+                    elif kind == _CONSOLE:
+                        if not self.quiet:
+                            console_lines.append(payload)
+                    elif kind == _FLUSH:
+                        waiters.append(payload)
+                    elif kind == _STOP:
+                        stopping = True
+
+                if file_lines:
+                    log_file.write("".join(file_lines))
+                    file_lines.clear()
+                    unflushed = True
+
+                # Console and file are both flushed at most once per refresh tick
+                now = time.monotonic()
+                if now >= next_render or waiters or stopping:
+                    if console_lines:
+                        self._render(console_lines)
+                        console_lines = []
+                    if unflushed:
+                        log_file.flush()
+                        unflushed = False
+                    next_render = now + self.refresh_interval
+
+                if waiters or stopping:
+                    for waiter in waiters:
+                        waiter.set()
+                if stopping:
+                    return
+        finally:
+            if log_file:
+                log_file.close()
@@ -0,0 +1,719 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B N+1 / Chatty Request Detector
+
+Finds request patterns in src/services and src/components that multiply
+round trips:
+
+  * awaited API calls inside ``for``/``while`` loops - one round trip per
+    item, page or chunk, in sequence
+  * per-item fan-out through ``.map``/``.forEach`` callbacks
+  * serial chains - independent ``await``ed reads issued one after another
+
+Every service method and every function in a component that reaches the API
+(directly, through other service methods or through local helpers) is an
+action. Its round trips are estimated for N items (list lengths, array
+arguments) and P pages, and hotspots are ranked by round trips x the
+recorded latency of each endpoint (median duration_ms in
+api_test_report_*.json).
+
+Estimates are confirmed by replaying the action under Node: the real service
+modules run against a local api_stand_in.StandInServer that counts the
+requests they make. Component functions run with their local helpers and
+with React state, props and setters stubbed out.
+
+Static counts take the most expensive arm of each if/else chain and leave
+out catch blocks (error paths). A replay that makes fewer requests than
+estimated usually took an early return on stubbed state; one that makes
+more ran a loop over a collection whose length is not N.
+
+Usage:
+    python nplus1_detector.py [--items 20] [--pages 1] [--top 15] [--no-replay] [--json nplus1.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from api_stand_in import StandInRoutes, StandInServer
+from endpoint_catalog import template_for
+from service_map import SRC_DIR, ServiceMap, block_end, find_api_calls, find_delegates, mask_source
+
+DEFAULT_LATENCY_MS = 300.0
+REPLAY_TIMEOUT = 30
+
+_LOOP_RE = re.compile(r"\b(for|while)\s*\(")
+_ITERATION_RE = re.compile(r"\.(forEach|map|flatMap)\s*\(")
+_COUNTED_FOR_RE = re.compile(
+    r"^\(\s*(?:let|var)?\s*(\w+)\s*=\s*(\d+)\s*;\s*\1\s*(<=?)\s*([^;]+?)\s*;\s*\1\s*(?:\+\+|\+=\s*(\w+))\s*\)$"
+)
+_FOR_OF_RE = re.compile(r"^\(\s*(?:const|let|var)\s+.+?\s+(?:of|in)\s+(.+)\)$", re.S)
+_COMPONENT_CALL_RE = re.compile(r"\b(\w+Service)\.(\w+)\s*\(")
+_FUNCTION_RE = re.compile(
+    r"(?:const|let)\s+(\w+)\s*=\s*(?:React\.)?(?:useCallback\(\s*)?(?:async\s*)?(?:\([^()]*\)|\w+)\s*=>\s*\{"
+    r"|(?:async\s+)?function\s+(\w+)\s*\([^()]*\)\s*\{"
+)
+_IF_RE = re.compile(r"\bif\s*\(")
+_ELSE_RE = re.compile(r"\s*else\b\s*")
+_TERNARY_AWAIT_RE = re.compile(r"\?\s*await\s+[\w$.]+\s*\(")
+_ELSE_AWAIT_RE = re.compile(r"\s*:\s*await\s+[\w$.]+\s*\(")
+_CATCH_RE = re.compile(r"(?<!\.)\bcatch\s*(?:\([^()]*\))?\s*\{")
+_FUNCTION_WRAPPER_RE = re.compile(r"(?:const|let)\s+\w+\s*=\s*(?:React\.)?(?:useCallback\(\s*)?")
+_AWAIT_CALL_RE = re.compile(r"(?:(?:const|let|var)\s+(\w+|\[[^\]]*\]|\{[^}]*\})\s*=\s*)?\bawait\s+([\w$.]+)\s*\(")
+
+# Node harness: load the service modules, stub the browser, run one action
+_HARNESS = r"""
+import { pathToFileURL } from 'node:url';
+
+const spec = JSON.parse(process.argv[2]);
+const store = new Map(Object.entries(spec.storage));
+globalThis.localStorage = {
+  getItem: (key) => (store.has(key) ? store.get(key) : null),
+  setItem: (key, value) => store.set(key, String(value)),
+  removeItem: (key) => store.delete(key),
+  clear: () => store.clear(),
+};
+globalThis.window = globalThis;
+process.env.REACT_APP_API_URL = spec.baseUrl;
+process.env.NODE_ENV = 'test';
+for (const level of ['log', 'info', 'warn', 'error', 'debug']) console[level] = () => {};
+
+const modules = {};
+for (const file of spec.modules) {
+  try {
+    Object.assign(modules, await import(pathToFileURL(file).href));
+  } catch (error) {
+    // A module that does not load under Node is simply not available
+  }
+}
+
+// Stands in for anything a component function reads that is not a service
+const stub = new Proxy(function () {}, {
+  get: (target, key) => {
+    if (key === 'then') return undefined;
+    if (key === Symbol.toPrimitive) return () => 0;
+    if (key === Symbol.iterator) return function* () {};
+    if (key === 'length') return 0;
+    return stub;
+  },
+  apply: () => stub,
+  construct: () => stub,
+});
+const args = spec.args.map((arg) => (arg && arg.$stub ? stub : arg));
+
+async function run() {
+  if (spec.kind === 'service') {
+    const service = modules[spec.service];
+    if (!service) throw new Error(`${spec.service} is not exported`);
+    return service[spec.method](...args);
+  }
+  // Local helpers of the component are compiled on first use, in the same scope
+  const helpers = {};
+  const scope = new Proxy({}, {
+    has: (target, key) => key !== '__args' && key !== '__scope',
+    get: (target, key) => {
+      if (key === Symbol.unscopables) return undefined;
+      if (key in modules) return modules[key];
+      if (typeof key === 'string' && Object.hasOwn(spec.helpers, key)) {
+        if (!(key in helpers)) {
+          helpers[key] = new Function('__scope', `with (__scope) { return (${spec.helpers[key]}); }`)(scope);
+        }
+        return helpers[key];
+      }
+      if (key in globalThis) return globalThis[key];
+      return stub;
+    },
+    set: () => true,
+  });
+  const AsyncFunction = (async () => {}).constructor;
+  const action = new AsyncFunction('__scope', '__args', `with (__scope) { return await (${spec.source})(...__args); }`);
+  return action(scope, args);
+}
+
+let error = null;
+try {
+  await Promise.race([
+    run(),
+    new Promise((resolve, reject) => setTimeout(() => reject(new Error('timed out')), spec.timeoutMs)),
+  ]);
+} catch (caught) {
+  error = String(caught && caught.message ? caught.message : caught);
+}
+process.stdout.write(JSON.stringify({ error }) + '\n');
+process.exit(0);
+"""
+
+_IMPORT_SPECIFIER_RE = re.compile(r"""(\bfrom\s+['"])(\.{1,2}/[^'"]+)(['"])""")
+
+
+@dataclass
+class Trips:
+    """Iterations of a loop as a function of N items and P pages"""
+    kind: str  # "items", "pages", "fixed" or "derived" (from the loop that fills the collection)
+    label: str
+    count: int = 0
+    start: int = 0
+    step: int = 1
+    inclusive: bool = False
+    source: Optional["Trips"] = None
+
+    def value(self, items: int, pages: int) -> int:
+        if self.kind == "derived":
+            base = self.source.value(items, pages)
+        else:
+            base = {"items": items, "pages": pages}.get(self.kind, self.count)
+        span = base - self.start + (1 if self.inclusive else 0)
+        return max(0, -(-span // self.step))
+
+    def describe(self) -> str:
+        if self.kind == "derived":
+            source = self.source
+            return f"{self.label} (= {source.label}{f' / {source.step}' if source.step > 1 else ''})"
+        return self.label + (f" / {self.step}" if self.step > 1 else "")
+
+
+@dataclass
+class Loop:
+    kind: str
+    start: int
+    body_start: int
+    body_end: int
+    trips: Trips
+    sequential: bool
+    line: int
+
+
+@dataclass
+class Branch:
+    """An if / else if / else chain or awaited ternary (one arm runs), or a catch block (no arm: error path only)"""
+    start: int
+    end: int
+    arms: List[Tuple[int, int]]
+
+
+@dataclass
+class Action:
+    name: str
+    kind: str  # "service" or "component"
+    file: str
+    line: int
+    start: int
+    end: int
+    expression_start: int
+    params: List[str] = field(default_factory=list)
+    service: Optional[str] = None
+    method: Optional[str] = None
+
+
+class SourceFile:
+    def __init__(self, path: str):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            self.text = f.read()
+        self.path = path
+        self.masked = mask_source(self.text)
+        self.functions: Dict[str, Tuple[int, int, int]] = {}
+        for match in _FUNCTION_RE.finditer(self.masked):
+            name = match.group(1) or match.group(2)
+            body = match.end() - 1
+            self.functions.setdefault(name, (match.start(), body, block_end(self.masked, body)))
+        self.loops = self._find_loops()
+        self.branches = self._find_branches()
+
+    def expression(self, name: str) -> Tuple[int, int]:
+        """Span of a local function as a JS expression (without the const / useCallback wrapping)"""
+        definition, _body_start, body_end = self.functions[name]
+        wrapper = _FUNCTION_WRAPPER_RE.match(self.masked, definition)
+        return (wrapper.end() if wrapper else definition), body_end
+
+    def line_of(self, offset: int) -> int:
+        return self.text.count("\n", 0, offset) + 1
+
+    def _constant(self, name: str) -> Optional[int]:
+        match = re.search(r"\b(?:const|let|var)\s+" + re.escape(name) + r"\s*=\s*(\d+)", self.masked)
+        return int(match.group(1)) if match else None
+
+    def _statement(self, index: int) -> Tuple[int, int]:
+        """Span of the block or single statement starting at (or after whitespace from) ``index``"""
+        masked = self.masked
+        while index < len(masked) and masked[index].isspace():
+            index += 1
+        if masked[index:index + 1] == "{":
+            return index, block_end(masked, index)
+        return index, masked.find(";", index) + 1 or len(masked)
+
+    def _find_loops(self) -> List[Loop]:
+        masked = self.masked
+        loops = []
+        for match in _LOOP_RE.finditer(masked):
+            paren = match.end() - 1
+            close = block_end(masked, paren)
+            body_start, body_end = self._statement(close)
+            header = masked[paren:close]
+            trips = Trips("items", "while")
+            if match.group(1) == "for":
+                counted = _COUNTED_FOR_RE.match(header)
+                iterated = _FOR_OF_RE.match(header)
+                if counted:
+                    variable, first, comparison, bound, step = counted.groups()
+                    step_value = int(step) if step and step.isdigit() else (self._constant(step) if step else 1)
+                    trips = Trips("items", bound.strip(), start=int(first), step=step_value or 1,
+                                  inclusive=comparison == "<=")
+                    if bound.isdigit():
+                        trips.kind, trips.count = "fixed", int(bound)
+                    elif not bound.endswith(".length"):
+                        # A count read from a response or argument (e.g. response.data.pages)
+                        trips.kind = "pages"
+                elif iterated:
+                    trips = Trips("items", iterated.group(1).strip())
+            sequential = "await" in masked[body_start:body_end]
+            loops.append(Loop(match.group(1), match.start(), body_start, body_end, trips, sequential,
+                              self.line_of(match.start())))
+
+        for match in _ITERATION_RE.finditer(masked):
+            paren = match.end() - 1
+            collection = re.search(r"([\w$.?]+)$", masked[:match.start()])
+            label = f"{collection.group(1) if collection else '...'}.{match.group(1)}"
+            loops.append(Loop(match.group(1), match.start(), paren, block_end(masked, paren),
+                              Trips("items", label), False, self.line_of(match.start())))
+
+        # A collection filled by push() inside another loop has that loop's length
+        for loop in loops:
+            bound = loop.trips.label
+            if loop.trips.kind == "items" and bound.endswith(".length"):
+                name = re.escape(bound[:-len(".length")])
+                for other in loops:
+                    if other is not loop and re.search(r"\b" + name + r"\.push\(", masked[other.body_start:other.body_end]):
+                        loop.trips = Trips("derived", bound, start=loop.trips.start, step=loop.trips.step,
+                                           inclusive=loop.trips.inclusive, source=other.trips)
+                        break
+        loops.sort(key=lambda loop: loop.start)
+        return loops
+
+    def _find_branches(self) -> List[Branch]:
+        masked = self.masked
+        branches = []
+        for match in _IF_RE.finditer(masked):
+            if re.search(r"\belse\s*$", masked[:match.start()]):
+                continue  # an "else if", part of the chain that starts before it
+            arms = []
+            paren = match.end() - 1
+            while True:
+                arm = self._statement(block_end(masked, paren))
+                arms.append(arm)
+                otherwise = _ELSE_RE.match(masked, arm[1])
+                if not otherwise:
+                    break
+                chained = _IF_RE.match(masked, otherwise.end())
+                if not chained:
+                    arms.append(self._statement(otherwise.end()))
+                    break
+                paren = chained.end() - 1
+            if len(arms) > 1:
+                branches.append(Branch(match.start(), arms[-1][1], arms))
+        for match in _TERNARY_AWAIT_RE.finditer(masked):
+            first = (match.start() + 1, block_end(masked, match.end() - 1))
+            otherwise = _ELSE_AWAIT_RE.match(masked, first[1])
+            if otherwise:
+                second = (first[1], block_end(masked, otherwise.end() - 1))
+                branches.append(Branch(match.start(), second[1], [first, second]))
+        for match in _CATCH_RE.finditer(masked):
+            branches.append(Branch(match.start(), block_end(masked, match.end() - 1), []))
+        branches.sort(key=lambda branch: branch.start)
+        return branches
+
+
+class CostModel:
+    """Round trips per action, by endpoint"""
+
+    def __init__(self, service_map: ServiceMap):
+        self.service_map = service_map
+        self.files: Dict[str, SourceFile] = {}
+        self.unresolved: Dict[Tuple[str, str], List[str]] = {}
+
+    def source(self, path: str) -> SourceFile:
+        if path not in self.files:
+            self.files[path] = SourceFile(path)
+        return self.files[path]
+
+    def requests(self, action: Action, items: int, pages: int) -> Counter:
+        src = self.source(action.file)
+        return self._region(src, action.start, action.end, action.service, items, pages, (action.name,))
+
+    def loops_with_requests(self, action: Action, items: int, pages: int) -> List[Tuple[Loop, Counter]]:
+        src = self.source(action.file)
+        found = []
+        for loop in self._top_loops(src, action.start, action.end):
+            inner = self._region(src, loop.body_start, loop.body_end, action.service, items, pages, (action.name,))
+            if inner:
+                found.append((loop, inner))
+        return found
+
+    def _top_loops(self, src: SourceFile, start: int, end: int) -> List[Loop]:
+        top = []
+        for loop in src.loops:
+            if start <= loop.start and loop.body_end <= end and not any(
+                    other.body_start <= loop.start < other.body_end for other in top):
+                top.append(loop)
+        return top
+
+    def _calls(self, src: SourceFile, start: int, end: int, service: Optional[str], items: int, pages: int, stack):
+        """(offset, requests) for every call in the region that reaches the API"""
+        events = [(call.offset, Counter({(call.method, call.template): 1}))
+                  for call in find_api_calls(src.path, src.text, src.masked, start, end)]
+
+        if service:
+            targets = [(target, name, offset) for target, name, offset in find_delegates(src.masked, start, end, service)]
+        else:
+            targets = [(m.group(1), m.group(2), m.start()) for m in _COMPONENT_CALL_RE.finditer(src.masked, start, end)]
+        for target, name, offset in targets:
+            if target not in self.service_map.services:
+                continue
+            method = self.service_map.get(target, name)
+            if method is None:
+                where = f"{os.path.relpath(src.path, os.path.dirname(self.service_map.src_dir))}:{src.line_of(offset)}"
+                self.unresolved.setdefault((target, name), [])
+                if where not in self.unresolved[(target, name)]:
+                    self.unresolved[(target, name)].append(where)
+                continue
+            key = f"{target}.{name}"
+            callee = self.source(method.file)
+            if key in stack:
+                # Recursion: count the call's own requests once, without following it further
+                events.append((offset, Counter((call.method, call.template) for call in method.calls)))
+            else:
+                events.append((offset, self._region(callee, method.start, method.end, target, items, pages,
+                                                    stack + (key,))))
+
+        for name, (definition, body_start, body_end) in src.functions.items():
+            key = f"{src.path}:{name}"
+            if key in stack or name[:1].isupper():
+                continue
+            for call in re.finditer(r"(?<![\w$.])" + re.escape(name) + r"\s*\(", src.masked[:end]):
+                if call.start() < start or definition <= call.start() < body_start:
+                    continue
+                if re.search(r"function\s+$", src.masked[max(0, call.start() - 20):call.start()]):
+                    continue
+                requests = self._region(src, body_start, body_end, service, items, pages, stack + (key,))
+                if requests:
+                    events.append((call.start(), requests))
+        return events
+
+    def _top_structures(self, src: SourceFile, start: int, end: int) -> List:
+        """Outermost loops and branches within [start, end)"""
+        spans = [(loop.start, loop.body_end, loop) for loop in src.loops]
+        spans += [(branch.start, branch.end, branch) for branch in src.branches]
+        top = []
+        for first, last, structure in sorted(spans, key=lambda span: (span[0], -span[1])):
+            if start <= first and last <= end and not any(s <= first < e for s, e, _other in top):
+                top.append((first, last, structure))
+        return [structure for _first, _last, structure in top]
+
+    def _region(self, src: SourceFile, start: int, end: int, service: Optional[str], items: int, pages: int,
+                stack) -> Counter:
+        """Requests made by one pass over the region: loops multiply, one arm of a branch runs, catch blocks don't"""
+        events = self._calls(src, start, end, service, items, pages, stack)
+        top = self._top_structures(src, start, end)
+        bodies = [(s.body_start, s.body_end) if isinstance(s, Loop) else (s.start, s.end) for s in top]
+        total = Counter()
+        for offset, requests in events:
+            if not any(body_start <= offset < body_end for body_start, body_end in bodies):
+                total.update(requests)
+        for structure in top:
+            if isinstance(structure, Loop):
+                inner = self._region(src, structure.body_start, structure.body_end, service, items, pages, stack)
+                trips = structure.trips.value(items, pages)
+                for key, count in inner.items():
+                    total[key] += count * trips
+            elif structure.arms:
+                # Branch conditions still run; of the arms, count the most expensive
+                bounds = [structure.start] + [edge for arm in structure.arms for edge in arm] + [structure.end]
+                for gap_start, gap_end in zip(bounds[::2], bounds[1::2]):
+                    for offset, requests in events:
+                        if gap_start <= offset < gap_end:
+                            total.update(requests)
+                arms = [self._region(src, arm_start, arm_end, service, items, pages, stack)
+                        for arm_start, arm_end in structure.arms]
+                total.update(max(arms, key=lambda arm: sum(arm.values())))
+        return +total
+
+    def serial_chain(self, action: Action, items: int, pages: int) -> int:
+        """Longest run of awaited, read-only API-reaching calls that do not use each other's results"""
+        src = self.source(action.file)
+        loops = self._top_loops(src, action.start, action.end)
+        longest = run = 0
+        produced: List[str] = []
+        scope = None
+        for match in _AWAIT_CALL_RE.finditer(src.masked, action.start, action.end):
+            if any(loop.start <= match.start() < loop.body_end for loop in loops):
+                continue
+            if any(not branch.arms and branch.start <= match.start() < branch.end for branch in src.branches):
+                continue
+            # Awaits in different arms of a branch never run one after another
+            arms = [arm for branch in src.branches for arm in branch.arms if arm[0] <= match.start() < arm[1]]
+            here = max(arms, default=None)
+            if here != scope:
+                run, produced, scope = 0, [], here
+            paren = match.end() - 1
+            close = block_end(src.masked, paren)
+            requests = self._region(src, match.start(), close, action.service, items, pages, (action.name,))
+            if not requests:
+                continue
+            if any(method != "GET" for method, _template in requests):
+                # Writes are ordered on purpose; only reads could run concurrently
+                run, produced = 0, []
+                continue
+            arguments = src.text[paren:close]
+            if run and not any(re.search(r"\b" + re.escape(name) + r"\b", arguments) for name in produced):
+                run += 1
+            else:
+                run, produced = 1, []
+            if match.group(1):
+                produced.extend(re.findall(r"\w+", match.group(1)))
+            longest = max(longest, run)
+        return longest
+
+
+def find_actions(service_map: ServiceMap, model: CostModel, src_dir: str) -> List[Action]:
+    actions = []
+    for (service, name), method in sorted(service_map.methods.items()):
+        actions.append(Action(f"{service}.{name}", "service", method.file, method.line, method.start, method.end,
+                              method.start, list(method.params), service, name))
+    for path in sorted(glob.glob(os.path.join(src_dir, "components", "**", "*.js*"), recursive=True)):
+        src = model.source(path)
+        component = os.path.splitext(os.path.basename(path))[0]
+        for name, (definition, body_start, body_end) in src.functions.items():
+            if name[:1].isupper():
+                continue
+            header = src.masked[definition:body_start]
+            params = re.search(r"\(([^()]*)\)\s*(?:=>\s*)?$", header.strip())
+            actions.append(Action(f"{component}.{name}", "component", path, src.line_of(definition), body_start,
+                                  body_end, src.expression(name)[0], [p for p in (params.group(1).split(",") if params else []) if p.strip()]))
+    return actions
+
+
+def load_latencies(pattern: str = "api_test_report_*.json") -> Tuple[Dict[Tuple[str, str], float], float]:
+    """Median recorded duration per (method, template), and the overall median"""
+    samples: Dict[Tuple[str, str], List[float]] = {}
+    for report in sorted(glob.glob(pattern)):
+        try:
+            with open(report, "r", encoding="utf-8") as f:
+                results = json.load(f).get("detailed_results", [])
+        except (OSError, ValueError):
+            continue
+        for result in results:
+            if result.get("duration_ms") is None or not result.get("endpoint"):
+                continue
+            method = (result.get("method") or "GET").upper()
+            samples.setdefault((method, template_for(method, result["endpoint"])), []).append(result["duration_ms"])
+    every = [value for values in samples.values() for value in values]
+    overall = statistics.median(every) if every else DEFAULT_LATENCY_MS
+    return {key: statistics.median(values) for key, values in samples.items()}, overall
+
+
+def _argument_for(param: str, items: int):
+    name = param.strip().split("=")[0].strip()
+    lowered = name.lower()
+    if "progress" in lowered or lowered.endswith("callback") or lowered.startswith("on"):
+        return None
+    if lowered in ("page",):
+        return 1
+    if lowered in ("limit", "pagesize"):
+        return 10
+    if lowered == "year":
+        return 2025
+    if lowered.endswith(("data", "list", "ids", "items")) or (lowered.endswith("s") and not lowered.endswith("status")):
+        return [{"id": f"00000000-0000-4000-8000-{index:012d}", "name": f"Item {index}",
+                 "email": f"item{index}@example.com"} for index in range(items)]
+    return "00000000-0000-4000-8000-000000000001"
+
+
+class NodeReplayer:
+    """Runs actions from a copy of src/services and src/utils under Node"""
+
+    def __init__(self, src_dir: str, base_url: str, items: int):
+        self.node = shutil.which("node")
+        self.base_url = base_url
+        self.items = items
+        self.workspace = tempfile.mkdtemp(prefix="nplus1-")
+        self.modules = []
+        for folder in ("services", "utils"):
+            for path in sorted(glob.glob(os.path.join(src_dir, folder, "*.js"))):
+                target = os.path.join(self.workspace, folder, os.path.basename(path))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    text = f.read()
+                # Node's ESM loader needs the extensions the bundler adds
+                text = _IMPORT_SPECIFIER_RE.sub(
+                    lambda m: m.group(1) + m.group(2) + ("" if os.path.splitext(m.group(2))[1] else ".js") + m.group(3),
+                    text,
+                )
+                with open(target, "w", encoding="utf-8") as f:
+                    f.write(text)
+                if folder == "services" and os.path.basename(path) != "index.js":
+                    self.modules.append(target)
+        with open(os.path.join(self.workspace, "package.json"), "w", encoding="utf-8") as f:
+            json.dump({"type": "module"}, f)
+        self.harness = os.path.join(self.workspace, "harness.mjs")
+        with open(self.harness, "w", encoding="utf-8") as f:
+            f.write(_HARNESS)
+
+    def replay(self, action: Action, src: SourceFile) -> Optional[str]:
+        """Run one action; returns the error it raised, if any"""
+        profile = {"company_id": "00000000-0000-4000-8000-000000000001", "role": "admin"}
+        spec = {
+            "baseUrl": self.base_url,
+            "modules": self.modules,
+            "timeoutMs": (REPLAY_TIMEOUT - 5) * 1000,
+            "storage": {
+                "token": "stand-in-token", "authToken": "stand-in-token",
+                "company_id": profile["company_id"], "userProfile": json.dumps(profile),
+                "user": json.dumps({"id": "00000000-0000-4000-8000-000000000002", **profile}),
+            },
+        }
+        if action.kind == "service":
+            spec.update(kind="service", service=action.service, method=action.method,
+                        args=[_argument_for(param, self.items) for param in action.params])
+        else:
+            spec.update(kind="function", source=src.text[action.expression_start:action.end].strip(),
+                        args=[{"$stub": True} for _param in action.params],
+                        helpers={name: src.text[slice(*src.expression(name))].strip()
+                                 for name in src.functions if not name[:1].isupper()})
+        completed = subprocess.run([self.node, self.harness, json.dumps(spec)], capture_output=True, text=True,
+                                   timeout=REPLAY_TIMEOUT, cwd=self.workspace)
+        lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+        if not lines:
+            return (completed.stderr.strip().splitlines() or ["no result"])[-1]
+        return json.loads(lines[-1]).get("error")
+
+    def close(self):
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+
+def build_report(src_dir: str = SRC_DIR, items: int = 20, pages: int = 1, replay: bool = True,
+                 report_glob: str = "api_test_report_*.json") -> Dict:
+    service_map = ServiceMap(src_dir)
+    model = CostModel(service_map)
+    latencies, default_latency = load_latencies(report_glob)
+
+    def latency_of(key):
+        return latencies.get(key, default_latency)
+
+    rows = []
+    for action in find_actions(service_map, model, src_dir):
+        requests = model.requests(action, items, pages)
+        if not requests:
+            continue
+        loops = model.loops_with_requests(action, items, pages)
+        chain = model.serial_chain(action, items, pages)
+        trips = sum(requests.values())
+        if not loops and chain < 2:
+            continue
+        per_item = round((sum(model.requests(action, items * 2, pages).values()) - trips) / items, 2)
+        patterns = [
+            f"{'sequential' if loop.sequential else 'parallel'} {loop.kind} x {loop.trips.describe()} "
+            f"({os.path.basename(action.file)}:{loop.line})"
+            for loop, _inner in loops
+        ]
+        if chain >= 2:
+            patterns.append(f"serial chain of {chain} independent awaits")
+        rows.append({
+            "action": action.name,
+            "kind": action.kind,
+            "location": f"{os.path.relpath(action.file, os.path.dirname(src_dir))}:{action.line}",
+            "round_trips": trips,
+            "per_item": per_item,
+            "endpoints": {f"{m} {t}": count for (m, t), count in sorted(requests.items())},
+            "latency_cost_ms": round(sum(count * latency_of(key) for key, count in requests.items()), 1),
+            "patterns": patterns,
+            "replayed": None,
+            "replay_error": None,
+            "_action": action,
+        })
+
+    node = shutil.which("node")
+    if replay and node and rows:
+        fallback = {"success": True, "data": [{"id": f"00000000-0000-4000-8000-{i:012d}", "name": f"Item {i}"}
+                                              for i in range(items)]}
+        with StandInServer(StandInRoutes(list_length=items), fallback=fallback) as server:
+            replayer = NodeReplayer(src_dir, server.url + "/api/v1", items)
+            try:
+                for row in rows:
+                    action = row["_action"]
+                    server.reset()
+                    try:
+                        row["replay_error"] = replayer.replay(action, model.source(action.file))
+                    except subprocess.TimeoutExpired:
+                        row["replay_error"] = "replay timed out"
+                    row["replayed"] = server.request_count
+            finally:
+                replayer.close()
+
+    for row in rows:
+        del row["_action"]
+    rows.sort(key=lambda row: (-row["latency_cost_ms"], row["action"]))
+    return {
+        "items": items,
+        "pages": pages,
+        "default_latency_ms": default_latency,
+        "replay": "node" if replay and node else ("disabled" if not replay else "node not found"),
+        "hotspots": rows,
+        "unresolved_calls": [
+            {"call": f"{service}.{name}", "call_sites": sites} for (service, name), sites in sorted(model.unresolved.items())
+        ],
+    }
+
+
+def print_report(report: Dict, top: int = 15):
+    print(f"🔁 Chatty-request hotspots (N={report['items']} items, P={report['pages']} pages, "
+          f"replay: {report['replay']})")
+    print(f"   ranked by round trips x recorded endpoint latency (default {report['default_latency_ms']:.0f} ms)\n")
+    print(f"   {'action':52} {'trips':>6} {'/item':>6} {'replay':>8} {'cost ms':>10}")
+    for row in report["hotspots"][:top]:
+        if row["replayed"] is None:
+            replay = "-"
+        elif row["replayed"] == row["round_trips"]:
+            replay = f"✅ {row['replayed']}"
+        else:
+            replay = f"⚠️  {row['replayed']}"
+        print(f"   {row['action']:52} {row['round_trips']:>6} {row['per_item']:>+6.2g} {replay:>8} "
+              f"{row['latency_cost_ms']:>10,.0f}")
+        print(f"      {row['location']}  " + "; ".join(row["patterns"]))
+        if row["replay_error"]:
+            print(f"      replay stopped: {row['replay_error'][:100]}")
+
+    if report["unresolved_calls"]:
+        print("\n❓ Service methods called but not defined (each call throws before any request)")
+        for entry in report["unresolved_calls"]:
+            print(f"   {entry['call']:52} {', '.join(entry['call_sites'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find N+1 and chatty request patterns in the frontend")
+    parser.add_argument("--src", default=SRC_DIR, help="Source directory (default src)")
+    parser.add_argument("--items", type=int, default=20, help="Items per list / array argument (default 20)")
+    parser.add_argument("--pages", type=int, default=1, help="Pages reported by paginated endpoints (default 1)")
+    parser.add_argument("--reports", default="api_test_report_*.json", help="Recorded reports glob (latencies)")
+    parser.add_argument("--top", type=int, default=15, help="Hotspots to print (default 15)")
+    parser.add_argument("--no-replay", action="store_true", help="Skip the Node replay against the stand-in")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    report = build_report(args.src, args.items, args.pages, not args.no_replay, args.reports)
+    print_report(report, args.top)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,601 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Over-Fetch Analyzer
+
+Static endpoint-to-component call graph with an over-fetching estimate:
+
+  * every ``xService.method(...)`` call site under src/components is mapped to
+    the endpoints it hits (service_map.py)
+  * the value it returns is followed through the component by name:
+    assignments, destructuring, ``setX(...)`` state, ``.map/.filter/...``
+    callbacks and JSX props into child components
+  * the response fields read along the way are compared with a response body
+    for the endpoint - a recorded 2xx body from api_test_report_*.json when
+    there is one, otherwise the api_stand_in.py example
+  * unread fields are priced in bytes, per endpoint and per route page view
+    (every GET call site reachable from the route's page components, via
+    import_graph.py), which ranks the endpoints that most need sparse fields
+
+The tracking is name-based and deliberately conservative: a value passed to
+an unknown function counts as fully read, and call sites whose result is not
+assigned, only used through ``Promise.allSettled``, or never read past the
+response envelope are listed as untracked rather than counted as waste.
+
+Usage:
+    python overfetch_analyzer.py [--list-length 20] [--top 15] [--json overfetch.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from api_stand_in import StandInRoutes
+from endpoint_catalog import match_template, normalize_path
+from import_graph import ImportGraph, parse_routes, resolve
+from service_map import SRC_DIR, ServiceMap, block_end, mask_source
+
+FieldPath = Tuple[str, ...]
+
+ELEMENT = "[]"
+# Read by the shared response handling on every call
+ENVELOPE_FIELDS = ("success", "message", "error")
+ITERATORS = {"map", "filter", "forEach", "find", "findIndex", "some", "every", "flatMap", "sort"}
+SAME_ELEMENTS = {"map", "filter", "sort", "slice", "concat", "reverse", "flatMap"}
+NOT_A_READ = {"length"}
+OPAQUE_CALLEES = {"if", "while", "switch", "for", "Boolean", "isArray", "keys", "log", "warn", "error", "info", "debug"}
+
+_CALL_SITE_RE = re.compile(r"\b(\w+Service)\.(\w+)\s*\(")
+_IMPORT_RE = re.compile(r"""^\s*import\s+(\w+)\s*(?:,\s*\{[^}]*\})?\s+from\s+['"](\.[^'"]+)['"]""", re.M)
+_STATE_RE = re.compile(r"const\s*\[\s*(\w+)\s*,\s*(set\w+)\s*\]\s*=\s*useState")
+_CHAIN_RE = re.compile(r"(?:\??\.[A-Za-z_$][\w$]*|\??\.?\[[^\[\]]*\])*")
+_STEP_RE = re.compile(r"\.([A-Za-z_$][\w$]*)|\[([^\]]*)\]")
+_ASSIGN_TAIL_RE = re.compile(
+    r"(?:(const|let|var)\s+)?([\w$]+)\s*=\s*(?:await\s+)?(?:Promise\.all\(\s*)?"
+    r"(?:[^;={},]*?(?:\|\||\?\?|\?|:)\s*)?$"
+)
+_DESTRUCTURE_TAIL_RE = re.compile(r"(?:const|let|var)\s*\{([^}]*)\}\s*=\s*(?:await\s+)?$")
+_SETTER_TAIL_RE = re.compile(r"\b(set[A-Z][\w$]*)\(\s*(?:[^;{},]*?(?:\|\||\?\?|\?|:)\s*)?$")
+_PROP_TAIL_RE = re.compile(r"\b([\w$]+)=\{\s*$")
+_ARGUMENT_TAIL_RE = re.compile(r"([\w$]+)\(\s*(?:[^()]*,\s*)?$")
+_CALLBACK_RE = re.compile(r"\(\s*(?:async\s*)?(?:\(\s*)?(?:(\w+)|\{([^}]*)\})")
+_TEMPLATE_EXPRESSION_RE = re.compile(r"\$\{[^{}`]*\}")
+_DECLARATION_TAIL_RE = re.compile(r"(?:const|let|var)\s*[\[{][^=;]*$")
+# JSX text (``<p>Loading companies...</p>``) and hook dependency lists are not uses
+_JSX_TEXT_TAIL_RE = re.compile(r"(?<![=])>[^<>{}();=]*$")
+_DEPENDENCIES_TAIL_RE = re.compile(r"\}\s*,\s*\[[\w$,.?\s]*$")
+_LOGGING_TAIL_RE = re.compile(r"\bconsole\.\w+\([^;]*$")
+_PARAMETER_PATTERN_NEXT_RE = re.compile(r"[\w$\s,=:]*\}\s*\)\s*=>")
+_EXISTENCE_NEXT_RE = re.compile(r"\s*(?:&&|\?(?![.?]))")
+_THEN_RE = re.compile(r"\s*\.then\(")
+_RESULT_VAR_RE = re.compile(
+    r"(?:const|let|var)\s+(\w+)\s*=\s*await\s+(?:(?:apiService|this)\.(?:get|post|put|patch|delete)\(|\w+\.json\(\))"
+)
+
+
+class Taint(NamedTuple):
+    """``name`` holds the response value at ``path`` within [start, end) of a file"""
+    name: str
+    path: FieldPath
+    start: int
+    end: int
+
+
+@dataclass
+class CallSite:
+    file: str
+    line: int
+    service: str
+    method: str
+    endpoints: List[Tuple[str, str]]
+    tracked: bool = False
+    reads: Set[FieldPath] = field(default_factory=set)
+
+
+def enclosing_end(masked: str, index: int) -> int:
+    """Index of the bracket that closes the block containing ``index``"""
+    depth = 0
+    for position in range(index, len(masked)):
+        char = masked[position]
+        if char in "({[":
+            depth += 1
+        elif char in ")}]":
+            depth -= 1
+            if depth < 0:
+                return position
+    return len(masked)
+
+
+def _keys(pattern: str) -> List[Tuple[str, str]]:
+    """(field, local name) pairs of a destructuring pattern body"""
+    pairs = []
+    for part in pattern.split(","):
+        part = part.split("=")[0].strip()
+        if not part or part.startswith("..."):
+            continue
+        key, _, alias = part.partition(":")
+        pairs.append((key.strip(), (alias or key).strip()))
+    return [(key, alias) for key, alias in pairs if re.fullmatch(r"[\w$]+", key) and re.fullmatch(r"[\w$]+", alias)]
+
+
+class SourceFile:
+    """A component file with the views the tracker needs"""
+
+    def __init__(self, path: str):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            self.text = f.read()
+        self.path = path
+        self.code = mask_source(self.text, strings=False)
+        self.masked = mask_source(self.text)
+        # Identifiers are matched outside strings, except inside ${...} template expressions
+        view = list(self.masked)
+        for expression in _TEMPLATE_EXPRESSION_RE.finditer(self.code):
+            view[expression.start():expression.end()] = self.code[expression.start():expression.end()]
+        self.view = "".join(view)
+        self.states = {setter: state for state, setter in _STATE_RE.findall(self.masked)}
+        self.imports = {}
+        for name, specifier in _IMPORT_RE.findall(self.code):
+            target = resolve(specifier, path)
+            if target and target.endswith((".js", ".jsx")):
+                self.imports[name] = target
+
+    def line_of(self, offset: int) -> int:
+        return self.text.count("\n", 0, offset) + 1
+
+
+class FieldTracker:
+    """Follows response values through component files by name"""
+
+    def __init__(self):
+        self.files: Dict[str, SourceFile] = {}
+
+    def source(self, path: str) -> SourceFile:
+        if path not in self.files:
+            self.files[path] = SourceFile(path)
+        return self.files[path]
+
+    def track(self, path: str, seeds: List[Taint], _visited: Optional[Set] = None) -> Set[FieldPath]:
+        """Response field paths read starting from ``seeds`` in ``path``"""
+        visited = _visited if _visited is not None else set()
+        src = self.source(path)
+        reads: Set[FieldPath] = set()
+        pending = list(seeds)
+        done: Set[Taint] = set()
+
+        while pending:
+            taint = pending.pop()
+            if taint in done:
+                continue
+            done.add(taint)
+            pattern = re.compile(r"(?<![\w$.])" + re.escape(taint.name) + r"(?![\w$])")
+            for occurrence in pattern.finditer(src.view, taint.start, taint.end):
+                new_taints, new_reads, props = self._occurrence(src, taint, occurrence.start(), occurrence.end())
+                pending.extend(new_taints)
+                reads |= new_reads
+                for component, prop, prop_path in props:
+                    child = src.imports.get(component)
+                    key = (child, prop, prop_path)
+                    if child is None:
+                        reads.add(prop_path)
+                    elif key not in visited:
+                        visited.add(key)
+                        child_src = self.source(child)
+                        reads |= self.track(child, [Taint(prop, prop_path, 0, len(child_src.code))], visited)
+        return reads
+
+    def _occurrence(self, src: SourceFile, taint: Taint, start: int, end: int):
+        code, masked, view = src.code, src.masked, src.view
+        after = view[end:end + 40]
+        before = masked[max(0, start - 80):start]
+        # Declarations, assignment targets, object keys and callback parameters are not uses
+        if re.match(r"\s*=(?![=>])", after) or re.match(r"\)?\s*=>", after) or _DECLARATION_TAIL_RE.search(before):
+            return [], set(), []
+        if _JSX_TEXT_TAIL_RE.search(before) or _DEPENDENCIES_TAIL_RE.search(before) or _LOGGING_TAIL_RE.search(before):
+            return [], set(), []
+        if re.search(r"\(\s*\{[\w$\s,=:]*$", before) and _PARAMETER_PATTERN_NEXT_RE.match(after):
+            return [], set(), []
+        if re.match(r"\s*:(?!:)", after) and re.search(r"[{,]\s*$", before):
+            return [], set(), []
+
+        chain_end = _CHAIN_RE.match(view, end).end()
+        path = taint.path
+        method = None
+        steps = _STEP_RE.findall(code[end:chain_end])
+        called = re.match(r"\s*\(", view[chain_end:chain_end + 20]) is not None
+        for position, (name, index) in enumerate(steps):
+            if name and position == len(steps) - 1 and called:
+                method = name
+                break
+            if name in NOT_A_READ:
+                return [], set(), []
+            if name:
+                path = path + (name,)
+            else:
+                literal = index.strip()
+                path = path + ((literal.strip("'\"`"),) if literal[:1] in "'\"`" else (ELEMENT,))
+
+        taints: List[Taint] = []
+        reads: Set[FieldPath] = set()
+        props: List[Tuple[str, str, FieldPath]] = []
+
+        if method == "reduce":
+            # (accumulator, element) => ...
+            paren = code.index("(", chain_end)
+            callback = re.match(r"\(\s*(?:async\s*)?\(\s*[\w$]+\s*,\s*([\w$]+)", code[paren:])
+            if callback:
+                taints.append(Taint(callback.group(1), path + (ELEMENT,), paren, block_end(masked, paren)))
+            return taints, reads, props
+
+        if method in ITERATORS or method in SAME_ELEMENTS:
+            # Follow the callback parameter, and any chained array calls after it
+            paren = code.index("(", chain_end)
+            result_path = path
+            while True:
+                close = block_end(masked, paren)
+                callback = _CALLBACK_RE.match(code, paren)
+                if method in ITERATORS and callback:
+                    element = path + (ELEMENT,)
+                    if callback.group(1):
+                        taints.append(Taint(callback.group(1), element, paren, close))
+                    else:
+                        for key, alias in _keys(callback.group(2)):
+                            reads.add(element + (key,))
+                            taints.append(Taint(alias, element + (key,), paren, close))
+                if method == "find":
+                    result_path = path + (ELEMENT,)
+                following = re.match(r"\s*\??\.(\w+)\s*\(", code[close:close + 40])
+                if not following or following.group(1) not in ITERATORS | SAME_ELEMENTS:
+                    break
+                method = following.group(1)
+                paren = close + following.end() - 1
+            taints.extend(self._flows(src, start, result_path, reads, props, allow_read=False))
+            return taints, reads, props
+
+        if method is not None:
+            # A method on a field (e.g. .toLowerCase(), .includes()) reads that field
+            if path:
+                reads.add(path)
+            return taints, reads, props
+
+        if _EXISTENCE_NEXT_RE.match(view, chain_end) or (
+                re.match(r"\s*\)", view[chain_end:chain_end + 5]) and re.search(r"(?:&&|\bif\s*\(\s*!?)\s*$", before)):
+            # Only checked for presence (``x.data && ...``, ``if (x.data)``, ``x.data ? a : b``)
+            return taints, reads, props
+        taints.extend(self._flows(src, start, path, reads, props, allow_read=bool(steps) or bool(taint.path)))
+        return taints, reads, props
+
+    def _local_parameter(self, src: SourceFile, function: str, index: int):
+        """(parameter, body start, body end) of a function defined in the same file"""
+        definition = _local_function_re(function).search(src.masked)
+        if not definition:
+            return None
+        params = [p.split("=")[0].strip() for p in (definition.group(1) or definition.group(2) or "").split(",")]
+        if index >= len(params) or not re.fullmatch(r"[\w$]+", params[index]):
+            return None
+        body = definition.end() - 1
+        return params[index], body, block_end(src.masked, body)
+
+    def _flows(self, src: SourceFile, start: int, path: FieldPath, reads: Set[FieldPath], props, allow_read: bool):
+        """Where a value at ``start`` goes: new names, props, or a plain read"""
+        code, masked = src.code, src.masked
+        window = masked[max(0, start - 300):start]
+        boundary = max(window.rfind(";"), window.rfind("{"), window.rfind("}"))
+        statement = window[boundary + 1:]
+
+        setter = _SETTER_TAIL_RE.search(window[-200:])
+        if setter and setter.group(1) in src.states:
+            return [Taint(src.states[setter.group(1)], path, 0, len(code))]
+        prop = _PROP_TAIL_RE.search(window)
+        if prop:
+            tag = list(re.finditer(r"<([A-Z]\w*)", window))
+            if tag and "<" not in window[tag[-1].end():] and ">" not in window[tag[-1].end():].replace("=>", ""):
+                props.append((tag[-1].group(1), prop.group(1), path))
+                return []
+        destructure = _DESTRUCTURE_TAIL_RE.search(masked[max(0, start - 300):start])
+        if destructure:
+            region_end = enclosing_end(masked, start)
+            taints = []
+            for key, alias in _keys(destructure.group(1)):
+                reads.add(path + (key,))
+                taints.append(Taint(alias, path + (key,), start, region_end))
+            return taints
+        assignment = _ASSIGN_TAIL_RE.search(statement)
+        if assignment and assignment.group(2) not in ("const", "let", "var"):
+            name = assignment.group(2)
+            scope = start
+            if not assignment.group(1):
+                # Reassignment: the name lives as long as its declaration
+                declarations = list(re.finditer(r"\b(?:let|var|const)\s+" + re.escape(name) + r"\b", code[:start]))
+                scope = declarations[-1].start() if declarations else start
+            return [Taint(name, path, start, enclosing_end(masked, scope))]
+        if re.search(r"(?:\.\.\.|\breturn)\s*$", window):
+            # Spread into a new object or returned: followed where that value lands
+            return []
+        if not allow_read:
+            return []
+        argument = _ARGUMENT_TAIL_RE.search(window[-200:])
+        if argument:
+            if argument.group(1) in OPAQUE_CALLEES:
+                return []
+            local = self._local_parameter(src, argument.group(1), argument.group(0).count(","))
+            if local:
+                return [Taint(local[0], path, local[1], local[2])]
+            # Handed to code we do not follow: assume all of it is used
+            reads.add(path)
+        elif path and not re.search(r"!\s*$", window):
+            # Rendered, compared, interpolated, ...
+            reads.add(path)
+        return []
+
+
+def _local_function_re(name: str) -> re.Pattern:
+    return re.compile(
+        r"(?:(?:const|let)\s+" + re.escape(name) + r"\s*=\s*(?:useCallback\(\s*)?(?:async\s*)?\(([^)]*)\)\s*=>\s*|"
+        r"function\s+" + re.escape(name) + r"\s*\(([^)]*)\)\s*)\{"
+    )
+
+
+def service_reads(tracker: FieldTracker, service_map: ServiceMap, service: str, name: str):
+    """(returned path, fields read) for a service method
+
+    The returned path is the part of the body handed back to the caller
+    (``return result.data`` -> ("data",)), or None when the method returns
+    something computed from it - then only the service's own reads count.
+    """
+    method = service_map.get(service, name)
+    if not method:
+        return (), set()
+    src = tracker.source(method.file)
+    result = _RESULT_VAR_RE.search(src.code, method.start, method.end)
+    if not result:
+        return (), set()
+    variable = result.group(1)
+    reads = tracker.track(method.file, [Taint(variable, (), result.end(), method.end)])
+    returned = re.compile(r"\breturn\s+" + re.escape(variable) + r"((?:\??\.\w+)*)\s*(?:;|\n|\}|\|\|)")
+    match = returned.search(src.code, result.end(), method.end)
+    prefix = tuple(re.findall(r"\w+", match.group(1))) if match else None
+    reads.discard(prefix)
+    return prefix, reads
+
+
+def find_call_sites(tracker: FieldTracker, service_map: ServiceMap, components_dir: str) -> List[CallSite]:
+    sites = []
+    for path in sorted(glob.glob(os.path.join(components_dir, "**", "*.js*"), recursive=True)):
+        src = tracker.source(path)
+        for call in _CALL_SITE_RE.finditer(src.masked):
+            service, name = call.group(1), call.group(2)
+            if service not in service_map.services:
+                continue
+            endpoints = sorted({(c.method, c.template) for c in service_map.endpoints(service, name)})
+            if not endpoints:
+                continue
+            site = CallSite(path, src.line_of(call.start()), service, name, endpoints)
+            prefix, inner_reads = service_reads(tracker, service_map, service, name)
+            if prefix is None:
+                site.tracked, site.reads = True, inner_reads
+                sites.append(site)
+                continue
+            seeds = []
+            window = src.masked[max(0, call.start() - 200):call.start()]
+            assignment = re.search(r"(?:(?:const|let|var)\s+)?([\w$]+)\s*=\s*await\s+$", window)
+            if assignment:
+                seeds.append(Taint(assignment.group(1), prefix, call.start(), enclosing_end(src.masked, call.start())))
+            close = block_end(src.masked, call.end() - 1)
+            then = _THEN_RE.match(src.masked, close)
+            if then:
+                paren = close + then.end() - 1
+                callback = _CALLBACK_RE.match(src.code, paren)
+                if callback and callback.group(1):
+                    seeds.append(Taint(callback.group(1), prefix, paren, block_end(src.masked, paren)))
+            if seeds:
+                site.tracked = True
+                site.reads = inner_reads | tracker.track(path, seeds)
+            sites.append(site)
+    return sites
+
+
+def load_recorded(pattern: str = "api_test_report_*.json") -> Dict[Tuple[str, str], Any]:
+    """Largest recorded 2xx JSON body per (method, template)"""
+    bodies: Dict[Tuple[str, str], Any] = {}
+    for report in sorted(glob.glob(pattern)):
+        try:
+            with open(report, "r", encoding="utf-8") as f:
+                results = json.load(f).get("detailed_results", [])
+        except (OSError, ValueError):
+            continue
+        for result in results:
+            status = result.get("status_code") or 0
+            body = result.get("response_data")
+            if not 200 <= status < 300 or not isinstance(body, (dict, list)):
+                continue
+            method = (result.get("method") or "GET").upper()
+            template = match_template(method, normalize_path(result.get("endpoint", "")))
+            if template and json_size(body) > json_size(bodies.get((method, template))):
+                bodies[(method, template)] = body
+    return bodies
+
+
+def json_size(value: Any) -> int:
+    if value is None:
+        return 0
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def unread_bytes(value: Any, path: FieldPath, reads: Set[FieldPath]) -> Tuple[int, Set[FieldPath]]:
+    """Bytes of ``value`` (at ``path``) that no read path touches, and the unread field paths"""
+    if any(path[:len(read)] == read for read in reads):
+        return 0, set()
+    if not any(read[:len(path)] == path for read in reads):
+        return json_size(value), {path}
+    total, unread = 0, set()
+    if isinstance(value, dict):
+        for key, child in value.items():
+            size, paths = unread_bytes(child, path + (key,), reads)
+            if paths == {path + (key,)}:
+                size += json_size(key) + 2  # key, colon and separator
+            total += size
+            unread |= paths
+    elif isinstance(value, list):
+        for child in value:
+            size, paths = unread_bytes(child, path + (ELEMENT,), reads)
+            total += size
+            unread |= paths
+    return total, unread
+
+
+def has_path(value: Any, path: FieldPath) -> bool:
+    for step in path:
+        if step == ELEMENT and isinstance(value, list) and value:
+            value = value[0]
+        elif isinstance(value, dict) and step in value:
+            value = value[step]
+        else:
+            return False
+    return True
+
+
+def dotted(path: FieldPath) -> str:
+    return ".".join(path).replace(".[]", "[]") or "(body)"
+
+
+def build_report(src_dir: str = SRC_DIR, list_length: int = 20, report_glob: str = "api_test_report_*.json") -> Dict:
+    service_map = ServiceMap(src_dir)
+    tracker = FieldTracker()
+    sites = find_call_sites(tracker, service_map, os.path.join(src_dir, "components"))
+    recorded = load_recorded(report_glob)
+    stand_in = StandInRoutes(list_length=list_length)
+
+    # Union of reads per endpoint: a field is only removable if no consumer reads it
+    consumers: Dict[Tuple[str, str], List[CallSite]] = {}
+    for site in sites:
+        for endpoint in site.endpoints:
+            consumers.setdefault(endpoint, []).append(site)
+
+    endpoints = {}
+    for (method, template), users in consumers.items():
+        if (method, template) in recorded:
+            body, source = recorded[(method, template)], "recorded"
+        elif (method, template) in stand_in.bodies:
+            body, source = json.loads(stand_in.bodies[(method, template)]), "stand-in"
+        else:
+            body, source = None, "none"
+        # A consumer with no reads past the envelope either ignores the body or hands it
+        # on in a way the tracker cannot follow (``setX(Array.isArray(data) ? data :
+        # data.items)``) - conservatively untracked rather than counted as reading nothing
+        tracked = [site for site in users if site.tracked
+                   and any(read[0] not in ENVELOPE_FIELDS for read in site.reads)]
+        # A consumer reading only fields the body does not have expects another
+        # shape - its real reads are unknown, so it is left out like untracked ones
+        mismatched = [site for site in tracked if body is not None
+                      and not any(has_path(body, read) for read in site.reads if read[0] not in ENVELOPE_FIELDS)]
+        counted = [site for site in tracked if site not in mismatched]
+        reads = set().union(*(site.reads for site in counted)) | {(name,) for name in ENVELOPE_FIELDS}
+        wasted, unread = unread_bytes(body, (), reads) if body is not None and counted else (0, set())
+        size = json_size(body)
+        endpoints[(method, template)] = {
+            "method": method,
+            "template": template,
+            "source": source,
+            "response_bytes": size,
+            "wasted_bytes": wasted,
+            "wasted_pct": round(wasted / size * 100, 1) if size else 0.0,
+            "fields_read": sorted(dotted(p) for p in reads if p[0] not in ENVELOPE_FIELDS and has_path(body, p)),
+            "fields_unread": sorted(dotted(p) for p in unread),
+            "call_sites": [f"{os.path.relpath(s.file, os.path.dirname(src_dir))}:{s.line}" for s in users],
+            "untracked_call_sites": len(users) - len(tracked),
+            "shape_mismatches": [f"{os.path.relpath(s.file, os.path.dirname(src_dir))}:{s.line}" for s in mismatched],
+            "routes": [],
+        }
+
+    graph = ImportGraph(src_dir, None).build()
+    routes, imports = parse_routes(os.path.join(graph.src_dir, "App.jsx"))
+    page_modules = {imports[name] for _path, pages in routes for name in pages}
+    shell = graph.reachable({os.path.join(graph.src_dir, "index.js")}, stop=page_modules)
+    route_rows = []
+    for route, pages in routes:
+        modules = shell | graph.reachable({imports[name] for name in pages})
+        fetched = [(site, endpoint) for site in sites if os.path.abspath(site.file) in modules
+                   for endpoint in site.endpoints if endpoint[0] == "GET"]
+        for _site, endpoint in fetched:
+            if route not in endpoints[endpoint]["routes"]:
+                endpoints[endpoint]["routes"].append(route)
+        route_rows.append({
+            "route": route,
+            "pages": pages,
+            "get_call_sites": len(fetched),
+            "wasted_bytes": sum(endpoints[endpoint]["wasted_bytes"] for _site, endpoint in fetched),
+            "response_bytes": sum(endpoints[endpoint]["response_bytes"] for _site, endpoint in fetched),
+        })
+    route_rows.sort(key=lambda row: (-row["wasted_bytes"], row["route"]))
+
+    ranked = sorted(endpoints.values(), key=lambda row: (-row["wasted_bytes"] * max(len(row["routes"]), 1), row["template"]))
+    return {
+        "list_length": list_length,
+        "call_sites": len(sites),
+        "tracked_call_sites": sum(site.tracked for site in sites),
+        "endpoints": ranked,
+        "routes": route_rows,
+    }
+
+
+def print_report(report: Dict, top: int = 15):
+    print(f"🔎 {report['call_sites']} service call sites in src/components "
+          f"({report['tracked_call_sites']} with a tracked result), lists of {report['list_length']}")
+
+    print("\n📦 Endpoints by wasted bytes per page view (wasted x routes fetching it)")
+    for row in report["endpoints"][:top]:
+        if not row["wasted_bytes"]:
+            continue
+        print(f"   {row['method']:6} {row['template']:45} {row['wasted_bytes']:>8,} of {row['response_bytes']:>8,} B "
+              f"({row['wasted_pct']:>5.1f}%)  {len(row['routes'])} route(s)  [{row['source']}]")
+        print(f"          read:   {', '.join(row['fields_read']) or '-'}")
+        print(f"          unread: {', '.join(row['fields_unread'][:12])}"
+              f"{' ...' if len(row['fields_unread']) > 12 else ''}")
+
+    print("\n🧭 Routes by wasted bytes per page view (every reachable GET call site fires once)")
+    for row in report["routes"][:top]:
+        if row["get_call_sites"]:
+            print(f"   {row['route']:40} {row['wasted_bytes']:>8,} of {row['response_bytes']:>8,} B  "
+                  f"{row['get_call_sites']} GET call site(s)")
+
+    mismatched = [row for row in report["endpoints"] if row["shape_mismatches"]]
+    if mismatched:
+        print("\n⚠️  Consumers reading fields the response does not have (expecting another shape)")
+        for row in mismatched:
+            print(f"   {row['method']:6} {row['template']:45} {', '.join(row['shape_mismatches'])}")
+
+    unsampled = [row for row in report["endpoints"] if row["source"] == "none"]
+    if unsampled:
+        print("\n📭 No recorded or stand-in body to compare (counted as 0 B)")
+        for row in unsampled:
+            print(f"   {row['method']:6} {row['template']}")
+
+    untracked = [row for row in report["endpoints"] if row["untracked_call_sites"]]
+    if untracked:
+        print("\n❔ Call sites whose result is not followed (not counted as waste)")
+        for row in untracked:
+            print(f"   {row['method']:6} {row['template']:45} {row['untracked_call_sites']} of {len(row['call_sites'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate over-fetched response bytes per endpoint and page view")
+    parser.add_argument("--src", default=SRC_DIR, help="Source directory (default src)")
+    parser.add_argument("--list-length", type=int, default=20, help="Items per list in stand-in responses (default 20)")
+    parser.add_argument("--reports", default="api_test_report_*.json", help="Recorded reports glob")
+    parser.add_argument("--top", type=int, default=15, help="Rows to print per section (default 15)")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    report = build_report(args.src, args.list_length, args.reports)
+    print_report(report, args.top)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Page-Load Simulator
+
+Estimates how long each route takes to become ready - every request made by
+its mount effects has completed - before a change ships:
+
+  * the page -> service -> endpoint call graph is extracted from src/: each
+    ``useEffect`` of the route's components, the local functions and service
+    methods it calls, and the API calls those make. ``await`` puts calls in
+    sequence, ``Promise.all``/``allSettled`` and un-awaited calls run them
+    concurrently, loops repeat them for N items
+  * every request's latency is drawn from the recorded durations of its
+    endpoint in api_test_report_*.json, or in result stores saved with
+    ``--store`` (``--reports "runs/*.npz"``) for runs too large to list
+    every request in the JSON report
+  * page-ready time is sampled with a vectorised Monte Carlo run and reported
+    as percentiles, together with the await chain that is most often the
+    critical path
+
+Endpoints with few recorded samples keep their recorded median and borrow
+their spread: the pooled per-endpoint spread when enough endpoints have
+several samples, otherwise a lognormal with ``--sigma``. Endpoints never
+recorded use the median of all successful samples. Of each if/else the arm
+with the most requests is taken; catch blocks are left out.
+
+Usage:
+    python page_load_simulator.py [--route /admin/dashboard] [--samples 10000] [--items 20] [--json pageload.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from endpoint_catalog import template_for
+from import_graph import ImportGraph, parse_routes
+from nplus1_detector import Branch, Loop, SourceFile
+from result_store import ResultStore, report_results
+from service_map import SRC_DIR, ServiceMap, block_end, find_api_calls, find_delegates
+
+DEFAULT_SAMPLES = 10000
+DEFAULT_SIGMA = 0.35
+DEFAULT_LATENCY_MS = 300.0
+MIN_EMPIRICAL_SAMPLES = 5
+MIN_POOLED_RATIOS = 20
+
+_COMPONENT_CALL_RE = re.compile(r"\b(\w+Service)\.(\w+)\s*\(")
+_EFFECT_RE = re.compile(r"\buseEffect\s*\(\s*(?:(?:async\s*)?\([^()]*\)\s*=>\s*\{|(\w+)\s*[,)])")
+_CONCURRENT_RE = re.compile(r"\bPromise\.(?:all|allSettled)\s*\(")
+_AWAITED_RE = re.compile(r"(?:\bawait|\breturn)\s*\(?\s*$")
+
+
+@dataclass
+class Step:
+    """A request ("call"), or steps run one after another ("seq") or concurrently ("par")"""
+    kind: str
+    children: List["Step"] = field(default_factory=list)
+    endpoint: Optional[Tuple[str, str]] = None
+    origin: str = ""
+
+    def requests(self) -> int:
+        return 1 if self.kind == "call" else sum(child.requests() for child in self.children)
+
+    def endpoints(self) -> Counter:
+        """Requests per (method, template)"""
+        if self.kind == "call":
+            return Counter({self.endpoint: 1})
+        return sum((child.endpoints() for child in self.children), Counter())
+
+
+def seq(steps: List[Step]) -> Step:
+    flat = [c for s in steps for c in (s.children if s.kind == "seq" else [s]) if c.kind == "call" or c.children]
+    return flat[0] if len(flat) == 1 else Step("seq", flat)
+
+
+def par(steps: List[Step]) -> Step:
+    flat = [c for s in steps for c in (s.children if s.kind == "par" else [s]) if c.kind == "call" or c.children]
+    return flat[0] if len(flat) == 1 else Step("par", flat)
+
+
+@dataclass
+class _Item:
+    order: int
+    step: Step
+    blocking: bool
+
+
+class PlanBuilder:
+    """Request plans (Step trees) for regions of source files, following calls"""
+
+    def __init__(self, service_map: ServiceMap, items: int = 20, pages: int = 1):
+        self.service_map = service_map
+        self.items = items
+        self.pages = pages
+        self.files: Dict[str, SourceFile] = {}
+
+    def source(self, path: str) -> SourceFile:
+        if path not in self.files:
+            self.files[path] = SourceFile(path)
+        return self.files[path]
+
+    def mount(self, path: str) -> Step:
+        """Requests made by the useEffect callbacks of a component file; effects start together"""
+        src = self.source(path)
+        effects = []
+        for match in _EFFECT_RE.finditer(src.masked):
+            if match.group(1):
+                if match.group(1) in src.functions:
+                    _definition, body_start, body_end = src.functions[match.group(1)]
+                    effects.append(self.plan(src, body_start, body_end, None, (f"{path}:{match.group(1)}",))[0])
+            else:
+                body = match.end() - 1
+                effects.append(self.plan(src, body, block_end(src.masked, body), None, ())[0])
+        return par(effects)
+
+    def plan(self, src: SourceFile, start: int, end: int, service: Optional[str], stack) -> Tuple[Step, bool]:
+        """Step tree for one pass over [start, end), and whether it awaits anything"""
+        structures = self._top_structures(src, start, end)
+        spans = [self._body(s) for s in structures]
+        items = []
+        for offset, step in self._calls(src, start, end, service, stack):
+            if not any(first <= offset < last for first, last in spans):
+                items.append(_Item(offset, step, self._awaited(src, offset)))
+
+        for structure in structures:
+            if isinstance(structure, Loop):
+                inner, blocking = self.plan(src, structure.body_start, structure.body_end, service, stack)
+                copies = [inner] * structure.trips.value(self.items, self.pages)
+                items.append(_Item(structure.body_start, seq(copies) if structure.sequential else par(copies),
+                                   structure.sequential and blocking))
+            elif isinstance(structure, Branch):
+                if not structure.arms:
+                    continue  # catch block
+                arms = [self.plan(src, arm_start, arm_end, service, stack) for arm_start, arm_end in structure.arms]
+                step, blocking = max(arms, key=lambda arm: arm[0].requests())
+                items.append(_Item(structure.arms[0][0], step, blocking))
+            else:
+                first, last = structure
+                inner = self._concurrent(src, first, last, service, stack)
+                items.append(_Item(first, inner, self._awaited(src, first)))
+
+        # An un-awaited step runs alongside everything after it
+        items.sort(key=lambda item: item.order)
+        step = Step("seq")
+        for item in reversed(items):
+            step = seq([item.step, step]) if item.blocking else par([item.step, step])
+        return step, any(item.blocking for item in items)
+
+    def _concurrent(self, src: SourceFile, start: int, end: int, service: Optional[str], stack) -> Step:
+        """Promise.all(...): every element - call, loop or nested plan - runs concurrently"""
+        paren = _CONCURRENT_RE.match(src.masked, start).end() - 1
+        structures = self._top_structures(src, paren + 1, end - 1)
+        spans = [self._body(s) for s in structures]
+        steps = [step for offset, step in self._calls(src, paren + 1, end - 1, service, stack)
+                 if not any(first <= offset < last for first, last in spans)]
+        for structure in structures:
+            if isinstance(structure, Loop):
+                inner, _blocking = self.plan(src, structure.body_start, structure.body_end, service, stack)
+                steps.extend([inner] * structure.trips.value(self.items, self.pages))
+            elif isinstance(structure, Branch) and structure.arms:
+                arms = [self.plan(src, s, e, service, stack)[0] for s, e in structure.arms]
+                steps.append(max(arms, key=Step.requests))
+            elif isinstance(structure, tuple):
+                steps.append(self._concurrent(src, structure[0], structure[1], service, stack))
+        return par(steps)
+
+    @staticmethod
+    def _body(structure) -> Tuple[int, int]:
+        if isinstance(structure, Loop):
+            return structure.body_start, structure.body_end
+        if isinstance(structure, Branch):
+            return structure.start, structure.end
+        return structure
+
+    @staticmethod
+    def _awaited(src: SourceFile, offset: int) -> bool:
+        return bool(_AWAITED_RE.search(src.masked, max(0, offset - 40), offset))
+
+    def _top_structures(self, src: SourceFile, start: int, end: int) -> List:
+        """Outermost loops, branches and Promise.all calls within [start, end)"""
+        spans = [(loop.start, loop.body_end, loop) for loop in src.loops]
+        spans += [(branch.start, branch.end, branch) for branch in src.branches]
+        for match in _CONCURRENT_RE.finditer(src.masked, start, end):
+            span = (match.start(), block_end(src.masked, match.end() - 1))
+            spans.append((span[0], span[1], span))
+        top = []
+        for first, last, structure in sorted(spans, key=lambda span: (span[0], -span[1])):
+            if start <= first and last <= end and not any(s <= first < e for s, e, _other in top):
+                top.append((first, last, structure))
+        return [structure for _first, _last, structure in top]
+
+    def _calls(self, src: SourceFile, start: int, end: int, service: Optional[str], stack) -> List[Tuple[int, Step]]:
+        """(offset, plan) for every call in the region that reaches the API"""
+        origin = stack[-1].rsplit(":", 1)[-1] if stack else os.path.basename(src.path)
+        events = [(call.offset, Step("call", endpoint=(call.method, call.template), origin=origin))
+                  for call in find_api_calls(src.path, src.text, src.masked, start, end)]
+
+        if service:
+            targets = find_delegates(src.masked, start, end, service)
+        else:
+            targets = [(m.group(1), m.group(2), m.start()) for m in _COMPONENT_CALL_RE.finditer(src.masked, start, end)]
+        for target, name, offset in targets:
+            method = self.service_map.get(target, name)
+            key = f"{target}.{name}"
+            if method is None or key in stack:
+                continue
+            step, _blocking = self.plan(self.source(method.file), method.start, method.end, target, stack + (key,))
+            if step.kind == "call" or step.children:
+                events.append((offset, step))
+
+        for name, (definition, body_start, body_end) in src.functions.items():
+            key = f"{src.path}:{name}"
+            if key in stack or name[:1].isupper():
+                continue
+            for call in re.finditer(r"(?<![\w$.])" + re.escape(name) + r"\s*\(", src.masked[:end]):
+                if call.start() < start or definition <= call.start() < body_start:
+                    continue
+                if re.search(r"function\s+$", src.masked[max(0, call.start() - 20):call.start()]):
+                    continue
+                step, _blocking = self.plan(src, body_start, body_end, service, stack + (key,))
+                if step.kind == "call" or step.children:
+                    events.append((call.start(), step))
+        return events
+
+
+class LatencyModel:
+    """Per-endpoint latency samplers built from recorded api_test_report_*.json runs"""
+
+    def __init__(self, pattern: str = "api_test_report_*.json", sigma: float = DEFAULT_SIGMA,
+                 rng: Optional[np.random.Generator] = None):
+        self.rng = rng or np.random.default_rng()
+        self.sigma = sigma
+        successful: Dict[Tuple[str, str], List[float]] = {}
+        every: Dict[Tuple[str, str], List[float]] = {}
+        for report in sorted(glob.glob(pattern)):
+            if report.endswith(".npz"):
+                self._add_store(report, successful, every)
+                continue
+            try:
+                with open(report, "r", encoding="utf-8") as f:
+                    results = report_results(json.load(f), report)
+            except (OSError, ValueError):
+                continue
+            for result in results:
+                if result.get("duration_ms") is None or not result.get("endpoint"):
+                    continue
+                method = (result.get("method") or "GET").upper()
+                key = (method, template_for(method, result["endpoint"]))
+                every.setdefault(key, []).append(result["duration_ms"])
+                if result.get("success"):
+                    successful.setdefault(key, []).append(result["duration_ms"])
+        # Failed requests (401s, 404s) return early; prefer the successful samples of an endpoint
+        self.samples = {key: np.array(successful.get(key) or values) for key, values in every.items()}
+        pooled = [v for values in successful.values() for v in values] or [v for vs in every.values() for v in vs]
+        self.default_ms = statistics.median(pooled) if pooled else DEFAULT_LATENCY_MS
+        ratios = [v / np.median(values) for values in self.samples.values() if len(values) >= 2 for v in values]
+        self.ratios = np.array(ratios) if len(ratios) >= MIN_POOLED_RATIOS else None
+
+    @staticmethod
+    def _add_store(path: str, successful: Dict[Tuple[str, str], List[float]],
+                   every: Dict[Tuple[str, str], List[float]]):
+        """Durations per endpoint from a result store (``--store results.npz``)"""
+        store = ResultStore.load(path)
+        routes, durations = store.column("route"), store.column("duration_ms")
+        ok = store.column("success") > 0
+        labels = store.labels("route")
+        for code in np.unique(routes):
+            method, _, template = labels[code].partition(" ")
+            rows = routes == code
+            every.setdefault((method, template), []).extend(durations[rows].tolist())
+            if (rows & ok).any():
+                successful.setdefault((method, template), []).extend(durations[rows & ok].tolist())
+
+    def median(self, endpoint: Tuple[str, str]) -> float:
+        own = self.samples.get(endpoint)
+        return float(np.median(own)) if own is not None else self.default_ms
+
+    def recorded(self, endpoint: Tuple[str, str]) -> int:
+        own = self.samples.get(endpoint)
+        return 0 if own is None else len(own)
+
+    def sample(self, endpoint: Tuple[str, str], n: int) -> np.ndarray:
+        own = self.samples.get(endpoint)
+        if own is not None and len(own) >= MIN_EMPIRICAL_SAMPLES:
+            return self.rng.choice(own, n)
+        median = self.median(endpoint)
+        if self.ratios is not None:
+            return median * self.rng.choice(self.ratios, n)
+        return median * self.rng.lognormal(0.0, self.sigma, n)
+
+
+class Simulator:
+    """Vectorised Monte Carlo over a Step tree: one column per sampled page load
+
+    Alongside the times, every sample carries the id of the chain of requests
+    that decided it (its critical path).
+    """
+
+    def __init__(self, latencies: LatencyModel, samples: int = DEFAULT_SAMPLES):
+        self.latencies = latencies
+        self.n = samples
+        self.paths: List[Tuple] = []
+        self._path_ids: Dict[Tuple, int] = {}
+
+    def _path(self, chain: Tuple) -> int:
+        if chain not in self._path_ids:
+            self._path_ids[chain] = len(self.paths)
+            self.paths.append(chain)
+        return self._path_ids[chain]
+
+    def run(self, step: Step) -> Tuple[np.ndarray, np.ndarray]:
+        if step.kind == "call":
+            link = (step.endpoint, step.origin)
+            return self.latencies.sample(step.endpoint, self.n), np.full(self.n, self._path((link,)))
+        if not step.children:
+            return np.zeros(self.n), np.full(self.n, self._path(()))
+        results = [self.run(child) for child in step.children]
+        times = np.stack([t for t, _p in results])
+        paths = np.stack([p for _t, p in results])
+        if step.kind == "par":
+            winner = times.argmax(axis=0)
+            columns = np.arange(self.n)
+            return times[winner, columns], paths[winner, columns]
+        # Sequence: the chain is every child's chain in order
+        combos, inverse = np.unique(paths, axis=1, return_inverse=True)
+        ids = np.array([self._path(sum((self.paths[i] for i in combo), ())) for combo in combos.T])
+        return times.sum(axis=0), ids[inverse.reshape(-1)]
+
+
+def find_pages(src_dir: str, own_only: bool = False) -> List[Tuple[str, List[str]]]:
+    """(route, component files whose effects run when it loads)"""
+    graph = ImportGraph(src_dir, None).build()
+    routes, imports = parse_routes(os.path.join(graph.src_dir, "App.jsx"))
+    components_dir = os.path.join(graph.src_dir, "components")
+    pages = []
+    for route, names in routes:
+        roots = {imports[name] for name in names if name in imports}
+        modules = roots if own_only else graph.reachable(roots)
+        files = sorted(m for m in modules if m.startswith(components_dir) and m.endswith((".js", ".jsx")))
+        if files:
+            pages.append((route, files))
+    return pages
+
+
+def build_report(src_dir: str = SRC_DIR, samples: int = DEFAULT_SAMPLES, items: int = 20, pages: int = 1,
+                 route: Optional[str] = None, own_only: bool = False, sigma: float = DEFAULT_SIGMA,
+                 seed: Optional[int] = None, report_glob: str = "api_test_report_*.json") -> Dict:
+    rng = np.random.default_rng(seed)
+    latencies = LatencyModel(report_glob, sigma, rng)
+    builder = PlanBuilder(ServiceMap(src_dir), items, pages)
+    root = os.path.dirname(src_dir)
+    rows = []
+    for path, files in find_pages(src_dir, own_only):
+        if route and path != route:
+            continue
+        plan = par([builder.mount(file) for file in files])
+        if not plan.requests():
+            continue
+        simulator = Simulator(latencies, samples)
+        times, path_ids = simulator.run(plan)
+        chain_id, hits = Counter(path_ids.tolist()).most_common(1)[0]
+        endpoints = plan.endpoints()
+        rows.append({
+            "route": path,
+            "components": [os.path.relpath(f, root) for f in files],
+            "requests": plan.requests(),
+            "unrecorded_endpoints": sorted(f"{m} {t}" for m, t in endpoints if not latencies.recorded((m, t))),
+            "p50_ms": round(float(np.percentile(times, 50)), 1),
+            "p90_ms": round(float(np.percentile(times, 90)), 1),
+            "p99_ms": round(float(np.percentile(times, 99)), 1),
+            "mean_ms": round(float(times.mean()), 1),
+            "critical_path": [
+                {"endpoint": f"{endpoint[0]} {endpoint[1]}", "from": origin,
+                 "median_ms": round(latencies.median(endpoint), 1)}
+                for endpoint, origin in simulator.paths[chain_id]
+            ],
+            "critical_path_share": round(hits / samples, 3),
+        })
+    rows.sort(key=lambda row: (-row["p90_ms"], row["route"]))
+    return {
+        "samples": samples,
+        "items": items,
+        "pages": pages,
+        "default_latency_ms": latencies.default_ms,
+        "spread": "pooled recorded" if latencies.ratios is not None else f"lognormal sigma={sigma}",
+        "routes": rows,
+    }
+
+
+def print_report(report: Dict, top: int = 20):
+    print(f"⏱️  Page-ready time, {report['samples']:,} simulated loads per route "
+          f"(N={report['items']} items, spread: {report['spread']})\n")
+    print(f"   {'route':48} {'reqs':>5} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    for row in report["routes"][:top]:
+        print(f"   {row['route']:48} {row['requests']:>5} {row['p50_ms']:>9,.0f} {row['p90_ms']:>9,.0f} "
+              f"{row['p99_ms']:>9,.0f}")
+        chain = row["critical_path"]
+        print(f"      critical path ({row['critical_path_share'] * 100:.0f}% of loads, "
+              f"{len(chain)} awaited request{'s' if len(chain) != 1 else ''}):")
+        for link in chain:
+            print(f"         → {link['endpoint']:44} {link['median_ms']:>7,.0f} ms  {link['from']}")
+        if row["unrecorded_endpoints"]:
+            print(f"      no recorded latency ({report['default_latency_ms']:.0f} ms assumed): "
+                  + ", ".join(row["unrecorded_endpoints"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate page-ready time from the call graph and recorded latencies")
+    parser.add_argument("--src", default=SRC_DIR, help="Source directory (default src)")
+    parser.add_argument("--route", help="Only this route (e.g. /admin/dashboard)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help=f"Simulated loads (default {DEFAULT_SAMPLES})")
+    parser.add_argument("--items", type=int, default=20, help="Items per list for loops (default 20)")
+    parser.add_argument("--pages", type=int, default=1, help="Pages reported by paginated endpoints (default 1)")
+    parser.add_argument("--own-only", action="store_true", help="Only the route's page components, not their children")
+    parser.add_argument("--sigma", type=float, default=DEFAULT_SIGMA,
+                        help=f"Lognormal spread for thinly recorded endpoints (default {DEFAULT_SIGMA})")
+    parser.add_argument("--seed", type=int, help="Random seed for repeatable runs")
+    parser.add_argument("--reports", default="api_test_report_*.json", help="Recorded reports or .npz result stores glob (latencies)")
+    parser.add_argument("--top", type=int, default=20, help="Routes to print (default 20)")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    report = build_report(args.src, args.samples, args.items, args.pages, args.route, args.own_only, args.sigma,
+                          args.seed, args.reports)
+    print_report(report, args.top)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Payload Metrics
+
+Byte counts for one request/response exchange, shared by
+api_endpoint_tester.py and test_api_ui_integration.py:
+
+  * request: wire bytes (request line, headers including Host, body) and
+    decoded body bytes
+  * response: wire bytes (status line, headers, body as received - still
+    compressed when the server used Content-Encoding) and decoded body bytes
+  * compression ratio - decoded over wire body bytes (1.0 when uncompressed)
+  * effective bytes/sec - decoded response bytes per second of request time
+
+The wire body size is counted off the socket by the ``count_wire_bytes``
+response hook (both testers install it on their sessions), so it is exact for
+compressed and chunked responses, chunk framing included. Without the hook it
+comes from urllib3's byte counter (``response.raw.tell()``), which is exact
+for Content-Length responses but stays at 0 for chunked ones - their wire
+size and compression ratio are then reported as unknown (None). Transports
+without a raw stream (the in-process stand-in) fall back to Content-Length,
+then to the decoded size. Header sizes are rebuilt from the parsed headers and
+can be off by a few bytes of whitespace.
+
+Per-endpoint aggregation happens in the result store
+(``ResultStore.payload_summary``, result_store.py), grouped per
+"METHOD /template" so ``/companies/abc/employees`` and
+``/companies/xyz/employees`` share a row and payload growth of list
+endpoints shows up across reports.
+
+Usage:
+    session.hooks["response"].append(count_wire_bytes)
+    metrics = exchange_metrics(response, duration_s)   # dict, see PAYLOAD_FIELDS
+"""
+
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+PAYLOAD_FIELDS = ["request_wire_bytes", "request_body_bytes", "response_wire_bytes", "response_body_bytes",
+                  "compression_ratio", "effective_bytes_per_sec"]
+
+
+def empty_metrics() -> Dict:
+    """Metrics of a request that got no response"""
+    return {name: None if name == "compression_ratio" else 0 for name in PAYLOAD_FIELDS}
+
+
+def _header_bytes(headers) -> int:
+    return sum(len(str(k)) + len(str(v)) + 4 for k, v in headers.items()) + 2   # "k: v\r\n" ... "\r\n"
+
+
+def request_bytes(request: requests.PreparedRequest) -> Dict:
+    """Wire and body size of a prepared request"""
+    body = request.body
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    body_bytes = len(body) if isinstance(body, (bytes, bytearray)) else 0   # streamed bodies are not counted
+    parts = urlsplit(request.url)
+    line = len(f"{request.method} {request.path_url} HTTP/1.1\r\n")
+    host = len(f"Host: {parts.netloc}\r\n") if "Host" not in request.headers else 0
+    return {"request_wire_bytes": line + host + _header_bytes(request.headers) + body_bytes,
+            "request_body_bytes": body_bytes}
+
+
+class _CountingReader:
+    """File wrapper counting the bytes read through it"""
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.count = 0
+
+    def read(self, *args):
+        data = self.fp.read(*args)
+        self.count += len(data)
+        return data
+
+    def read1(self, *args):
+        data = self.fp.read1(*args)
+        self.count += len(data)
+        return data
+
+    def readline(self, *args):
+        data = self.fp.readline(*args)
+        self.count += len(data)
+        return data
+
+    def readinto(self, buffer):
+        n = self.fp.readinto(buffer)
+        self.count += n or 0
+        return n
+
+    def __getattr__(self, name):
+        return getattr(self.fp, name)
+
+
+def count_wire_bytes(response: requests.Response, *args, **kwargs) -> requests.Response:
+    """requests response hook: count body bytes as read off the socket
+
+    Runs before requests reads the body, and wraps the http.client file
+    object under urllib3 - so chunk framing is counted too, and compressed
+    bodies are counted before decoding.
+    """
+    http_response = getattr(response.raw, "_fp", None)
+    fp = getattr(http_response, "fp", None)
+    if fp is not None and not isinstance(fp, _CountingReader):
+        http_response.fp = response._wire_counter = _CountingReader(fp)
+    return response
+
+
+def _wire_body_bytes(response: requests.Response, decoded: int) -> Optional[int]:
+    counter = getattr(response, "_wire_counter", None)
+    if counter is not None:
+        return counter.count
+    if "chunked" in response.headers.get("Transfer-Encoding", "").lower():
+        return None   # urllib3 does not count chunked reads
+    raw = response.raw
+    if raw is not None and hasattr(raw, "tell"):
+        try:
+            counted = raw.tell()
+            if counted or not decoded:
+                return counted
+        except (OSError, ValueError):
+            pass
+    length = response.headers.get("Content-Length")
+    if length and length.isdigit():
+        return int(length)
+    return decoded
+
+
+def exchange_metrics(response: requests.Response, duration_s: float) -> Dict:
+    """Request and response byte counts, compression ratio and effective bytes/sec"""
+    metrics = request_bytes(response.request) if response.request is not None else \
+        {"request_wire_bytes": 0, "request_body_bytes": 0}
+    decoded = len(response.content or b"")
+    wire_body = _wire_body_bytes(response, decoded)
+    status_line = len(f"HTTP/1.1 {response.status_code} {response.reason or ''}\r\n")
+    metrics.update({
+        "response_wire_bytes": None if wire_body is None else
+        status_line + _header_bytes(response.headers) + wire_body,
+        "response_body_bytes": decoded,
+        "compression_ratio": round(decoded / wire_body, 3) if wire_body else None,
+        "effective_bytes_per_sec": round(decoded / duration_s, 1) if duration_s > 0 else 0,
+    })
+    return metrics
+
+
+def format_bytes(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if value < 1024:
+        return f"{value:.0f} B"
+    if value < 1024 ** 2:
+        return f"{value / 1024:.1f} KB"
+    return f"{value / 1024 ** 2:.1f} MB"
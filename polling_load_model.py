@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Polling Load Model & Capacity Planner
+
+How many requests per second does an active user generate, and how much
+backend does that take for N tenants?
+
+  * extracts refresh triggers from src/components: ``setInterval`` polling
+    (period resolved from literals, constants and ``useState`` defaults),
+    ``focus`` / ``visibilitychange`` / ``online`` listeners, and the mount
+    effects that run on every page view
+  * counts the requests each trigger makes by endpoint (page_load_simulator's
+    call-graph extraction) and the routes that mount each component
+  * builds a per-user request-rate model: a user views ``--views-per-min``
+    pages, spread evenly over the routes of ``--role``, spends equal time on
+    each, and focuses the tab ``--focus-per-min`` times
+  * given a latency-versus-throughput curve from a load run, finds the
+    throughput one backend instance sustains within ``--slo-ms`` p95 and
+    ``--max-error-rate``, and the instances needed for ``--tenants`` x
+    ``--active`` users with ``--headroom``
+
+The curve is JSON (a list, or ``{"points": [...]}``) or CSV with one row per
+load step: ``throughput_rps`` and ``p95_ms``, optionally ``error_rate``.
+
+Usage:
+    python polling_load_model.py [--role admin] [--tenants 50 --active 20] [--curve load_curve.json]
+"""
+
+import argparse
+import csv
+import glob
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from nplus1_detector import SourceFile
+from page_load_simulator import PlanBuilder, find_pages
+from service_map import SRC_DIR, ServiceMap, block_end
+
+DEFAULT_SLO_MS = 1000.0
+DEFAULT_MAX_ERROR_RATE = 0.01
+
+_INTERVAL_RE = re.compile(r"\bsetInterval\s*\(")
+_LISTENER_RE = re.compile(r"\b(?:window|document)\.addEventListener\s*\(\s*['\"](focus|visibilitychange|online)['\"]\s*,\s*")
+_EFFECT_RE = re.compile(r"\buseEffect\s*\(")
+_STATE_DEFAULT_RE = re.compile(r"const\s+\[\s*(\w+)\s*,\s*\w+\s*\]\s*=\s*(?:React\.)?useState\(\s*(\d+(?:\.\d+)?)\s*\)")
+_CONSTANT_RE = re.compile(r"\bconst\s+(\w+)\s*=\s*(\d+(?:\.\d+)?)\s*;")
+_SERVICE_CALL_RE = re.compile(r"\b(\w+Service)\.(\w+)\s*\(")
+_ROUTE_BLOCK_RE = re.compile(r"<Route\b(.*?)(?=<Route\b|</Routes>)", re.S)
+_ROUTE_PATH_RE = re.compile(r"""\bpath=["']([^"']+)["']""")
+_ROUTE_ROLE_RE = re.compile(r"""\brequiredRole=["']([^"']+)["']""")
+
+
+@dataclass
+class Trigger:
+    component: str
+    kind: str  # "interval", "focus", "visibilitychange", "online" or "mount"
+    file: str
+    line: int
+    period_s: Optional[float] = None
+    requests: Counter = field(default_factory=Counter)
+    undefined: List[str] = field(default_factory=list)
+    routes: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        if self.kind == "interval":
+            return f"every {self.period_s:g} s" if self.period_s else "interval (period unknown)"
+        return {"mount": "on page view", "focus": "on focus"}.get(self.kind, f"on {self.kind}")
+
+
+def resolve_delay(expression: str, masked: str) -> Optional[float]:
+    """Milliseconds for a delay like ``30000``, ``POLL_MS`` or ``refreshInterval * 1000``"""
+    values = {name: value for name, value in _CONSTANT_RE.findall(masked)}
+    values.update({name: value for name, value in _STATE_DEFAULT_RE.findall(masked)})
+    resolved = re.sub(r"[A-Za-z_$][\w$]*", lambda m: values.get(m.group(0), "?"), expression)
+    if not re.fullmatch(r"[\d.\s+\-*/()]+", resolved):
+        return None
+    try:
+        return float(eval(resolved, {"__builtins__": {}}))  # digits and arithmetic only
+    except (SyntaxError, ZeroDivisionError, TypeError):
+        return None
+
+
+def route_roles(app_file: str) -> Dict[str, Optional[str]]:
+    """Route path -> requiredRole of its ProtectedRoute (None when public or unguarded)"""
+    with open(app_file, "r", encoding="utf-8") as f:
+        text = f.read()
+    roles = {}
+    for block in _ROUTE_BLOCK_RE.findall(text):
+        path = _ROUTE_PATH_RE.search(block)
+        if path:
+            role = _ROUTE_ROLE_RE.search(block)
+            roles[path.group(1)] = role.group(1) if role else None
+    return roles
+
+
+def _callback_span(masked: str, paren: int) -> Tuple[int, int]:
+    """Span of the first argument of a call whose ``(`` is at ``paren``"""
+    close = block_end(masked, paren)
+    depth = 0
+    for index in range(paren + 1, close):
+        char = masked[index]
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            return paren + 1, index
+    return paren + 1, close - 1
+
+
+def _reached_spans(src: SourceFile, start: int, end: int, seen=None) -> List[Tuple[int, int]]:
+    """[start, end) plus the bodies of the local functions it calls, transitively"""
+    seen = seen if seen is not None else set()
+    spans = [(start, end)]
+    for name, (_definition, body_start, body_end) in src.functions.items():
+        if name not in seen and re.search(r"(?<![\w$.])" + re.escape(name) + r"\s*\(", src.masked[start:end]):
+            seen.add(name)
+            spans.extend(_reached_spans(src, body_start, body_end, seen))
+    return spans
+
+
+def find_triggers(src_dir: str, builder: PlanBuilder) -> List[Trigger]:
+    service_map = builder.service_map
+    root = os.path.dirname(src_dir)
+    pages = find_pages(src_dir)
+    mounted_on: Dict[str, List[str]] = {}
+    for route, files in pages:
+        for file in files:
+            mounted_on.setdefault(file, []).append(route)
+
+    triggers = []
+    for path in sorted(glob.glob(os.path.join(src_dir, "components", "**", "*.js*"), recursive=True)):
+        src = builder.source(path)
+        component = os.path.splitext(os.path.basename(path))[0]
+        found = []
+        for match in _INTERVAL_RE.finditer(src.masked):
+            paren = match.end() - 1
+            callback = _callback_span(src.masked, paren)
+            delay = src.masked[callback[1] + 1:block_end(src.masked, paren) - 1].strip()
+            delay_ms = resolve_delay(delay, src.masked) if delay else None
+            trigger = Trigger(component, "interval", path, src.line_of(match.start()),
+                              delay_ms / 1000 if delay_ms else None)
+            found.append((trigger, callback))
+        for match in _LISTENER_RE.finditer(src.masked):
+            end = block_end(src.masked, src.masked.rfind("(", 0, match.end()))
+            found.append((Trigger(component, match.group(1), path, src.line_of(match.start())), (match.end(), end - 1)))
+
+        for trigger, (start, end) in found:
+            handler = src.masked[start:end].strip()
+            if re.fullmatch(r"[\w$]+", handler) and handler in src.functions:
+                _definition, start, end = src.functions[handler]
+            step, _blocking = builder.plan(src, start, end, None, ())
+            trigger.requests = step.endpoints()
+            calls = [c for first, last in _reached_spans(src, start, end)
+                     for c in _SERVICE_CALL_RE.findall(src.masked[first:last])]
+            trigger.undefined = sorted({f"{s}.{m}" for s, m in calls
+                                        if s in service_map.services and not service_map.get(s, m)})
+            trigger.routes = mounted_on.get(path, [])
+            triggers.append(trigger)
+
+        effect = _EFFECT_RE.search(src.masked)
+        mount = builder.mount(path).endpoints() if effect else None
+        if mount:
+            triggers.append(Trigger(component, "mount", path, src.line_of(effect.start()), requests=mount,
+                                    routes=mounted_on.get(path, [])))
+
+    for trigger in triggers:
+        trigger.file = os.path.relpath(trigger.file, root)
+    return triggers
+
+
+def user_rate_model(triggers: List[Trigger], routes: List[str], views_per_min: float,
+                    focus_per_min: float) -> Dict[str, Dict[Tuple[str, str], float]]:
+    """Requests per second per active user, by trigger kind and endpoint
+
+    Each route gets an equal share of page views and of time on page.
+    """
+    share = 1 / len(routes) if routes else 0.0
+    rates: Dict[str, Counter] = {"mount": Counter(), "interval": Counter(), "focus": Counter()}
+    for trigger in triggers:
+        on_routes = sum(1 for route in trigger.routes if route in routes)
+        if not on_routes:
+            continue
+        if trigger.kind == "mount":
+            per_second = views_per_min / 60 * share * on_routes
+            kind = "mount"
+        elif trigger.kind == "interval":
+            if not trigger.period_s:
+                continue
+            per_second = share * on_routes / trigger.period_s
+            kind = "interval"
+        else:
+            per_second = focus_per_min / 60 * share * on_routes
+            kind = "focus"
+        for endpoint, count in trigger.requests.items():
+            rates[kind][endpoint] += count * per_second
+    return {kind: dict(counter) for kind, counter in rates.items()}
+
+
+def load_curve(path: str) -> List[Dict[str, float]]:
+    """Valid load-run points sorted by throughput: throughput_rps, p95_ms and error_rate"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".csv"):
+        rows = list(csv.DictReader(text.splitlines()))
+    else:
+        data = json.loads(text)
+        rows = data.get("points", []) if isinstance(data, dict) else data
+    points = []
+    for row in rows:
+        throughput = row.get("throughput_rps", row.get("rps"))
+        p95 = row.get("p95_ms", row.get("p95"))
+        if throughput in (None, "") or p95 in (None, ""):
+            continue
+        if str(row.get("valid", True)).lower() == "false":
+            continue   # the load generator was saturated, not the backend
+        points.append({"throughput_rps": float(throughput), "p95_ms": float(p95),
+                       "error_rate": float(row.get("error_rate") or 0)})
+    return sorted(points, key=lambda point: point["throughput_rps"])
+
+
+def sustainable_throughput(points: List[Dict[str, float]], slo_ms: float, max_error_rate: float) -> Optional[float]:
+    """Highest throughput within the SLO, interpolated to where p95 crosses it"""
+    best = None
+    for previous, point in zip([None] + points[:-1], points):
+        if point["p95_ms"] <= slo_ms and point["error_rate"] <= max_error_rate:
+            best = point["throughput_rps"]
+            continue
+        if previous is not None and best == previous["throughput_rps"] and point["error_rate"] <= max_error_rate:
+            rise = point["p95_ms"] - previous["p95_ms"]
+            if rise > 0:
+                fraction = (slo_ms - previous["p95_ms"]) / rise
+                best = previous["throughput_rps"] + fraction * (point["throughput_rps"] - previous["throughput_rps"])
+        break
+    return best
+
+
+def p95_at(points: List[Dict[str, float]], throughput: float) -> Optional[float]:
+    """p95 interpolated on the measured curve; None beyond the last point"""
+    for previous, point in zip(points, points[1:]):
+        if previous["throughput_rps"] <= throughput <= point["throughput_rps"]:
+            span = point["throughput_rps"] - previous["throughput_rps"]
+            fraction = (throughput - previous["throughput_rps"]) / span if span else 0
+            return previous["p95_ms"] + fraction * (point["p95_ms"] - previous["p95_ms"])
+    if points and throughput <= points[0]["throughput_rps"]:
+        return points[0]["p95_ms"]
+    return None
+
+
+def build_report(src_dir: str = SRC_DIR, role: Optional[str] = None, views_per_min: float = 2.0,
+                 focus_per_min: float = 0.5, tenants: int = 10, active: int = 20, curve: Optional[str] = None,
+                 curve_instances: int = 1, slo_ms: float = DEFAULT_SLO_MS,
+                 max_error_rate: float = DEFAULT_MAX_ERROR_RATE, headroom: float = 1.3) -> Dict:
+    builder = PlanBuilder(ServiceMap(src_dir))
+    triggers = find_triggers(src_dir, builder)
+    roles = route_roles(os.path.join(src_dir, "App.jsx"))
+    routes = sorted({route for trigger in triggers for route in trigger.routes
+                     if role is None or roles.get(route) == role})
+    rates = user_rate_model(triggers, routes, views_per_min, focus_per_min)
+    per_user = sum(value for kind in rates.values() for value in kind.values())
+    users = tenants * active
+    demand = per_user * users
+
+    report = {
+        "role": role or "all",
+        "routes": routes,
+        "assumptions": {"views_per_min": views_per_min, "focus_per_min": focus_per_min},
+        "triggers": [
+            {"component": t.component, "trigger": t.describe(), "kind": t.kind, "location": f"{t.file}:{t.line}",
+             "requests": {f"{m} {p}": c for (m, p), c in sorted(t.requests.items())},
+             "undefined_calls": t.undefined, "routes": t.routes}
+            for t in triggers if t.kind != "mount" or t.routes
+        ],
+        "per_user_rps": per_user,
+        "per_user_by_kind": {kind: sum(values.values()) for kind, values in rates.items()},
+        "per_user_by_endpoint": dict(sorted(
+            ((f"{m} {p}", sum(r.get((m, p), 0.0) for r in rates.values()))
+             for m, p in {e for r in rates.values() for e in r}),
+            key=lambda item: -item[1])),
+        "tenants": tenants,
+        "active_users_per_tenant": active,
+        "demand_rps": demand,
+        "capacity": None,
+    }
+
+    if curve:
+        points = load_curve(curve)
+        sustainable = sustainable_throughput(points, slo_ms, max_error_rate)
+        per_instance = sustainable / curve_instances if sustainable else None
+        needed = math.ceil(demand * headroom / per_instance) if per_instance else None
+        report["capacity"] = {
+            "curve": curve,
+            "points": len(points),
+            "slo_p95_ms": slo_ms,
+            "max_error_rate": max_error_rate,
+            "sustainable_rps": sustainable,
+            "per_instance_rps": per_instance,
+            "headroom": headroom,
+            "instances_needed": max(needed, 1) if needed is not None else None,
+            "p95_at_demand_ms": p95_at(points, demand / needed * curve_instances) if needed else None,
+            "max_users_per_instance": int(per_instance / headroom / per_user) if per_instance and per_user else None,
+        }
+    return report
+
+
+def print_report(report: Dict, top: int = 10):
+    print("📡 Refresh triggers in src/components")
+    for trigger in report["triggers"]:
+        if trigger["kind"] == "mount":
+            continue
+        requests = ", ".join(f"{count} x {endpoint}" for endpoint, count in trigger["requests"].items()) or "no requests"
+        print(f"   {trigger['component']:28} {trigger['trigger']:18} {requests}   ({trigger['location']})")
+        if trigger["undefined_calls"]:
+            print(f"      ⚠️  calls undefined {', '.join(trigger['undefined_calls'])} - throws before any request")
+        if not trigger["routes"]:
+            print("      ⚠️  not mounted by any route in App.jsx")
+    mounts = [t for t in report["triggers"] if t["kind"] == "mount"]
+    print(f"   + {len(mounts)} components fetch on mount "
+          f"({sum(sum(t['requests'].values()) for t in mounts)} requests per full mount)")
+
+    assumptions = report["assumptions"]
+    print(f"\n👤 Per active user (role: {report['role']}, {len(report['routes'])} routes, "
+          f"{assumptions['views_per_min']:g} views/min, {assumptions['focus_per_min']:g} focus/min)")
+    by_kind = report["per_user_by_kind"]
+    print(f"   {report['per_user_rps']:.4f} req/s ({report['per_user_rps'] * 3600:,.0f} req/h): "
+          f"page views {by_kind['mount']:.4f}, polling {by_kind['interval']:.4f}, focus {by_kind['focus']:.4f}")
+    for endpoint, rate in list(report["per_user_by_endpoint"].items())[:top]:
+        print(f"      {endpoint:50} {rate * 3600:>8,.1f} req/h")
+
+    print(f"\n🏢 {report['tenants']} tenants x {report['active_users_per_tenant']} active users: "
+          f"{report['demand_rps']:.2f} req/s")
+    capacity = report["capacity"]
+    if capacity is None:
+        print("   (pass --curve with a load run's throughput/p95 points to size the backend)")
+        return
+    if capacity["per_instance_rps"] is None:
+        print(f"   ❌ No point of {capacity['curve']} meets p95 <= {capacity['slo_p95_ms']:.0f} ms "
+              f"with <= {capacity['max_error_rate']:.1%} errors")
+        return
+    print(f"   One instance sustains {capacity['per_instance_rps']:.1f} req/s within p95 <= "
+          f"{capacity['slo_p95_ms']:.0f} ms ({capacity['points']} load steps)")
+    p95 = capacity["p95_at_demand_ms"]
+    print(f"   ✅ {capacity['instances_needed']} instance(s) with {capacity['headroom'] - 1:.0%} headroom"
+          + (f", expected p95 {p95:.0f} ms" if p95 is not None else ""))
+    if capacity["max_users_per_instance"] is not None:
+        print(f"   ≈ {capacity['max_users_per_instance']:,} active users per instance")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model per-user request rates and size the backend")
+    parser.add_argument("--src", default=SRC_DIR, help="Source directory (default src)")
+    parser.add_argument("--role", help="Only routes guarded by this requiredRole (e.g. admin, company_owner)")
+    parser.add_argument("--views-per-min", type=float, default=2.0, help="Page views per active user per minute")
+    parser.add_argument("--focus-per-min", type=float, default=0.5, help="Tab focus events per user per minute")
+    parser.add_argument("--tenants", type=int, default=10, help="Tenants (companies)")
+    parser.add_argument("--active", type=int, default=20, help="Concurrently active users per tenant")
+    parser.add_argument("--curve", help="Load-run curve: JSON or CSV with throughput_rps, p95_ms, error_rate")
+    parser.add_argument("--curve-instances", type=int, default=1, help="Backend instances behind the load run")
+    parser.add_argument("--slo-ms", type=float, default=DEFAULT_SLO_MS, help="p95 latency objective")
+    parser.add_argument("--max-error-rate", type=float, default=DEFAULT_MAX_ERROR_RATE, help="Error-rate objective")
+    parser.add_argument("--headroom", type=float, default=1.3, help="Capacity multiplier over demand (default 1.3)")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = build_report(args.src, args.role, args.views_per_min, args.focus_per_min, args.tenants, args.active,
+                          args.curve, args.curve_instances, args.slo_ms, args.max_error_rate, args.headroom)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
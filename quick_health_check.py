@@ -3,13 +3,37 @@
 ThoughtPro B2B Quick API Health Check
 
 A lightweight version for quick validation of critical endpoints.
+
+Without requests installed (or with --fast) the checks run concurrently
+through the standard-library fast probe (fast_probe.py) under one deadline.
 """
 
-import requests
-import json
+import importlib.util
+import sys
 import time
 from datetime import datetime
 
+# requests is imported only on the requests path - it costs ~80 ms of start-up
+HAVE_REQUESTS = importlib.util.find_spec("requests") is not None
+
+# Whole-run deadline for the fast path
+FAST_DEADLINE = 10.0
+
+API_CHECKS = [
+    ("POST", "/auth/supabase/login", "User Login"),
+    ("GET", "/psychologists", "Get Psychologists"),
+    ("POST", "/api/v1/companies-supabase", "Create Company"),
+    ("GET", "/employee-subscriptions/status", "Health Check"),
+    ("POST", "/bookings", "Create Booking"),
+]
+
+UI_CHECKS = [
+    ("/", "Landing Page"),
+    ("/login", "Login Page"),
+    ("/dashboard", "Dashboard"),
+    ("/employees", "Employee Management"),
+]
+
 class QuickHealthCheck:
     def __init__(self, api_url="https://thoughtprob2b.thoughthealer.org", ui_url="http://localhost:3000"):
         self.api_url = api_url.rstrip('/')
@@ -18,6 +42,7 @@ class QuickHealthCheck:
     
     def test_endpoint(self, method, endpoint, description):
         """Quick endpoint test"""
+        import requests
         try:
             url = f"{self.api_url}{endpoint}"
             start = time.time()
@@ -43,6 +68,7 @@ class QuickHealthCheck:
     
     def test_ui_page(self, path, description):
         """Quick UI test"""
+        import requests
         try:
             url = f"{self.ui_url}{path}"
             start = time.time()
@@ -59,29 +85,67 @@ class QuickHealthCheck:
             print(result)
             self.results.append(result)
     
-    def run_quick_check(self):
-        """Run essential endpoint checks"""
+    def print_header(self):
         print("🔬 ThoughtPro B2B Quick Health Check")
         print("=" * 60)
         print(f"API: {self.api_url}")
         print(f"UI:  {self.ui_url}")
         print("=" * 60)
+    
+    def run_quick_check(self, fast=False):
+        """Run essential endpoint checks"""
+        if fast or not HAVE_REQUESTS:
+            return self.run_fast_check()
+        
+        self.print_header()
         
         # Critical API endpoints
         print("\n🔧 API ENDPOINTS:")
-        self.test_endpoint("POST", "/auth/supabase/login", "User Login")
-        self.test_endpoint("GET", "/psychologists", "Get Psychologists")
-        self.test_endpoint("POST", "/api/v1/companies-supabase", "Create Company")
-        self.test_endpoint("GET", "/employee-subscriptions/status", "Health Check")
-        self.test_endpoint("POST", "/bookings", "Create Booking")
+        for method, endpoint, description in API_CHECKS:
+            self.test_endpoint(method, endpoint, description)
         
         # UI pages
         print("\n🌐 UI PAGES:")
-        self.test_ui_page("/", "Landing Page")
-        self.test_ui_page("/login", "Login Page") 
-        self.test_ui_page("/dashboard", "Dashboard")
-        self.test_ui_page("/employees", "Employee Management")
+        for path, description in UI_CHECKS:
+            self.test_ui_page(path, description)
+        
+        self.print_summary()
+    
+    def run_fast_check(self, deadline=FAST_DEADLINE):
+        """Run the same checks concurrently with the standard-library fast probe"""
+        from fast_probe import probe_all
+        
+        self.print_header()
+        
+        probes = [(method, f"{self.api_url}{endpoint}", description) for method, endpoint, description in API_CHECKS]
+        probes += [("GET", f"{self.ui_url}{path}", description) for path, description in UI_CHECKS]
+        all_results = probe_all(probes, deadline=deadline)
+        
+        print("\n🔧 API ENDPOINTS:")
+        for (method, endpoint, description), result in zip(API_CHECKS, all_results):
+            if result['status_code']:
+                status = "✅ OK" if result['status_code'] in [200, 201, 400, 401] else "❌ FAIL"
+                line = (f"{status} {method:4} {endpoint:40} {description} "
+                        f"({result['status_code']}) {result['duration_ms'] / 1000:.2f}s")
+            else:
+                line = f"❌ FAIL {method:4} {endpoint:40} {description} - {str(result['error'])[:50]}"
+            print(line)
+            self.results.append(line)
+        
+        print("\n🌐 UI PAGES:")
+        for (path, description), result in zip(UI_CHECKS, all_results[len(API_CHECKS):]):
+            if result['status_code']:
+                status = "✅ OK" if result['status_code'] == 200 else "⚠️ WARN"
+                line = (f"{status} UI   {path:40} {description} "
+                        f"({result['status_code']}) {result['duration_ms'] / 1000:.2f}s")
+            else:
+                line = f"❌ FAIL UI   {path:40} {description} - Connection failed"
+            print(line)
+            self.results.append(line)
         
+        self.print_summary()
+    
+    def print_summary(self):
         print(f"\n📊 SUMMARY: {len(self.results)} tests completed at {datetime.now().strftime('%H:%M:%S')}")
         
         # Count results
@@ -98,4 +162,4 @@ class QuickHealthCheck:
 
 if __name__ == "__main__":
     checker = QuickHealthCheck()
-    checker.run_quick_check()
\ No newline at end of file
+    checker.run_quick_check(fast='--fast' in sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Test Report Diff
+
+Compares two or more api_test_report_*.json files produced by
+ProductionAPITester, or columnar result stores (``--store results.npz``,
+result_store.py) - the format to use for multi-million-sample runs. Results
+are aligned by endpoint template (see endpoint_catalog.py), so
+``/companies/abc/employees`` and ``/companies/xyz/employees`` land in the
+same bucket.
+
+For each endpoint the first report is the baseline. Every later report gets:
+  * p50 and p95 latency deltas with bootstrap confidence intervals
+  * a Mann-Whitney U (rank-based) significance test
+  * payload growth: the median decoded response size, from the byte counts
+    the testers record (payload_metrics.py), when it grew by at least
+    ``--min-payload-growth`` percent. Growth is reported, not failed on
+
+Everything is vectorized with NumPy. Bootstrap quantiles are drawn directly
+from the Beta distribution of the order statistic, so the cost does not grow
+with the sample count and runs with millions of samples compare in seconds.
+
+Exit code is 1 when any endpoint regressed significantly, 0 otherwise.
+
+Usage:
+    python report_diff.py baseline.json candidate.json [more.json ...]
+"""
+
+import argparse
+import json
+import math
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from endpoint_catalog import template_for
+from result_store import ResultStore, report_results
+
+
+def _store_columns(store_file: str, value: str, keep_column: str) -> Dict[str, np.ndarray]:
+    """``value`` per route from a result store, for rows where ``keep_column`` is non-zero"""
+    store = ResultStore.load(store_file)
+    routes = store.column("route")
+    values = store.column(value).astype(np.float64)
+    keep = store.column(keep_column) > 0
+    routes, values = routes[keep], values[keep]
+    order = np.argsort(routes, kind="stable")
+    groups, starts = np.unique(routes[order], return_index=True)
+    labels = store.labels("route")
+    return {labels[group]: part for group, part in zip(groups, np.split(values[order], starts[1:]))}
+
+
+def load_samples(report_file: str) -> Dict[str, np.ndarray]:
+    """Latency samples (ms) per "METHOD /template" from a report or result-store file
+
+    Requests that never got a response (status code 0) are left out - their
+    duration is the time to fail, not a latency.
+    """
+    if report_file.endswith(".npz"):
+        return _store_columns(report_file, "duration_ms", "status_code")
+    with open(report_file, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    buckets: Dict[str, List[float]] = {}
+    for result in report_results(report, report_file):
+        if not result.get("status_code"):
+            continue
+        method = result.get("method", "GET").upper()
+        key = f"{method} {template_for(method, result.get('endpoint', ''))}"
+        buckets.setdefault(key, []).append(result.get("duration_ms", 0.0))
+    return {key: np.asarray(values, dtype=np.float64) for key, values in buckets.items()}
+
+
+def load_payloads(report_file: str) -> Dict[str, np.ndarray]:
+    """Decoded response sizes (bytes) per "METHOD /template"; reports without byte counts give {}"""
+    if report_file.endswith(".npz"):
+        return _store_columns(report_file, "response_body_bytes", "response_wire_bytes")
+    with open(report_file, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    buckets: Dict[str, List[float]] = {}
+    for result in report.get("detailed_results", []):
+        if not result.get("response_wire_bytes"):
+            continue
+        method = result.get("method", "GET").upper()
+        key = f"{method} {template_for(method, result.get('endpoint', ''))}"
+        buckets.setdefault(key, []).append(result.get("response_body_bytes") or 0)
+    return {key: np.asarray(values, dtype=np.float64) for key, values in buckets.items()}
+
+
+def payload_growth(base: Dict[str, np.ndarray], cand: Dict[str, np.ndarray], min_growth_pct: float) -> List[Dict]:
+    """Endpoints whose median decoded response size grew by ``min_growth_pct`` or more"""
+    rows = []
+    for key in sorted(set(base) & set(cand)):
+        base_median, cand_median = float(np.median(base[key])), float(np.median(cand[key]))
+        if base_median <= 0:
+            continue
+        growth = (cand_median - base_median) / base_median * 100
+        if growth >= min_growth_pct:
+            rows.append({"endpoint": key, "baseline_bytes": base_median, "candidate_bytes": cand_median,
+                         "growth_pct": round(growth, 1)})
+    return sorted(rows, key=lambda r: -r["growth_pct"])
+
+
+def bootstrap_quantile(sorted_samples: np.ndarray, q: float, n_boot: int, rng: np.random.Generator) -> np.ndarray:
+    """Bootstrap distribution of the q-quantile of ``sorted_samples``
+
+    The k-th order statistic of n draws from the empirical distribution is
+    F_n^-1(U_(k)) with U_(k) ~ Beta(k, n - k + 1), so each bootstrap replicate
+    costs one Beta draw and one index lookup.
+    """
+    n = sorted_samples.size
+    k = min(max(int(math.ceil(q * n)), 1), n)
+    u = rng.beta(k, n - k + 1, size=n_boot)
+    idx = np.minimum((u * n).astype(np.int64), n - 1)
+    return sorted_samples[idx]
+
+
+def rank_sum_test(a: np.ndarray, b: np.ndarray) -> Tuple[float, float]:
+    """Two-sided Mann-Whitney U test (normal approximation with tie correction)
+
+    Returns (p_value, probability that a random b sample exceeds a random a
+    sample). The second value is 0.5 when the distributions are identical.
+    """
+    n1, n2 = a.size, b.size
+    combined = np.concatenate((a, b))
+    _values, inverse, counts = np.unique(combined, return_inverse=True, return_counts=True)
+    # Average rank of each distinct value
+    upper = np.cumsum(counts)
+    avg_rank = upper - (counts - 1) / 2.0
+    ranks = avg_rank[inverse]
+
+    u_b = ranks[n1:].sum() - n2 * (n2 + 1) / 2.0
+    mean_u = n1 * n2 / 2.0
+    n = n1 + n2
+    tie_term = (counts.astype(np.float64) ** 3 - counts).sum() / (n * (n - 1)) if n > 1 else 0.0
+    var_u = n1 * n2 / 12.0 * ((n + 1) - tie_term)
+    if var_u <= 0:
+        return 1.0, 0.5
+    z = (abs(u_b - mean_u) - 0.5) / math.sqrt(var_u)
+    p_value = math.erfc(max(z, 0.0) / math.sqrt(2))
+    return p_value, u_b / (n1 * n2)
+
+
+def compare_endpoint(base: np.ndarray, cand: np.ndarray, n_boot: int, confidence: float,
+                     rng: np.random.Generator) -> Dict:
+    """Latency deltas, confidence intervals and significance for one endpoint"""
+    base_sorted = np.sort(base)
+    cand_sorted = np.sort(cand)
+    alpha = (1 - confidence) / 2
+    row = {"baseline_n": int(base.size), "candidate_n": int(cand.size)}
+
+    for label, q in (("p50", 0.5), ("p95", 0.95)):
+        base_q = float(np.quantile(base_sorted, q))
+        cand_q = float(np.quantile(cand_sorted, q))
+        deltas = (bootstrap_quantile(cand_sorted, q, n_boot, rng)
+                  - bootstrap_quantile(base_sorted, q, n_boot, rng))
+        low, high = np.quantile(deltas, [alpha, 1 - alpha])
+        row[label] = {
+            "baseline_ms": round(base_q, 3),
+            "candidate_ms": round(cand_q, 3),
+            "delta_ms": round(cand_q - base_q, 3),
+            "delta_pct": round((cand_q - base_q) / base_q * 100, 2) if base_q > 0 else None,
+            "ci_ms": [round(float(low), 3), round(float(high), 3)],
+        }
+
+    p_value, prob_slower = rank_sum_test(base, cand)
+    row["p_value"] = p_value
+    row["prob_candidate_slower"] = round(prob_slower, 4)
+    return row
+
+
+def classify(row: Dict, alpha: float, min_effect_pct: float) -> str:
+    """regressed / improved / unchanged
+
+    A change must be statistically significant, have a p50 confidence interval
+    that excludes zero and exceed ``min_effect_pct`` - with millions of
+    samples even a 0.1% shift is "significant", but nobody cares about it.
+    """
+    p50 = row["p50"]
+    low, high = p50["ci_ms"]
+    effect = p50["delta_pct"] if p50["delta_pct"] is not None else 0.0
+    if row["p_value"] >= alpha or abs(effect) < min_effect_pct:
+        return "unchanged"
+    if low > 0:
+        return "regressed"
+    if high < 0:
+        return "improved"
+    return "unchanged"
+
+
+def diff_reports(report_files: List[str], n_boot: int = 2000, confidence: float = 0.95,
+                 alpha: float = 0.01, min_effect_pct: float = 5.0, min_samples: int = 1,
+                 seed: Optional[int] = 0, min_payload_growth_pct: float = 10.0) -> Dict:
+    """Compare every report after the first against the first"""
+    rng = np.random.default_rng(seed)
+    baseline = load_samples(report_files[0])
+    baseline_payloads = load_payloads(report_files[0])
+    comparisons = []
+
+    for candidate_file in report_files[1:]:
+        candidate = load_samples(candidate_file)
+        shared = sorted(set(baseline) & set(candidate))
+        # Bonferroni: one test per aligned endpoint
+        corrected_alpha = alpha / max(len(shared), 1)
+        rows = []
+        for key in shared:
+            base, cand = baseline[key], candidate[key]
+            if base.size < min_samples or cand.size < min_samples:
+                continue
+            row = compare_endpoint(base, cand, n_boot, confidence, rng)
+            row["endpoint"] = key
+            row["verdict"] = classify(row, corrected_alpha, min_effect_pct)
+            rows.append(row)
+
+        rows.sort(key=lambda r: -(r["p50"]["delta_pct"] or 0.0))
+        comparisons.append({
+            "baseline": report_files[0],
+            "candidate": candidate_file,
+            "alpha": corrected_alpha,
+            "only_in_baseline": sorted(set(baseline) - set(candidate)),
+            "only_in_candidate": sorted(set(candidate) - set(baseline)),
+            "regressed": [r for r in rows if r["verdict"] == "regressed"],
+            "improved": [r for r in rows if r["verdict"] == "improved"][::-1],
+            "unchanged": [r for r in rows if r["verdict"] == "unchanged"],
+            "payload_growth": payload_growth(baseline_payloads, load_payloads(candidate_file),
+                                             min_payload_growth_pct),
+        })
+    return {"comparisons": comparisons}
+
+
+def print_diff(result: Dict):
+    """Ranked console output"""
+    for comparison in result["comparisons"]:
+        print(f"\n📊 {comparison['baseline']} → {comparison['candidate']}")
+        print("=" * 100)
+        for title, emoji, rows in (("REGRESSED", "❌", comparison["regressed"]),
+                                   ("IMPROVED", "✅", comparison["improved"])):
+            print(f"\n{emoji} {title} ({len(rows)}):")
+            for row in rows:
+                p50, p95 = row["p50"], row["p95"]
+                delta = "-" if p50["delta_pct"] is None else f"{p50['delta_pct']:+.1f}%"
+                print(f"   {row['endpoint']:65} p50 {p50['baseline_ms']:9.2f} → {p50['candidate_ms']:9.2f} ms "
+                      f"({delta}, CI {p50['ci_ms'][0]:+.2f}..{p50['ci_ms'][1]:+.2f})")
+                print(f"   {'':65} p95 {p95['baseline_ms']:9.2f} → {p95['candidate_ms']:9.2f} ms "
+                      f"| p={row['p_value']:.2e} | n={row['baseline_n']}/{row['candidate_n']}")
+        print(f"\n➖ Unchanged: {len(comparison['unchanged'])}")
+        if comparison["payload_growth"]:
+            print(f"\n📦 PAYLOAD GROWTH ({len(comparison['payload_growth'])}):")
+            for row in comparison["payload_growth"]:
+                print(f"   {row['endpoint']:65} {row['baseline_bytes']:>10.0f} → {row['candidate_bytes']:>10.0f} bytes "
+                      f"({row['growth_pct']:+.1f}%)")
+        if comparison["only_in_baseline"]:
+            print(f"⚠️  Only in baseline: {', '.join(comparison['only_in_baseline'])}")
+        if comparison["only_in_candidate"]:
+            print(f"⚠️  Only in candidate: {', '.join(comparison['only_in_candidate'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistical diff of ThoughtPro API test reports")
+    parser.add_argument("reports", nargs="+", help="Baseline report followed by one or more candidates")
+    parser.add_argument("--bootstrap", type=int, default=2000, help="Bootstrap replicates (default 2000)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="CI confidence level (default 0.95)")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level before correction (default 0.01)")
+    parser.add_argument("--min-effect", type=float, default=5.0, help="Minimum p50 change in %% to flag (default 5)")
+    parser.add_argument("--min-samples", type=int, default=1, help="Skip endpoints with fewer samples")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the bootstrap")
+    parser.add_argument("--min-payload-growth", type=float, default=10.0,
+                        help="Report endpoints whose median response size grew by this %% (default 10)")
+    parser.add_argument("--json", dest="json_file", help="Also write the diff to this JSON file")
+    args = parser.parse_args()
+
+    if len(args.reports) < 2:
+        parser.error("need a baseline and at least one candidate report")
+
+    result = diff_reports(args.reports, n_boot=args.bootstrap, confidence=args.confidence,
+                          alpha=args.alpha, min_effect_pct=args.min_effect,
+                          min_samples=args.min_samples, seed=args.seed,
+                          min_payload_growth_pct=args.min_payload_growth)
+    print_diff(result)
+
+    if args.json_file:
+        with open(args.json_file, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Diff saved to: {args.json_file}")
+
+    regressions = sum(len(c["regressed"]) for c in result["comparisons"])
+    if regressions:
+        print(f"\n❌ {regressions} significant regression(s)")
+        sys.exit(1)
+    print("\n✅ No significant regressions")
+
+
+if __name__ == "__main__":
+    main()
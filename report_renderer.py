@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Streaming Report Renderer
+
+Writes one report as text, JSON and HTML at the same time, section by
+section, straight to the open files - nothing is built up as one big string
+or one big object first:
+
+  * ``ReportRenderer`` sinks are file objects; text may go to several at
+    once (the report file and stdout), and any format can be left out
+  * sections are key/value summaries, tables whose rows are consumed from an
+    iterator as they are written, bullet notes, and JSON-only values or
+    record streams (e.g. full per-request results)
+  * ``render_result_sections`` adds the sections every test report shares,
+    computed on the columnar result store (result_store.py): latency and
+    errors per route, status codes, payload sizes, and the top-N slowest and
+    failed samples. Only aggregates and N sample rows are ever decoded, so a
+    5M-request run renders in seconds and in memory that does not grow with
+    the run beyond the store's own columns
+
+Usage:
+    with open("report.txt", "w") as text, open("report.json", "w") as js, open("report.html", "w") as html:
+        renderer = ReportRenderer("API TEST REPORT", text=[text, sys.stdout], json_file=js, html=html)
+        renderer.begin()
+        renderer.summary("summary", "Summary Statistics", [("total", "Total Tests", 120)])
+        render_result_sections(store, renderer, top_n=20)
+        renderer.end()
+"""
+
+import html as html_lib
+import json
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from payload_metrics import format_bytes
+
+TEXT_WIDTH = 79
+DEFAULT_TOP_N = 20
+# Runs up to this size also list every result; larger ones get aggregates and samples only
+DETAIL_LIMIT = 200
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 2em; color: #222; }}
+table {{ border-collapse: collapse; margin: 0.5em 0 1.5em; font-size: 0.9em; }}
+th, td {{ border: 1px solid #ddd; padding: 0.25em 0.6em; text-align: left; }}
+td.num {{ text-align: right; font-variant-numeric: tabular-nums; }}
+th {{ background: #f4f4f4; }}
+</style></head><body>
+<h1>{title}</h1>
+"""
+
+
+@dataclass
+class Column:
+    """One table column: row key, header label, text width and value format
+
+    ``fmt`` is a format string or a function of the value; JSON always gets
+    the raw value.
+    """
+    key: str
+    label: str
+    width: int = 10
+    fmt: Union[str, Callable[[Any], str]] = "{}"
+    numeric: bool = True
+
+    def format(self, value: Any) -> str:
+        if value is None:
+            return "-"
+        try:
+            return self.fmt(value) if callable(self.fmt) else self.fmt.format(value)
+        except (TypeError, ValueError):
+            return str(value)
+
+    def pad(self, text: str) -> str:
+        return text.rjust(self.width) if self.numeric else text.ljust(self.width)
+
+
+class ReportRenderer:
+    """Single-pass writer of a report to text, JSON and HTML sinks"""
+
+    def __init__(self, title: str, text: Union[IO, Sequence[IO], None] = None, json_file: Optional[IO] = None,
+                 html: Optional[IO] = None):
+        self.title = title
+        self.text: List[IO] = list(text) if isinstance(text, (list, tuple)) else ([text] if text else [])
+        self.json = json_file
+        self.html = html
+        self._json_fields = 0
+
+    # --- low-level writers ---------------------------------------------------
+
+    def _line(self, line: str = ""):
+        for sink in self.text:
+            sink.write(line.rstrip() + "\n")
+
+    def _json_key(self, name: str):
+        self.json.write(("," if self._json_fields else "") + f"\n  {json.dumps(name)}: ")
+        self._json_fields += 1
+
+    def _heading(self, title: str):
+        if self.text:
+            self._line()
+            self._line(f"{title.upper()}:")
+            self._line("-" * TEXT_WIDTH)
+        if self.html:
+            self.html.write(f"<h2>{html_lib.escape(title)}</h2>\n")
+
+    # --- sections ------------------------------------------------------------
+
+    def begin(self, lines: Sequence[str] = ()):
+        """Report header; ``lines`` are shown under the title"""
+        if self.text:
+            self._line("=" * TEXT_WIDTH)
+            self._line(self.title.center(TEXT_WIDTH))
+            self._line("=" * TEXT_WIDTH)
+            for line in lines:
+                self._line(line)
+        if self.json:
+            self.json.write("{")
+            self._json_key("title")
+            self.json.write(json.dumps(self.title))
+        if self.html:
+            self.html.write(_HTML_HEAD.format(title=html_lib.escape(self.title)))
+            for line in lines:
+                self.html.write(f"<p>{html_lib.escape(line)}</p>\n")
+
+    def summary(self, name: str, title: str, items: Iterable[Tuple]):
+        """Key/value section; items are ``(key, label, value[, display])``
+
+        JSON gets ``{key: value}``; text and HTML show ``label: display``
+        (display defaults to the value). Items with no label are JSON-only.
+        """
+        items = list(items)
+        visible = [item for item in items if item[1]]
+        if visible:
+            self._heading(title)
+            if self.html:
+                self.html.write("<table>\n")
+            for item in visible:
+                display = item[3] if len(item) > 3 else item[2]
+                self._line(f"{item[1]}: {display}")
+                if self.html:
+                    self.html.write(f"<tr><th>{html_lib.escape(str(item[1]))}</th>"
+                                    f"<td>{html_lib.escape(str(display))}</td></tr>\n")
+            if self.html:
+                self.html.write("</table>\n")
+        if self.json:
+            self._json_key(name)
+            self.json.write(json.dumps({item[0]: item[2] for item in items}, default=str))
+
+    def table(self, name: str, title: str, columns: Sequence[Column], rows: Iterable[Dict],
+              empty: str = "(none)") -> int:
+        """Table section; ``rows`` is consumed once, row by row. Returns the row count
+
+        Text and HTML show ``columns``; JSON gets every field of each row.
+        """
+        self._heading(title)
+        if self.text:
+            self._line("   " + " ".join(column.pad(column.label) for column in columns))
+        if self.html:
+            self.html.write("<table><thead><tr>" + "".join(f"<th>{html_lib.escape(c.label)}</th>" for c in columns)
+                            + "</tr></thead><tbody>\n")
+        if self.json:
+            self._json_key(name)
+            self.json.write("[")
+
+        count = 0
+        for row in rows:
+            cells = [column.format(row.get(column.key)) for column in columns]
+            if self.text:
+                self._line("   " + " ".join(column.pad(cell) for column, cell in zip(columns, cells)))
+            if self.html:
+                self.html.write("<tr>" + "".join(
+                    ('<td class="num">' if column.numeric else "<td>") + html_lib.escape(cell) + "</td>"
+                    for column, cell in zip(columns, cells)) + "</tr>\n")
+            if self.json:
+                self.json.write(("," if count else "") + "\n    " + json.dumps(row, default=str, ensure_ascii=False))
+            count += 1
+
+        if not count:
+            self._line(f"   {empty}")
+        if self.html:
+            if not count:
+                self.html.write(f"<tr><td colspan=\"{len(columns)}\">{html_lib.escape(empty)}</td></tr>\n")
+            self.html.write("</tbody></table>\n")
+        if self.json:
+            self.json.write("\n  ]" if count else "]")
+        return count
+
+    def notes(self, name: str, title: str, lines: Iterable[str]):
+        """Bullet list section"""
+        lines = list(lines)
+        self._heading(title)
+        for line in lines:
+            self._line(f"• {line}")
+        if self.html:
+            self.html.write("<ul>\n" + "".join(f"<li>{html_lib.escape(line)}</li>\n" for line in lines) + "</ul>\n")
+        if self.json:
+            self._json_key(name)
+            self.json.write(json.dumps(lines))
+
+    def value(self, name: str, value: Any):
+        """JSON-only field"""
+        if self.json:
+            self._json_key(name)
+            self.json.write(json.dumps(value, default=str, ensure_ascii=False))
+
+    def records(self, name: str, rows: Iterable[Dict]) -> int:
+        """JSON-only list of whole records, written one at a time"""
+        if not self.json:
+            return 0
+        self._json_key(name)
+        self.json.write("[")
+        count = 0
+        for row in rows:
+            self.json.write(("," if count else "") + "\n    " + json.dumps(row, default=str, ensure_ascii=False))
+            count += 1
+        self.json.write("\n  ]" if count else "]")
+        return count
+
+    def end(self, footer: str = "END OF REPORT"):
+        if self.text:
+            self._line()
+            self._line(footer)
+        if self.json:
+            self.json.write("\n}\n")
+        if self.html:
+            self.html.write("</body></html>\n")
+
+
+SAMPLE_COLUMNS = [
+    Column("timestamp", "Time", 26, numeric=False),
+    Column("method", "Method", 6, numeric=False),
+    Column("endpoint", "Endpoint", 45, numeric=False),
+    Column("status_code", "Code", 5),
+    Column("duration_ms", "ms", 9, "{:.1f}"),
+    Column("message", "Message", 30, numeric=False),
+]
+
+
+def render_result_sections(store, renderer: ReportRenderer, top_n: int = DEFAULT_TOP_N, failed=None,
+                           where=None):
+    """Aggregate and top-N sections shared by the test reports
+
+    ``failed`` is a mask of the rows to sample as failures (default: no 2xx),
+    ``where`` limits every section to part of the store (e.g. API rows only).
+    """
+    import numpy as np
+
+    keep = np.ones(len(store), dtype=bool) if where is None else np.asarray(where, dtype=bool)
+    answered = keep & (store.column("status_code") > 0)
+    failed = keep & (store.column("success") == 0 if failed is None else np.asarray(failed, dtype=bool))
+
+    latency = store.group_by("route", "duration_ms", where=answered)
+    errors = store.count_by("route", failed)
+    requests = store.count_by("route", keep)
+    by_route = [{"route": route, "requests": count, "errors": errors.get(route, 0), **latency.get(route, {})}
+                for route, count in requests.items()]
+    by_route.sort(key=lambda row: -(row.get("p95") or 0))
+    renderer.table("latency_by_endpoint", "Latency by endpoint (ms, answered requests)", [
+        Column("route", "Endpoint", 50, numeric=False),
+        Column("requests", "Requests", 9),
+        Column("errors", "Errors", 7),
+        Column("mean", "mean", 9, "{:.1f}"),
+        Column("p50", "p50", 9, "{:.1f}"),
+        Column("p95", "p95", 9, "{:.1f}"),
+        Column("p99", "p99", 9, "{:.1f}"),
+        Column("max", "max", 9, "{:.1f}"),
+    ], iter(by_route))
+
+    codes = store.group_by("status_code", "duration_ms", (), where=keep)
+    renderer.table("status_codes", "Status codes", [
+        Column("status_code", "Code", 6),
+        Column("count", "Requests", 10),
+        Column("mean", "mean ms", 10, "{:.1f}"),
+    ], ({"status_code": code, **row} for code, row in sorted(codes.items())))
+
+    payload = store.payload_summary(keep)
+    renderer.table("payload_by_endpoint", "Payload sizes (mean per response)", [
+        Column("route", "Endpoint", 50, numeric=False),
+        Column("response_body_bytes_mean", "decoded", 10, format_bytes),
+        Column("response_wire_bytes_mean", "wire", 10, format_bytes),
+        Column("compression_ratio_mean", "ratio", 6, "{:.1f}x"),
+        Column("effective_bytes_per_sec_mean", "per sec", 10, format_bytes),
+    ], ({"route": route, **row} for route, row in
+        sorted(payload.items(), key=lambda item: -(item[1]["response_body_bytes_mean"] or 0)) if row["responses"]))
+
+    # Top-N slowest: a partial selection, then only N rows are decoded
+    durations = np.where(answered, store.column("duration_ms"), -np.inf)
+    n = min(top_n, int(answered.sum()))
+    slowest = np.argpartition(-durations, n - 1)[:n] if n else np.zeros(0, dtype=np.int64)
+    slowest = slowest[np.argsort(-durations[slowest])]
+    renderer.table("slowest", f"Slowest {n} requests", SAMPLE_COLUMNS, store.rows(slowest))
+
+    failed_indexes = np.flatnonzero(failed)
+    shown = renderer.table("failed", f"Failed requests (first {min(top_n, failed_indexes.size)} "
+                                     f"of {failed_indexes.size})",
+                           SAMPLE_COLUMNS, store.rows(failed_indexes[:top_n]))
+    return {"failed": int(failed_indexes.size), "failed_shown": shown}
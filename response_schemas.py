@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Response Schema Validation
+
+Response schemas for every catalogued endpoint (models from api_endpoints.md,
+envelopes as observed in recorded api_test_report_*.json runs), compiled once
+into plain Python validator functions.
+
+Compiled validators are cached by schema hash, so endpoints sharing a schema
+share one function. ``ResponseValidator`` validates every response in
+functional runs and a configurable random sample in load runs, and keeps
+track of the CPU time it spends so the overhead can be reported.
+
+Supported schema keywords: ``type`` (string or list), ``required``,
+``properties`` and ``items``. Optional properties may be null.
+"""
+
+import hashlib
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from endpoint_catalog import ENDPOINT_TEMPLATES, match_template
+
+Validator = Callable[[Any], List[str]]
+
+# ---------------------------------------------------------------------------
+# Models (api_endpoints.md - Data Models & Schemas)
+# ---------------------------------------------------------------------------
+
+USER_PROFILE = {
+    "type": "object",
+    "required": ["id", "email"],
+    "properties": {
+        "id": {"type": "string"},
+        "name": {"type": "string"},
+        "email": {"type": "string"},
+        "phone": {"type": "string"},
+        "company_id": {"type": "string"},
+        "role": {"type": "string"},
+        "is_active": {"type": "boolean"},
+        "plan_type": {"type": "string"},
+        "planType": {"type": "string"},
+        "validityDays": {"type": "number"},
+        "expiry_date": {"type": "string"},
+        "created_at": {"type": "string"},
+        "updated_at": {"type": "string"},
+    },
+}
+
+COMPANY = {
+    "type": "object",
+    "required": ["id", "name"],
+    "properties": {
+        "id": {"type": "string"},
+        "name": {"type": "string"},
+        "email": {"type": "string"},
+        "phone": {"type": "string"},
+        "address": {"type": "string"},
+        "industry": {"type": "string"},
+        "size": {"type": "string"},
+        "subscription_plan": {"type": "string"},
+        "is_active": {"type": "boolean"},
+        "created_at": {"type": "string"},
+    },
+}
+
+EMPLOYEE = {
+    "type": "object",
+    "required": ["id"],
+    "properties": {
+        "id": {"type": "string"},
+        "name": {"type": "string"},
+        "email": {"type": "string"},
+        "personalEmail": {"type": "string"},
+        "company_id": {"type": "string"},
+        "department": {"type": "string"},
+        "position": {"type": "string"},
+        "role": {"type": "string"},
+        "phone": {"type": "string"},
+    },
+}
+
+PSYCHOLOGIST = {
+    "type": "object",
+    "required": ["id", "name"],
+    "properties": {
+        "id": {"type": "string"},
+        "name": {"type": "string"},
+        "email": {"type": "string"},
+        "specialization": {"type": ["string", "array"]},
+        "experience_years": {"type": "number"},
+        "rating": {"type": "number"},
+        "hourly_rate": {"type": "number"},
+        "availability": {"type": "object"},
+        "is_available": {"type": "boolean"},
+        "degree": {"type": "string"},
+        "mobile_number": {"type": "string"},
+        "emergency_call_rate": {"type": "number"},
+        "session_45_minute_rate": {"type": "number"},
+        "session_30_minute_rate": {"type": "number"},
+        "created_at": {"type": "string"},
+        "updated_at": {"type": "string"},
+    },
+}
+
+AVAILABILITY = {
+    "type": "object",
+    "required": ["id", "psychologist_id"],
+    "properties": {
+        "id": {"type": "string"},
+        "psychologist_id": {"type": "string"},
+        "time_slot": {"type": "string"},
+        "availability_status": {"type": "string"},
+        "created_at": {"type": "string"},
+        "updated_at": {"type": "string"},
+    },
+}
+
+HOLIDAY = {
+    "type": "object",
+    "required": ["id", "date"],
+    "properties": {
+        "id": {"type": "string"},
+        "date": {"type": "string"},
+        "description": {"type": "string"},
+        "created_at": {"type": "string"},
+        "updated_at": {"type": "string"},
+    },
+}
+
+BOOKING = {
+    "type": "object",
+    "required": ["id", "psychologist_id"],
+    "properties": {
+        "id": {"type": "string"},
+        "employee_id": {"type": "string"},
+        "psychologist_id": {"type": "string"},
+        "session_date": {"type": "string"},
+        "session_duration": {"type": "number"},
+        "session_type": {"type": "string"},
+        "status": {"type": "string"},
+        "meeting_link": {"type": "string"},
+        "notes": {"type": "string"},
+        "cost": {"type": "number"},
+        "appointment_date": {"type": "string"},
+        "appointment_time": {"type": "string"},
+        "meet_link": {"type": "string"},
+        "created_at": {"type": "string"},
+        "updated_at": {"type": "string"},
+    },
+}
+
+EMPLOYEE_PAYMENT = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string"},
+        "employee_id": {"type": "string"},
+        "email": {"type": "string"},
+        "product_id": {"type": "string"},
+        "plan_type": {"type": "string"},
+        "validity_days": {"type": "number"},
+        "expiry_date": {"type": "string"},
+        "is_subscription": {"type": "boolean"},
+        "verified_at": {"type": "string"},
+    },
+}
+
+# ---------------------------------------------------------------------------
+# Envelopes
+# ---------------------------------------------------------------------------
+
+
+def envelope(payload: Optional[Dict] = None, key: str = "data", required_data: bool = True, **extra) -> Dict:
+    """SuccessResponse envelope: {success, message, <key>: payload}"""
+    properties = {"success": {"type": "boolean"}, "message": {"type": "string"}}
+    required = ["success"]
+    if payload is not None:
+        properties[key] = payload
+        if required_data:
+            required.append(key)
+    for name, schema in extra.items():
+        properties[name] = schema
+    return {"type": "object", "required": required, "properties": properties}
+
+
+def array_of(item: Dict) -> Dict:
+    return {"type": "array", "items": item}
+
+
+SUCCESS_RESPONSE = envelope({"type": ["object", "array"]}, required_data=False)
+
+# ErrorResponse and ValidationErrorResponse share "success"; the message lives
+# in either "message" or "error"
+ERROR_RESPONSE = {
+    "type": "object",
+    "required": ["success"],
+    "properties": {
+        "success": {"type": "boolean"},
+        "message": {"type": "string"},
+        "error": {"type": "string"},
+        "errors": {"type": "array"},
+        "details": {"type": ["object", "array"]},
+    },
+}
+
+TOKEN_RESPONSE = envelope(
+    {"type": "object", "properties": {"token": {"type": "string"}, "user": USER_PROFILE}},
+    required_data=False,
+    token={"type": "string"},
+    user=USER_PROFILE,
+)
+
+EMPLOYEE_CREATION_RESPONSE = envelope(
+    EMPLOYEE,
+    key="employee",
+    required_data=False,
+    data={"type": "object"},
+    temporaryPassword={"type": "string"},
+    credentialsId={"type": "string"},
+)
+
+TEMP_PASSWORD_LOGIN_RESPONSE = envelope(
+    {
+        "type": "object",
+        "properties": {
+            "token": {"type": "string"},
+            "requiresPasswordChange": {"type": "boolean"},
+            "isFirstLogin": {"type": "boolean"},
+            "user": USER_PROFILE,
+        },
+    },
+    required_data=False,
+    token={"type": "string"},
+    requiresPasswordChange={"type": "boolean"},
+    isFirstLogin={"type": "boolean"},
+)
+
+SUBSCRIPTION_CONFIG = {
+    "type": "object",
+    "properties": {
+        "plan_type": {"type": "string"},
+        "max_employees": {"type": "number"},
+        "features": {"type": "array", "items": {"type": "string"}},
+        "billing_cycle": {"type": "string"},
+    },
+}
+
+# Success-response schema per (method, template)
+RESPONSE_SCHEMAS: Dict[tuple, Dict] = {
+    ("POST", "/auth/supabase/register-profile"): envelope(USER_PROFILE, key="profile"),
+    ("POST", "/auth/supabase/create-credentials"): SUCCESS_RESPONSE,
+    ("POST", "/auth/supabase/login"): TOKEN_RESPONSE,
+    ("GET", "/auth/supabase/profile"): envelope(USER_PROFILE, required_data=False, profile=USER_PROFILE),
+    ("POST", "/auth/supabase/create-employee-temp"): EMPLOYEE_CREATION_RESPONSE,
+    ("POST", "/auth/supabase/login-temp"): TEMP_PASSWORD_LOGIN_RESPONSE,
+    ("PUT", "/auth/supabase/update-temp-password"): TOKEN_RESPONSE,
+
+    ("POST", "/companies-supabase"): envelope(COMPANY, required_data=False, company_id={"type": "string"}),
+    ("POST", "/companies/{companyId}/employees"): EMPLOYEE_CREATION_RESPONSE,
+    ("GET", "/companies/{companyId}/employees"): envelope(array_of(EMPLOYEE)),
+    ("POST", "/companies/{companyId}/employees/{employeeId}/resend-credentials"): SUCCESS_RESPONSE,
+    ("POST", "/companies/{companyId}/employees/bulk"): envelope({"type": ["object", "array"]}),
+    ("POST", "/companies/forgot-password/personal-email"): SUCCESS_RESPONSE,
+    ("GET", "/companies-supabase/{companyId}/subscription-config"): envelope(SUBSCRIPTION_CONFIG),
+    ("PUT", "/companies-supabase/{companyId}/subscription-config"): envelope(SUBSCRIPTION_CONFIG),
+
+    ("GET", "/psychologists"): envelope(array_of(PSYCHOLOGIST)),
+    ("POST", "/psychologists"): envelope(PSYCHOLOGIST),
+    ("GET", "/psychologists/search"): envelope(array_of(PSYCHOLOGIST)),
+    ("GET", "/psychologists/{id}"): envelope(PSYCHOLOGIST),
+
+    ("GET", "/bookings/my-bookings"): envelope(array_of(BOOKING)),
+    ("GET", "/bookings/psychologist-bookings"): envelope(array_of(BOOKING)),
+    ("POST", "/bookings"): envelope(BOOKING),
+
+    ("POST", "/employee-subscriptions/verify/purchase"): envelope(EMPLOYEE_PAYMENT),
+    ("POST", "/employee-subscriptions/verify/subscription"): envelope(EMPLOYEE_PAYMENT),
+    ("GET", "/employee-subscriptions/active"): envelope(array_of(EMPLOYEE_PAYMENT)),
+    ("GET", "/employee-subscriptions/status"): envelope({
+        "type": "object",
+        "required": ["status"],
+        "properties": {
+            "isInitialized": {"type": "boolean"},
+            "packageName": {"type": "string"},
+            "serviceAccountKey": {"type": "string"},
+            "status": {"type": "string"},
+            "timestamp": {"type": "string"},
+        },
+    }),
+
+    ("POST", "/availability"): envelope(AVAILABILITY),
+    ("GET", "/availability/{psychologist_id}"): envelope(array_of(AVAILABILITY)),
+    ("PATCH", "/availability/{id}"): envelope(AVAILABILITY),
+    ("DELETE", "/availability/{id}"): SUCCESS_RESPONSE,
+    ("POST", "/availability/populate-n-days"): envelope({"type": "object"}),
+    ("PATCH", "/availability/toggle-day"): envelope({"type": "object"}),
+    ("GET", "/holidays"): envelope(array_of(HOLIDAY)),
+    ("POST", "/holidays"): envelope(HOLIDAY),
+    ("DELETE", "/holidays/{id}"): SUCCESS_RESPONSE,
+
+    ("GET", "/auth/supabase/company/{companyId}/employees-status"): envelope(array_of(EMPLOYEE)),
+}
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+_TYPE_CHECKS = {
+    "string": "isinstance({v}, str)",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool))",
+    "boolean": "isinstance({v}, bool)",
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "null": "{v} is None",
+}
+
+_VALIDATOR_CACHE: Dict[str, Validator] = {}
+
+
+def schema_hash(schema: Dict) -> str:
+    """Stable hash of a schema, used as the validator cache key"""
+    return hashlib.sha1(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _emit(schema: Dict, var: str, path: str, lines: List[str], indent: int, names: List[int],
+          nullable: bool = False):
+    """Append the checks for ``schema`` applied to variable ``var``
+
+    ``path`` is a Python expression for the JSON path, only evaluated when an
+    error is recorded. Every block starts with ``pass`` so empty schemas still
+    produce valid source.
+    """
+    pad = "    " * indent
+    types = schema.get("type")
+    if types is not None:
+        types = [types] if isinstance(types, str) else list(types)
+        allowed = types + (["null"] if nullable and "null" not in types else [])
+        checks = " or ".join(_TYPE_CHECKS[t].format(v=var) for t in allowed)
+        lines.append(f"{pad}if not ({checks}):")
+        lines.append(f"{pad}    errs.append({path} + {': expected ' + '/'.join(types) + ', got '!r} + type({var}).__name__)")
+
+    required = schema.get("required", [])
+    properties = schema.get("properties", {})
+    if required or properties:
+        lines.append(f"{pad}if isinstance({var}, dict):")
+        lines.append(f"{pad}    pass")
+        for name in required:
+            lines.append(f"{pad}    if {name!r} not in {var}:")
+            lines.append(f"{pad}        errs.append({path} + {'.' + name + ': missing required field'!r})")
+        for name, sub in properties.items():
+            names[0] += 1
+            child = f"v{names[0]}"
+            lines.append(f"{pad}    {child} = {var}.get({name!r}, _MISSING)")
+            lines.append(f"{pad}    if {child} is not _MISSING:")
+            lines.append(f"{pad}        pass")
+            _emit(sub, child, f"{path} + {'.' + name!r}", lines, indent + 2, names,
+                  nullable=name not in required)
+
+    items = schema.get("items")
+    if items is not None:
+        names[0] += 1
+        index, item = f"n{names[0]}", f"i{names[0]}"
+        lines.append(f"{pad}if isinstance({var}, list):")
+        lines.append(f"{pad}    for {index}, {item} in enumerate({var}):")
+        lines.append(f"{pad}        pass")
+        _emit(items, item, f"{path} + '[' + str({index}) + ']'", lines, indent + 2, names)
+        # One broken item usually means all of them are; keep the report short
+        lines.append(f"{pad}        if len(errs) > {MAX_ERRORS}:")
+        lines.append(f"{pad}            break")
+
+
+MAX_ERRORS = 20
+
+
+def compile_schema(schema: Dict) -> Validator:
+    """Generate a validator function for ``schema`` (cached by schema hash)"""
+    key = schema_hash(schema)
+    validator = _VALIDATOR_CACHE.get(key)
+    if validator is not None:
+        return validator
+
+    lines: List[str] = []
+    _emit(schema, "data", "'$'", lines, 1, [0])
+    source = "def validate(data):\n    errs = []\n" + "\n".join(lines) + "\n    return errs\n"
+    namespace: Dict[str, Any] = {"_MISSING": _MISSING}
+    exec(compile(source, f"<schema {key[:12]}>", "exec"), namespace)
+    validator = namespace["validate"]
+    validator.__source__ = source
+    _VALIDATOR_CACHE[key] = validator
+    return validator
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+# Compiled once at import; lookups at request time are dictionary hits
+COMPILED_VALIDATORS: Dict[tuple, Validator] = {
+    key: compile_schema(schema) for key, schema in RESPONSE_SCHEMAS.items()
+}
+ERROR_VALIDATOR: Validator = compile_schema(ERROR_RESPONSE)
+
+
+def schema_for(method: str, path: str) -> Optional[Dict]:
+    """Success-response schema for a concrete or templated path"""
+    template = match_template(method, path)
+    if template is None:
+        return None
+    return RESPONSE_SCHEMAS.get((method.upper(), template))
+
+
+def missing_schemas() -> List[tuple]:
+    """Catalogued endpoints without a response schema"""
+    return [(m, t) for m, t, _c, _a in ENDPOINT_TEMPLATES if (m, t) not in RESPONSE_SCHEMAS]
+
+
+class ResponseValidator:
+    """Validate API responses against the compiled schemas
+
+    ``sample_rate`` is 1.0 for functional runs (every response checked) and
+    typically 0.01-0.1 for load runs. Validation time is accumulated so the
+    share of generator CPU spent on validation can be reported.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, seed: Optional[int] = None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {sample_rate}")
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed).random
+        self.checked = 0
+        self.skipped = 0
+        self.unknown = 0
+        self.failed = 0
+        self.validation_time = 0.0
+        self.failures_by_endpoint: Dict[str, int] = {}
+
+    def sample(self) -> bool:
+        """Draw whether the next response is checked; load runs call this before parsing a body"""
+        if self.sample_rate < 1.0 and self._random() >= self.sample_rate:
+            self.skipped += 1
+            return False
+        return True
+
+    def validate(self, method: str, endpoint: str, status_code: int, data: Any) -> Optional[List[str]]:
+        """Return schema errors ([] when valid) or None when the response was not checked"""
+        if not self.sample():
+            return None
+        return self.check(method, endpoint, status_code, data)
+
+    def check(self, method: str, endpoint: str, status_code: int, data: Any) -> Optional[List[str]]:
+        """Validate without sampling (after ``sample()`` returned True)"""
+        start = time.perf_counter()
+        template = match_template(method, endpoint)
+        if template is None or not status_code:
+            self.unknown += 1
+            self.validation_time += time.perf_counter() - start
+            return None
+
+        if 200 <= status_code < 300:
+            validator = COMPILED_VALIDATORS.get((method.upper(), template))
+        else:
+            validator = ERROR_VALIDATOR
+        if validator is None:
+            self.unknown += 1
+            self.validation_time += time.perf_counter() - start
+            return None
+
+        errors = validator(data)
+        self.checked += 1
+        if errors:
+            self.failed += 1
+            key = f"{method.upper()} {template}"
+            self.failures_by_endpoint[key] = self.failures_by_endpoint.get(key, 0) + 1
+        self.validation_time += time.perf_counter() - start
+        return errors
+
+    def summary(self, generator_cpu_time: Optional[float] = None) -> Dict[str, Any]:
+        """Counts plus validation overhead as a share of generator CPU time"""
+        if generator_cpu_time is None:
+            generator_cpu_time = time.process_time()
+        overhead_pct = (self.validation_time / generator_cpu_time * 100) if generator_cpu_time > 0 else 0.0
+        return {
+            "sample_rate": self.sample_rate,
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "unknown_endpoint": self.unknown,
+            "schema_failures": self.failed,
+            "failures_by_endpoint": dict(self.failures_by_endpoint),
+            "validation_time_ms": round(self.validation_time * 1000, 3),
+            "overhead_pct_of_cpu": round(overhead_pct, 3),
+        }
+
+
+def validate_report(report_file: str) -> Dict[str, Any]:
+    """Validate every recorded response in an api_test_report_*.json file"""
+    with open(report_file, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    validator = ResponseValidator()
+    mismatches = []
+    for result in report.get("detailed_results", []):
+        errors = validator.validate(
+            result.get("method", "GET"), result.get("endpoint", ""),
+            result.get("status_code") or 0, result.get("response_data")
+        )
+        if errors:
+            mismatches.append({
+                "method": result.get("method"),
+                "endpoint": result.get("endpoint"),
+                "status_code": result.get("status_code"),
+                "errors": errors[:5],
+            })
+    return {"report_file": report_file, "summary": validator.summary(), "mismatches": mismatches}
+
+
+def main():
+    """Validate recorded reports given on the command line"""
+    import glob
+
+    files = sys.argv[1:] or sorted(glob.glob("api_test_report_*.json"))
+    if not files:
+        print("❌ No api_test_report_*.json files found")
+        sys.exit(1)
+
+    print("🔍 ThoughtPro B2B Response Schema Validation")
+    print("=" * 80)
+    uncovered = missing_schemas()
+    print(f"Schemas: {len(RESPONSE_SCHEMAS)} endpoints, {len(_VALIDATOR_CACHE)} compiled validators")
+    if uncovered:
+        print(f"⚠️  Catalogued endpoints without schema: {len(uncovered)}")
+
+    exit_code = 0
+    for report_file in files:
+        result = validate_report(report_file)
+        summary = result["summary"]
+        print(f"\n📄 {report_file}")
+        print(f"   Checked: {summary['checked']} | Unknown endpoints: {summary['unknown_endpoint']} | "
+              f"Mismatches: {summary['schema_failures']}")
+        for mismatch in result["mismatches"]:
+            exit_code = 1
+            print(f"   ❌ {mismatch['method']} {mismatch['endpoint']} ({mismatch['status_code']})")
+            for error in mismatch["errors"]:
+                print(f"      └─ {error}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
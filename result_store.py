@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Columnar Result Store
+
+Test results as typed columns instead of one dict or dataclass per request:
+
+  * numbers live in ``array.array`` columns - timings as float64, status
+    codes as int32, byte counts as int64, flags as int8 - about 90 bytes a
+    row instead of a kilobyte or more for a dict
+  * strings (method, endpoint, "METHOD /template" route, status, message)
+    are dictionary-encoded: each column stores uint32 codes into a list of
+    distinct values, so a million rows over forty endpoints keep forty strings
+  * queries run on NumPy views of the columns: counts, group-by with
+    mean/min/max and nearest-rank percentiles in one sort, filters as masks
+  * export to ``.npz`` (columns plus dictionaries; ``ResultStore.load`` reads
+    it back) or CSV (written row by row)
+
+Appending only needs the standard library; NumPy is imported for queries and
+``.npz`` files. Rows come from ProductionAPITester result dicts or from
+ThoughtProAPITester ``TestResult`` objects - ``execution_time`` (seconds),
+``response_code`` and ``error`` are accepted as aliases of ``duration_ms``,
+``status_code`` and ``message``. Response bodies are not stored.
+
+Usage:
+    store = ResultStore()
+    store.append(result)                                   # dict or dataclass
+    store.group_by("route", "duration_ms")                 # {route: {count, mean, p50, p95, p99, ...}}
+    store.save("results.npz")                              # or results.csv
+
+    python result_store.py results.npz [--group-by route] [--csv results.csv]
+"""
+
+import argparse
+import csv
+import math
+import sys
+import time
+from array import array
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from endpoint_catalog import template_for
+
+FORMAT_VERSION = 1
+
+# name -> array typecode; missing values are NaN for floats and 0 otherwise
+NUMERIC_COLUMNS = {
+    "timestamp": "d",
+    "duration_ms": "d",
+    "status_code": "i",
+    "success": "b",
+    "short_circuited": "b",
+    "requires_auth": "b",
+    "request_wire_bytes": "q",
+    "request_body_bytes": "q",
+    "response_wire_bytes": "q",
+    "response_body_bytes": "q",
+    "compression_ratio": "f",
+    "effective_bytes_per_sec": "d",
+}
+STRING_COLUMNS = ["method", "endpoint", "route", "status", "message"]
+COLUMNS = ["timestamp", "method", "endpoint", "route", "status_code", "status", "success", "duration_ms",
+           "short_circuited", "requires_auth", "request_wire_bytes", "request_body_bytes",
+           "response_wire_bytes", "response_body_bytes", "compression_ratio", "effective_bytes_per_sec", "message"]
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+class ResultStore:
+    """Append-only columnar table of request results"""
+
+    def __init__(self):
+        self.numeric: Dict[str, array] = {name: array(code) for name, code in NUMERIC_COLUMNS.items()}
+        self.codes: Dict[str, array] = {name: array("I") for name in STRING_COLUMNS}
+        self.dictionaries: Dict[str, List[str]] = {name: [] for name in STRING_COLUMNS}
+        self._index: Dict[str, Dict[str, int]] = {name: {} for name in STRING_COLUMNS}
+        self._routes: Dict[tuple, str] = {}
+
+    # --- writing -------------------------------------------------------------
+
+    def _encode(self, column: str, value) -> int:
+        value = "" if value is None else str(value)
+        index = self._index[column]
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(self.dictionaries[column])
+            self.dictionaries[column].append(value)
+        return code
+
+    def append(self, row) -> None:
+        """Add one result - a ProductionAPITester dict or a TestResult-like object"""
+        if not isinstance(row, dict):
+            row = vars(row)
+        get = row.get
+        method = str(get("method") or "GET").upper()
+        endpoint = get("endpoint") or ""
+        route = self._routes.get((method, endpoint))
+        if route is None:
+            route = self._routes[(method, endpoint)] = f"{method} {template_for(method, endpoint)}"
+        status = get("status")
+        status = getattr(status, "value", status)
+        duration_ms = get("duration_ms")
+        if duration_ms is None and get("execution_time") is not None:
+            duration_ms = get("execution_time") * 1000
+        status_code = get("status_code", get("response_code")) or 0
+        success = get("success")
+        if success is None:
+            success = 200 <= status_code < 300
+        ratio = get("compression_ratio")
+
+        numeric = self.numeric
+        numeric["timestamp"].append(_timestamp(get("timestamp")))
+        numeric["duration_ms"].append(float("nan") if duration_ms is None else float(duration_ms))
+        numeric["status_code"].append(int(status_code))
+        numeric["success"].append(1 if success else 0)
+        numeric["short_circuited"].append(1 if get("short_circuited") or status == "[SHORT]" else 0)
+        numeric["requires_auth"].append(1 if get("requires_auth") else 0)
+        for name in ("request_wire_bytes", "request_body_bytes", "response_wire_bytes", "response_body_bytes"):
+            numeric[name].append(int(get(name) or 0))
+        numeric["compression_ratio"].append(float("nan") if ratio is None else float(ratio))
+        numeric["effective_bytes_per_sec"].append(float(get("effective_bytes_per_sec") or 0.0))
+
+        codes = self.codes
+        codes["method"].append(self._encode("method", method))
+        codes["endpoint"].append(self._encode("endpoint", endpoint))
+        codes["route"].append(self._encode("route", route))
+        codes["status"].append(self._encode("status", status))
+        codes["message"].append(self._encode("message", get("message", get("error"))))
+
+    def extend(self, rows) -> "ResultStore":
+        for row in rows:
+            self.append(row)
+        return self
+
+    @classmethod
+    def from_rows(cls, rows) -> "ResultStore":
+        return cls().extend(rows)
+
+    def clear(self):
+        self.__init__()
+
+    def __len__(self) -> int:
+        return len(self.numeric["duration_ms"])
+
+    # --- reading -------------------------------------------------------------
+
+    def column(self, name: str):
+        """NumPy copy of a numeric column, or the codes of a string column"""
+        import numpy as np
+
+        source = self.numeric.get(name)
+        if source is None:
+            source = self.codes[name]
+        return np.frombuffer(source, dtype=np.dtype(source.typecode)).copy() if len(source) else \
+            np.zeros(0, dtype=np.dtype(source.typecode))
+
+    def labels(self, name: str) -> List[str]:
+        return self.dictionaries[name]
+
+    def mask(self, name: str, predicate: Callable[[str], bool]):
+        """Boolean mask of rows whose string column value satisfies ``predicate``"""
+        import numpy as np
+
+        wanted = [code for code, value in enumerate(self.dictionaries[name]) if predicate(value)]
+        return np.isin(self.column(name), np.asarray(wanted, dtype=np.uint32))
+
+    def count(self, name: str, where=None) -> int:
+        """Rows where the flag column ``name`` is set"""
+        values = self.column(name)
+        if where is not None:
+            values = values[where]
+        return int(values.sum())
+
+    def count_by(self, name: str, where=None) -> Dict[str, int]:
+        """Row count per value of a string column"""
+        import numpy as np
+
+        codes = self.column(name)
+        if where is not None:
+            codes = codes[where]
+        counts = np.bincount(codes, minlength=len(self.dictionaries[name]))
+        return {self.dictionaries[name][code]: int(n) for code, n in enumerate(counts) if n}
+
+    def group_by(self, key: str = "route", value: str = "duration_ms",
+                 percentiles: Sequence[float] = (50, 95, 99), where=None) -> Dict[str, Dict]:
+        """count, mean, min, max and nearest-rank percentiles of ``value`` per ``key``
+
+        ``key`` is a string column (grouped by label) or a numeric one (by
+        value). NaN values and rows outside ``where`` are left out.
+        """
+        import numpy as np
+
+        keys = self.column(key)
+        values = self.column(value).astype(np.float64)
+        keep = ~np.isnan(values)
+        if where is not None:
+            keep &= where
+        keys, values = keys[keep], values[keep]
+        if not values.size:
+            return {}
+
+        if not percentiles and key in self.codes:
+            # No order statistics needed - O(n) bincount over the codes instead of a sort
+            keys = keys.astype(np.int64)
+            size = int(keys.max()) + 1
+            counts_all = np.bincount(keys, minlength=size)
+            groups = np.nonzero(counts_all)[0]
+            counts = counts_all[groups]
+            low = np.full(size, np.inf)
+            high = np.full(size, -np.inf)
+            np.minimum.at(low, keys, values)
+            np.maximum.at(high, keys, values)
+            result = {
+                "count": counts,
+                "mean": np.bincount(keys, weights=values, minlength=size)[groups] / counts,
+                "min": low[groups],
+                "max": high[groups],
+            }
+            return self._labelled(key, groups, result)
+
+        order = np.lexsort((values, keys))
+        keys, values = keys[order], values[order]
+        groups, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+        sums = np.add.reduceat(values, starts)
+        result = {
+            "count": counts,
+            "mean": sums / counts,
+            "min": values[starts],
+            "max": values[starts + counts - 1],
+        }
+        for q in percentiles:
+            ranks = np.clip(np.ceil(q / 100 * counts).astype(np.int64) - 1, 0, counts - 1)
+            result[f"p{q:g}"] = values[starts + ranks]
+        return self._labelled(key, groups, result)
+
+    def _labelled(self, key: str, groups, result: Dict) -> Dict[str, Dict]:
+        labels = self.dictionaries.get(key) if key in self.codes else None
+        summary: Dict[str, Dict] = {}
+        for i, group in enumerate(groups):
+            label = labels[group] if labels is not None else group.item()
+            summary[label] = {name: (int(column[i]) if name == "count" else round(float(column[i]), 3))
+                              for name, column in result.items()}
+        return summary
+
+    def percentile(self, value: str, q: float, where=None) -> Optional[float]:
+        """Nearest-rank percentile of a numeric column over all (or the ``where``) rows"""
+        import numpy as np
+
+        values = self.column(value).astype(np.float64)
+        if where is not None:
+            values = values[where]
+        values = np.sort(values[~np.isnan(values)])
+        if not values.size:
+            return None
+        rank = min(max(math.ceil(q / 100 * values.size) - 1, 0), values.size - 1)
+        return float(values[rank])
+
+    def payload_summary(self, where=None) -> Dict[str, Dict]:
+        """Per route: requests, responses, mean/max sizes, mean compression and bytes/sec
+
+        One entry per row of the report's ``payload_by_endpoint``; rows without a
+        response (no wire bytes) count as requests only.
+        """
+        import numpy as np
+
+        keep = np.ones(len(self), dtype=bool) if where is None else np.asarray(where, dtype=bool)
+        answered = keep & (self.column("response_wire_bytes") > 0)
+        requests = self.count_by("route", keep)
+        stats = {name: self.group_by("route", name, (), answered)
+                 for name in ("request_wire_bytes", "response_wire_bytes", "response_body_bytes",
+                              "compression_ratio", "effective_bytes_per_sec")}
+
+        def pick(name: str, route: str, field: str, digits: int = 1):
+            row = stats[name].get(route)
+            return round(row[field], digits) if row else None
+
+        summary: Dict[str, Dict] = {}
+        for route in sorted(requests):
+            body = stats["response_body_bytes"].get(route)
+            summary[route] = {
+                "requests": requests[route],
+                "responses": body["count"] if body else 0,
+                "request_wire_bytes_mean": pick("request_wire_bytes", route, "mean"),
+                "response_wire_bytes_mean": pick("response_wire_bytes", route, "mean"),
+                "response_body_bytes_mean": pick("response_body_bytes", route, "mean"),
+                "response_body_bytes_max": int(body["max"]) if body else None,
+                "compression_ratio_mean": pick("compression_ratio", route, "mean", 2),
+                "effective_bytes_per_sec_mean": pick("effective_bytes_per_sec", route, "mean"),
+            }
+        return summary
+
+    def payload_totals(self, where=None) -> Dict:
+        """Bytes sent and received over all (or the ``where``) rows"""
+        totals = {}
+        for name in ("request_wire_bytes", "response_wire_bytes", "response_body_bytes"):
+            values = self.column(name)
+            totals[name] = int((values[where] if where is not None else values).sum())
+        return totals
+
+    def row(self, i: int) -> Dict:
+        """Row ``i`` decoded to a dict"""
+        row = {}
+        for name in COLUMNS:
+            if name in self.codes:
+                row[name] = self.dictionaries[name][self.codes[name][i]]
+            else:
+                value = self.numeric[name][i]
+                if name in ("success", "short_circuited", "requires_auth"):
+                    value = bool(value)
+                elif isinstance(value, float) and math.isnan(value):
+                    value = None
+                elif name == "compression_ratio":
+                    value = round(value, 3)   # stored as float32
+                row[name] = value
+        row["timestamp"] = datetime.fromtimestamp(row["timestamp"]).isoformat()
+        return row
+
+    def rows(self, where=None) -> Iterator[Dict]:
+        """Decoded rows, one dict at a time; ``where`` is a boolean mask or an array of row indexes"""
+        if where is None:
+            indexes = range(len(self))
+        else:
+            indexes = where.nonzero()[0] if where.dtype == bool else where
+        for i in indexes:
+            yield self.row(int(i))
+
+    # --- files ---------------------------------------------------------------
+
+    def save(self, path: str):
+        """Write ``.npz`` (columns and dictionaries) or, by extension, ``.csv``"""
+        if path.endswith(".csv"):
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=COLUMNS)
+                writer.writeheader()
+                writer.writerows(self.rows())
+            return
+
+        import numpy as np
+
+        arrays = {name: self.column(name) for name in list(self.numeric) + list(self.codes)}
+        for name, values in self.dictionaries.items():
+            arrays[f"dictionary_{name}"] = np.asarray(values, dtype=str)
+        arrays["format_version"] = np.asarray(FORMAT_VERSION)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ResultStore":
+        """Read a store written by ``save`` as ``.npz``"""
+        import numpy as np
+
+        store = cls()
+        with np.load(path, allow_pickle=False) as data:
+            for name, typecode in NUMERIC_COLUMNS.items():
+                store.numeric[name] = array(typecode, data[name].astype(np.dtype(typecode)).tobytes())
+            for name in STRING_COLUMNS:
+                store.codes[name] = array("I", data[name].astype(np.uint32).tobytes())
+                store.dictionaries[name] = [str(v) for v in data[f"dictionary_{name}"]]
+                store._index[name] = {value: code for code, value in enumerate(store.dictionaries[name])}
+        return store
+
+
+def report_results(report: Dict, source: str) -> List[Dict]:
+    """``detailed_results`` of a JSON test report, with a warning when the run left them out
+
+    Reports of runs above the testers' detail limit keep aggregates and
+    samples only; their per-request results are in a ``--store`` file.
+    """
+    if "detailed_results" not in report and "detailed_results_note" in report:
+        print(f"⚠️  {source} has no per-request results (large run) - re-run the tester with "
+              f"--store results.npz and pass the store instead", file=sys.stderr)
+    return report.get("detailed_results", [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a columnar result store")
+    parser.add_argument("store", help="Result store (.npz)")
+    parser.add_argument("--group-by", default="route", help="Column to group by (default route)")
+    parser.add_argument("--value", default="duration_ms", help="Numeric column to summarise (default duration_ms)")
+    parser.add_argument("--csv", help="Also export the rows to this CSV file")
+    args = parser.parse_args()
+
+    store = ResultStore.load(args.store)
+    print(f"📦 {args.store}: {len(store):,} rows")
+    groups = store.group_by(args.group_by, args.value)
+    print(f"\n{args.group_by:60} {'count':>10} {'mean':>10} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}")
+    print("-" * 126)
+    for label, row in sorted(groups.items(), key=lambda item: -item[1]["count"]):
+        print(f"{str(label):60} {row['count']:>10,} {row['mean']:>10.2f} {row['p50']:>10.2f} "
+              f"{row['p95']:>10.2f} {row['p99']:>10.2f} {row['max']:>10.2f}")
+    if args.csv:
+        store.save(args.csv)
+        print(f"\n💾 Rows exported to: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
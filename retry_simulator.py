@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Retry Amplification Simulator
+
+What do client retries do to the backend during a partial outage?
+
+  * discovers where src/ opts into retries: ``retryApiCall(...)``,
+    ``apiService.requestWithRetry(...)`` and ``apiService.get(url, true)``
+    style calls, and how deeply they nest
+  * a discrete-event simulation: logical calls arrive at ``--rps`` from
+    ``--clients`` browsers; each call goes through its stack of retry
+    layers; the backend fails a share of requests during the outage window
+    and, with ``--capacity-rps``, sheds whatever exceeds its capacity in
+    each second - so retries can keep an outage going after it ends
+  * retry policies: ``retryApiCall`` exactly as in src/utils/apiUtils.js
+    (``maxRetries`` counts attempts; 4xx never retried; a first 500 waits
+    ``delay * 2``, other 5xx and network errors ``delay * attempt``), no
+    retries, exponential backoff with full jitter, and either of those
+    behind a per-client retry budget (token bucket)
+  * reports request amplification overall and during the outage, peak
+    offered load, call success rate and latency, and recovery time: how long
+    after the outage ends the backend is back to its baseline error rate
+  * ``--live`` runs the real ``apiService.requestWithRetry`` under Node
+    against a fault-injecting api_stand_in.StandInServer and compares the
+    measured amplification with the simulated one
+
+Usage:
+    python retry_simulator.py [--rps 20] [--outage 30:60] [--failure-rate 0.5] [--capacity-rps 30] [--live]
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import math
+import os
+import random
+import re
+import shutil
+import subprocess
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Generator, List, Optional, Tuple
+
+from api_stand_in import StandInServer
+from nplus1_detector import NodeReplayer
+from service_map import SRC_DIR, block_end, mask_source
+
+RECOVERY_WINDOW_S = 5
+RECOVERY_MAX_ERROR_RATE = 0.01
+
+_WRAPPER_RE = re.compile(r"\b(retryApiCall|requestWithRetry)\s*\(|\bapiService\.(get|post|put|delete)\s*\(")
+
+# Node harness for --live: logical calls through the real ApiService.requestWithRetry
+_LIVE_HARNESS = r"""
+import { pathToFileURL } from 'node:url';
+
+const spec = JSON.parse(process.argv[2]);
+const store = new Map([['token', 'stand-in-token']]);
+globalThis.localStorage = {
+  getItem: (key) => (store.has(key) ? store.get(key) : null),
+  setItem: (key, value) => store.set(key, String(value)),
+  removeItem: (key) => store.delete(key),
+};
+globalThis.window = globalThis;
+process.env.REACT_APP_API_URL = spec.baseUrl;
+for (const level of ['log', 'info', 'warn', 'error', 'debug']) console[level] = () => {};
+
+const { apiService } = await import(pathToFileURL(spec.apiModule).href);
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+const started = Date.now();
+const results = await Promise.all(spec.arrivals.map(async (at) => {
+  await sleep(at);
+  const begin = Date.now();
+  try {
+    await apiService.requestWithRetry(spec.endpoint, { method: 'GET' }, spec.maxRetries);
+    return { ok: true, start: begin - started, end: Date.now() - started };
+  } catch (error) {
+    return { ok: false, start: begin - started, end: Date.now() - started };
+  }
+}));
+process.stdout.write(JSON.stringify(results) + '\n');
+process.exit(0);
+"""
+
+
+class RetryPolicy:
+    """Decides whether and when to retry; ``None`` means give up"""
+
+    name = "none"
+
+    def next_delay(self, status: int, attempt: int, client: int, rng: random.Random) -> Optional[float]:
+        return None
+
+    def on_call(self, client: int):
+        """A new logical call from ``client`` started (retry budgets earn tokens here)"""
+
+
+class RetryApiCall(RetryPolicy):
+    """src/utils/apiUtils.js retryApiCall(apiCall, maxRetries = 2, delay = 1000)"""
+
+    def __init__(self, max_retries: int = 2, delay_ms: float = 1000):
+        self.max_retries = max_retries
+        self.delay_ms = delay_ms
+        self.name = f"retryApiCall({max_retries}, {delay_ms:g})"
+
+    def next_delay(self, status, attempt, client, rng):
+        if attempt >= self.max_retries or 400 <= status < 500:
+            return None
+        if status == 500 and attempt == 1:
+            return self.delay_ms * 2
+        return self.delay_ms * attempt
+
+
+class ExponentialJitter(RetryPolicy):
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2^(attempt-1)))"""
+
+    def __init__(self, max_attempts: int = 4, base_ms: float = 500, cap_ms: float = 10000):
+        self.max_attempts = max_attempts
+        self.base_ms = base_ms
+        self.cap_ms = cap_ms
+        self.name = f"exp-jitter({max_attempts}, {base_ms:g}..{cap_ms:g})"
+
+    def next_delay(self, status, attempt, client, rng):
+        if attempt >= self.max_attempts or 400 <= status < 500:
+            return None
+        return rng.uniform(0, min(self.cap_ms, self.base_ms * 2 ** (attempt - 1)))
+
+
+class RetryBudget(RetryPolicy):
+    """Per-client token bucket around another policy: each call earns ``ratio`` tokens, each retry costs one"""
+
+    def __init__(self, inner: RetryPolicy, ratio: float = 0.1, capacity: float = 3.0):
+        self.inner = inner
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens: Dict[int, float] = {}
+        self.name = f"{inner.name} + budget {ratio:.0%}"
+
+    def on_call(self, client):
+        self.tokens[client] = min(self.capacity, self.tokens.get(client, self.capacity) + self.ratio)
+        self.inner.on_call(client)
+
+    def next_delay(self, status, attempt, client, rng):
+        delay = self.inner.next_delay(status, attempt, client, rng)
+        if delay is None or self.tokens.get(client, self.capacity) < 1:
+            return None
+        self.tokens[client] = self.tokens.get(client, self.capacity) - 1
+        return delay
+
+
+@dataclass
+class Scenario:
+    rps: float = 20.0
+    duration_s: float = 120.0
+    clients: int = 200
+    outage_start_s: float = 30.0
+    outage_end_s: float = 60.0
+    failure_rate: float = 0.5
+    failure_status: int = 503
+    latency_ms: float = 150.0
+    capacity_rps: Optional[float] = None
+
+
+@dataclass
+class Result:
+    name: str
+    layers: int
+    calls: int = 0
+    failed_calls: int = 0
+    requests: int = 0
+    sent_per_second: Counter = field(default_factory=Counter)
+    failed_per_second: Counter = field(default_factory=Counter)
+    calls_per_second: Counter = field(default_factory=Counter)
+    durations: List[float] = field(default_factory=list)
+
+
+class Simulation:
+    """Discrete-event simulation of logical calls through nested retry layers"""
+
+    def __init__(self, scenario: Scenario, layers: List[RetryPolicy], seed: int = 0, name: str = ""):
+        self.scenario = scenario
+        self.layers = layers
+        self.rng = random.Random(seed)
+        self.now = 0.0
+        self._queue: List[Tuple[float, int, Generator, object]] = []
+        self._sequence = 0
+        self.result = Result(name or " > ".join(p.name for p in layers) or "no retries", len(layers))
+
+    def _schedule(self, at: float, process: Generator, value=None):
+        self._sequence += 1
+        heapq.heappush(self._queue, (at, self._sequence, process, value))
+
+    def _respond(self) -> Tuple[int, float]:
+        """Status and latency for a request sent now"""
+        scenario = self.scenario
+        second = int(self.now / 1000)
+        self.result.sent_per_second[second] += 1
+        status = 200
+        if scenario.outage_start_s * 1000 <= self.now < scenario.outage_end_s * 1000 \
+                and self.rng.random() < scenario.failure_rate:
+            status = scenario.failure_status
+        elif scenario.capacity_rps and self.result.sent_per_second[second] > scenario.capacity_rps:
+            status = 503  # shed: over capacity this second
+        if status != 200:
+            self.result.failed_per_second[second] += 1
+        return status, self.rng.expovariate(1 / scenario.latency_ms) if scenario.latency_ms else 0.0
+
+    def _through(self, depth: int, client: int):
+        """One pass through layers[depth:], resolving to the final status"""
+        if depth == len(self.layers):
+            return (yield "request")
+        policy = self.layers[depth]
+        attempt = 1
+        while True:
+            status = yield from self._through(depth + 1, client)
+            if status == 200:
+                return status
+            delay = policy.next_delay(status, attempt, client, self.rng)
+            if delay is None:
+                return status
+            yield delay
+            attempt += 1
+
+    def _call(self, client: int):
+        start = self.now
+        for policy in self.layers:
+            policy.on_call(client)
+        status = yield from self._through(0, client)
+        self.result.calls += 1
+        self.result.calls_per_second[int(start / 1000)] += 1
+        self.result.durations.append(self.now - start)
+        if status != 200:
+            self.result.failed_calls += 1
+
+    def run(self) -> Result:
+        at = 0.0
+        while True:
+            at += self.rng.expovariate(self.scenario.rps / 1000)
+            if at >= self.scenario.duration_s * 1000:
+                break
+            self._schedule(at, self._call(self.rng.randrange(self.scenario.clients)))
+        while self._queue:
+            self.now, _sequence, process, value = heapq.heappop(self._queue)
+            try:
+                step = process.send(value)
+            except StopIteration:
+                continue
+            if step == "request":
+                self.result.requests += 1
+                status, latency = self._respond()
+                self._schedule(self.now + latency, process, status)
+            else:
+                self._schedule(self.now + step, process, None)
+        return self.result
+
+
+def summarize(result: Result, scenario: Scenario) -> Dict:
+    outage = range(int(scenario.outage_start_s), int(scenario.outage_end_s))
+    sent_in_outage = sum(result.sent_per_second[s] for s in outage)
+    calls_in_outage = sum(result.calls_per_second[s] for s in outage)
+    baseline = scenario.rps
+
+    # Recovered: from this second on, requests stop failing and load is back within Poisson noise of baseline
+    recovery = None
+    last = int(scenario.duration_s)
+    ceiling = baseline + 3 * math.sqrt(baseline)
+    for second in range(int(scenario.outage_end_s), last):
+        window = range(second, min(second + RECOVERY_WINDOW_S, last))
+        if all(result.failed_per_second[s] <= RECOVERY_MAX_ERROR_RATE * max(result.sent_per_second[s], 1)
+               and result.sent_per_second[s] <= ceiling for s in window):
+            recovery = float(second - scenario.outage_end_s)
+            break
+    durations = sorted(result.durations)
+    return {
+        "policy": result.name,
+        "layers": result.layers,
+        "calls": result.calls,
+        "requests": result.requests,
+        "amplification": result.requests / result.calls if result.calls else 0.0,
+        "outage_amplification": sent_in_outage / calls_in_outage if calls_in_outage else 0.0,
+        "peak_rps": max(result.sent_per_second.values(), default=0),
+        "call_success_rate": 1 - result.failed_calls / result.calls if result.calls else 0.0,
+        "p50_call_ms": round(durations[len(durations) // 2], 1) if durations else 0.0,
+        "p99_call_ms": round(durations[int(len(durations) * 0.99)], 1) if durations else 0.0,
+        "recovery_s": recovery,
+    }
+
+
+def _retry_calls(masked: str, start: int, end: int) -> List[Tuple[re.Match, str, int]]:
+    """(match, kind, depth) for retrying calls in masked[start:end], outermost first"""
+    calls = []
+    position = start
+    while True:
+        match = _WRAPPER_RE.search(masked, position, end)
+        if not match:
+            return calls
+        position = match.end()
+        before = masked[max(0, match.start() - 30):match.start()]
+        if re.search(r"(?:function\s+|async\s+|const\s+\w+\s*=\s*)$", before) \
+                or re.match(r"\w+\s*\([^()]*\)\s*\{", masked[match.start():]):
+            continue  # the definition, not a call
+        paren = match.end() - 1
+        close = block_end(masked, paren)
+        if match.group(2):
+            # apiService.get(url, true) / post(url, body, true)
+            if not re.search(r",\s*true\s*\)$", masked[paren:close]):
+                continue
+            kind = f"apiService.{match.group(2)}(..., true)"
+        else:
+            kind = match.group(1)
+        inner = _retry_calls(masked, paren + 1, close - 1)
+        calls.append((match, kind, 1 + max((depth for _m, _k, depth in inner), default=0)))
+        position = close
+
+
+def find_retry_wrappers(src_dir: str = SRC_DIR) -> List[Dict]:
+    """Call sites that retry, with the number of retry layers they stack
+
+    ``requestWithRetry`` in api.js is the wrapper itself (``caller`` False);
+    everything else is a caller opting in.
+    """
+    root = os.path.dirname(src_dir)
+    api_module = os.path.join(src_dir, "services", "api.js")
+    sites = []
+    for path in sorted(glob.glob(os.path.join(src_dir, "**", "*.js*"), recursive=True)):
+        if os.sep + "build" + os.sep in path:
+            continue
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        masked = mask_source(text)
+        for match, kind, depth in _retry_calls(masked, 0, len(masked)):
+            sites.append({"location": f"{os.path.relpath(path, root)}:{text.count(chr(10), 0, match.start()) + 1}",
+                          "kind": kind, "depth": depth, "caller": path != api_module})
+    return sites
+
+
+def policy_sets(max_retries: int, delay_ms: float, depth: int) -> Dict[str, List[RetryPolicy]]:
+    """The compared configurations, outermost layer first"""
+    nested = max(depth, 2)
+    return {
+        "none": [],
+        "retryApiCall": [RetryApiCall(max_retries, delay_ms)],
+        f"retryApiCall x{nested} nested": [RetryApiCall(max_retries, delay_ms) for _layer in range(nested)],
+        "exp-jitter": [ExponentialJitter()],
+        "exp-jitter + budget": [RetryBudget(ExponentialJitter())],
+        "retryApiCall + budget": [RetryBudget(RetryApiCall(max_retries, delay_ms))],
+    }
+
+
+def run_live(scenario: Scenario, max_retries: int, delay_ms: float, src_dir: str = SRC_DIR,
+             endpoint: str = "/health", seed: int = 0) -> Dict:
+    """Real apiService.requestWithRetry under Node against a fault-injecting stand-in"""
+    rng = random.Random(seed)
+    arrivals, at = [], 0.0
+    while True:
+        at += rng.expovariate(scenario.rps / 1000)
+        if at >= scenario.duration_s * 1000:
+            break
+        arrivals.append(round(at))
+    per_second: Counter = Counter()
+    fault_rng = random.Random(seed + 1)
+    lock = threading.Lock()
+
+    def fault(method, path):
+        elapsed = time.monotonic() - server.started
+        with lock:
+            per_second[int(elapsed)] += 1
+            # Same service-time model as the simulation, slept outside the lock
+            latency = fault_rng.expovariate(1 / scenario.latency_ms) if scenario.latency_ms else 0.0
+            status = None
+            if scenario.outage_start_s <= elapsed < scenario.outage_end_s and fault_rng.random() < scenario.failure_rate:
+                status = scenario.failure_status
+            elif scenario.capacity_rps and per_second[int(elapsed)] > scenario.capacity_rps:
+                status = 503
+        time.sleep(latency / 1000)
+        return status
+
+    server = StandInServer(fallback={"success": True}, fault=fault)
+    with server:
+        replayer = NodeReplayer(src_dir, server.url + "/api/v1", 1)
+        try:
+            harness = os.path.join(replayer.workspace, "live.mjs")
+            with open(harness, "w", encoding="utf-8") as f:
+                f.write(_LIVE_HARNESS)
+            spec = {"baseUrl": server.url + "/api/v1", "endpoint": endpoint, "maxRetries": max_retries,
+                    "apiModule": os.path.join(replayer.workspace, "services", "api.js"), "arrivals": arrivals}
+            server.reset()
+            per_second.clear()
+            completed = subprocess.run([replayer.node, harness, json.dumps(spec)], capture_output=True, text=True,
+                                       timeout=scenario.duration_s + 60, cwd=replayer.workspace)
+        finally:
+            replayer.close()
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("[")]
+    if not lines:
+        raise RuntimeError((completed.stderr.strip().splitlines() or ["live run produced no result"])[-1])
+    calls = json.loads(lines[-1])
+
+    result = Result("live retryApiCall", 1)
+    for call in calls:
+        result.calls += 1
+        result.calls_per_second[int(call["start"] / 1000)] += 1
+        result.durations.append(call["end"] - call["start"])
+        result.failed_calls += 0 if call["ok"] else 1
+    for elapsed, _method, _template, status in server.log:
+        result.requests += 1
+        result.sent_per_second[int(elapsed)] += 1
+        if status != 200:
+            result.failed_per_second[int(elapsed)] += 1
+    return summarize(result, scenario)
+
+
+def build_report(scenario: Scenario, max_retries: int = 2, delay_ms: float = 1000, seed: int = 0,
+                 src_dir: str = SRC_DIR, live: bool = False) -> Dict:
+    wrappers = find_retry_wrappers(src_dir)
+    depth = max((site["depth"] for site in wrappers if site["caller"]), default=0)
+    rows = []
+    for name, layers in policy_sets(max_retries, delay_ms, depth).items():
+        rows.append(summarize(Simulation(scenario, layers, seed, name).run(), scenario))
+    report = {"scenario": scenario.__dict__, "retry_call_sites": wrappers, "discovered_depth": depth,
+              "policies": rows, "live": None}
+    if live:
+        if not shutil.which("node"):
+            report["live"] = {"error": "node not found"}
+        else:
+            simulated = next(row for row in rows if row["policy"] == "retryApiCall")
+            report["live"] = {"measured": run_live(scenario, max_retries, delay_ms, src_dir, seed=seed),
+                              "simulated": simulated}
+    return report
+
+
+def print_report(report: Dict):
+    scenario = report["scenario"]
+    print("🔁 Retry call sites in src/")
+    for site in report["retry_call_sites"]:
+        role = "caller" if site["caller"] else "wrapper"
+        print(f"   {site['location']:44} {site['kind']:32} {role:8} {site['depth']} layer(s)")
+    if not any(site["caller"] for site in report["retry_call_sites"]):
+        print("   no caller opts in (useRetry defaults to false) - every call today behaves like 'none'")
+
+    capacity = f", capacity {scenario['capacity_rps']:g} req/s" if scenario["capacity_rps"] else ""
+    print(f"\n🌩️  {scenario['rps']:g} calls/s for {scenario['duration_s']:g} s; outage "
+          f"{scenario['outage_start_s']:g}-{scenario['outage_end_s']:g} s failing "
+          f"{scenario['failure_rate']:.0%} with {scenario['failure_status'] or 'network errors'}{capacity}\n")
+    print(f"   {'policy':32} {'ampl':>5} {'outage':>7} {'peak/s':>7} {'success':>8} {'p99 ms':>8} {'recovery':>9}")
+    for row in report["policies"]:
+        print(_row(row))
+    live = report["live"]
+    if live:
+        print("\n🧪 Live: real apiService.requestWithRetry under Node vs the simulation")
+        if "error" in live:
+            print(f"   ❌ {live['error']}")
+        else:
+            print(_row(live["measured"]))
+            print(_row(live["simulated"], "simulated retryApiCall"))
+
+
+def _row(row: Dict, name: Optional[str] = None) -> str:
+    recovery = "never" if row["recovery_s"] is None else f"{row['recovery_s']:g} s"
+    return (f"   {(name or row['policy']):32} {row['amplification']:>5.2f} {row['outage_amplification']:>6.2f}x "
+            f"{row['peak_rps']:>7} {row['call_success_rate']:>8.1%} {row['p99_call_ms']:>8,.0f} {recovery:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate retry amplification during a partial outage")
+    parser.add_argument("--src", default=SRC_DIR, help="Source directory (default src)")
+    parser.add_argument("--rps", type=float, default=20.0, help="Logical calls per second (default 20)")
+    parser.add_argument("--duration", type=float, default=120.0, help="Simulated seconds (default 120)")
+    parser.add_argument("--clients", type=int, default=200, help="Browsers issuing the calls (default 200)")
+    parser.add_argument("--outage", default="30:60", help="Outage window start:end in seconds (default 30:60)")
+    parser.add_argument("--failure-rate", type=float, default=0.5, help="Share of requests failing in the outage")
+    parser.add_argument("--status", type=int, default=503, help="Failure status; 0 for network errors (default 503)")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Mean response time (default 150)")
+    parser.add_argument("--capacity-rps", type=float, help="Backend capacity; excess requests are shed with 503")
+    parser.add_argument("--max-retries", type=int, default=2, help="retryApiCall maxRetries (default 2)")
+    parser.add_argument("--delay-ms", type=float, default=1000, help="retryApiCall delay (default 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default 0)")
+    parser.add_argument("--live", action="store_true", help="Also run the real retry code against the stand-in")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    start, end = (float(value) for value in args.outage.split(":"))
+    scenario = Scenario(args.rps, args.duration, args.clients, start, end, args.failure_rate, args.status,
+                        args.latency_ms, args.capacity_rps)
+    report = build_report(scenario, args.max_retries, args.delay_ms, args.seed, args.src, args.live)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Scalability Fit
+
+Fits throughput-versus-concurrency curves from load runs (load_runner.py /
+``api_endpoint_tester.py --capacity``) with two models:
+
+  * Amdahl:  X(N) = lambda N / (1 + sigma (N - 1))
+  * Universal Scalability Law (USL):
+             X(N) = lambda N / (1 + sigma (N - 1) + kappa N (N - 1))
+
+lambda is the throughput of a single client, sigma the contention (the
+serialised share of the work) and kappa the coherency cost (crosstalk that
+grows with every pair of concurrent requests). For a fixed lambda the models
+are linear in sigma and kappa (``lambda N / X - 1``), so they are solved
+with NumPy least squares, constrained to 0 <= sigma <= 1 and kappa >= 0;
+lambda is found by a bounded one-dimensional search on the throughput
+residuals.
+
+For each curve the report gives R^2 and RMSE for both models, the predicted
+peak concurrency ``N* = sqrt((1 - sigma) / kappa)`` with its throughput (or
+the Amdahl ceiling when N* lies beyond ten times the measured range), and
+flags:
+
+  * coherency - the USL fits clearly better than Amdahl and throughput peaks
+    within reach (N* at most twice the highest measured concurrency), so
+    adding clients makes throughput fall. This points to cross-request
+    serialisation on the backend: a shared lock, hot rows, or cache
+    invalidation between requests
+  * contention - sigma above 0.1: more than a tenth of each request is
+    serialised, which caps throughput at lambda / sigma however many
+    instances are added
+
+Usage:
+    python scalability_fit.py capacity_curve.json [more curves ...] [--json fit.json]
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+CONTENTION_FLAG = 0.1
+COHERENCY_MIN_IMPROVEMENT = 0.25   # share of the Amdahl residual the USL must remove
+PEAK_REACH = 2.0                   # N* within this multiple of the highest measured N
+KAPPA_TOLERANCE = 1e-7             # smaller fitted kappa is numerical noise (reported as 0)
+PEAK_EXTRAPOLATION = 10.0          # N* beyond this multiple of the highest measured N is not reported
+
+
+def load_points(path: str) -> Tuple[str, np.ndarray, np.ndarray]:
+    """(name, concurrency, throughput) from a capacity curve; repeated N are averaged"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    name = os.path.splitext(os.path.basename(path))[0]
+    if path.endswith(".csv"):
+        rows = list(csv.DictReader(text.splitlines()))
+    else:
+        data = json.loads(text)
+        rows = data.get("points", []) if isinstance(data, dict) else data
+        if isinstance(data, dict) and data.get("target"):
+            name = data["target"]
+    return (name, *_arrays(rows))
+
+
+def _arrays(rows: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concurrency and mean throughput per concurrency level"""
+    by_n: Dict[float, List[float]] = {}
+    for row in rows:
+        n = row.get("concurrency")
+        x = row.get("throughput_rps")
+        if n in (None, "") or x in (None, ""):
+            continue
+        if str(row.get("valid", True)).lower() == "false":
+            continue   # the generator was saturated
+        by_n.setdefault(float(n), []).append(float(x))
+    n = np.array(sorted(by_n), dtype=float)
+    x = np.array([np.mean(by_n[value]) for value in n], dtype=float)
+    return n, x
+
+
+def _coefficients(n: np.ndarray, x: np.ndarray, lam: float, coherency: bool) -> Tuple[float, float]:
+    """sigma, kappa >= 0 for a fixed lambda (least squares on lambda N / X - 1)"""
+    y = lam * n / x - 1
+    columns = [n - 1, n * (n - 1)] if coherency else [n - 1]
+    a = np.column_stack(columns)
+    solution = np.linalg.lstsq(a, y, rcond=None)[0]
+    if coherency and (solution < 0).any():
+        # Active-set step: drop the negative term and refit the other
+        keep = 0 if solution[1] < 0 else 1
+        single = np.linalg.lstsq(a[:, [keep]], y, rcond=None)[0][0]
+        solution = np.zeros(2)
+        solution[keep] = max(single, 0.0)
+    solution = np.maximum(solution, 0.0)
+    solution[0] = min(solution[0], 1.0)   # at most all of the work is serialised
+    return float(solution[0]), float(solution[1]) if coherency else 0.0
+
+
+def predict(n: np.ndarray, lam: float, sigma: float, kappa: float) -> np.ndarray:
+    return lam * n / (1 + sigma * (n - 1) + kappa * n * (n - 1))
+
+
+def fit(n: np.ndarray, x: np.ndarray, coherency: bool = True) -> Dict:
+    """Least-squares Amdahl (coherency=False) or USL fit"""
+    per_client = x / n
+    low, high = 0.5 * per_client.max(), 2.0 * per_client.max()
+
+    def sse(lam: float) -> float:
+        sigma, kappa = _coefficients(n, x, lam, coherency)
+        return float(np.sum((x - predict(n, lam, sigma, kappa)) ** 2))
+
+    # Coarse grid, then golden-section refinement around the best grid point
+    grid = np.linspace(low, high, 200)
+    errors = [sse(lam) for lam in grid]
+    best = int(np.argmin(errors))
+    a, b = grid[max(best - 1, 0)], grid[min(best + 1, len(grid) - 1)]
+    ratio = (math.sqrt(5) - 1) / 2
+    for _ in range(60):
+        c, d = b - ratio * (b - a), a + ratio * (b - a)
+        if sse(c) < sse(d):
+            b = d
+        else:
+            a = c
+    lam = (a + b) / 2
+    sigma, kappa = _coefficients(n, x, lam, coherency)
+
+    fitted = predict(n, lam, sigma, kappa)
+    residual = float(np.sum((x - fitted) ** 2))
+    total = float(np.sum((x - x.mean()) ** 2))
+    result = {
+        "lambda_rps": round(lam, 3),
+        "sigma": round(sigma, 5),
+        "kappa": round(kappa, 7),
+        "r2": round(1 - residual / total, 4) if total > 0 else None,
+        "rmse_rps": round(math.sqrt(residual / len(n)), 3),
+        "sse": residual,
+    }
+    peak = math.sqrt(max(1 - sigma, 0) / kappa) if kappa > KAPPA_TOLERANCE else math.inf
+    if peak <= PEAK_EXTRAPOLATION * n.max():
+        result["peak_concurrency"] = round(peak, 1)
+        result["peak_rps"] = round(float(predict(np.array([peak]), lam, sigma, kappa)[0]), 2)
+    elif sigma > 0:
+        # No retrograde region within reach of the data - report the Amdahl ceiling
+        result["peak_concurrency"] = None
+        result["ceiling_rps"] = round(lam / sigma, 2)
+    return result
+
+
+def analyze_curve(name: str, n: np.ndarray, x: np.ndarray) -> Dict:
+    """Both fits, flags, and the predicted curve for charting"""
+    report: Dict = {"name": name, "points": len(n)}
+    if len(n) < 3:
+        report["error"] = f"need at least 3 concurrency levels, got {len(n)}"
+        return report
+
+    amdahl = fit(n, x, coherency=False)
+    usl = fit(n, x, coherency=True)
+    flags: List[str] = []
+    improvement = 1 - usl["sse"] / amdahl["sse"] if amdahl["sse"] > 0 else 0.0
+    peak = usl.get("peak_concurrency")
+    if usl["kappa"] > 0 and improvement >= COHERENCY_MIN_IMPROVEMENT and peak and peak <= PEAK_REACH * n.max():
+        flags.append(f"coherency: throughput peaks at N~{peak:.0f} and falls beyond - "
+                     f"cross-request serialisation on the backend")
+    if usl["sigma"] > CONTENTION_FLAG:
+        flags.append(f"contention: {usl['sigma']:.0%} of each request is serialised - "
+                     f"throughput is capped near {usl['lambda_rps'] / usl['sigma']:.0f} rps")
+
+    grid = np.unique(np.round(np.geomspace(1, max(2 * n.max(), (peak or 0) * 1.5, 2), 40)))
+    for model in (amdahl, usl):
+        model.pop("sse")
+    report.update({
+        "usl_improvement": round(improvement, 3),
+        "amdahl": amdahl,
+        "usl": usl,
+        "flags": flags,
+        "measured": [{"concurrency": float(a), "throughput_rps": float(b)} for a, b in zip(n, x)],
+        "predicted": [{"concurrency": float(c),
+                       "amdahl_rps": round(float(predict(np.array([c]), amdahl["lambda_rps"], amdahl["sigma"], 0)[0]), 2),
+                       "usl_rps": round(float(predict(np.array([c]), usl["lambda_rps"], usl["sigma"], usl["kappa"])[0]), 2)}
+                      for c in grid],
+    })
+    return report
+
+
+def analyze_report(report: Dict) -> Dict:
+    """Fit a capacity-search report (load_runner.capacity_search) in memory"""
+    n, x = _arrays(report.get("points", []))
+    return analyze_curve(report.get("target", "curve"), n, x)
+
+
+def print_fit(fit_report: Dict):
+    print(f"\n📐 {fit_report['name']} ({fit_report['points']} concurrency levels)")
+    if "error" in fit_report:
+        print(f"   ⚠️  {fit_report['error']}")
+        return
+    for label, model in (("Amdahl", fit_report["amdahl"]), ("USL", fit_report["usl"])):
+        line = (f"   {label:7} lambda {model['lambda_rps']:>8.2f} rps  sigma {model['sigma']:.4f}  "
+                f"kappa {model['kappa']:.6f}  R² {model['r2'] if model['r2'] is not None else '-'}  "
+                f"RMSE {model['rmse_rps']:.2f} rps")
+        print(line)
+    usl = fit_report["usl"]
+    if usl.get("peak_concurrency"):
+        print(f"   Predicted peak: N* = {usl['peak_concurrency']:.0f} at {usl['peak_rps']:.1f} rps")
+    elif usl.get("ceiling_rps"):
+        print(f"   No retrograde region: throughput approaches {usl['ceiling_rps']:.1f} rps")
+    for flag in fit_report["flags"]:
+        print(f"   🚩 {flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit Amdahl and USL models to capacity curves")
+    parser.add_argument("curves", nargs="+", help="Capacity curve files (.json or .csv)")
+    parser.add_argument("--json", help="Also write the fits to this file")
+    args = parser.parse_args()
+
+    fits = []
+    for path in args.curves:
+        name, n, x = load_points(path)
+        fits.append(analyze_curve(name, n, x))
+        print_fit(fits[-1])
+
+    flagged = [f["name"] for f in fits if f.get("flags")]
+    if flagged:
+        print(f"\n🚩 {len(flagged)} curve(s) flagged: {', '.join(flagged)}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"fits": fits}, f, indent=2)
+        print(f"\n💾 Fits written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
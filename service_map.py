@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B Service Map
+
+Static map of the frontend service layer (src/services/*.js): for every
+exported service object or instance, its methods and the API calls each one
+makes, normalised to endpoint_catalog.py templates.
+
+Recognised call shapes:
+  * ``apiService.get('/companies')`` / ``.post(`/companies/${id}/users`, ...)``
+  * ``fetch(`${BASE_URL}/psychologists/${id}`, { method: 'PUT', ... })``
+  * either of the above through a local ``const url = ...`` variable
+  * ``this.other()`` / ``otherService.method()`` delegation, followed
+    transitively by ``ServiceMap.endpoints()``
+
+Used by overfetch_analyzer.py and nplus1_detector.py. Run directly to print
+the map.
+
+Usage:
+    python service_map.py [--src src]
+"""
+
+import argparse
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from endpoint_catalog import match_template, normalize_path
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+
+_INSTANCE_RE = re.compile(r"^(?:export\s+)?const\s+(\w+)\s*=\s*new\s+(\w+)\s*\(", re.M)
+_OBJECT_RE = re.compile(r"^(?:export\s+)?const\s+(\w+)\s*=\s*\{", re.M)
+_CLASS_RE = re.compile(r"^(?:export\s+)?class\s+(\w+)[^{]*\{", re.M)
+_PARAMS = r"\(((?:[^()]|\([^()]*\))*)\)"
+_CLASS_METHOD_RE = re.compile(r"(?:async\s+)?(\w+)\s*" + _PARAMS + r"\s*\{")
+_OBJECT_METHOD_RE = re.compile(r"(\w+)\s*:\s*(?:async\s*)?(?:function\s*)?(?:" + _PARAMS + r"|(\w+))\s*(?:=>)?\s*\{")
+_API_CALL_RE = re.compile(r"\b(?:apiService|this)\.(get|post|put|patch|delete)\(\s*(`[^`]*`|'[^']*'|\"[^\"]*\"|\w+)")
+_FETCH_RE = re.compile(r"\bfetch\(\s*(`[^`]*`|'[^']*'|\"[^\"]*\"|\w+)")
+_FETCH_METHOD_RE = re.compile(r"method\s*:\s*['\"](\w+)['\"]")
+_DELEGATE_RE = re.compile(r"\b(this|\w+Service)\.(\w+)\s*\(")
+_KEYWORDS = {"if", "for", "while", "switch", "catch", "function", "return", "constructor"}
+
+
+def mask_source(text: str, strings: bool = True) -> str:
+    """``text`` with comments and string contents blanked, offsets preserved
+
+    Quote characters stay in place, so structure (braces, parentheses) can be
+    matched on the masked text and values read from the original. With
+    ``strings=False`` only comments are blanked.
+    """
+    out = list(text)
+    i, n = 0, len(text)
+    while i < n:
+        char = text[i]
+        if char == "/" and i + 1 < n and text[i + 1] in "/*":
+            end = text.find("\n", i) if text[i + 1] == "/" else text.find("*/", i + 2) + 2
+            end = n if end <= 1 or end == -1 else end
+            for j in range(i, end):
+                if out[j] != "\n":
+                    out[j] = " "
+            i = end
+            continue
+        if char in "'\"`":
+            j = i + 1
+            while j < n and text[j] != char:
+                if text[j] == "\\":
+                    j += 1
+                elif char != "`" and text[j] == "\n":
+                    break
+                j += 1
+            for k in range(i + 1, min(j, n) if strings else i + 1):
+                if out[k] != "\n":
+                    out[k] = " "
+            i = j + 1
+            continue
+        i += 1
+    return "".join(out)
+
+
+def block_end(masked: str, open_index: int) -> int:
+    """Index just past the brace/paren/bracket that closes the one at ``open_index``"""
+    pairs = {"{": "}", "(": ")", "[": "]"}
+    opener = masked[open_index]
+    closer = pairs[opener]
+    depth = 0
+    for index in range(open_index, len(masked)):
+        char = masked[index]
+        if char == opener:
+            depth += 1
+        elif char == closer:
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return len(masked)
+
+
+def to_template(method: str, url: str) -> Optional[str]:
+    """Catalog template for a JS URL literal (template-string expressions become parameters)"""
+    url = url.strip("`'\"")
+    # Drop the base URL expression, keep the path
+    url = re.sub(r"^\$\{[^}]*(?:BASE_URL|baseURL|API_URL)[^}]*\}", "", url)
+    url = re.sub(r"\$\{[^}]*\}", "{param}", url).split("?")[0]
+    if not url.startswith("/"):
+        return None
+    path = normalize_path(url)
+    return match_template(method, path) or path
+
+
+@dataclass
+class ApiCall:
+    method: str
+    template: str
+    file: str
+    line: int
+    offset: int
+    via: str = "apiService"  # or "fetch" for direct fetch() calls
+
+
+@dataclass
+class ServiceMethod:
+    service: str
+    name: str
+    file: str
+    line: int
+    start: int
+    end: int
+    params: List[str] = field(default_factory=list)
+    calls: List[ApiCall] = field(default_factory=list)
+    delegates: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def _line_of(text: str, offset: int) -> int:
+    return text.count("\n", 0, offset) + 1
+
+
+def _methods_in(body_start: int, body_end: int, masked: str, pattern: re.Pattern):
+    """Top-level method headers inside a class or object body"""
+    position = body_start + 1
+    while True:
+        match = pattern.search(masked, position, body_end - 1)
+        if not match:
+            return
+        # A brace before the match opens a nested value (e.g. a config object) - skip it
+        nested = masked.find("{", position, match.start())
+        if nested != -1:
+            position = block_end(masked, nested)
+            continue
+        open_index = match.end() - 1
+        end = block_end(masked, open_index)
+        position = end
+        if match.group(1) in _KEYWORDS:
+            continue
+        params = [p.strip().split("=")[0].strip() for p in (match.group(2) or "").split(",") if p.strip()]
+        if pattern is _OBJECT_METHOD_RE and match.group(3):
+            params = [match.group(3)]
+        yield match.group(1), match.start(), open_index, end, params
+
+
+def _resolve_local(body: str, name: str) -> Optional[str]:
+    match = re.search(r"(?:const|let|var)\s+" + re.escape(name) + r"\s*=\s*(`[^`]*`|'[^']*'|\"[^\"]*\")", body)
+    return match.group(1) if match else None
+
+
+def find_api_calls(path: str, text: str, masked: str, start: int, end: int) -> List[ApiCall]:
+    """apiService/this HTTP calls and fetch() calls within text[start:end]"""
+    body = text[start:end]
+    masked_body = masked[start:end]
+    calls = []
+    for call in _API_CALL_RE.finditer(masked_body):
+        http_method = call.group(1).upper()
+        argument = body[call.start(2):call.end(2)]
+        url = _resolve_local(body, argument) if re.fullmatch(r"\w+", argument) else argument
+        template = to_template(http_method, url) if url else None
+        if template:
+            offset = start + call.start()
+            calls.append(ApiCall(http_method, template, path, _line_of(text, offset), offset))
+
+    for call in _FETCH_RE.finditer(masked_body):
+        argument = body[call.start(1):call.end(1)]
+        url = _resolve_local(body, argument) if re.fullmatch(r"\w+", argument) else argument
+        close = block_end(masked_body, call.start() + call.group(0).index("("))
+        options = _FETCH_METHOD_RE.search(body, call.end(), close)
+        http_method = options.group(1).upper() if options else "GET"
+        template = to_template(http_method, url) if url else None
+        if template:
+            offset = start + call.start()
+            calls.append(ApiCall(http_method, template, path, _line_of(text, offset), offset, "fetch"))
+    calls.sort(key=lambda c: c.offset)
+    return calls
+
+
+def find_delegates(masked: str, start: int, end: int, service: str) -> List[Tuple[str, str, int]]:
+    """(service, method, offset) of this.x() / otherService.x() calls within masked[start:end]"""
+    delegates = []
+    for call in _DELEGATE_RE.finditer(masked, start, end):
+        target, target_method = call.group(1), call.group(2)
+        if target_method in HTTP_METHODS and target == "this":
+            continue
+        delegates.append((service if target == "this" else target, target_method, call.start()))
+    return delegates
+
+
+def parse_service_file(path: str) -> List[ServiceMethod]:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    masked = mask_source(text)
+
+    # class name -> exported instance name
+    instances = {cls: name for name, cls in _INSTANCE_RE.findall(masked)}
+    containers = []
+    for match in _CLASS_RE.finditer(masked):
+        service = instances.get(match.group(1))
+        if service:
+            containers.append((service, match.end() - 1, _CLASS_METHOD_RE))
+    for match in _OBJECT_RE.finditer(masked):
+        containers.append((match.group(1), match.end() - 1, _OBJECT_METHOD_RE))
+
+    methods = []
+    for service, open_index, pattern in containers:
+        end = block_end(masked, open_index)
+        for name, start, body_open, body_end, params in _methods_in(open_index, end, masked, pattern):
+            method = ServiceMethod(service, name, path, _line_of(text, start), body_open, body_end, params)
+            method.calls = find_api_calls(path, text, masked, body_open, body_end)
+            method.delegates = [(target, callee) for target, callee, _offset in find_delegates(masked, body_open, body_end, service)]
+            methods.append(method)
+    return methods
+
+
+class ServiceMap:
+    """All service methods under src/services, keyed by (service, method)"""
+
+    def __init__(self, src_dir: str = SRC_DIR):
+        self.src_dir = src_dir
+        self.methods: Dict[Tuple[str, str], ServiceMethod] = {}
+        services_dir = os.path.join(src_dir, "services")
+        for name in sorted(os.listdir(services_dir)):
+            if name.endswith(".js") and name not in ("api.js", "index.js"):
+                for method in parse_service_file(os.path.join(services_dir, name)):
+                    self.methods.setdefault((method.service, method.name), method)
+        self.services: Set[str] = {service for service, _name in self.methods}
+
+    def get(self, service: str, name: str) -> Optional[ServiceMethod]:
+        return self.methods.get((service, name))
+
+    def endpoints(self, service: str, name: str, _seen: Optional[Set] = None) -> List[ApiCall]:
+        """API calls a service method makes, including through delegated methods"""
+        seen = _seen if _seen is not None else set()
+        if (service, name) in seen:
+            return []
+        seen.add((service, name))
+        method = self.methods.get((service, name))
+        if not method:
+            return []
+        calls = list(method.calls)
+        for target in method.delegates:
+            calls.extend(self.endpoints(*target, _seen=seen))
+        return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Map frontend service methods to API endpoints")
+    parser.add_argument("--src", default=SRC_DIR, help="Source directory (default src)")
+    args = parser.parse_args()
+
+    service_map = ServiceMap(args.src)
+    print(f"🗺️  {len(service_map.methods)} service methods in {len(service_map.services)} services")
+    for (service, name), method in sorted(service_map.methods.items()):
+        calls = service_map.endpoints(service, name)
+        if calls:
+            endpoints = ", ".join(sorted({f"{c.method} {c.template}" for c in calls}))
+            print(f"   {service + '.' + name:55} {endpoints}")
+
+
+if __name__ == "__main__":
+    main()
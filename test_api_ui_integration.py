@@ -22,19 +22,22 @@ from dataclasses import dataclass
 from enum import Enum
 import uuid
 
+from circuit_breaker import HostCircuitBreaker, argv_option, breaker_from_argv
+from log_pipeline import LogPipeline
+from payload_metrics import count_wire_bytes, empty_metrics, exchange_metrics, format_bytes
+from report_renderer import DEFAULT_TOP_N, DETAIL_LIMIT, Column, ReportRenderer, render_result_sections
+from response_schemas import ResponseValidator
+from result_store import ResultStore
+from ui_prober import UI_ROUTES, BuildServer, UIRouteProber
+
 # Set environment variable for UTF-8 encoding on Windows
 if sys.platform.startswith('win'):
     os.environ['PYTHONIOENCODING'] = 'utf-8'
 
-# Configure logging with UTF-8 encoding
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('api_test_results.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Configure logging with UTF-8 encoding - records are queued and written to the
+# log file and console by a background thread so workers never block on I/O
+log_pipeline = LogPipeline('api_test_results.log')
+log_pipeline.install()
 logger = logging.getLogger(__name__)
 
 class TestStatus(Enum):
@@ -42,6 +45,7 @@ class TestStatus(Enum):
     FAIL = "[FAIL]"
     SKIP = "[SKIP]"
     WARNING = "[WARN]"
+    SHORT_CIRCUIT = "[SHORT]"
 
 @dataclass
 class TestResult:
@@ -52,20 +56,68 @@ class TestResult:
     message: str
     execution_time: float
     requires_auth: bool
+    # Byte counts (payload_metrics.exchange_metrics); zero when nothing came back
+    request_wire_bytes: int = 0
+    request_body_bytes: int = 0
+    response_wire_bytes: int = 0
+    response_body_bytes: int = 0
+    compression_ratio: Optional[float] = None
+    effective_bytes_per_sec: float = 0.0
+
+# Runs up to DETAIL_LIMIT results list every one by category in the report
+DETAIL_COLUMNS = [
+    Column('status', 'Status', 7, numeric=False),
+    Column('auth', 'Access', 6, numeric=False),
+    Column('method', 'Method', 6, numeric=False),
+    Column('endpoint', 'Endpoint', 50, numeric=False),
+    Column('seconds', 'Time', 8, "{:.3f}s"),
+    Column('message', 'Message', 0, numeric=False),
+]
+
+def _category(endpoint: str) -> str:
+    """Report category of a tested endpoint"""
+    if endpoint.startswith('UI:'):
+        return 'UI Tests'
+    if '/auth/' in endpoint:
+        return 'Authentication'
+    if '/companies' in endpoint or '/api/v1/companies' in endpoint:
+        return 'Company Management'
+    if '/psychologists' in endpoint:
+        return 'Psychologist Management'
+    if '/bookings' in endpoint:
+        return 'Booking Management'
+    if '/employee-subscriptions' in endpoint:
+        return 'Employee Subscriptions'
+    if '/availability' in endpoint or '/holidays' in endpoint:
+        return 'Availability & Holidays'
+    return 'Other'
 
 class ThoughtProAPITester:
     """Comprehensive API and UI integration test suite"""
     
-    def __init__(self, base_url: str = "https://thoughtprob2b.thoughthealer.org"):
+    def __init__(self, base_url: str = "https://thoughtprob2b.thoughthealer.org",
+                 validation_sample_rate: float = 1.0,
+                 breaker: Optional[HostCircuitBreaker] = None):
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
+        # Wire sizes counted off the socket - exact for chunked and compressed bodies
+        self.session.hooks['response'].append(count_wire_bytes)
         self.auth_token = None
         self.company_id = None
         self.employee_id = None
         self.psychologist_id = None
-        self.test_results: List[TestResult] = []
+        # TestResults are stored column-wise (result_store.py), not kept as objects
+        self.test_results = ResultStore()
+        self.store_path = None
+        self.report_top_n = DEFAULT_TOP_N
         self.ui_base_url = "http://localhost:3000"  # React dev server
         
+        # Response shape checks - every response in functional runs, sampled in load runs
+        self.schema_validator = ResponseValidator(sample_rate=validation_sample_rate)
+        
+        # Fail fast on an unreachable API host and bound the whole run (see circuit_breaker.py)
+        self.breaker = breaker or HostCircuitBreaker()
+        
         # Test data
         self.test_email = f"test_{uuid.uuid4().hex[:8]}@thoughtpro.com"
         self.test_company_name = f"TestCompany_{uuid.uuid4().hex[:8]}"
@@ -86,40 +138,50 @@ class ThoughtProAPITester:
         })
         
     def make_request(self, method: str, endpoint: str, data: dict = None, 
-                    params: dict = None, requires_auth: bool = False) -> Tuple[int, dict, float]:
-        """Make HTTP request with error handling and timing"""
+                    params: dict = None, requires_auth: bool = False) -> Tuple[int, dict, float, dict]:
+        """Make HTTP request with error handling and timing
+        
+        Returns (status code, response data, seconds, byte counts).
+        """
         url = f"{self.base_url}{endpoint}"
+        timeout = self.breaker.timeout()
         start_time = time.time()
         
         try:
             if method.upper() == 'GET':
-                response = self.session.get(url, params=params)
+                response = self.session.get(url, params=params, timeout=timeout)
             elif method.upper() == 'POST':
-                response = self.session.post(url, json=data, params=params)
+                response = self.session.post(url, json=data, params=params, timeout=timeout)
             elif method.upper() == 'PUT':
-                response = self.session.put(url, json=data, params=params)
+                response = self.session.put(url, json=data, params=params, timeout=timeout)
             elif method.upper() == 'PATCH':
-                response = self.session.patch(url, json=data, params=params)
+                response = self.session.patch(url, json=data, params=params, timeout=timeout)
             elif method.upper() == 'DELETE':
-                response = self.session.delete(url, params=params)
+                response = self.session.delete(url, params=params, timeout=timeout)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
                 
             execution_time = time.time() - start_time
+            self.breaker.record(url)
             
             try:
                 response_data = response.json()
             except:
                 response_data = {"raw_response": response.text}
                 
-            return response.status_code, response_data, execution_time
+            return response.status_code, response_data, execution_time, exchange_metrics(response, execution_time)
             
-        except requests.exceptions.ConnectionError:
+        except requests.exceptions.Timeout as e:
             execution_time = time.time() - start_time
-            return 0, {"error": "Connection failed"}, execution_time
+            self.breaker.record(url, e)
+            return 0, {"error": "Request timeout"}, execution_time, empty_metrics()
+        except requests.exceptions.ConnectionError as e:
+            execution_time = time.time() - start_time
+            self.breaker.record(url, e)
+            return 0, {"error": "Connection failed"}, execution_time, empty_metrics()
         except Exception as e:
             execution_time = time.time() - start_time
-            return 0, {"error": str(e)}, execution_time
+            return 0, {"error": str(e)}, execution_time, empty_metrics()
     
     def test_endpoint(self, method: str, endpoint: str, description: str, 
                      test_data: dict = None, params: dict = None, 
@@ -144,7 +206,23 @@ class ThoughtProAPITester:
             self.test_results.append(result)
             return result
         
-        status_code, response_data, exec_time = self.make_request(
+        # Skip without waiting if the API host is unreachable or the run is out of time
+        reason = self.breaker.check(self.session, f"{self.base_url}{endpoint}")
+        if reason:
+            result = TestResult(
+                endpoint=endpoint,
+                method=method,
+                status=TestStatus.SHORT_CIRCUIT,
+                response_code=0,
+                message=f"Short-circuited - {reason}",
+                execution_time=0.0,
+                requires_auth=requires_auth
+            )
+            self.test_results.append(result)
+            logger.info(f"{result.status.value} - {result.message}")
+            return result
+        
+        status_code, response_data, exec_time, payload = self.make_request(
             method, endpoint, test_data, params, requires_auth
         )
         
@@ -168,6 +246,15 @@ class ThoughtProAPITester:
             status = TestStatus.WARNING
             message = f"Unexpected status code: {status_code}"
         
+        # Verify the response matches the documented schema
+        if status == TestStatus.PASS:
+            schema_errors = self.schema_validator.validate(method, endpoint, status_code, response_data)
+            if schema_errors:
+                status = TestStatus.WARNING
+                message = f"Response schema mismatch - {schema_errors[0]}"
+                if len(schema_errors) > 1:
+                    message += f" (+{len(schema_errors) - 1} more)"
+        
         result = TestResult(
             endpoint=endpoint,
             method=method,
@@ -175,11 +262,12 @@ class ThoughtProAPITester:
             response_code=status_code,
             message=message,
             execution_time=exec_time,
-            requires_auth=requires_auth
+            requires_auth=requires_auth,
+            **payload
         )
         
         self.test_results.append(result)
-        logger.info(f"{status.value} - {message} ({exec_time:.3f}s)")
+        logger.info(f"{status.value} - {message} ({exec_time:.3f}s, {format_bytes(result.response_body_bytes)})")
         return result
     
     def test_authentication_endpoints(self):
@@ -626,51 +714,48 @@ class ThoughtProAPITester:
         )
     
     def test_ui_connectivity(self):
-        """Test UI connectivity and key frontend features"""
+        """Test UI connectivity and key frontend features
+        
+        Routes are probed concurrently; each route also loads the scripts and
+        stylesheets its HTML shell references (see ui_prober.py).
+        """
         logger.info("\nTESTING UI CONNECTIVITY")
         logger.info("=" * 50)
         
-        ui_endpoints = [
-            ("/", "Main Landing Page"),
-            ("/login", "Login Page"),
-            ("/dashboard", "Dashboard"),
-            ("/employees", "Employee Management"),
-            ("/psychologists", "Psychologist Management"),
-            ("/bookings", "Booking Management"),
-            ("/companies", "Company Management"),
-            ("/settings", "Settings Page")
-        ]
+        prober = UIRouteProber(self.ui_base_url, timeout=10)
+        routes = prober.probe_routes(UI_ROUTES)
         
-        for endpoint, description in ui_endpoints:
-            try:
-                start_time = time.time()
-                response = requests.get(f"{self.ui_base_url}{endpoint}", timeout=10)
-                exec_time = time.time() - start_time
-                
-                if response.status_code == 200:
-                    status = TestStatus.PASS
-                    message = "UI page accessible"
-                elif response.status_code == 404:
-                    status = TestStatus.WARNING
-                    message = "UI page not found - may not be implemented"
-                else:
-                    status = TestStatus.FAIL
-                    message = f"UI error: HTTP {response.status_code}"
-                    
-            except requests.exceptions.ConnectionError:
+        for route in routes:
+            endpoint, description = route['path'], route['description']
+            exec_time = route['time_to_last_byte_ms'] / 1000
+            
+            if route['connection_error']:
                 status = TestStatus.FAIL
                 message = "UI server not running (npm start required)"
                 exec_time = 0.0
-            except Exception as e:
+            elif route['error']:
                 status = TestStatus.FAIL
-                message = f"UI test error: {str(e)}"
+                message = f"UI test error: {route['error']}"
                 exec_time = 0.0
+            elif route['status_code'] == 200 and route['failed_assets']:
+                status = TestStatus.WARNING
+                message = f"UI page accessible but {len(route['failed_assets'])} asset(s) failed to load"
+            elif route['status_code'] == 200:
+                status = TestStatus.PASS
+                message = (f"UI page accessible - {route['asset_count']} assets, "
+                           f"{route['total_bytes'] / 1024:.0f}KB, critical path {route['critical_path_ms']:.0f}ms")
+            elif route['status_code'] == 404:
+                status = TestStatus.WARNING
+                message = "UI page not found - may not be implemented"
+            else:
+                status = TestStatus.FAIL
+                message = f"UI error: HTTP {route['status_code']}"
             
             result = TestResult(
                 endpoint=f"UI: {endpoint}",
                 method="GET",
                 status=status,
-                response_code=response.status_code if 'response' in locals() else 0,
+                response_code=route['status_code'],
                 message=message,
                 execution_time=exec_time,
                 requires_auth=False
@@ -678,98 +763,111 @@ class ThoughtProAPITester:
             
             self.test_results.append(result)
             logger.info(f"{status.value} - {description} - {message} ({exec_time:.3f}s)")
+        
+        logger.info(f"UI routes probed concurrently in {prober.wall_time_ms / 1000:.3f}s")
     
     def generate_report(self):
         """Generate comprehensive test report"""
         logger.info("\nGENERATING TEST REPORT")
         logger.info("=" * 50)
         
-        total_tests = len(self.test_results)
-        passed = len([r for r in self.test_results if r.status == TestStatus.PASS])
-        failed = len([r for r in self.test_results if r.status == TestStatus.FAIL])
-        skipped = len([r for r in self.test_results if r.status == TestStatus.SKIP])
-        warnings = len([r for r in self.test_results if r.status == TestStatus.WARNING])
-        
-        report = f"""
-===============================================================================
-                     THOUGHTPRO B2B API & UI TEST REPORT                        
-===============================================================================
-
-SUMMARY STATISTICS:
--------------------------------------------------------------------------------
-Total Tests: {total_tests}
-[PASS] Passed: {passed} ({passed/total_tests*100:.1f}%)
-[FAIL] Failed: {failed} ({failed/total_tests*100:.1f}%)
-[WARN] Warnings: {warnings} ({warnings/total_tests*100:.1f}%)
-[SKIP] Skipped: {skipped} ({skipped/total_tests*100:.1f}%)
-
-API Base URL: {self.base_url}
-UI Base URL: {self.ui_base_url}
-Test Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-DETAILED RESULTS:
--------------------------------------------------------------------------------
-"""
-        
-        # Group results by category
-        categories = {}
-        for result in self.test_results:
-            if result.endpoint.startswith('UI:'):
-                category = 'UI Tests'
-            elif '/auth/' in result.endpoint:
-                category = 'Authentication'
-            elif '/companies' in result.endpoint or '/api/v1/companies' in result.endpoint:
-                category = 'Company Management'
-            elif '/psychologists' in result.endpoint:
-                category = 'Psychologist Management'
-            elif '/bookings' in result.endpoint:
-                category = 'Booking Management'
-            elif '/employee-subscriptions' in result.endpoint:
-                category = 'Employee Subscriptions'
-            elif '/availability' in result.endpoint or '/holidays' in result.endpoint:
-                category = 'Availability & Holidays'
-            else:
-                category = 'Other'
-            
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(result)
-        
-        for category, results in categories.items():
-            report += f"\n* {category.upper()}:\n"
-            for result in results:
-                auth_indicator = "[AUTH]" if result.requires_auth else "[OPEN]"
-                report += f"   {result.status.value} {auth_indicator} {result.method:6} {result.endpoint:50} ({result.execution_time:.3f}s)\n"
-                if result.status in [TestStatus.FAIL, TestStatus.WARNING]:
-                    report += f"      └─ {result.message}\n"
-        
-        report += f"""
-RECOMMENDATIONS:
--------------------------------------------------------------------------------
-"""
+        store = self.test_results
+        total_tests = len(store)
+        by_status = store.count_by('status')
+        passed = by_status.get(TestStatus.PASS.value, 0)
+        failed = by_status.get(TestStatus.FAIL.value, 0)
+        skipped = by_status.get(TestStatus.SKIP.value, 0)
+        warnings = by_status.get(TestStatus.WARNING.value, 0)
+        short_circuited = by_status.get(TestStatus.SHORT_CIRCUIT.value, 0)
+        breaker_summary = self.breaker.summary()
+        schema_summary = self.schema_validator.summary()
+        api_rows = ~store.mask('endpoint', lambda endpoint: endpoint.startswith('UI:'))
+        payload_totals = store.payload_totals(api_rows)
+        
+        pct = lambda n: f"{n} ({n/total_tests*100:.1f}%)" if total_tests else str(n)
+        summary_items = [
+            ('total_tests', 'Total Tests', total_tests),
+            ('passed', '[PASS] Passed', passed, pct(passed)),
+            ('failed', '[FAIL] Failed', failed, pct(failed)),
+            ('warnings', '[WARN] Warnings', warnings, pct(warnings)),
+            ('skipped', '[SKIP] Skipped', skipped, pct(skipped)),
+            ('short_circuited', '[SHORT] Short-circuited', short_circuited, pct(short_circuited)),
+            ('schema_validation', 'Schema Checks', schema_summary,
+             f"{schema_summary['checked']} checked, {schema_summary['schema_failures']} mismatched "
+             f"({schema_summary['overhead_pct_of_cpu']:.2f}% of CPU)"),
+            ('payload_totals', 'Bytes', payload_totals,
+             f"{format_bytes(payload_totals['request_wire_bytes'])} sent, "
+             f"{format_bytes(payload_totals['response_wire_bytes'])} received "
+             f"({format_bytes(payload_totals['response_body_bytes'])} decoded)"),
+            ('api_base_url', 'API Base URL', self.base_url),
+            ('ui_base_url', 'UI Base URL', self.ui_base_url),
+            ('test_time', 'Test Time', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+            ('circuit_breaker', None, breaker_summary),
+        ]
         
+        recommendations = []
         if failed > 0:
-            report += "• Fix failed API endpoints before production deployment\n"
+            recommendations.append("Fix failed API endpoints before production deployment")
         if warnings > 0:
-            report += "• Review warning endpoints - they may need implementation\n"
+            recommendations.append("Review warning endpoints - they may need implementation")
         if skipped > 0:
-            report += "• Implement authentication to test protected endpoints\n"
-        
-        report += """• Ensure UI server is running (npm start) for complete testing
-• Verify API server is accessible and responding correctly
-• Check authentication flow for protected endpoints
-• Validate data models match API documentation
-
-END OF REPORT
-"""
-        
-        # Save report to file
-        with open('api_ui_test_report.txt', 'w', encoding='utf-8') as f:
-            f.write(report)
-        
-        print(report)
-        logger.info(f"Test report saved to: api_ui_test_report.txt")
+            recommendations.append("Implement authentication to test protected endpoints")
+        if short_circuited > 0:
+            recommendations.append(f"{short_circuited} test(s) were not sent - {'; '.join(breaker_summary['reasons'])}")
+        recommendations += ["Ensure UI server is running (npm start) for complete testing",
+                            "Verify API server is accessible and responding correctly",
+                            "Check authentication flow for protected endpoints",
+                            "Validate data models match API documentation"]
+        
+        # --store PATH: the columnar results as .npz (or .csv)
+        if self.store_path:
+            store.save(self.store_path)
+            logger.info(f"Result store saved to: {self.store_path}")
+        
+        # The report is a summary - print it even in quiet mode, after queued log lines.
+        # Text (file and stdout), JSON and HTML are written together, section by section
+        log_pipeline.flush()
+        with open('api_ui_test_report.txt', 'w', encoding='utf-8') as text_file, \
+                open('api_ui_test_report.json', 'w', encoding='utf-8') as json_file, \
+                open('api_ui_test_report.html', 'w', encoding='utf-8') as html_file:
+            renderer = ReportRenderer("THOUGHTPRO B2B API & UI TEST REPORT", text=[text_file, sys.stdout],
+                                      json_file=json_file, html=html_file)
+            renderer.begin()
+            renderer.summary('summary', 'Summary Statistics', summary_items)
+            self._render_detailed_results(store, renderer)
+            render_result_sections(store, renderer, self.report_top_n,
+                                   failed=store.mask('status', lambda status: status in (
+                                       TestStatus.FAIL.value, TestStatus.WARNING.value)))
+            renderer.notes('recommendations', 'Recommendations', recommendations)
+            renderer.end()
+        
+        logger.info("Test report saved to: api_ui_test_report.txt (also .json and .html)")
         logger.info(f"Test logs saved to: api_test_results.log")
+        log_pipeline.flush()
+    
+    def _render_detailed_results(self, store: ResultStore, renderer: ReportRenderer):
+        """Every result by category - only for runs small enough to read line by line"""
+        if len(store) > DETAIL_LIMIT:
+            renderer.notes('detailed_results_note', 'Detailed Results', [
+                f"{len(store)} results - listed by category only up to {DETAIL_LIMIT}; "
+                f"see the slowest and failed samples below, or save them all with --store"])
+            return
+        
+        categories: Dict[str, List[Dict]] = {}
+        for result in store.rows():
+            listed = result['status'] in (TestStatus.FAIL.value, TestStatus.WARNING.value)
+            categories.setdefault(_category(result['endpoint']), []).append({
+                'status': result['status'],
+                'auth': "[AUTH]" if result['requires_auth'] else "[OPEN]",
+                'method': result['method'],
+                'endpoint': result['endpoint'],
+                'seconds': result['duration_ms'] / 1000 if result['duration_ms'] is not None else None,
+                'message': f"└─ {result['message']}" if listed else "",
+            })
+        
+        for category, rows in categories.items():
+            renderer.table(f"results_{category.lower().replace(' & ', '_').replace(' ', '_')}",
+                           f"* {category}", DETAIL_COLUMNS, rows)
     
     def run_all_tests(self):
         """Execute complete test suite"""
@@ -777,6 +875,7 @@ END OF REPORT
         logger.info("=" * 80)
         
         self.setup_session()
+        self.breaker.start()
         
         try:
             # Run API endpoint tests
@@ -789,8 +888,11 @@ END OF REPORT
             self.test_health_check_endpoints()
             self.test_employee_management_endpoints()
             
-            # Run UI connectivity tests
-            self.test_ui_connectivity()
+            # Run UI connectivity tests (a separate host, but the same run deadline)
+            if self.breaker.expired():
+                logger.warning(f"Skipping UI connectivity tests - run deadline of {self.breaker.deadline:.0f}s exceeded")
+            else:
+                self.test_ui_connectivity()
             
         except KeyboardInterrupt:
             logger.warning("\n⚠️ Test execution interrupted by user")
@@ -802,6 +904,15 @@ END OF REPORT
 
 def main():
     """Main execution function"""
+    # --quiet: per-request progress goes to the log file only, summaries are still printed
+    log_pipeline.quiet = '--quiet' in sys.argv[1:]
+    # --deadline SECONDS and --breaker-threshold N bound a run against an unreachable API;
+    # --store PATH also saves the columnar results (.npz or .csv);
+    # --top N: slowest and failed samples listed in the report (default 20)
+    breaker = breaker_from_argv(sys.argv[1:])
+    store_path = argv_option(sys.argv[1:], '--store')
+    top_n = argv_option(sys.argv[1:], '--top', DEFAULT_TOP_N, int)
+    
     print("🔬 ThoughtPro B2B API & UI Integration Test Suite")
     print("=" * 60)
     
@@ -809,21 +920,33 @@ def main():
     api_base_url = "https://thoughtprob2b.thoughthealer.org/api/v1"
     ui_base_url = "http://localhost:3000"
     
+    # --serve-build: test the UI against a local static server over src/build
+    build_server = None
+    if '--serve-build' in sys.argv[1:]:
+        build_server = BuildServer().start()
+        ui_base_url = build_server.url
+    
     print(f"Using default API Base URL: {api_base_url}")
-    print(f"Using default UI Base URL: {ui_base_url}")
+    print(f"Using {'local build' if build_server else 'default'} UI Base URL: {ui_base_url}")
     
     # Initialize and run tests
-    tester = ThoughtProAPITester(api_base_url)
+    tester = ThoughtProAPITester(api_base_url, breaker=breaker)
     tester.ui_base_url = ui_base_url
+    tester.store_path = store_path
+    tester.report_top_n = top_n
     
     print(f"\n🎯 Testing API: {api_base_url}")
     print(f"🎯 Testing UI: {ui_base_url}")
     print("\n⏳ Starting tests...")
     
-    tester.run_all_tests()
+    try:
+        tester.run_all_tests()
+    finally:
+        if build_server:
+            build_server.stop()
     
     print("\n✅ Test execution completed!")
-    print("📄 Check 'api_ui_test_report.txt' for detailed results")
+    print("📄 Check 'api_ui_test_report.txt' (or .html / .json) for detailed results")
     print("📄 Check 'api_test_results.log' for execution logs")
 
 if __name__ == "__main__":
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+ThoughtPro B2B UI Route Prober
+
+Probes the React app's routes concurrently and, for every route, loads the
+page the way a browser would:
+
+  * fetch the HTML shell served for the route
+  * parse it for scripts, stylesheets and preloads
+  * fetch all of those assets at once
+
+Each route reports total bytes, time to last byte and a request waterfall.
+The waterfall marks the critical path: the HTML shell plus the render-blocking
+asset that finishes last.
+
+The asset list is cross-checked against src/build/asset-manifest.json, so an
+HTML shell that does not match the build is flagged.
+
+``BuildServer`` serves src/build locally, with the SPA rewrite from
+vercel.json, so the prober (and test_api_ui_integration.py --serve-build)
+works without a deployed frontend or ``npm start``.
+
+Usage:
+    python ui_prober.py                       # serve src/build locally and probe it
+    python ui_prober.py --url http://localhost:3000
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BUILD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "build")
+
+# Routes of the React app (see src/App.jsx)
+UI_ROUTES = [
+    ("/", "Main Landing Page"),
+    ("/login", "Login Page"),
+    ("/dashboard", "Dashboard"),
+    ("/employees", "Employee Management"),
+    ("/psychologists", "Psychologist Management"),
+    ("/bookings", "Booking Management"),
+    ("/companies", "Company Management"),
+    ("/settings", "Settings Page")
+]
+
+
+class AssetParser(HTMLParser):
+    """Collects (kind, url, render_blocking) for scripts, stylesheets and preloads"""
+
+    def __init__(self):
+        super().__init__()
+        self.assets: List[Tuple[str, str, bool]] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("src"):
+            # Classic scripts without async/defer block parsing; defer scripts
+            # still have to run before DOMContentLoaded, so both count
+            self.assets.append(("script", attrs["src"], "async" not in attrs))
+        elif tag == "link" and attrs.get("href"):
+            rel = (attrs.get("rel") or "").lower().split()
+            if "stylesheet" in rel:
+                self.assets.append(("stylesheet", attrs["href"], True))
+            elif "modulepreload" in rel or "preload" in rel:
+                self.assets.append(("preload", attrs["href"], False))
+
+
+def parse_assets(html: str) -> List[Tuple[str, str, bool]]:
+    parser = AssetParser()
+    parser.feed(html)
+    return parser.assets
+
+
+def load_manifest(build_dir: str = BUILD_DIR) -> Dict:
+    """asset-manifest.json of a CRA build (empty when missing)"""
+    path = os.path.join(build_dir, "asset-manifest.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def manifest_entrypoints(manifest: Dict) -> List[str]:
+    return ["/" + entry.lstrip("/") for entry in manifest.get("entrypoints", [])]
+
+
+class _BuildRequestHandler(SimpleHTTPRequestHandler):
+    """Static files from the build directory; unknown paths get index.html (vercel.json rewrite)"""
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if not os.path.exists(path):
+            self.path = "/index.html"
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _BuildHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops SYNs when assets are fetched in parallel;
+    # each drop costs a ~1 s retransmit that would be reported as load time
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class BuildServer:
+    """Local static server over src/build, started on a background thread"""
+
+    def __init__(self, build_dir: str = BUILD_DIR, host: str = "127.0.0.1", port: int = 0):
+        self.build_dir = build_dir
+        handler = lambda *args, **kwargs: _BuildRequestHandler(*args, directory=build_dir, **kwargs)
+        self.server = _BuildHTTPServer((host, port), handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "BuildServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="build-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class UIRouteProber:
+    """Concurrent route + asset prober"""
+
+    def __init__(self, base_url: str, timeout: float = 10.0, max_workers: int = 16,
+                 manifest: Optional[Dict] = None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.manifest = load_manifest() if manifest is None else manifest
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url: str, origin: float) -> Dict:
+        """One timed GET; times are ms relative to ``origin``"""
+        entry = {"url": url, "status_code": 0, "bytes": 0, "start_ms": 0.0, "ttfb_ms": 0.0,
+                 "end_ms": 0.0, "error": None, "body": None}
+        start = time.perf_counter()
+        entry["start_ms"] = round((start - origin) * 1000, 2)
+        try:
+            response = self.session.get(url, timeout=self.timeout, stream=True)
+            entry["ttfb_ms"] = round((time.perf_counter() - origin) * 1000, 2)
+            body = response.content
+            entry["status_code"] = response.status_code
+            entry["bytes"] = len(body)
+            entry["content_type"] = response.headers.get("Content-Type", "")
+            entry["body"] = body
+        except requests.exceptions.RequestException as e:
+            entry["error"] = str(e)
+            entry["connection_error"] = isinstance(e, requests.exceptions.ConnectionError)
+        entry["end_ms"] = round((time.perf_counter() - origin) * 1000, 2)
+        return entry
+
+    def probe_route(self, path: str, asset_pool: ThreadPoolExecutor) -> Dict:
+        """HTML shell, then every referenced asset in parallel"""
+        origin = time.perf_counter()
+        page = self.fetch(f"{self.base_url}{path}", origin)
+        page.update(kind="document", render_blocking=True)
+        route = {"path": path, "status_code": page["status_code"], "error": page["error"],
+                 "connection_error": page.get("connection_error", False), "waterfall": [page],
+                 "manifest_missing": [], "unreferenced_entrypoints": []}
+
+        html = page.pop("body")
+        if page["status_code"] == 200 and html:
+            assets = parse_assets(html.decode("utf-8", errors="replace"))
+            referenced = {urlsplit(src).path for _kind, src, _blocking in assets}
+            entrypoints = manifest_entrypoints(self.manifest)
+            known = set(self.manifest.get("files", {}).values()) | set(entrypoints)
+            if self.manifest:
+                route["manifest_missing"] = sorted(p for p in referenced if p not in known)
+                route["unreferenced_entrypoints"] = [p for p in entrypoints if p not in referenced]
+
+            page_url = page["url"]
+            futures = [(kind, blocking, asset_pool.submit(self.fetch, urljoin(page_url, src), origin))
+                       for kind, src, blocking in assets]
+            for kind, blocking, future in futures:
+                entry = future.result()
+                entry.pop("body")
+                entry.update(kind=kind, render_blocking=blocking)
+                route["waterfall"].append(entry)
+
+        waterfall = route["waterfall"]
+        route["total_bytes"] = sum(e["bytes"] for e in waterfall)
+        route["asset_count"] = len(waterfall) - 1
+        route["failed_assets"] = [e["url"] for e in waterfall[1:] if e["status_code"] != 200]
+        route["time_to_last_byte_ms"] = max(e["end_ms"] for e in waterfall)
+
+        # Critical path: document, then the render-blocking asset that finishes last
+        blocking = [e for e in waterfall[1:] if e["render_blocking"]]
+        critical = [page] + ([max(blocking, key=lambda e: e["end_ms"])] if blocking else [])
+        for entry in waterfall:
+            entry["critical"] = any(entry is c for c in critical)
+        route["critical_path_ms"] = critical[-1]["end_ms"]
+        return route
+
+    def probe_routes(self, routes: List[Tuple[str, str]] = None) -> List[Dict]:
+        """Probe all routes at once; results keep the order of ``routes``"""
+        routes = routes or UI_ROUTES
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ui-asset") as asset_pool, \
+                ThreadPoolExecutor(max_workers=len(routes), thread_name_prefix="ui-route") as route_pool:
+            futures = [route_pool.submit(self.probe_route, path, asset_pool) for path, _description in routes]
+            results = []
+            for (path, description), future in zip(routes, futures):
+                result = future.result()
+                result["description"] = description
+                results.append(result)
+        self.wall_time_ms = round((time.perf_counter() - start) * 1000, 2)
+        return results
+
+
+def format_waterfall(route: Dict, width: int = 40) -> List[str]:
+    """Text waterfall for one route; critical-path requests are marked with *"""
+    span = max(route["time_to_last_byte_ms"], 0.001)
+    lines = []
+    for entry in route["waterfall"]:
+        begin = int(entry["start_ms"] / span * width)
+        first_byte = int(entry["ttfb_ms"] / span * width) if entry["ttfb_ms"] else begin
+        end = max(int(entry["end_ms"] / span * width), first_byte + 1)
+        bar = " " * begin + "." * (first_byte - begin) + "█" * (end - first_byte)
+        name = urlsplit(entry["url"]).path or "/"
+        marker = "*" if entry.get("critical") else " "
+        lines.append(f"   {marker} {entry['kind']:10} {name[-38:]:38} |{bar:{width}}| "
+                     f"{entry['end_ms']:8.1f}ms {entry['bytes'] / 1024:8.1f}KB {entry['status_code'] or 'ERR'}")
+    return lines
+
+
+def print_results(results: List[Dict], wall_time_ms: float, waterfall: bool = True):
+    print(f"\n{'Route':16} {'Status':>6} {'Assets':>6} {'Total KB':>10} {'TTLB ms':>9} {'Critical ms':>12}")
+    print("-" * 65)
+    for route in results:
+        print(f"{route['path']:16} {route['status_code'] or 'ERR':>6} {route['asset_count']:6} "
+              f"{route['total_bytes'] / 1024:10.1f} {route['time_to_last_byte_ms']:9.1f} "
+              f"{route['critical_path_ms']:12.1f}")
+    print(f"\n⏱️  All routes probed in {wall_time_ms:.1f}ms")
+
+    if waterfall:
+        for route in results:
+            print(f"\n🌊 {route['path']} ({route['description']})")
+            for line in format_waterfall(route):
+                print(line)
+
+    for route in results:
+        if route["error"]:
+            print(f"❌ {route['path']}: {route['error']}")
+        for url in route["failed_assets"]:
+            print(f"❌ {route['path']}: asset failed - {url}")
+        for path in route["manifest_missing"]:
+            print(f"⚠️  {route['path']}: {path} is not in asset-manifest.json")
+        for path in route["unreferenced_entrypoints"]:
+            print(f"⚠️  {route['path']}: manifest entrypoint {path} is not referenced by the HTML")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent UI route and asset prober")
+    parser.add_argument("--url", help="UI base URL (default: serve src/build locally)")
+    parser.add_argument("--build-dir", default=BUILD_DIR, help="Build directory to serve and read the manifest from")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds (default 10)")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent asset requests (default 16)")
+    parser.add_argument("--no-waterfall", action="store_true", help="Only print the per-route table")
+    parser.add_argument("--json", dest="json_file", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = BuildServer(args.build_dir).start()
+        base_url = server.url
+
+    print("🌐 ThoughtPro B2B UI Route Prober")
+    print(f"UI: {base_url}" + (f" (serving {args.build_dir})" if server else ""))
+
+    try:
+        prober = UIRouteProber(base_url, timeout=args.timeout, max_workers=args.workers,
+                               manifest=load_manifest(args.build_dir))
+        results = prober.probe_routes()
+    finally:
+        if server:
+            server.stop()
+
+    print_results(results, prober.wall_time_ms, waterfall=not args.no_waterfall)
+
+    if args.json_file:
+        with open(args.json_file, "w", encoding="utf-8") as f:
+            json.dump({"base_url": base_url, "wall_time_ms": prober.wall_time_ms, "routes": results}, f, indent=2)
+        print(f"\n💾 Results saved to: {args.json_file}")
+
+    if any(route["status_code"] != 200 or route["failed_assets"] for route in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()